@@ -130,6 +130,22 @@ if __name__ == '__main__':
 		else:
 			globalData.persistent = 0
 
+		# Get alert dispatch settings (optional, configurations without
+		# this element keep the defaults of the global data).
+		alertDispatch = configRoot.find("general").find("alertDispatch")
+		if alertDispatch is not None:
+			if "window" in alertDispatch.attrib.keys():
+				globalData.alertWindow = float(
+					alertDispatch.attrib["window"])
+			if "maxExecuters" in alertDispatch.attrib.keys():
+				globalData.maxAlertExecuters = int(
+					alertDispatch.attrib["maxExecuters"])
+		if globalData.alertWindow < 0.0:
+			raise ValueError("Alert dispatch window has to be "
+				+ "a positive value or 0.")
+		if globalData.maxAlertExecuters < 1:
+			raise ValueError("Alert dispatch needs at least one executer.")
+
 		# parse smtp options if activated
 		smtpActivated = (str(
 			configRoot.find("smtp").find("general").attrib[
@@ -30,6 +30,13 @@ class _Alert:
 		raise NotImplementedError("Function not implemented yet.")
 
 
+	# triggers the alert for multiple sensor alerts that were collected
+	# at once (can be overwritten by alerts that are able to combine them)
+	def triggerAlerts(self, sensorAlerts):
+		for sensorAlert in sensorAlerts:
+			self.triggerAlert(sensorAlert)
+
+
 	def stopAlert(self, sensorAlert):
 		raise NotImplementedError("Function not implemented yet.")
 
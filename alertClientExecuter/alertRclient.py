@@ -11,7 +11,7 @@ import sys
 import os
 from lib import ServerCommunication, ConnectionWatchdog, Receiver
 from lib import SMTPAlert
-from lib import ExecuterAlert
+from lib import ExecuterAlert, ProcessExecuter
 from lib import UpdateChecker
 from lib import GlobalData
 import logging
@@ -130,6 +130,22 @@ if __name__ == '__main__':
 		else:
 			globalData.persistent = 0
 
+		# Get alert dispatch settings (optional, configurations without
+		# this element keep the defaults of the global data).
+		alertDispatch = configRoot.find("general").find("alertDispatch")
+		if alertDispatch is not None:
+			if "window" in alertDispatch.attrib.keys():
+				globalData.alertWindow = float(
+					alertDispatch.attrib["window"])
+			if "maxExecuters" in alertDispatch.attrib.keys():
+				globalData.maxAlertExecuters = int(
+					alertDispatch.attrib["maxExecuters"])
+		if globalData.alertWindow < 0.0:
+			raise ValueError("Alert dispatch window has to be "
+				+ "a positive value or 0.")
+		if globalData.maxAlertExecuters < 1:
+			raise ValueError("Alert dispatch needs at least one executer.")
+
 		# parse smtp options if activated
 		smtpActivated = (str(
 			configRoot.find("smtp").find("general").attrib[
@@ -169,10 +185,23 @@ if __name__ == '__main__':
 				raise ValueError("Update check can not have email "
 					+ "notification activated when smtp is not activated.")
 
+		# parse the settings of the process executer (optional, the
+		# defaults of the process executer are used if they are missing)
+		globalData.processExecuter = ProcessExecuter()
+		execution = configRoot.find("general").find("execution")
+		if (execution is not None
+			and "maxParallel" in execution.attrib.keys()):
+			globalData.processExecuter.maxParallel = int(
+				execution.attrib["maxParallel"])
+		if globalData.processExecuter.maxParallel < 1:
+			raise ValueError("Maximal number of parallel executed "
+				+ "processes has to be at least 1.")
+
 		# parse all alerts
 		for item in configRoot.find("alerts").iterfind("alert"):
 
 			alert = ExecuterAlert()
+			alert.processExecuter = globalData.processExecuter
 
 			# get executer specific values
 			tempExecute = makePath(
@@ -190,6 +219,14 @@ if __name__ == '__main__':
 			for argument in item.find("executer").iterfind("stopArgument"):
 				alert.stopExecute.append(str(argument.text))
 
+			# minimal time between two executions of the commands
+			# (optional, no cooldown if it is missing)
+			if "cooldown" in item.find("executer").attrib.keys():
+				alert.cooldown = float(
+					item.find("executer").attrib["cooldown"])
+			if alert.cooldown < 0.0:
+				raise ValueError("Cooldown of alert has to be positive.")
+
 			# these options are needed by the server to
 			# differentiate between the registered alerts
 			alert.id = int(item.find("general").attrib["id"])
@@ -263,6 +300,13 @@ if __name__ == '__main__':
 	watchdog.daemon = True
 	watchdog.start()
 
+	# start the process executer that executes the commands of the alerts
+	logging.info("[%s] Starting process executer thread." % fileName)
+	# set thread to daemon
+	# => threads terminates when main thread terminates
+	globalData.processExecuter.daemon = True
+	globalData.processExecuter.start()
+
 	# initialize all alerts
 	logging.info("[%s] Initializing alerts." % fileName)
 	for alert in globalData.alerts:
@@ -30,6 +30,13 @@ class _Alert:
 		raise NotImplementedError("Function not implemented yet.")
 
 
+	# triggers the alert for multiple sensor alerts that were collected
+	# at once (can be overwritten by alerts that are able to combine them)
+	def triggerAlerts(self, sensorAlerts):
+		for sensorAlert in sensorAlerts:
+			self.triggerAlert(sensorAlert)
+
+
 	def stopAlert(self, sensorAlert):
 		raise NotImplementedError("Function not implemented yet.")
 
@@ -56,6 +63,13 @@ class ExecuterAlert(_Alert):
 		# an alert is stopped
 		self.stopExecute = list()
 
+		# minimal time in seconds between the start of two executions
+		# of the commands of this alert
+		self.cooldown = 0.0
+
+		# instance of the process executer that executes the commands
+		self.processExecuter = None
+
 
 	# this function is called once when the alert client has connected itself
 	# to the server (should be use to initialize everything that is needed
@@ -67,25 +81,307 @@ class ExecuterAlert(_Alert):
 	# this function is called when this alert is triggered
 	def triggerAlert(self, sensorAlert):
 
-		logging.debug("[%s]: Executing process " % self.fileName
+		logging.debug("[%s]: Queueing process " % self.fileName
 			+ "'%s' with trigger arguments." % self.description)
-		try:
-			subprocess.Popen(self.triggerExecute, close_fds=True)
-		except Exception as e:
-			logging.exception("[%s]: Executing process " % self.fileName
-				+ "'%s' with trigger arguments failed." % self.description)
-		
+		self.processExecuter.queueExecution(self, True)
+
 
 	# this function is called when the alert is stopped
 	def stopAlert(self, sensorAlert):
 
-		logging.debug("[%s]: Executing process " % self.fileName
+		logging.debug("[%s]: Queueing process " % self.fileName
 			+ "'%s' with stop arguments." % self.description)
-		try:
-			subprocess.Popen(self.stopExecute, close_fds=True)
-		except Exception as e:
-			logging.exception("[%s]: Executing process " % self.fileName
-				+ "'%s' with stop arguments failed." % self.description)
+		self.processExecuter.queueExecution(self, False)
+
+
+# internal class that holds one execution of a command of an alert
+class _ProcessExecution:
+
+	def __init__(self):
+
+		# the alert the command belongs to and a flag that indicates if
+		# the command is executed with the trigger arguments
+		# (or with the stop arguments)
+		self.alert = None
+		self.isTrigger = None
+
+		# the started process and the time it was started
+		self.process = None
+		self.startTime = None
+
+
+	def getArgumentsName(self):
+		if self.isTrigger:
+			return "trigger"
+		return "stop"
+
+
+# this class executes the commands of the alerts in an own thread
+# (the number of trigger processes that run concurrently is bounded,
+# executions of the same command of an alert are executed one after
+# another in the order they were queued with the cooldown of the alert
+# between them, stop commands are started before queued trigger commands
+# and are not blocked by running triggers, queued duplicates are
+# coalesced and finished processes are reaped)
+class ProcessExecuter(threading.Thread):
+
+	def __init__(self):
+		threading.Thread.__init__(self)
+
+		# used for logging
+		self.fileName = os.path.basename(__file__)
+
+		# maximal number of trigger processes that run concurrently
+		# (stop processes are not bounded in order to not wait behind
+		# long running triggers)
+		self.maxParallel = 4
+
+		# interval in seconds in which the running processes are checked
+		self.reapInterval = 0.1
+
+		# interval in seconds in which the statistics are logged
+		# (only done in log level DEBUG)
+		self.statisticsInterval = 300
+
+		# queued executions (in the order they were queued) and the event
+		# that wakes up the executer thread
+		self.queueLock = threading.Semaphore(1)
+		self.queueEvent = threading.Event()
+		self.queuedExecutions = list()
+
+		# running executions (only accessed by the executer thread)
+		self.runningExecutions = list()
+
+		# the time the last execution of a command of an alert was
+		# started in the form:
+		# lastStartTimes[(<alert id>, <is trigger>)] = <time>
+		self.lastStartTimes = dict()
+
+		# statistics of the executions (durations in seconds)
+		self.executionsStarted = 0
+		self.executionsCoalesced = 0
+		self.executionsFailed = 0
+		self.exitStatusCounts = dict()
+		self.totalDuration = 0.0
+		self.maxDuration = 0.0
+
+
+	# queues an execution of the command of the given alert
+	# (with the trigger arguments or the stop arguments)
+	def queueExecution(self, alert, isTrigger):
+
+		execution = _ProcessExecution()
+		execution.alert = alert
+		execution.isTrigger = isTrigger
+
+		self.queueLock.acquire()
+
+		alertExecutions = filter(lambda x: x.alert is alert,
+			self.queuedExecutions)
+
+		# the last queued execution of the alert is the same
+		# => coalesce the new one into it
+		if (alertExecutions
+			and alertExecutions[-1].isTrigger == isTrigger):
+			self.executionsCoalesced += 1
+
+		else:
+			self.queuedExecutions.append(execution)
+			alertExecutions.append(execution)
+
+			# the last two queued executions of the alert are the
+			# same trigger/stop pair as the two before
+			# => coalesce the new pair into the old one
+			if (len(alertExecutions) >= 4
+				and alertExecutions[-4].isTrigger
+				== alertExecutions[-2].isTrigger
+				and alertExecutions[-3].isTrigger
+				== alertExecutions[-1].isTrigger):
+				self.queuedExecutions.remove(alertExecutions[-2])
+				self.queuedExecutions.remove(alertExecutions[-1])
+				self.executionsCoalesced += 2
+
+		self.queueLock.release()
+
+		self.queueEvent.set()
+
+
+	# internal function that checks the running processes and reaps
+	# the finished ones
+	def _reapProcesses(self):
+
+		for execution in list(self.runningExecutions):
+
+			exitStatus = execution.process.poll()
+			if exitStatus is None:
+				continue
+
+			self.runningExecutions.remove(execution)
+
+			duration = time.time() - execution.startTime
+			self.totalDuration += duration
+			self.maxDuration = max(self.maxDuration, duration)
+			self.exitStatusCounts[exitStatus] = \
+				self.exitStatusCounts.get(exitStatus, 0) + 1
+
+			if exitStatus != 0:
+				self.executionsFailed += 1
+				logging.warning("[%s]: Process '%s' with %s arguments "
+					% (self.fileName, execution.alert.description,
+					execution.getArgumentsName())
+					+ "exited with status %d after %.3f seconds."
+					% (exitStatus, duration))
+
+			else:
+				logging.debug("[%s]: Process '%s' with %s arguments "
+					% (self.fileName, execution.alert.description,
+					execution.getArgumentsName())
+					+ "finished after %.3f seconds." % duration)
+
+
+	# internal function that starts the queued executions that are
+	# allowed to run
+	#
+	# returns the time in seconds until the next queued execution
+	# is allowed to run (or None if no execution waits for its cooldown)
+	def _startExecutions(self):
+
+		utcTimestamp = time.time()
+		nextStart = None
+
+		# get the executions that are allowed to run (only the first
+		# queued execution of each command of an alert is allowed to run
+		# if no execution of the same command of the alert runs and its
+		# cooldown has passed; a trigger is not allowed to overtake a queued
+		# stop of its alert, a stop overtakes queued triggers of its alert
+		# which are discarded because the alert is stopped afterwards;
+		# stop executions are checked first and only trigger executions
+		# are bounded by maxParallel)
+		executionsToStart = list()
+		runningTriggers = len(filter(lambda x: x.isTrigger,
+			self.runningExecutions))
+		blockedCommands = set(map(lambda x: (x.alert.id, x.isTrigger),
+			self.runningExecutions))
+		self.queueLock.acquire()
+
+		candidates = list()
+		queuedAlerts = set()
+		stoppedAlerts = set()
+		for execution in self.queuedExecutions:
+			alertId = execution.alert.id
+			if execution.isTrigger:
+				if not alertId in queuedAlerts:
+					candidates.append(execution)
+			elif not alertId in stoppedAlerts:
+				stoppedAlerts.add(alertId)
+				candidates.append(execution)
+			queuedAlerts.add(alertId)
+		candidates.sort(key=lambda x: x.isTrigger)
+
+		for execution in candidates:
+
+			if (execution.isTrigger
+				and runningTriggers >= self.maxParallel):
+				break
+
+			# trigger was discarded by a stop started before
+			if not execution in self.queuedExecutions:
+				continue
+
+			commandKey = (execution.alert.id, execution.isTrigger)
+			if commandKey in blockedCommands:
+				continue
+
+			waitTime = (self.lastStartTimes.get(commandKey, 0.0)
+				+ execution.alert.cooldown - utcTimestamp)
+			if waitTime > 0.0:
+				if nextStart is None or waitTime < nextStart:
+					nextStart = waitTime
+				continue
+
+			blockedCommands.add(commandKey)
+			if execution.isTrigger:
+				runningTriggers += 1
+
+			else:
+				position = self.queuedExecutions.index(execution)
+				for obsolete in self.queuedExecutions[:position]:
+					if obsolete.alert is execution.alert:
+						self.queuedExecutions.remove(obsolete)
+						self.executionsCoalesced += 1
+
+			self.queuedExecutions.remove(execution)
+			executionsToStart.append(execution)
+		self.queueLock.release()
+
+		for execution in executionsToStart:
+
+			logging.debug("[%s]: Executing process " % self.fileName
+				+ "'%s' with %s arguments."
+				% (execution.alert.description,
+				execution.getArgumentsName()))
+
+			if execution.isTrigger:
+				command = execution.alert.triggerExecute
+			else:
+				command = execution.alert.stopExecute
+
+			self.lastStartTimes[(execution.alert.id,
+				execution.isTrigger)] = utcTimestamp
+			try:
+				execution.startTime = time.time()
+				execution.process = subprocess.Popen(command,
+					close_fds=True)
+				self.executionsStarted += 1
+				self.runningExecutions.append(execution)
+			except Exception as e:
+				self.executionsFailed += 1
+				logging.exception("[%s]: Executing process " % self.fileName
+					+ "'%s' with %s arguments failed."
+					% (execution.alert.description,
+					execution.getArgumentsName()))
+
+		return nextStart
+
+
+	def _logStatistics(self):
+		executionsFinished = sum(self.exitStatusCounts.values())
+		averageDuration = 0.0
+		if executionsFinished > 0:
+			averageDuration = self.totalDuration / executionsFinished
+		logging.debug("[%s]: Processes: %d started, %d coalesced, "
+			% (self.fileName, self.executionsStarted,
+			self.executionsCoalesced)
+			+ "%d failed, exit status counts %s, "
+			% (self.executionsFailed, str(self.exitStatusCounts))
+			+ "duration %.3f seconds average, %.3f seconds maximum."
+			% (averageDuration, self.maxDuration))
+
+
+	def run(self):
+
+		lastStatistics = time.time()
+
+		while True:
+
+			self.queueEvent.clear()
+
+			self._reapProcesses()
+			nextStart = self._startExecutions()
+
+			if (time.time() - lastStatistics) > self.statisticsInterval:
+				self._logStatistics()
+				lastStatistics = time.time()
+
+			# check the running processes regularly, otherwise wait until
+			# an execution is queued or the next cooldown has passed
+			if self.runningExecutions:
+				timeout = self.reapInterval
+			elif nextStart is not None:
+				timeout = nextStart
+			else:
+				timeout = self.statisticsInterval
+			self.queueEvent.wait(timeout)
 
 
 # this class is used to trigger or stop an alert
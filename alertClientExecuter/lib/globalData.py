@@ -49,6 +49,18 @@ class GlobalData:
 		# this variable holds the object of the server communication
 		self.serverComm = None
 
+		# instance of the process executer that executes the commands
+		# of the alerts
+		self.processExecuter = None
+
 		# Flag that indicates if this node is registered as persistent
 		# (0 or 1).
-		self.persistent = None
\ No newline at end of file
+		self.persistent = None
+
+		# time window in seconds in which sensor alerts for the same alert
+		# and alert level are collected before the alert is triggered
+		# (0 triggers the alert for each sensor alert immediately)
+		self.alertWindow = 0.0
+
+		# maximal number of alerts that are executed concurrently
+		self.maxAlertExecuters = 10
\ No newline at end of file
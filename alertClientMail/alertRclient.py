@@ -9,9 +9,10 @@
 
 import sys
 import os
+import signal
 from lib import ServerCommunication, ConnectionWatchdog, Receiver
 from lib import SMTPAlert
-from lib import MailAlert
+from lib import MailAlert, MailDispatcher
 from lib import UpdateChecker
 from lib import GlobalData
 import logging
@@ -20,6 +21,12 @@ import random
 import xml.etree.ElementTree
 
 
+# Function is called when the client is terminated in order to shut
+# down gracefully (pending eMails are sent before exiting).
+def sigtermHandler(signum, frame):
+	sys.exit(0)
+
+
 # Function creates a path location for the given user input.
 def makePath(inputLocation):
 	# Do nothing if the given location is an absolute path.
@@ -129,6 +136,22 @@ if __name__ == '__main__':
 		else:
 			globalData.persistent = 0
 
+		# Get alert dispatch settings (optional, configurations without
+		# this element keep the defaults of the global data).
+		alertDispatch = configRoot.find("general").find("alertDispatch")
+		if alertDispatch is not None:
+			if "window" in alertDispatch.attrib.keys():
+				globalData.alertWindow = float(
+					alertDispatch.attrib["window"])
+			if "maxExecuters" in alertDispatch.attrib.keys():
+				globalData.maxAlertExecuters = int(
+					alertDispatch.attrib["maxExecuters"])
+		if globalData.alertWindow < 0.0:
+			raise ValueError("Alert dispatch window has to be "
+				+ "a positive value or 0.")
+		if globalData.maxAlertExecuters < 1:
+			raise ValueError("Alert dispatch needs at least one executer.")
+
 		# parse smtp options if activated
 		smtpActivated = (str(
 			configRoot.find("smtp").find("general").attrib[
@@ -187,6 +210,14 @@ if __name__ == '__main__':
 			alert.templateFile = makePath(
 				str(item.find("mail").attrib["templateFile"]))
 
+			# digest window is optional
+			if "digestWindow" in item.find("mail").attrib:
+				alert.digestWindow = int(
+					item.find("mail").attrib["digestWindow"])
+				if alert.digestWindow < 0:
+					raise ValueError("Digest window of mail alert "
+						+ "has to be 0 or greater.")
+
 			# check if the template file exists
 			if not os.path.isfile(alert.templateFile):
 				raise ValueError("Mail template file '%s' does not exist."
@@ -270,9 +301,21 @@ if __name__ == '__main__':
 	watchdog.daemon = True
 	watchdog.start()
 
+	# start the dispatcher that sends the eMails of all alerts
+	# (all alerts use the smtp server configuration)
+	logging.info("[%s] Starting mail dispatcher thread." % fileName)
+	globalData.mailDispatcher = MailDispatcher(
+		str(configRoot.find("smtp").find("server").attrib["host"]),
+		int(configRoot.find("smtp").find("server").attrib["port"]))
+	# set thread to daemon
+	# => threads terminates when main thread terminates
+	globalData.mailDispatcher.daemon = True
+	globalData.mailDispatcher.start()
+
 	# initialize all alerts
 	logging.info("[%s] Initializing alerts." % fileName)
 	for alert in globalData.alerts:
+		alert.mailDispatcher = globalData.mailDispatcher
 		alert.initializeAlert()
 
 	# only start update checker if it is activated
@@ -287,6 +330,14 @@ if __name__ == '__main__':
 
 	logging.info("[%s] Client started." % fileName)
 
+	signal.signal(signal.SIGTERM, sigtermHandler)
+
 	# generate receiver to handle incoming data (for example status updates)
 	receiver = Receiver(globalData.serverComm)
-	receiver.run()
\ No newline at end of file
+	try:
+		receiver.run()
+	finally:
+		# send all pending digests before exiting
+		logging.info("[%s] Sending pending eMails before exiting."
+			% fileName)
+		globalData.mailDispatcher.exit()
\ No newline at end of file
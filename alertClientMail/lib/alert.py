@@ -13,6 +13,7 @@ import os
 import logging
 import smtplib
 import threading
+import Queue
 from localObjects import SensorDataType
 
 
@@ -31,6 +32,13 @@ class _Alert:
 		raise NotImplementedError("Function not implemented yet.")
 
 
+	# triggers the alert for multiple sensor alerts that were collected
+	# at once (can be overwritten by alerts that are able to combine them)
+	def triggerAlerts(self, sensorAlerts):
+		for sensorAlert in sensorAlerts:
+			self.triggerAlert(sensorAlert)
+
+
 	def stopAlert(self, sensorAlert):
 		raise NotImplementedError("Function not implemented yet.")
 
@@ -59,8 +67,15 @@ class MailAlert(_Alert):
 		self.subject = None
 		self.templateFile = None
 
+		# Time window in seconds in which sensor alerts are merged into
+		# one eMail (0 sends one eMail per sensor alert).
+		self.digestWindow = 0
+
 		self.bodyText = None
 
+		# Instance of the dispatcher that sends the eMails.
+		self.mailDispatcher = None
+
 
 	# Internal function that replaces the wildcards in the message
 	# with the corresponding values.
@@ -116,33 +131,193 @@ class MailAlert(_Alert):
 			self.bodyText = fp.read()
 
 
-	def triggerAlert(self, sensorAlert):
+	# Builds the eMail for the given sensor alerts (more than one sensor
+	# alert is only given in digest mode).
+	#
+	# Returns the eMail as string.
+	def buildMail(self, sensorAlerts):
 
 		# replace wildcards with the actual values
-		tempMsg = self._replaceWildcards(sensorAlert, self.bodyText)
-		tempSbj = self._replaceWildcards(sensorAlert, self.subject)
+		tempSbj = self._replaceWildcards(sensorAlerts[0], self.subject)
+		tempMsgs = list()
+		for sensorAlert in sensorAlerts:
+			tempMsgs.append(self._replaceWildcards(sensorAlert,
+				self.bodyText))
+
+		if len(sensorAlerts) > 1:
+			tempSbj += " (+%d more)" % (len(sensorAlerts) - 1)
 
 		emailHeader = "From: %s\r\nTo: %s\r\nSubject: %s\r\n" \
 			% (self.fromAddr, self.toAddr, tempSbj)
 
-		try:
-			logging.info("[%s] Sending eMail for triggered alert."
-				% self.fileName)
-			smtpServer = smtplib.SMTP(self.host, self.port)
-			smtpServer.sendmail(self.fromAddr, self.toAddr, 
-				emailHeader + tempMsg)
-			smtpServer.quit()
+		return emailHeader + "\r\n----------\r\n".join(tempMsgs)
 
-		except Exception as e:
-			logging.exception("[%s]: Unable to send eMail for "
-				% self.fileName
-				+ "triggered alert.")
+
+	def triggerAlert(self, sensorAlert):
+
+		logging.info("[%s] Queuing eMail for triggered alert."
+			% self.fileName)
+
+		# the eMail is sent by the dispatcher thread
+		self.mailDispatcher.queueMail(self, sensorAlert)
 
 
 	def stopAlert(self, sensorAlert):
 		pass
 
 
+# this class sends the eMails of all mail alerts over one reused
+# SMTP session (and merges sensor alerts into one eMail if the alert
+# has the digest mode activated)
+class MailDispatcher(threading.Thread):
+
+	def __init__(self, host, port):
+		threading.Thread.__init__(self)
+
+		self.fileName = os.path.basename(__file__)
+
+		self.host = host
+		self.port = port
+
+		# time in seconds an idle SMTP session is kept open
+		self.idleTimeout = 60
+
+		# queue of (alert, sensorAlert) tuples that have to be processed
+		self.mailQueue = Queue.Queue()
+
+		# sensor alerts that wait for the digest window of their alert
+		# to end in the form: digests[alertId] = (deadline, alert, list)
+		self.digests = dict()
+
+		self.smtpServer = None
+		self.lastUsed = 0.0
+
+		# statistics
+		self.mailsSent = 0
+		self.sensorAlertsSent = 0
+
+		# maximal time in seconds to wait for the pending eMails
+		# to be sent when the dispatcher is shut down
+		self.exitTimeout = 20.0
+
+
+	# queues a sensor alert for the given alert
+	def queueMail(self, alert, sensorAlert):
+		self.mailQueue.put( (alert, sensorAlert) )
+
+
+	# shuts down the dispatcher after all queued sensor alerts and all
+	# pending digests were sent (waits at most "exitTimeout" seconds)
+	def exit(self):
+		self.mailQueue.put( (None, None) )
+		self.join(self.exitTimeout)
+
+
+	def _closeSession(self):
+		if self.smtpServer is not None:
+			try:
+				self.smtpServer.quit()
+			except Exception as e:
+				pass
+		self.smtpServer = None
+
+
+	# internal function that sends the eMail over the SMTP session
+	# (the session is re-established once if the server closed it)
+	def _sendMail(self, alert, sensorAlerts):
+
+		mail = alert.buildMail(sensorAlerts)
+
+		for i in range(2):
+			try:
+				if self.smtpServer is None:
+					self.smtpServer = smtplib.SMTP(self.host, self.port)
+
+				logging.info("[%s] Sending eMail for %d triggered alert(s)."
+					% (self.fileName, len(sensorAlerts)))
+
+				self.smtpServer.sendmail(alert.fromAddr, alert.toAddr, mail)
+				self.lastUsed = time.time()
+				self.mailsSent += 1
+				self.sensorAlertsSent += len(sensorAlerts)
+				return
+
+			except smtplib.SMTPServerDisconnected as e:
+				self.smtpServer = None
+				if i == 0:
+					continue
+				logging.exception("[%s]: Unable to send eMail for "
+					% self.fileName
+					+ "triggered alert.")
+
+			except Exception as e:
+				logging.exception("[%s]: Unable to send eMail for "
+					% self.fileName
+					+ "triggered alert.")
+				self._closeSession()
+				return
+
+
+	# internal function that sends all digests whose window has ended
+	# (or all digests if "force" is set)
+	def _sendDigests(self, force=False):
+		now = time.time()
+		for alertId in list(self.digests.keys()):
+			deadline, alert, sensorAlerts = self.digests[alertId]
+			if force or deadline <= now:
+				del self.digests[alertId]
+				self._sendMail(alert, sensorAlerts)
+
+
+	def run(self):
+
+		while True:
+
+			# wait until the next digest window ends
+			# or the idle session has to be closed
+			timeout = self.idleTimeout
+			if self.digests:
+				nextDeadline = min(map(lambda x: x[0],
+					self.digests.values()))
+				timeout = max(0.0, nextDeadline - time.time())
+
+			try:
+				alert, sensorAlert = self.mailQueue.get(True, timeout)
+
+				# dispatcher is shut down
+				# => send pending digests without waiting for their window
+				if alert is None:
+					self._sendDigests(force=True)
+					self._closeSession()
+					return
+
+				if alert.digestWindow > 0:
+					if alert.id in self.digests:
+						self.digests[alert.id][2].append(sensorAlert)
+					else:
+						self.digests[alert.id] = (
+							time.time() + alert.digestWindow,
+							alert, [sensorAlert])
+				else:
+					self._sendMail(alert, [sensorAlert])
+
+			except Queue.Empty:
+				pass
+
+			self._sendDigests()
+
+			# close SMTP session if it was not used for a while
+			if (self.smtpServer is not None
+				and (time.time() - self.lastUsed) > self.idleTimeout):
+
+				logging.debug("[%s] Closing idle SMTP session "
+					% self.fileName
+					+ "(%d eMail(s) for %d sensor alert(s) sent so far)."
+					% (self.mailsSent, self.sensorAlertsSent))
+
+				self._closeSession()
+
+
 # this class is used to trigger or stop an alert
 # in an own thread to not block the initiating thread
 class AsynchronousAlertExecuter(threading.Thread):
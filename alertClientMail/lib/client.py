@@ -10,13 +10,15 @@
 import socket
 import time
 import ssl
+import select
+import Queue
 import threading
 import logging
 import os
 import base64
 import random
 import json
-from alert import AsynchronousAlertExecuter
+import zlib
 from localObjects import SensorAlert, SensorDataType
 BUFSIZE = 4096
 
@@ -34,6 +36,10 @@ class Client:
 		self.socket = None
 		self.sslSocket = None
 
+		# this lock is used to not read from and write to the ssl
+		# connection at the same time in different threads
+		self.ioLock = threading.Semaphore(1)
+
 
 	def connect(self):
 		self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -53,19 +59,55 @@ class Client:
 		self.sslSocket.connect((self.host, self.port))
 
 
+	# internal function that waits until data of the server can be read
+	# without holding the lock (a timeout of None waits until data
+	# arrives or the connection is closed)
+	def _waitForData(self, timeout):
+
+		# data that is already decrypted is not seen by select
+		if self.sslSocket.pending() > 0:
+			return
+
+		readable, _, _ = select.select([self.sslSocket], [], [], timeout)
+		if not readable:
+			raise socket.timeout("timed out")
+
+
 	def send(self, data):
-		count = self.sslSocket.send(data)
+		self.ioLock.acquire()
+		try:
+			count = self.sslSocket.send(data)
+		finally:
+			self.ioLock.release()
 
 
 	def recv(self, buffsize, timeout=20.0):
+		self._waitForData(timeout)
+
+		# the data is already available
+		# => the read timeout only applies to incomplete ssl records
+		if timeout is None:
+			timeout = 20.0
+
 		data = None
-		self.sslSocket.settimeout(timeout)
-		data = self.sslSocket.recv(buffsize)
-		self.sslSocket.settimeout(None)
+		self.ioLock.acquire()
+		try:
+			self.sslSocket.settimeout(timeout)
+			data = self.sslSocket.recv(buffsize)
+			self.sslSocket.settimeout(None)
+		finally:
+			self.ioLock.release()
 		return data
 
 
 	def close(self):
+		# shut down the connection first to wake up the thread
+		# that waits for data of the server
+		try:
+			self.socket.shutdown(socket.SHUT_RDWR)
+		except Exception as e:
+			pass
+
 		# closing SSLSocket will also close the underlying socket
 		self.sslSocket.close()
 
@@ -100,12 +142,28 @@ class ServerCommunication:
 		# this lock is used to only allow one thread to use the communication
 		self.connectionLock = threading.BoundedSemaphore(1)
 
+		# data received by the thread handling the incoming communication
+		# that belongs to the transaction of the thread holding the lock
+		# (None signals that the connection was closed)
+		self.responseQueue = Queue.Queue()
+
+		# this lock is used to hand over received data and release the
+		# connection lock atomically
+		self.responseLock = threading.Semaphore(1)
+
 		# file nme of this file (used for logging)
 		self.fileName = os.path.basename(__file__)
 
 		# list of all handled alerts
 		self.alerts = self.globalData.alerts
 
+		# dispatcher that executes the triggered and stopped alerts
+		# set thread to daemon
+		# => threads terminates when main thread terminates
+		self.alertDispatcher = AlertDispatcher(self.globalData)
+		self.alertDispatcher.daemon = True
+		self.alertDispatcher.start()
+
 		# flag that states if the client is connected
 		self.isConnected = False
 
@@ -113,6 +171,21 @@ class ServerCommunication:
 		# transaction with the server
 		self.transactionInitiation = False
 
+		# flag that states if the compression of large messages was
+		# negotiated with the server, the minimal size of a message in bytes
+		# that is sent compressed and the maximal size of a
+		# decompressed message
+		self.compression = False
+		self.compressionThreshold = 1024
+		self.maxDecompressedSize = 16777216
+
+		# statistics of the compressed messages of the current connection
+		# (sizes before and after the compression and the time spent
+		# to compress and decompress them)
+		self.compressionRawSize = 0
+		self.compressionSize = 0
+		self.compressionTime = 0.0
+
 
 	# internal function that acquires the lock
 	def _acquireLock(self):
@@ -123,7 +196,64 @@ class ServerCommunication:
 	# internal function that releases the lock
 	def _releaseLock(self):
 		logging.debug("[%s]: Release lock." % self.fileName)
+
+		# discard data that was handed over but not used by the
+		# transaction (together with the release so that no data
+		# of the next transaction is discarded)
+		self.responseLock.acquire()
+		while not self.responseQueue.empty():
+			self.responseQueue.get_nowait()
 		self.connectionLock.release()
+		self.responseLock.release()
+
+
+	# internal function that acquires the lock for the data received by
+	# the thread handling the incoming communication if no other thread
+	# is in a transaction with the server (otherwise the data is handed
+	# over to the thread holding the lock)
+	#
+	# returns True if the lock was acquired
+	def _acquireLockForReceivedData(self, data):
+		self.responseLock.acquire()
+		if not self.connectionLock.acquire(False):
+			self.responseQueue.put(data)
+			self.responseLock.release()
+			return False
+		logging.debug("[%s]: Acquire lock." % self.fileName)
+		self.responseLock.release()
+		return True
+
+
+	# internal function that gets the data the server sent during the
+	# transaction of this thread (it is received and handed over by the
+	# thread handling the incoming communication)
+	def _recvResponse(self, timeout=20.0):
+		data = self.responseQueue.get(True, timeout)
+		if data is None:
+			raise ValueError("Connection to server closed.")
+		return data
+
+
+	# internal function that closes the connection the thread handling
+	# the incoming communication was not able to receive data from
+	def _closeReceivingConnection(self, client):
+
+		# wake up the thread that is in a transaction with the server
+		# => it cleans up the session itself
+		self.responseLock.acquire()
+		if not self.connectionLock.acquire(False):
+			self.responseQueue.put(None)
+			self.responseLock.release()
+			return
+		logging.debug("[%s]: Acquire lock." % self.fileName)
+		self.responseLock.release()
+
+		# clean up session before exiting
+		# (only if the connection was not closed or re-established
+		# in the meantime)
+		if self.client is client and self.isConnected:
+			self._cleanUpSessionForClosing()
+		self._releaseLock()
 
 
 	# Internal function to check sanity of the alertLevels.
@@ -453,13 +583,88 @@ class ServerCommunication:
 		# set client as disconnected
 		self.isConnected = False
 
+		# log the statistics of the compressed messages
+		if self.compressionRawSize > 0:
+			logging.info("[%s]: Compressed messages: %d bytes "
+				% (self.fileName, self.compressionRawSize)
+				+ "as %d bytes (%.1f%%) in %.3f seconds."
+				% (self.compressionSize,
+				100.0 * self.compressionSize / self.compressionRawSize,
+				self.compressionTime))
+			self.compressionRawSize = 0
+			self.compressionSize = 0
+			self.compressionTime = 0.0
+
 		self.client.close()
 
 
+	# internal function that compresses the given message with zlib
+	# and records the compression ratio and the time spent
+	def _compressData(self, messageType, message):
+
+		startTime = time.time()
+		data = zlib.compress(message)
+		duration = time.time() - startTime
+
+		self.compressionRawSize += len(message)
+		self.compressionSize += len(data)
+		self.compressionTime += duration
+
+		logging.debug("[%s]: Compressed %s message from %d to %d "
+			% (self.fileName, messageType, len(message), len(data))
+			+ "bytes in %.2f ms." % (duration * 1000))
+
+		return data
+
+
+	# internal function that compresses the given message if the
+	# compression was negotiated with the server and the message is large
+	# enough (returns a tuple of the data to send and its encoding
+	# which is None if the message is not compressed)
+	def _compressMessage(self, messageType, message):
+
+		if (not self.compression
+			or len(message) < self.compressionThreshold):
+			return message, None
+
+		return self._compressData(messageType, message), "zlib"
+
+
+	# internal function that decompresses the given received data
+	# with the given encoding (None if the data is not compressed)
+	def _decompressMessage(self, messageType, data, encoding):
+
+		if encoding is None:
+			return data
+
+		if not self.compression or encoding != "zlib":
+			raise ValueError("Encoding '%s' was not negotiated."
+				% encoding)
+
+		startTime = time.time()
+		decompressor = zlib.decompressobj()
+		message = decompressor.decompress(data, self.maxDecompressedSize)
+		if decompressor.unconsumed_tail:
+			raise ValueError("Decompressed message is larger than %d bytes."
+				% self.maxDecompressedSize)
+		duration = time.time() - startTime
+
+		self.compressionRawSize += len(message)
+		self.compressionSize += len(data)
+		self.compressionTime += duration
+
+		logging.debug("[%s]: Decompressed %s message from %d to %d "
+			% (self.fileName, messageType, len(data), len(message))
+			+ "bytes in %.2f ms." % (duration * 1000))
+
+		return message
+
+
 	# this internal function that tries to initiate a transaction with
 	# the server (and acquires a lock if it is told to do so)
+	# (the encoding of the message is announced if it is compressed)
 	def _initiateTransaction(self, messageType, messageSize,
-		acquireLock=False):
+		acquireLock=False, encoding=None):
 
 		# try to get the exclusive state to be allowed to initiate a
 		# transaction with the server
@@ -518,6 +723,8 @@ class ServerCommunication:
 					"size": messageSize,
 					"message": messageType,
 					"payload": payload}
+				if encoding is not None:
+					message["encoding"] = encoding
 				self.client.send(json.dumps(message))
 			except Exception as e:
 				logging.exception("[%s]: Sending RTS " % self.fileName
@@ -537,7 +744,7 @@ class ServerCommunication:
 			logging.debug("[%s]: Receiving CTS." % self.fileName)
 
 			try:
-				data = self.client.recv(BUFSIZE)
+				data = self._recvResponse()
 				message = json.loads(data)
 
 				# check if an error was received
@@ -603,19 +810,25 @@ class ServerCommunication:
 		return True
 
 
-	# Internal function that builds the client authentication message.
-	def _buildAuthenticationMessage(self, regMessageSize):
+	# Internal function that builds the client authentication message
+	# (offers the compression of large messages and the size of the
+	# compressed registration message if it is large enough).
+	def _buildAuthenticationMessage(self, regMessageSize,
+		compressedRegMessageSize=None):
 
 		payload = {"type": "request",
 			"version": self.version,
 			"rev": self.rev,
 			"username": self.username,
-			"password": self.password}
+			"password": self.password,
+			"compression": "zlib"}
 		utcTimestamp = int(time.time())
 		message = {"clientTime": utcTimestamp,
 			"size": regMessageSize,
 			"message": "initialization",
 			"payload": payload}
+		if compressedRegMessageSize is not None:
+			message["compressedSize"] = compressedRegMessageSize
 		return json.dumps(message)
 
 
@@ -657,9 +870,13 @@ class ServerCommunication:
 
 
 	# internal function to verify the server/client version and authenticate
-	def _verifyVersionAndAuthenticate(self, regMessageSize):
+	def _verifyVersionAndAuthenticate(self, regMessageSize,
+		compressedRegMessageSize=None):
+
+		self.compression = False
 
-		authMessage = self._buildAuthenticationMessage(regMessageSize)
+		authMessage = self._buildAuthenticationMessage(regMessageSize,
+			compressedRegMessageSize)
 
 		# send user credentials and version
 		try:
@@ -772,6 +989,10 @@ class ServerCommunication:
 
 			return False
 
+		# check if the server accepted the compression of large messages
+		self.compression = (
+			message["payload"].get("compression", None) == "zlib")
+
 		return True
 
 
@@ -999,18 +1220,8 @@ class ServerCommunication:
 			return False
 
 		# trigger all alerts that have the same alert level
-		for alert in self.alerts:
-			for alertLevel in sensorAlert.alertLevels:
-				if alertLevel in alert.alertLevels:
-					# trigger alert in an own thread to not block this one
-					alertTriggerProcess = AsynchronousAlertExecuter(alert)
-					alertTriggerProcess.sensorAlert = sensorAlert
-					# set thread to daemon
-					# => threads terminates when main thread terminates
-					alertTriggerProcess.daemon = True
-					alertTriggerProcess.triggerAlert = True
-					alertTriggerProcess.start()
-					break
+		# (done by the dispatcher to not block this thread)
+		self.alertDispatcher.queueSensorAlert(sensorAlert)
 
 		return True
 
@@ -1037,14 +1248,8 @@ class ServerCommunication:
 			return False
 
 		# stop all alerts
-		for alert in self.alerts:
-			# stop alert in an own thread to not block this one
-			alertStopProcess = AsynchronousAlertExecuter(alert)
-			# set thread to daemon
-			# => threads terminates when main thread terminates
-			alertStopProcess.daemon = True
-			alertStopProcess.stopAlert = True
-			alertStopProcess.start()
+		# (done by the dispatcher to not block this thread)
+		self.alertDispatcher.queueStopAlerts()
 
 		return True
 
@@ -1069,11 +1274,19 @@ class ServerCommunication:
 
 			return False
 
-		# Build registration message.
+		# Build registration message (and offer the server to send it
+		# compressed if it is large enough).
 		regMessage = self._buildRegistrationMessage()
+		compressedRegMessage = None
+		compressedRegMessageSize = None
+		if len(regMessage) >= self.compressionThreshold:
+			compressedRegMessage = self._compressData("registration",
+				regMessage)
+			compressedRegMessageSize = len(compressedRegMessage)
 
 		# First check version and authenticate.
-		if not self._verifyVersionAndAuthenticate(len(regMessage)):
+		if not self._verifyVersionAndAuthenticate(len(regMessage),
+			compressedRegMessageSize):
 			self.client.close()
 			logging.error("[%s]: Version verification and " % self.fileName
 				+ "authentication failed.")
@@ -1082,7 +1295,10 @@ class ServerCommunication:
 
 			return False
 
-		# Second register node.
+		# Second register node
+		# (compressed if the server accepted the compression).
+		if self.compression and compressedRegMessage is not None:
+			regMessage = compressedRegMessage
 		if not self._registerNode(regMessage):
 			self.client.close()
 			logging.error("[%s]: Registration failed."
@@ -1106,25 +1322,44 @@ class ServerCommunication:
 	# this function handles the incoming messages from the server
 	def handleCommunication(self):
 
-		self._acquireLock()
+		# only handle the connection that is currently established
+		# (a connection that is re-established in the meantime
+		# is handled by the next call)
+		if not self.isConnected:
+			return
+		client = self.client
 
 		# handle commands in an infinity loop
 		while True:
 
 			messageSize = 0
 
+			# wait for data of the server without holding the lock
+			# (other threads can start their transactions with the server
+			# in the meantime and get the data they wait for handed over)
 			try:
-				# try to receive data for 0.5 seconds and then
-				# timeout to give other threads the possibility
-				# to send acquire the lock and send data to the server
-				data = self.client.recv(BUFSIZE, timeout=0.5)
-				if not data:
+				data = client.recv(BUFSIZE, timeout=None)
+			except Exception as e:
+				logging.exception("[%s]: Receiving failed." % self.fileName)
 
-					# clean up session before exiting
-					self._cleanUpSessionForClosing()
-					self._releaseLock()
-					return
+				self._closeReceivingConnection(client)
+				return
 
+			if not data:
+				self._closeReceivingConnection(client)
+				return
+
+			# data that does not belong to a transaction of another thread
+			# starts a transaction of the server
+			if not self._acquireLockForReceivedData(data):
+				continue
+
+			# connection was re-established in the meantime
+			if self.client is not client:
+				self._releaseLock()
+				return
+
+			try:
 				data = data.strip()
 				message = json.loads(data)
 				# check if an error was received
@@ -1142,6 +1377,7 @@ class ServerCommunication:
 				if str(message["payload"]["type"]).upper() == "RTS":
 					receivedTransactionId = int(message["payload"]["id"])
 					messageSize = int(message["size"])
+					encoding = message.get("encoding", None)
 
 					# received RTS (request to send) message
 					logging.debug("[%s]: Received RTS %s message."
@@ -1179,6 +1415,10 @@ class ServerCommunication:
 							self._releaseLock()
 							return
 
+					# decompress the message if it was sent compressed
+					data = self._decompressMessage(str(message["message"]),
+						data, encoding)
+
 				# if no RTS was received
 				# => server does not stick to protocol
 				# => terminate session
@@ -1192,33 +1432,6 @@ class ServerCommunication:
 					self._releaseLock()
 					return
 
-			except ssl.SSLError as e:
-
-				# catch receive timeouts
-				err = e.args[0]
-				if err == "The read operation timed out":
-
-					# release lock and acquire to let other threads send
-					# data to the server
-					# (wait 0.5 seconds in between, because semaphore
-					# are released in random order => other threads could be
-					# unlucky and not be chosen => this has happened when
-					# loglevel was not debug => hdd I/O has slowed this process
-					# down)
-					self._releaseLock()
-					time.sleep(0.5)
-					self._acquireLock()
-
-					# continue receiving
-					continue
-
-				logging.exception("[%s]: Receiving failed." % self.fileName)
-
-				# clean up session before exiting
-				self._cleanUpSessionForClosing()
-				self._releaseLock()
-				return
-
 			except Exception as e:
 				logging.exception("[%s]: Receiving failed." % self.fileName)
 
@@ -1324,6 +1537,8 @@ class ServerCommunication:
 
 			self.lastRecv = int(time.time())
 
+			self._releaseLock()
+
 
 	# this function reconnects the client to the server
 	def reconnect(self):
@@ -1378,7 +1593,7 @@ class ServerCommunication:
 
 		# get ping response from server
 		try:
-			data = self.client.recv(BUFSIZE)
+			data = self._recvResponse()
 			message = json.loads(data)
 			# check if an error was received
 			if "error" in message.keys():
@@ -1455,6 +1670,177 @@ class ServerCommunication:
 		return True
 
 
+# internal class that executes the alerts handed over by the dispatcher
+class _AlertExecuter(threading.Thread):
+
+	def __init__(self, dispatcher):
+		threading.Thread.__init__(self)
+		self.fileName = os.path.basename(__file__)
+		self.dispatcher = dispatcher
+
+
+	def run(self):
+
+		while True:
+
+			alert, sensorAlerts = self.dispatcher.executionQueue.get()
+
+			try:
+				# stop the alert
+				if sensorAlerts is None:
+					alert.stopAlert(None)
+
+				# trigger the alert for a single sensor alert
+				elif len(sensorAlerts) == 1:
+					alert.triggerAlert(sensorAlerts[0])
+
+				# trigger the alert for all collected sensor alerts at once
+				else:
+					alert.triggerAlerts(sensorAlerts)
+
+			except Exception as e:
+				logging.exception("[%s]: Executing alert '%s' failed."
+					% (self.fileName, alert.description))
+
+
+# this class dispatches the triggered and stopped alerts to a bounded
+# number of executer threads (the sensor alerts for an alert that are
+# received within the configured time window are collected per alert level
+# and handed over to the alert at once)
+class AlertDispatcher(threading.Thread):
+
+	def __init__(self, globalData):
+		threading.Thread.__init__(self)
+
+		self.fileName = os.path.basename(__file__)
+
+		# list of all handled alerts
+		self.alerts = globalData.alerts
+
+		# time window in seconds in which the sensor alerts are collected
+		# and the maximal number of alerts that are executed concurrently
+		self.alertWindow = globalData.alertWindow
+		self.maxAlertExecuters = globalData.maxAlertExecuters
+
+		self.dispatchLock = threading.Semaphore(1)
+		self.dispatchEvent = threading.Event()
+
+		# sensor alerts that are collected in the form:
+		# collectedSensorAlerts[(<alert id>, <alert level>)] =
+		# [<time first sensor alert was collected>, <alert>,
+		# [<sensor alert>, ...]]
+		self.collectedSensorAlerts = dict()
+
+		# queue of the alerts that are executed in the form
+		# (<alert>, [<sensor alert>, ...]) to trigger an alert or
+		# (<alert>, None) to stop an alert
+		self.executionQueue = Queue.Queue()
+
+
+	# internal function that hands over the collected sensor alerts
+	# whose time window has passed (or all if forced) to the executers
+	# (dispatch lock has to be held)
+	#
+	# returns the time in seconds until the next time window passes
+	# (or None if no sensor alerts are collected)
+	def _dispatchSensorAlerts(self, force=False):
+
+		utcTimestamp = time.time()
+		nextDispatch = None
+
+		for key in sorted(self.collectedSensorAlerts.keys(),
+			key=lambda x: self.collectedSensorAlerts[x][0]):
+
+			collectedTime, alert, sensorAlerts = \
+				self.collectedSensorAlerts[key]
+
+			waitTime = collectedTime + self.alertWindow - utcTimestamp
+			if waitTime > 0.0 and not force:
+				if nextDispatch is None or waitTime < nextDispatch:
+					nextDispatch = waitTime
+				continue
+
+			del self.collectedSensorAlerts[key]
+
+			if len(sensorAlerts) > 1:
+				logging.debug("[%s]: Triggering alert '%s' "
+					% (self.fileName, alert.description)
+					+ "for %d collected sensor alerts."
+					% len(sensorAlerts))
+
+			self.executionQueue.put( (alert, sensorAlerts) )
+
+		return nextDispatch
+
+
+	# queues the given sensor alert for all alerts that have
+	# the same alert level
+	def queueSensorAlert(self, sensorAlert):
+
+		self.dispatchLock.acquire()
+
+		for alert in self.alerts:
+			for alertLevel in sensorAlert.alertLevels:
+				if alertLevel in alert.alertLevels:
+
+					if self.alertWindow <= 0.0:
+						self.executionQueue.put( (alert, [sensorAlert]) )
+						break
+
+					key = (alert.id, alertLevel)
+					if key in self.collectedSensorAlerts.keys():
+						self.collectedSensorAlerts[key][2].append(
+							sensorAlert)
+					else:
+						self.collectedSensorAlerts[key] = [time.time(),
+							alert, [sensorAlert]]
+					break
+
+		self.dispatchLock.release()
+
+		self.dispatchEvent.set()
+
+
+	# queues the stop of all alerts (the collected sensor alerts are
+	# handed over before to keep their order)
+	def queueStopAlerts(self):
+
+		self.dispatchLock.acquire()
+
+		self._dispatchSensorAlerts(force=True)
+
+		for alert in self.alerts:
+			self.executionQueue.put( (alert, None) )
+
+		self.dispatchLock.release()
+
+
+	def run(self):
+
+		# start the executer threads
+		for i in range(self.maxAlertExecuters):
+			executer = _AlertExecuter(self)
+			# set thread to daemon
+			# => threads terminates when main thread terminates
+			executer.daemon = True
+			executer.start()
+
+		while True:
+
+			self.dispatchEvent.clear()
+
+			self.dispatchLock.acquire()
+			nextDispatch = self._dispatchSensorAlerts()
+			self.dispatchLock.release()
+
+			# wait until the next time window passes or until a new
+			# sensor alert is collected
+			if nextDispatch is None:
+				self.dispatchEvent.wait()
+			else:
+				self.dispatchEvent.wait(nextDispatch)
+
+
 # this class checks if the connection to the server has broken down
 # => reconnects it if necessary
 class ConnectionWatchdog(threading.Thread):
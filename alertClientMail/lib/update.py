@@ -20,6 +20,7 @@ import tempfile
 import shutil
 import stat
 import math
+import Queue
 
 
 # internal class that is used as an enum to represent the type of file update
@@ -190,6 +191,26 @@ class Updater:
 		# size of the download chunks
 		self.chunkSize = 4096
 
+		# number of files that are downloaded in parallel
+		self.downloadThreads = 3
+
+		# number of times an interrupted download is resumed
+		# and the timeout of a stalled download in seconds
+		self.downloadRetries = 3
+		self.downloadTimeout = 30
+
+		# idle keep-alive connections to the update server that are reused
+		# for the next request
+		self.connectionPool = list()
+		self.connectionPoolLock = threading.Semaphore(1)
+
+		# cache of the hashes of the files of this instance as dict of
+		# file location => [size, mtime, sha256 hash] (a file is only hashed
+		# again if its size or mtime has changed)
+		self.hashCacheFile = self.instanceLocation + "config/updateCache.json"
+		self.hashCache = None
+		self.hashCacheChanged = False
+
 
 	# internal function that acquires the lock
 	def _acquireLock(self):
@@ -203,6 +224,109 @@ class Updater:
 		self.updaterLock.release()
 
 
+	# internal function that gets an idle connection to the update server
+	# from the pool (or creates a new one if none is idle)
+	def _getConnection(self):
+
+		conn = None
+		self.connectionPoolLock.acquire()
+		if self.connectionPool:
+			conn = self.connectionPool.pop()
+		self.connectionPoolLock.release()
+
+		if conn is None:
+			conn = VerifiedHTTPSConnection(self.host, self.port, self.caFile,
+				timeout=self.downloadTimeout)
+
+		return conn
+
+
+	# internal function that gives a connection whose response was read
+	# completely back to the pool
+	def _putConnection(self, conn):
+		self.connectionPoolLock.acquire()
+		self.connectionPool.append(conn)
+		self.connectionPoolLock.release()
+
+
+	# internal function that closes all idle connections of the pool
+	def _closeConnections(self):
+		self.connectionPoolLock.acquire()
+		for conn in self.connectionPool:
+			conn.close()
+		self.connectionPool = list()
+		self.connectionPoolLock.release()
+
+
+	# internal function that loads the cached hashes of the files
+	# of this instance
+	def _loadHashCache(self):
+
+		self.hashCache = dict()
+		self.hashCacheChanged = False
+
+		if not os.path.exists(self.hashCacheFile):
+			return
+
+		try:
+			with open(self.hashCacheFile, 'r') as fp:
+				hashCache = json.loads(fp.read())
+
+			if not isinstance(hashCache, dict):
+				raise ValueError("Hash cache is not of type dict.")
+
+			self.hashCache = hashCache
+
+		except Exception as e:
+			logging.exception("[%s]: Loading hash cache failed."
+				% self.fileName)
+
+
+	# internal function that stores the cached hashes of the files
+	# of this instance (if they have changed)
+	def _storeHashCache(self):
+
+		if not self.hashCacheChanged:
+			return
+
+		try:
+			with open(self.hashCacheFile, 'w') as fp:
+				fp.write(json.dumps(self.hashCache))
+
+			self.hashCacheChanged = False
+
+		except Exception as e:
+			logging.exception("[%s]: Storing hash cache failed."
+				% self.fileName)
+
+
+	# internal function that gets the sha256 hash of the given file of this
+	# instance (it is only calculated if the file has changed since
+	# its hash was cached)
+	def _getFileHash(self, clientFile):
+
+		fileStat = os.stat(self.instanceLocation + clientFile)
+
+		cacheEntry = self.hashCache.get(clientFile)
+		if (cacheEntry is not None
+			and cacheEntry[0] == fileStat.st_size
+			and cacheEntry[1] == fileStat.st_mtime):
+			return cacheEntry[2]
+
+		f = open(self.instanceLocation + clientFile, 'r')
+		sha256Hash = self._sha256File(f)
+		f.close()
+
+		# only cache the hash if the file was not modified shortly before
+		# (a second change within the same mtime would not be noticed)
+		if (time.time() - fileStat.st_mtime) > 2:
+			self.hashCache[clientFile] = [fileStat.st_size,
+				fileStat.st_mtime, sha256Hash]
+			self.hashCacheChanged = True
+
+		return sha256Hash
+
+
 	# internal function that checks which files are new and which files have
 	# to be updated
 	#
@@ -221,6 +345,9 @@ class Updater:
 					+ "information for checking files.")
 				return None
 
+		if self.hashCache is None:
+			self._loadHashCache()
+
 		counterUpdate = 0
 		counterNew = 0
 
@@ -232,9 +359,7 @@ class Updater:
 			# => check if file has to be updated
 			if os.path.exists(self.instanceLocation + clientFile):
 
-				f = open(self.instanceLocation + clientFile, 'r')
-				sha256Hash = self._sha256File(f)
-				f.close()
+				sha256Hash = self._getFileHash(clientFile)
 
 				# check if file has changed
 				# => if not ignore it
@@ -263,6 +388,8 @@ class Updater:
 				filesToUpdate[clientFile] = _FileUpdateType.NEW
 				counterNew += 1
 
+		self._storeHashCache()
+
 		logging.info("[%s]: Files to modify: %d; New files: %d"
 			% (self.fileName, counterUpdate, counterNew))
 
@@ -434,39 +561,56 @@ class Updater:
 
 
 		# download file from server
-		conn = VerifiedHTTPSConnection(self.host, self.port, self.caFile)
-		try:
-
-			conn.request("GET", self.serverPath + "/"
-				+ self.repoInstanceLocation + "/" + fileLocation)
-			response = conn.getresponse()
+		# (an interrupted download is resumed where it has stopped)
+		retries = 0
+		while True:
 
-			# check if server responded correctly
-			# => download file
-			if response.status == 200:
+			conn = self._getConnection()
+			try:
 
-				# get the size of the response
+				offset = fileHandle.tell()
+				headers = dict()
+				if offset > 0:
+					headers["Range"] = "bytes=%d-" % offset
+
+				conn.request("GET", self.serverPath + "/"
+					+ self.repoInstanceLocation + "/" + fileLocation,
+					headers=headers)
+				response = conn.getresponse()
+
+				# check if server responded correctly
+				# => download file
+				# (a server that does not support resuming a download
+				# responds with the whole file)
+				if response.status == 200:
+					offset = 0
+					fileHandle.seek(0)
+					fileHandle.truncate()
+
+				elif (response.status != 206
+					or offset == 0
+					or not str(response.getheader("content-range",
+					"")).startswith("bytes %d-" % offset)):
+					raise ValueError("Server response code not 200 (was %d)."
+						% response.status)
+
+				# get the size of the file
 				fileSize = -1
 				try:
-					headers = response.getheaders()
-					for header in headers:
-						if header[0] == "content-length":
-							fileSize = int(header[1])
-							break
+					fileSize = offset \
+						+ int(response.getheader("content-length"))
 				except:
 					fileSize = -1
 
 				# check if the file size was part of the header
 				# and we can output the status of the download
 				showStatus = False
+				printedPercentage = 0
 				if fileSize > 0:
 					showStatus = True
-					maxChunks = int(math.ceil(float(fileSize)
-						/ float(self.chunkSize)))
+					printedPercentage = (offset * 10) / fileSize
 
 				# actually download file
-				chunkCount = 0
-				printedPercentage = 0
 				while True:
 					chunk = response.read(self.chunkSize)
 					if not chunk:
@@ -474,9 +618,8 @@ class Updater:
 					fileHandle.write(chunk)
 
 					# output status of the download
-					chunkCount += 1
 					if showStatus:
-						if chunkCount > maxChunks:
+						if fileHandle.tell() > fileSize:
 							showStatus = False
 
 							logging.warning("[%s]: Concent information of "
@@ -487,24 +630,46 @@ class Updater:
 							continue
 
 						else:
-							percentage = int((float(chunkCount)
-								/ float(maxChunks)) * 100)
+							percentage = int((float(fileHandle.tell())
+								/ float(fileSize)) * 100)
 							if (percentage / 10) > printedPercentage:
 								printedPercentage = percentage / 10
 
 								logging.info("[%s]: Download: %d%%"
 									% (self.fileName, printedPercentage * 10))
 
-			else:
-				raise ValueError("Server response code not 200 (was %d)."
-					% response.status)
+				# a closed connection ends the response early
+				if fileSize > 0 and fileHandle.tell() < fileSize:
+					raise ValueError("Download incomplete (%d of %d bytes)."
+						% (fileHandle.tell(), fileSize))
 
-		except Exception as e:
-			logging.exception("[%s]: Downloading file '%s' from the "
-				% (self.fileName, fileLocation)
-				+ "server failed.")
+				# keep the connection alive for the next download
+				if response.will_close:
+					conn.close()
+				else:
+					self._putConnection(conn)
 
-			return None
+				break
+
+			except Exception as e:
+				conn.close()
+
+				retries += 1
+				if retries > self.downloadRetries:
+					logging.exception("[%s]: Downloading file '%s' from the "
+						% (self.fileName, fileLocation)
+						+ "server failed.")
+
+					fileHandle.close()
+
+					return None
+
+				logging.warning("[%s]: Downloading file '%s' interrupted "
+					% (self.fileName, fileLocation)
+					+ "at %d bytes. Resuming (%d/%d)."
+					% (fileHandle.tell(), retries, self.downloadRetries))
+
+				time.sleep(1)
 
 
 		# calculate sha256 hash of the downloaded file
@@ -525,6 +690,8 @@ class Updater:
 			logging.debug("[%s]: Repository: %s"
 				% (self.fileName, fileHash))
 
+			fileHandle.close()
+
 			return None
 
 		logging.info("[%s]: Successfully downloaded file: '%s'"
@@ -533,12 +700,69 @@ class Updater:
 		return fileHandle
 
 
+	# internal function that downloads the given files in parallel into
+	# temporary files (the download threads share the keep-alive
+	# connections of the pool)
+	#
+	# return None or a dict of the handles to the temporary files
+	def _downloadFiles(self, filesToDownload):
+
+		filesQueue = Queue.Queue()
+		for fileToDownload in filesToDownload:
+			filesQueue.put(fileToDownload)
+
+		downloadedFileHandles = dict()
+		downloadThreads = list()
+		for i in range(min(self.downloadThreads, len(filesToDownload))):
+			downloadThread = threading.Thread(target=self._downloadWorker,
+				args=(filesQueue, downloadedFileHandles))
+			# set thread to daemon
+			# => threads terminates when main thread terminates
+			downloadThread.daemon = True
+			downloadThread.start()
+			downloadThreads.append(downloadThread)
+
+		for downloadThread in downloadThreads:
+			downloadThread.join()
+
+		self._closeConnections()
+
+		# check if one file was not downloaded
+		# => close all file handles
+		# => temporary file is automatically deleted
+		if (len(downloadedFileHandles) != len(filesToDownload)
+			or None in downloadedFileHandles.values()):
+
+			for fileHandle in downloadedFileHandles.values():
+				if fileHandle is not None:
+					fileHandle.close()
+
+			return None
+
+		return downloadedFileHandles
+
+
+	# internal function that is executed by the download threads
+	# (stops if one download has failed)
+	def _downloadWorker(self, filesQueue, downloadedFileHandles):
+
+		while not None in downloadedFileHandles.values():
+
+			try:
+				fileToDownload = filesQueue.get_nowait()
+			except Queue.Empty:
+				return
+
+			downloadedFileHandles[fileToDownload] = self._downloadFile(
+				fileToDownload, self.newestFiles[fileToDownload])
+
+
 	# internal function that calculates the sha256 hash of the file
 	def _sha256File(self, fileHandle):
 		fileHandle.seek(0)
 		sha256 = hashlib.sha256()
 		while True:
-			data = fileHandle.read(128)
+			data = fileHandle.read(self.chunkSize)
 			if not data:
 				break
 			sha256.update(data)
@@ -572,6 +796,8 @@ class Updater:
 			logging.exception("[%s]: Getting repository information failed."
 				% self.fileName)
 
+			conn.close()
+
 			return False
 
 
@@ -595,6 +821,8 @@ class Updater:
 			logging.exception("[%s]: Parsing repository information failed."
 				% self.fileName)
 
+			conn.close()
+
 			return False
 
 
@@ -618,8 +846,13 @@ class Updater:
 			logging.exception("[%s]: Getting version information failed."
 				% self.fileName)
 
+			conn.close()
+
 			return False
 
+		# all information is received
+		conn.close()
+
 
 		# parse version information string
 		try:
@@ -709,35 +942,24 @@ class Updater:
 
 
 		# download all files that have to be updated
-		downloadedFileHandles = dict()
+		# (only new files and files that have to be modified)
+		filesToDownload = list()
 		for fileToUpdate in filesToUpdate.keys():
-
-			# only download file if it is new or has to be modified
 			if (filesToUpdate[fileToUpdate] == _FileUpdateType.NEW
 				or filesToUpdate[fileToUpdate] == _FileUpdateType.MODIFY):
+				filesToDownload.append(fileToUpdate)
 
-				# download new files, if one file fails
-				# => close all file handles and abort update process
-				downloadedFileHandle = self._downloadFile(fileToUpdate,
-					self.newestFiles[fileToUpdate])
-				if downloadedFileHandle is None:
-
-					logging.error("[%s]: Downloading files from the "
-						% self.fileName
-						+ "repository failed. Aborting update process.")
-
-					# close all temporary file handles
-					# => temporary file is automatically deleted
-					for fileHandle in downloadedFileHandles.keys():
-						downloadedFileHandles[fileHandle].close()
-
-					self._releaseLock()
+		# if one file fails => abort update process
+		downloadedFileHandles = self._downloadFiles(filesToDownload)
+		if downloadedFileHandles is None:
 
-					return False
+			logging.error("[%s]: Downloading files from the "
+				% self.fileName
+				+ "repository failed. Aborting update process.")
 
-				else:
+			self._releaseLock()
 
-					downloadedFileHandles[fileToUpdate] = downloadedFileHandle
+			return False
 
 
 		# copy all files to the correct location
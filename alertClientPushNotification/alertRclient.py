@@ -11,7 +11,7 @@ import sys
 import os
 from lib import ServerCommunication, ConnectionWatchdog, Receiver
 from lib import SMTPAlert
-from lib import PushAlert
+from lib import PushAlert, PushConnectionManager
 from lib import UpdateChecker
 from lib import GlobalData
 import logging
@@ -129,6 +129,22 @@ if __name__ == '__main__':
 		else:
 			globalData.persistent = 0
 
+		# Get alert dispatch settings (optional, configurations without
+		# this element keep the defaults of the global data).
+		alertDispatch = configRoot.find("general").find("alertDispatch")
+		if alertDispatch is not None:
+			if "window" in alertDispatch.attrib.keys():
+				globalData.alertWindow = float(
+					alertDispatch.attrib["window"])
+			if "maxExecuters" in alertDispatch.attrib.keys():
+				globalData.maxAlertExecuters = int(
+					alertDispatch.attrib["maxExecuters"])
+		if globalData.alertWindow < 0.0:
+			raise ValueError("Alert dispatch window has to be "
+				+ "a positive value or 0.")
+		if globalData.maxAlertExecuters < 1:
+			raise ValueError("Alert dispatch needs at least one executer.")
+
 		# parse smtp options if activated
 		smtpActivated = (str(
 			configRoot.find("smtp").find("general").attrib[
@@ -265,6 +281,15 @@ if __name__ == '__main__':
 	watchdog.daemon = True
 	watchdog.start()
 
+	# start the connection manager that sends the notifications
+	# to the push server
+	logging.info("[%s] Starting push connection manager thread." % fileName)
+	globalData.pushConnectionManager = PushConnectionManager(globalData)
+	# set thread to daemon
+	# => threads terminates when main thread terminates
+	globalData.pushConnectionManager.daemon = True
+	globalData.pushConnectionManager.start()
+
 	# initialize all alerts
 	logging.info("[%s] Initializing alerts." % fileName)
 	for alert in globalData.alerts:
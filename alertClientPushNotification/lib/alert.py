@@ -18,6 +18,8 @@ import base64
 import json
 import hashlib
 import re
+import heapq
+import Queue
 from Crypto.Cipher import AES
 from localObjects import SensorDataType
 BUFSIZE = 4096
@@ -75,6 +77,253 @@ class Client:
 		self.sslSocket.close()
 
 
+# Internal class that represents a notification that is queued to be sent
+# to the push server (the given sensor alerts are sorted by the time they
+# were received, the latest one is used for the time and state).
+class _PushNotification:
+
+	def __init__(self, alert, subject, message, sensorAlerts):
+		self.alert = alert
+		self.subject = subject
+		self.message = message
+		self.sensorAlerts = sensorAlerts
+		self.sensorAlert = sensorAlerts[-1]
+
+		# Number of failed attempts to send this notification.
+		self.retries = 0
+
+
+# This class holds a long-lived connection to the push server and sends
+# the queued notifications of all alerts over it. Notifications of the
+# same alert that are queued at the same time are combined into one
+# notification (the push protocol carries one notification per request).
+# Notifications that have to be retried are scheduled by this thread and
+# do not block the thread of the alert.
+class PushConnectionManager(threading.Thread):
+
+	def __init__(self, globalData):
+		threading.Thread.__init__(self)
+
+		self.fileName = os.path.basename(__file__)
+
+		self.pushServerAddress = globalData.pushServerAddress
+		self.pushServerPort = globalData.pushServerPort
+		self.pushServerCert = globalData.pushServerCert
+		self.pushRetryTimeout = globalData.pushRetryTimeout
+
+		# Backoff in seconds for connection attempts to the push server
+		# (doubled on every failed attempt up to the retry timeout).
+		self.minBackoff = 5
+		self.backoff = self.minBackoff
+
+		# Notifications that should be sent as soon as possible and the
+		# maximal number of queued notifications that are taken at once
+		# to be combined.
+		self.sendQueue = Queue.Queue()
+		self.maxBatchSize = 50
+
+		# Notifications that are scheduled to be retried in the form
+		# [(<time to retry>, <counter>, <notification>), ...] (heap).
+		self.retryHeap = list()
+		self.retryCounter = 0
+
+		self.client = None
+
+		# Flag that indicates if the push server keeps the connection
+		# open after a response (it is disabled as soon as the server
+		# closes a reused connection).
+		self.reuseConnection = True
+
+
+	# Queues the given notification to be sent to the push server.
+	def queueNotification(self, notification):
+		self.sendQueue.put(notification)
+
+
+	def _closeConnection(self):
+		if self.client is not None:
+			try:
+				self.client.close()
+			except Exception as e:
+				pass
+		self.client = None
+
+
+	def _connect(self):
+		logging.debug("[%s] Connecting to push server '%s'."
+			% (self.fileName, self.pushServerAddress))
+
+		self.client = Client(self.pushServerAddress,
+			self.pushServerPort, self.pushServerCert)
+		self.client.connect()
+
+
+	# Internal function that sends the request over the (reused)
+	# connection and returns the response.
+	def _request(self, request):
+
+		if self.client is not None:
+
+			# Try to send over the already established connection.
+			# If the server closed the connection in the meantime
+			# we reconnect and send it again (a timeout is not retried
+			# since the server could have processed the message).
+			responseStr = None
+			try:
+				self.client.send(request)
+				responseStr = self.client.recv(BUFSIZE)
+			except socket.timeout as e:
+				raise
+			except Exception as e:
+				pass
+
+			if responseStr:
+				return responseStr
+
+			logging.debug("[%s] Connection to push server closed. "
+				% self.fileName
+				+ "Reconnecting.")
+			self._closeConnection()
+
+			if responseStr == "":
+				self.reuseConnection = False
+
+		self._connect()
+		self.client.send(request)
+		return self.client.recv(BUFSIZE)
+
+
+	# Internal function that sends the notification to the push server.
+	# Returns True for not retrying and False for retrying to send
+	# the notification.
+	def _sendNotification(self, notification):
+
+		alert = notification.alert
+		request = alert._buildRequest(notification)
+
+		logging.info("[%s] Sending message for sensorAlert to server '%s'."
+			% (self.fileName, self.pushServerAddress))
+
+		try:
+			responseStr = self._request(request)
+
+		except Exception as e:
+			logging.exception("[%s]: Unable to send message for "
+				% self.fileName
+				+ "sensorAlert to server '%s'."
+				% self.pushServerAddress)
+
+			self._closeConnection()
+
+			# Return False in order to retry again to send the message.
+			return False
+
+		finally:
+			if not self.reuseConnection:
+				self._closeConnection()
+
+		return alert._checkResponse(responseStr)
+
+
+	# Internal function that takes the further queued notifications
+	# and combines the notifications of the same alert into one.
+	# Returns the list of notifications to send.
+	def _getBatch(self, notification):
+
+		batch = [notification]
+		while len(batch) < self.maxBatchSize:
+			try:
+				batch.append(self.sendQueue.get_nowait())
+			except Queue.Empty:
+				break
+
+		alertOrder = list()
+		alertNotifications = dict()
+		for notification in batch:
+			if not notification.alert in alertNotifications.keys():
+				alertOrder.append(notification.alert)
+				alertNotifications[notification.alert] = list()
+			alertNotifications[notification.alert].append(notification)
+
+		notifications = list()
+		for alert in alertOrder:
+			if len(alertNotifications[alert]) == 1:
+				notifications.append(alertNotifications[alert][0])
+				continue
+
+			sensorAlerts = list()
+			for notification in alertNotifications[alert]:
+				sensorAlerts.extend(notification.sensorAlerts)
+
+			logging.debug("[%s] Combined %d queued notifications of "
+				% (self.fileName, len(alertNotifications[alert]))
+				+ "channel '%s' into one message." % alert.channel)
+
+			notifications.append(alert._createNotification(sensorAlerts))
+
+		return notifications
+
+
+	def _scheduleRetry(self, notification, timeout):
+		notification.retries += 1
+		self.retryCounter += 1
+		heapq.heappush(self.retryHeap,
+			(time.time() + timeout, self.retryCounter, notification))
+
+
+	def run(self):
+
+		while True:
+
+			# Wait for the next notification (or the next retry).
+			timeout = None
+			if self.retryHeap:
+				timeout = max(0.0, self.retryHeap[0][0] - time.time())
+
+			notification = None
+			try:
+				if timeout is None:
+					# Wait with a timeout since a blocking get() can not
+					# be interrupted.
+					notification = self.sendQueue.get(True, 3600)
+				else:
+					notification = self.sendQueue.get(True, timeout)
+			except Queue.Empty:
+				pass
+
+			if notification is None:
+				if (not self.retryHeap
+					or self.retryHeap[0][0] > time.time()):
+					continue
+				notifications = [heapq.heappop(self.retryHeap)[2]]
+
+			else:
+				notifications = self._getBatch(notification)
+
+			for notification in notifications:
+
+				if self._sendNotification(notification):
+					self.backoff = self.minBackoff
+					continue
+
+				# Schedule the notification to be sent again. If the push
+				# server is not reachable, the backoff is used for
+				# retrying instead of the fixed retry timeout.
+				if self.client is None:
+					retryTimeout = min(self.backoff, self.pushRetryTimeout)
+					self.backoff = min(self.backoff * 2,
+						self.pushRetryTimeout)
+				else:
+					retryTimeout = self.pushRetryTimeout
+
+				logging.info("[%s] Retrying to send notification to "
+					% self.fileName
+					+ "channel '%s' in %d seconds."
+					% (notification.alert.channel, retryTimeout))
+
+				self._scheduleRetry(notification, retryTimeout)
+
+
 # Internal class that holds the important attributes
 # for a alert to work with (this class must be inherited from the
 # used alert class).
@@ -90,6 +339,13 @@ class _Alert(object):
 		raise NotImplementedError("Function not implemented yet.")
 
 
+	# triggers the alert for multiple sensor alerts that were collected
+	# at once (can be overwritten by alerts that are able to combine them)
+	def triggerAlerts(self, sensorAlerts):
+		for sensorAlert in sensorAlerts:
+			self.triggerAlert(sensorAlert)
+
+
 	def stopAlert(self, sensorAlert):
 		raise NotImplementedError("Function not implemented yet.")
 
@@ -238,12 +494,22 @@ class PushAlert(_Alert):
 		return tempMsg
 
 
-	# Internal function that sends the message to the push server.
-	# Returns True for not retrying and False for retrying to send the message.
-	def _sendMessage(self, data):
+	# Internal function that builds the request for the given notification
+	# that is sent to the push server (called by the connection manager
+	# for each attempt to send the notification).
+	def _buildRequest(self, notification):
 
-		logging.debug("[%s] Sending sensorAlert message."
-				% self.fileName)
+		# Create payload for the message.
+		payload = json.dumps( {
+			"sbj": notification.subject, # Subject
+			"msg": notification.message, # Message
+			"tt": notification.sensorAlert.timeReceived, # Time Triggered
+			"ts": int(time.time()), # Time Sent
+			"is_sa": True, # Is SensorAlert
+			"st": notification.sensorAlert.state # State
+			} )
+
+		data = self._prepareMessage(payload)
 
 		prefixedChannel = self._generatePrefixedChannel(self.username,
 			self.channel)
@@ -254,27 +520,12 @@ class PushAlert(_Alert):
 			"data": data,
 			"version": self.protocolVersion}
 
-		# Send message to push server.
-		responseStr = None
-		try:
-
-			logging.info("[%s] Sending message for sensorAlert to server '%s'."
-				% (self.fileName, self.pushServerAddress))
+		return json.dumps(finalData)
 
-			client = Client(self.pushServerAddress,
-				self.pushServerPort, self.pushServerCert)
-			client.connect()
-			client.send(json.dumps(finalData))
-			responseStr = client.recv(BUFSIZE)
 
-		except Exception as e:
-			logging.exception("[%s]: Unable to send message for "
-				% self.fileName
-				+ "sensorAlert to server '%s'."
-				% self.pushServerAddress)
-
-			# Return False in order to retry again to send the message.
-			return False
+	# Internal function that checks the response of the push server.
+	# Returns True for not retrying and False for retrying to send the message.
+	def _checkResponse(self, responseStr):
 
 		logging.debug("[%s] Received response: '%s'."
 				% (self.fileName, responseStr))
@@ -289,7 +540,7 @@ class PushAlert(_Alert):
 			logging.exception("[%s]: Received illegal message from server "
 				% self.fileName
 				+ "'%s' with content: '%s'."
-				% self.pushServerAddress, responseStr)
+				% (self.pushServerAddress, responseStr))
 
 			# Return True in order to NOT retry to send the message.
 			return True
@@ -366,10 +617,21 @@ class PushAlert(_Alert):
 			self.msgText = fp.read()
 
 
-	def triggerAlert(self, sensorAlert):
+	# Internal function that creates the notification for the given
+	# sensor alerts (multiple sensor alerts are combined into one
+	# notification, the subject and the time of the notification are taken
+	# from the latest sensor alert).
+	def _createNotification(self, sensorAlerts):
 
-		tempMsg = self._replaceWildcards(sensorAlert, self.msgText)
-		tempSbj = self._replaceWildcards(sensorAlert, self.subject)
+		sensorAlerts = sorted(sensorAlerts, key=lambda x: x.timeReceived)
+		latestSensorAlert = sensorAlerts[-1]
+
+		tempMsg = "\n\n".join(map(
+			lambda x: self._replaceWildcards(x, self.msgText),
+			reversed(sensorAlerts)))
+		tempSbj = self._replaceWildcards(latestSensorAlert, self.subject)
+		if len(sensorAlerts) > 1:
+			tempSbj += " (+%d more)" % (len(sensorAlerts) - 1)
 		oldSize = len(tempMsg) + len(tempSbj)
 		tempSbj, tempMsg = self._truncToSize(tempSbj, tempMsg)
 		newSize = len(tempMsg) + len(tempSbj)
@@ -378,30 +640,25 @@ class PushAlert(_Alert):
 			logging.info("[%s] Truncated message size from %d to %d."
 				% (self.fileName, oldSize, newSize))
 
-		# Send message to push server.
-		while True:
+		return _PushNotification(self, tempSbj, tempMsg, sensorAlerts)
+
 
-			# Create payload for the message.
-			payload = json.dumps( {
-				"sbj": tempSbj, # Subject
-				"msg": tempMsg, # Message
-				"tt": sensorAlert.timeReceived, # Time Triggered
-				"ts": int(time.time()), # Time Sent
-				"is_sa": True, # Is SensorAlert
-				"st": sensorAlert.state # State
-				} )
+	def triggerAlert(self, sensorAlert):
 
-			preparedPayload = self._prepareMessage(payload)
+		# Queue message for the push server (sending and retrying is
+		# done by the connection manager).
+		notification = self._createNotification([sensorAlert])
+		self.globalData.pushConnectionManager.queueNotification(notification)
 
-			if self._sendMessage(preparedPayload):
-				break
 
-			logging.info("[%s] Retrying to send notification to channel '%s' "
-					% (self.fileName, self.channel)
-					+ "in %d seconds."
-					% self.pushRetryTimeout)
+	# Combines all collected sensor alerts into one notification.
+	def triggerAlerts(self, sensorAlerts):
+
+		logging.debug("[%s] Combined %d sensor alerts into one message."
+			% (self.fileName, len(sensorAlerts)))
 
-			time.sleep(self.pushRetryTimeout)
+		notification = self._createNotification(sensorAlerts)
+		self.globalData.pushConnectionManager.queueNotification(notification)
 
 
 	def stopAlert(self, sensorAlert):
@@ -53,10 +53,22 @@ class GlobalData:
 		# (0 or 1).
 		self.persistent = None
 
+		# time window in seconds in which sensor alerts for the same alert
+		# and alert level are collected before the alert is triggered
+		# (0 triggers the alert for each sensor alert immediately)
+		self.alertWindow = 0.0
+
+		# maximal number of alerts that are executed concurrently
+		self.maxAlertExecuters = 10
+
 		# Push server settings.
 		self.pushServerAddress = "push.alertr.de"
 		self.pushServerPort = 14944
 		self.pushServerCert = os.path.dirname(os.path.abspath(__file__)) \
 			+ "/../config/push.alertr.de.crt"
 		self.pushRetryTimeout = 300
-		self.pushSbjMsgSize = 1400
\ No newline at end of file
+		self.pushSbjMsgSize = 1400
+
+		# Instance of the connection manager that sends all
+		# notifications to the push server.
+		self.pushConnectionManager = None
\ No newline at end of file
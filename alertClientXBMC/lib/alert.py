@@ -12,7 +12,10 @@ import random
 import os
 import logging
 import threading
-from thirdparty import xbmcjson
+import json
+import httplib
+import socket
+import base64
 
 
 # internal class that holds the important attributes
@@ -30,6 +33,13 @@ class _Alert:
 		raise NotImplementedError("Function not implemented yet.")
 
 
+	# triggers the alert for multiple sensor alerts that were collected
+	# at once (can be overwritten by alerts that are able to combine them)
+	def triggerAlerts(self, sensorAlerts):
+		for sensorAlert in sensorAlerts:
+			self.triggerAlert(sensorAlert)
+
+
 	def stopAlert(self, sensorAlert):
 		raise NotImplementedError("Function not implemented yet.")
 
@@ -38,6 +48,141 @@ class _Alert:
 		raise NotImplementedError("Function not implemented yet.")
 
 
+# internal class that holds a persistent (keep-alive) json rpc session
+# to a xbmc instance
+class _XbmcSession:
+
+	def __init__(self, host, port, username, password):
+
+		self.fileName = os.path.basename(__file__)
+
+		# host and port of the xbmc instance
+		self.host = host
+		self.port = port
+
+		# timeout in seconds of the requests
+		self.timeout = 10.0
+
+		# credentials used for the json rpc service
+		self.username = username
+		self.password = password
+
+		# flag that indicates if the last batch reached the xbmc instance
+		# (only the first failure and the recovery are logged)
+		self.reachable = True
+
+		# the kept-alive connection and the id of the next request
+		self.connection = None
+		self.requestId = 0
+
+		# lock that serializes the requests of the session
+		self.sessionLock = threading.Semaphore(1)
+
+
+	# internal function that closes the connection of the session
+	def _closeConnection(self):
+		if self.connection is not None:
+			try:
+				self.connection.close()
+			except Exception as e:
+				pass
+		self.connection = None
+
+
+	# internal function that posts the given data to the json rpc service
+	# (a reused connection that was closed by xbmc in the meantime
+	# is reopened once)
+	#
+	# returns the parsed response
+	def _post(self, data):
+
+		headers = {"Content-Type": "application/json",
+			"Authorization": "Basic "
+			+ base64.b64encode(self.username + ":" + self.password)}
+
+		while True:
+
+			reusedConnection = self.connection is not None
+			if not reusedConnection:
+				self.connection = httplib.HTTPConnection(self.host,
+					self.port, timeout=self.timeout)
+
+			try:
+				self.connection.request("POST", "/jsonrpc", data, headers)
+				response = self.connection.getresponse()
+				responseData = response.read()
+
+			except (httplib.HTTPException, socket.error) as e:
+				self._closeConnection()
+				if reusedConnection:
+					continue
+				raise
+
+			if response.getheader("connection", "").lower() == "close":
+				self._closeConnection()
+
+			if response.status != 200:
+				raise ValueError("Received response code %d."
+					% response.status)
+
+			return json.loads(responseData)
+
+
+	# executes the given requests (list of tuples in the form
+	# [(method, params), ...]) as one batch in one round trip
+	#
+	# returns a list of the results of the requests (None for a failed
+	# request) or None if the batch failed
+	def executeBatch(self, requests):
+
+		self.sessionLock.acquire()
+
+		batch = list()
+		for method, params in requests:
+			batch.append({"jsonrpc": "2.0",
+				"id": self.requestId,
+				"method": method,
+				"params": params})
+			self.requestId += 1
+
+		try:
+			responses = self._post(json.dumps(batch))
+		except Exception as e:
+			if self.reachable:
+				logging.exception("[%s]: Not able to send requests to "
+					% self.fileName
+					+ "XBMC instance.")
+			else:
+				logging.debug("[%s]: XBMC instance still not reachable."
+					% self.fileName)
+			self.reachable = False
+			self._closeConnection()
+			self.sessionLock.release()
+			return None
+
+		if not self.reachable:
+			logging.info("[%s]: XBMC instance reachable again."
+				% self.fileName)
+			self.reachable = True
+
+		self.sessionLock.release()
+
+		# a batch with only one request can be answered with a
+		# single response
+		if isinstance(responses, dict):
+			responses = [responses]
+
+		results = dict()
+		for response in responses:
+			if "error" in response.keys():
+				logging.debug("[%s]: XBMC returned error '%s'."
+					% (self.fileName, str(response["error"])))
+				continue
+			results[response["id"]] = response["result"]
+
+		return map(lambda x: results.get(x["id"]), batch)
+
+
 # this function class an alert that controls a xbmc instance
 # (for example shows a notification and pauses the player)
 class XbmcAlert(_Alert):
@@ -52,9 +197,12 @@ class XbmcAlert(_Alert):
 		self.triggered = None
 		self.triggerDelay = None
 
-		# host and port of the xbmc instance
+		# host and port of the xbmc instance and the credentials
+		# of its json rpc service
 		self.host = None
 		self.port = None
+		self.username = None
+		self.password = None
 		
 		# message notification
 		self.showMessage = None
@@ -66,6 +214,45 @@ class XbmcAlert(_Alert):
 		# should the player be paused
 		self.pausePlayer = None
 
+		# the persistent json rpc session to the xbmc instance
+		self.session = None
+
+		# cached ids of the active audio/video players of the xbmc instance
+		# and the interval in seconds in which they are polled
+		# (only if the player should be paused)
+		self.activePlayerIds = list()
+		self.playerStateLock = threading.Semaphore(1)
+		self.playerStateInterval = 10
+
+
+	# internal function that extracts the ids of the audio/video players
+	# from the result of "Player.GetActivePlayers"
+	def _getPlayerIds(self, result):
+		playerIds = list()
+		if result is None:
+			return playerIds
+		for player in result:
+			if (player["type"] == "audio"
+				or player["type"] == "video"):
+				playerIds.append(player["playerid"])
+		return playerIds
+
+
+	# internal function that polls the active players of the xbmc instance
+	# and caches them (executed in an own thread)
+	def _pollPlayerState(self):
+
+		while True:
+
+			results = self.session.executeBatch(
+				[("Player.GetActivePlayers", {})])
+			if results is not None:
+				self.playerStateLock.acquire()
+				self.activePlayerIds = self._getPlayerIds(results[0])
+				self.playerStateLock.release()
+
+			time.sleep(self.playerStateInterval)
+
 
 	# this function is called once when the alert client has connected itself
 	# to the server
@@ -74,6 +261,17 @@ class XbmcAlert(_Alert):
 		# set the time of the trigger
 		self.triggered = 0.0
 
+		self.session = _XbmcSession(self.host, self.port, self.username,
+			self.password)
+
+		# start the thread that keeps the cached player state up to date
+		if self.pausePlayer is True:
+			thread = threading.Thread(target=self._pollPlayerState)
+			# set thread to daemon
+			# => threads terminates when main thread terminates
+			thread.daemon = True
+			thread.start()
+
 
 	# this function is called when this alert is triggered
 	def triggerAlert(self, sensorAlert):
@@ -95,84 +293,89 @@ class XbmcAlert(_Alert):
 				if ("message" in sensorAlert.optionalData):
 					receivedMessage = sensorAlert.optionalData["message"]
 
-			# connect to the xbmc json rpc service
-			try:
-				xbmcInstance = xbmcjson.XBMC("http://" + self.host
-					+ ":" + str(self.port) + "/jsonrpc")
-			except Exception as e:
-				logging.exception("[%s]: Not able to connect to XBMC instance."
-					% self.fileName)
-
+			# all requests are sent as one batch in one round trip
+			requests = list()
+
+			# pause the players that are known to be active if configured
+			# (the active players are requested again to pause players
+			# that were started since they were polled the last time)
+			pausedPlayerIds = list()
+			if self.pausePlayer is True:
+				self.playerStateLock.acquire()
+				pausedPlayerIds = list(self.activePlayerIds)
+				self.playerStateLock.release()
+
+				for playerId in pausedPlayerIds:
+					requests.append(("Player.PlayPause",
+						{"playerid": playerId, "play": False}))
+				requests.append(("Player.GetActivePlayers", {}))
+
+			# show a message on the display if configured
+			if self.showMessage is True:
+
+				# differentiate between a generic displayed notification
+				# and a notification which also shows the received message
+				if receivedMessage is None:
+
+					# differentiate between a sensor alert triggered by
+					# a sensor going back in normal state or in alert state
+					if sensorAlert.state == 1:
+						tempMessage = "\"" \
+							+ sensorAlert.description \
+							+ "\" triggered."
+					else:
+						tempMessage = "\"" \
+							+ sensorAlert.description \
+							+ "\" back to normal."
+
+				else:
+
+					# differentiate between a sensor alert triggered by
+					# a sensor going back in normal state or in alert state
+					if sensorAlert.state == 1:
+						tempMessage = "\"" \
+							+ sensorAlert.description \
+							+ "\" triggered. Received message: \"" \
+							+ receivedMessage \
+							+ "\""
+					else:
+						tempMessage = "\"" \
+							+ sensorAlert.description \
+							+ "\" back to normal. Received message: \"" \
+							+ receivedMessage \
+							+ "\""
+
+				requests.append(("GUI.ShowNotification",
+					{"title": "alertR",
+					"message": tempMessage,
+					"displaytime": self.displayTime}))
+
+			if not requests:
 				return
 
-			# ping the xbmc instance
-			try:
-				response = xbmcInstance.JSONRPC.Ping()
-			except Exception as e:
-				logging.exception("[%s]: Not able to ping XBMC instance."
+			results = self.session.executeBatch(requests)
+			if results is None:
+				logging.error("[%s]: XBMC does not respond."
 					% self.fileName)
-
 				return
 
-			# check if xbmc instance respond
-			if (not response is None 
-				and response["result"] == "pong"):
-
-				# get player id of the player instance that plays audio/video
-				playerId = None
-				response = xbmcInstance.Player.GetActivePlayers()
-				for i in range(len(response["result"])):
-					if (response["result"][i]["type"] == "audio"
-						or response["result"][i]["type"] == "video"):
-						playerId = response["result"][i]["playerid"]
-
-				# if audio/video is played => pause it if configured
-				if (not playerId is None
-					and self.pausePlayer is True):
-					xbmcInstance.Player.PlayPause(playerid=playerId,
-						play=False)
-
-				# show a message on the display if configured
-				if self.showMessage is True:
-
-					# differentiate between a generic displayed notification
-					# and a notification which also shows the received message
-					if receivedMessage is None:
-
-						# differentiate between a sensor alert triggered by
-						# a sensor going back in normal state or in alert state
-						if sensorAlert.state == 1:
-							tempMessage = "\"" \
-								+ sensorAlert.description \
-								+ "\" triggered."
-						else:
-							tempMessage = "\"" \
-								+ sensorAlert.description \
-								+ "\" back to normal."
-
-					else:
-
-						# differentiate between a sensor alert triggered by
-						# a sensor going back in normal state or in alert state
-						if sensorAlert.state == 1:
-							tempMessage = "\"" \
-								+ sensorAlert.description \
-								+ "\" triggered. Received message: \"" \
-								+ receivedMessage \
-								+ "\""
-						else:
-							tempMessage = "\"" \
-								+ sensorAlert.description \
-								+ "\" back to normal. Received message: \"" \
-								+ receivedMessage \
-								+ "\""
-
-					xbmcInstance.GUI.ShowNotification(title="alertR",
-						message=tempMessage, displaytime=self.displayTime)
-
-			else:
-				logging.error("[%s]: XBMC does not respond."
-					% self.fileName)
+			if self.pausePlayer is True:
+
+				# update the cached player state
+				activePlayerIds = self._getPlayerIds(
+					results[len(pausedPlayerIds)])
+				self.playerStateLock.acquire()
+				self.activePlayerIds = activePlayerIds
+				self.playerStateLock.release()
+
+				# pause the players that were not known to be active
+				requests = list()
+				for playerId in activePlayerIds:
+					if not playerId in pausedPlayerIds:
+						requests.append(("Player.PlayPause",
+							{"playerid": playerId, "play": False}))
+				if requests:
+					self.session.executeBatch(requests)
 
 
 	# this function is called when the alert is stopped
@@ -24,6 +24,14 @@ class FocusedElement:
 	alertLevels = 4
 
 
+# bit flags of the screen updates that can be pending
+# (are coalesced into one screen update by the urwid thread)
+class ScreenUpdate:
+	status = 1
+	sensorAlert = 2
+	connectionFail = 4
+
+
 # this class is used by the urwid console thread
 # to process actions concurrently and do not block the console thread
 class ScreenActionExecuter(threading.Thread):
@@ -85,6 +93,13 @@ class ScreenUpdater(threading.Thread):
 		self.screenUpdaterEvent = threading.Event()
 		self.screenUpdaterEvent.clear()
 
+		# minimal time in seconds between two screen updates
+		# (all update requests during this interval are merged into one)
+		self.frameInterval = 0.1
+
+		# time of the last screen update request to the console
+		self.lastScreenUpdate = 0.0
+
 		# set exit flag as false
 		self.exitFlag = False
 
@@ -98,7 +113,16 @@ class ScreenUpdater(threading.Thread):
 			# wait until thread is woken up by an event to update the screen
 			# or 10 seconds elapsed
 			self.screenUpdaterEvent.wait(10)
+
+			# wait until the current frame interval is over before clearing
+			# the event => all update requests that arrive in the meantime
+			# are coalesced into one screen update
+			timeToNextFrame = (self.lastScreenUpdate + self.frameInterval
+				- time.time())
+			if 0 < timeToNextFrame <= self.frameInterval:
+				time.sleep(timeToNextFrame)
 			self.screenUpdaterEvent.clear()
+			self.lastScreenUpdate = time.time()
 
 			# if reference to console object does not exist
 			# => get it from global data or if it does not exist continue loop
@@ -108,40 +132,37 @@ class ScreenUpdater(threading.Thread):
 				else:
 					continue			
 
+			pendingUpdates = 0
+
 			# check if a sensor alert was received
 			# => update screen with sensor alert
+			# (the sensor alert also updates the status of the screen,
+			# a connection failure is shown with the next status update)
 			if len(self.sensorAlerts) != 0:
 				logging.info("[%s]: Updating screen with sensor alert."
 					% self.fileName)
-				if not self.console.updateScreen("sensoralert"):
-					logging.error("[%s]: Updating screen " % self.fileName
-						+ "with sensor alert failed.")
-
-				# do not use the old status information from the server
-				# to update the screen => wait for new status update
-				continue
+				pendingUpdates |= ScreenUpdate.sensorAlert
 
-			# update screen normally
-			logging.debug("[%s]: Updating screen." % self.fileName)
-			if not self.console.updateScreen("status"):
-				logging.error("[%s]: Updating screen failed." % self.fileName)
+			else:
+				# update screen normally
+				logging.debug("[%s]: Updating screen." % self.fileName)
+				pendingUpdates |= ScreenUpdate.status
 
-			# if reference to server communication object does not exist
-			# => get it from global data or if it does not exist continue loop 
-			if self.serverComm == None:
-				if self.globalData.serverComm != None:
+				# if reference to server communication object does not exist
+				# => get it from global data
+				if self.serverComm == None:
 					self.serverComm = self.globalData.serverComm
-				else:
-					continue
 
-			# check if the client is not connected to the server
-			# => update screen to connection failure
-			if not self.serverComm.isConnected:
-				logging.debug("[%s]: Updating screen " % self.fileName
-					+ "for connection failure.")
-				if not self.console.updateScreen("connectionfail"):
-					logging.error("[%s]: Updating screen failed."
-						% self.fileName)
+				# check if the client is not connected to the server
+				# => update screen to connection failure
+				if (self.serverComm != None
+					and not self.serverComm.isConnected):
+					logging.debug("[%s]: Updating screen " % self.fileName
+						+ "for connection failure.")
+					pendingUpdates |= ScreenUpdate.connectionFail
+
+			if not self.console.updateScreen(pendingUpdates):
+				logging.error("[%s]: Updating screen failed." % self.fileName)
 
 
 	# sets the exit flag to shut down the thread
@@ -179,8 +200,12 @@ class Console:
 		self.maxCountShowAlertLevelsPerPage = \
 			self.globalData.maxCountShowAlertLevelsPerPage
 
-		# lock that is being used so only one thread can update the screen
-		self.consoleLock = threading.BoundedSemaphore(1)
+		# bit mask of the screen updates that are pending
+		# (see ScreenUpdate) and a flag that signalizes if the urwid
+		# thread was already woken up to process them
+		self.pendingUpdates = 0
+		self.wakeupPending = False
+		self.pendingUpdatesLock = threading.Semaphore(1)
 
 		# urwid grid object for sensor alerts
 		self.sensorAlertsPile = None
@@ -195,10 +220,8 @@ class Console:
 		# urwid object that shows if the alert system is active
 		self.alertSystemActive = None
 
-		# a list of all urwid sensor objects
-		self.sensorUrwidObjects = list()
-
 		# a list of all urwid sensor objects that are shown on the page
+		# (urwid objects are only created for the shown sensors)
 		self.shownSensorUrwidObjects = list()
 
 		# urwid grid object for sensors
@@ -207,13 +230,15 @@ class Console:
 		# the current page of the sensor objects that is shown
 		self.currentSensorPage = 0
 
+		# the number of pages of the sensor objects when the page was
+		# shown the last time
+		self.sensorPageCount = 0
+
 		# the footer of the sensor box (which shows the current page number)
 		self.sensorsFooter = None
 
-		# a list of all urwid alert objects
-		self.alertUrwidObjects = list()
-
 		# a list of all urwid alert objects that are shown on the page
+		# (urwid objects are only created for the shown alerts)
 		self.shownAlertUrwidObjects = list()
 
 		# urwid grid object for alerts
@@ -222,13 +247,15 @@ class Console:
 		# the current page of the alert objects that is shown
 		self.currentAlertPage = 0
 
+		# the number of pages of the alert objects when the page was
+		# shown the last time
+		self.alertPageCount = 0
+
 		# the footer of the alert box (which shows the current page number)
 		self.alertsFooter = None
 
-		# a list of all urwid manager objects
-		self.managerUrwidObjects = list()
-
 		# a list of all urwid manager objects that are shown on the page
+		# (urwid objects are only created for the shown managers)
 		self.shownManagerUrwidObjects = list()
 
 		# urwid grid object for managers
@@ -237,13 +264,15 @@ class Console:
 		# the current page of the manager objects that is shown
 		self.currentManagerPage = 0
 
+		# the number of pages of the manager objects when the page was
+		# shown the last time
+		self.managerPageCount = 0
+
 		# the footer of the manager box (which shows the current page number)
 		self.managersFooter = None
 
-		# a list of all urwid alert level objects
-		self.alertLevelUrwidObjects = list()
-
 		# a list of all urwid alert level objects that are shown on the page
+		# (urwid objects are only created for the shown alert levels)
 		self.shownAlertLevelUrwidObjects = list()
 
 		# urwid grid object for alert levels
@@ -252,6 +281,10 @@ class Console:
 		# the current page of the alert level objects that is shown
 		self.currentAlertLevelPage = 0
 
+		# the number of pages of the alert level objects when the page was
+		# shown the last time
+		self.alertLevelPageCount = 0
+
 		# the footer of the alert level box
 		# (which shows the current page number)
 		self.alertLevelsFooter = None
@@ -259,6 +292,11 @@ class Console:
 		# a list of all urwid sensor alert objects
 		self.sensorAlertUrwidObjects = list()
 
+		# number of screen updates and the time they took in total
+		# (only measured in debug mode)
+		self.screenUpdateCount = 0
+		self.screenUpdateTime = 0.0
+
 		# the file descriptor for the urwid callback to update the screen
 		self.screenFd = None
 
@@ -525,18 +563,6 @@ class Console:
 				currentElements.focus_position = tempPos
 
 
-	# internal function that acquires the lock
-	def _acquireLock(self):
-		logging.debug("[%s]: Acquire lock." % self.fileName)
-		self.consoleLock.acquire()
-
-
-	# internal function that releases the lock
-	def _releaseLock(self):
-		logging.debug("[%s]: Release lock." % self.fileName)
-		self.consoleLock.release()
-
-
 	# get a list of alert level objects that belong to the given
 	# object (object has to have attribute alertLevels)
 	def _getAlertLevelsOfObj(self, obj):
@@ -576,16 +602,144 @@ class Console:
 		return currentSensors
 
 
+	# internal function that checks if the given shown urwid object has
+	# to be updated (this is the case if its object or node has changed)
+	def _urwidObjectNeedsUpdate(self, urwidObject, obj, changedNodes,
+		forceUpdate=False):
+
+		# check if object/node still exists
+		# => the urwid object is removed when the page is shown again
+		node = getattr(urwidObject, "node", False)
+		if obj is None or node is None:
+			return False
+
+		if obj.dirty or node in changedNodes or forceUpdate:
+			obj.dirty = False
+			return True
+
+		return False
+
+
+	# internal function that calculates how many pages the given
+	# number of objects have
+	def _getPageCount(self, objectCount, maxCountPerPage):
+		pageCount = objectCount / maxCountPerPage
+		if (objectCount % maxCountPerPage) != 0:
+			pageCount += 1
+		return pageCount
+
+
+	# internal function that checks if the page of an element group has
+	# to be shown again because objects were added or removed
+	# (this is the case if the shown objects differ from the objects
+	# that belong to the page or the number of pages has changed)
+	def _pageChanged(self, objects, shownObjects, pageIndex,
+		maxCountPerPage, pageCount):
+
+		if self._getPageCount(len(objects), maxCountPerPage) != pageCount:
+			return True
+
+		startIndex = pageIndex * maxCountPerPage
+		return (objects[startIndex:startIndex + maxCountPerPage]
+			!= shownObjects)
+
+
+	# internal function that gets the node the given object belongs to
+	# (the node has to be of one of the given node types)
+	def _getNodeOfObj(self, obj, objType, nodeTypes):
+
+		nodeObjBelongs = None
+		for node in self.nodes:
+			if obj.nodeId == node.nodeId:
+				nodeObjBelongs = node
+				break
+		if nodeObjBelongs is None:
+			raise ValueError(
+				"Could not find a node the %s belongs to." % objType)
+		elif not nodeObjBelongs.nodeType in nodeTypes:
+			raise ValueError(
+				'Node the %s belongs to is not of ' % objType
+				+ 'type "%s".' % '" or "'.join(nodeTypes))
+
+		return nodeObjBelongs
+
+
+	# internal function that updates the given urwid objects before
+	# they are shown
+	def _updateShownUrwidObjects(self, urwidObjects):
+
+		for urwidObject in urwidObjects:
+			if self.serverComm.isConnected:
+				urwidObject.updateCompleteWidget()
+			else:
+				urwidObject.setConnectionFail()
+
+
+	# internal function that updates the shown detailed view
+	# (the detailed view is closed if its object no longer exists)
+	def _updateDetailedView(self):
+
+		if self.currentFocused == FocusedElement.sensors:
+			if not self.detailedView.sensor in self.sensors:
+				self._closeDetailedView()
+			else:
+				objAlertLevels = self._getAlertLevelsOfObj(
+					self.detailedView.sensor)
+				self.detailedView.updateCompleteWidget(objAlertLevels)
+
+		elif self.currentFocused == FocusedElement.alerts:
+			if not self.detailedView.alert in self.alerts:
+				self._closeDetailedView()
+			else:
+				objAlertLevels = self._getAlertLevelsOfObj(
+					self.detailedView.alert)
+				self.detailedView.updateCompleteWidget(objAlertLevels)
+
+		elif self.currentFocused == FocusedElement.managers:
+			if not self.detailedView.manager in self.managers:
+				self._closeDetailedView()
+			else:
+				self.detailedView.updateCompleteWidget()
+
+		else:
+			if not self.detailedView.alertLevel in self.alertLevels:
+				self._closeDetailedView()
+			else:
+				# get all sensors and alerts that belong to the
+				# shown alert level
+				currentSensors = self._getSensorsOfAlertLevel(
+					self.detailedView.alertLevel)
+				currentAlerts = self._getAlertsOfAlertLevel(
+					self.detailedView.alertLevel)
+
+				self.detailedView.updateCompleteWidget(currentSensors,
+					currentAlerts)
+
+
+	# internal function that rebuilds the shown sensor alerts
+	# (the newest sensor alert is shown on top and the remaining space
+	# is filled up with empty sensor alerts)
+	def _updateSensorAlertsPile(self):
+
+		newContents = list()
+		for sensorAlertUrwid in reversed(self.sensorAlertUrwidObjects):
+			newContents.append( (sensorAlertUrwid.get(),
+				self.sensorAlertsPile.options()) )
+		for i in range(self.maxCountShowSensorAlert - len(newContents)):
+			newContents.append( (self.emtpySensorAlert,
+				self.sensorAlertsPile.options()) )
+
+		self.sensorAlertsPile.contents[:] = newContents
+
+
 	# internal function that shows the alert urwid objects given
-	# by a page index
+	# by a page index (urwid objects are only created for the alerts
+	# on the shown page and are removed as soon as they are no longer shown)
 	def _showAlertsAtPageIndex(self, pageIndex):
 
-		# calculate how many pages the alert urwid objects have
-		alertPageCount = (len(self.alertUrwidObjects)
-			/ self.maxCountShowAlertsPerPage)
-		if ((len(self.alertUrwidObjects) % self.maxCountShowAlertsPerPage)
-			!= 0):
-			alertPageCount += 1
+		# calculate how many pages the alert objects have
+		alertPageCount = self._getPageCount(len(self.alerts),
+			self.maxCountShowAlertsPerPage)
 
 		# check if the index to show is within the page range
 		if pageIndex >= alertPageCount:
@@ -593,17 +747,42 @@ class Console:
 		elif pageIndex < 0:
 			pageIndex = alertPageCount - 1
 
+		self.currentAlertPage = pageIndex
+		self.alertPageCount = alertPageCount
+
 		logging.debug("[%s]: Update shown alerts with page index: %d."
 			% (self.fileName, pageIndex))
 
-		# get all alert urwid objects that should be shown on the new page
+		# get all alert objects that should be shown on the new page
+		startIndex = pageIndex * self.maxCountShowAlertsPerPage
+		newShownAlerts = self.alerts[startIndex:
+			startIndex + self.maxCountShowAlertsPerPage]
+
+		# remove the urwid objects of the alerts that are no longer shown
+		# => object will be deleted by garbage collector
+		for oldShownAlert in self.shownAlertUrwidObjects:
+			if not oldShownAlert.alert in newShownAlerts:
+				oldShownAlert.unlink()
+
+		# get the urwid objects of the alerts on the new page
 		del self.shownAlertUrwidObjects[:]
-		for i in range(self.maxCountShowAlertsPerPage):
-			tempItemIndex = i + (pageIndex * self.maxCountShowAlertsPerPage)
-			if tempItemIndex >= len(self.alertUrwidObjects):
-				break
-			self.shownAlertUrwidObjects.append(
-				self.alertUrwidObjects[tempItemIndex])
+		for alert in newShownAlerts:
+			alertUrwid = alert.alertUrwid
+
+			# create new urwid object if the alert was not shown before
+			# (also links urwid object to alert object)
+			if alertUrwid is None:
+				nodeAlertBelongs = self._getNodeOfObj(alert, "alert",
+					["alert"])
+				alertUrwid = AlertUrwid(alert, nodeAlertBelongs)
+			self.shownAlertUrwidObjects.append(alertUrwid)
+
+			# the urwid object is updated before it is shown
+			alert.dirty = False
+
+		# update the urwid objects before they are shown
+		# (urwid objects that are not shown are not updated)
+		self._updateShownUrwidObjects(self.shownAlertUrwidObjects)
 
 		# delete all old shown alert objects and replace them by the new ones
 		del self.alertsGrid.contents[:]
@@ -621,12 +800,12 @@ class Console:
 
 		logging.debug("[%s]: Show next alerts page." % self.fileName)
 
-		# calculate how many pages the alert urwid objects have
-		alertPageCount = (len(self.alertUrwidObjects)
+		# calculate how many pages the alert objects have
+		alertPageCount = (len(self.alerts)
 			/ self.maxCountShowAlertsPerPage)
 		if alertPageCount == 0:
 			return
-		if ((len(self.alertUrwidObjects) % self.maxCountShowAlertsPerPage)
+		if ((len(self.alerts) % self.maxCountShowAlertsPerPage)
 			!= 0):
 			alertPageCount += 1
 
@@ -644,12 +823,12 @@ class Console:
 
 		logging.debug("[%s]: Show previous alerts page." % self.fileName)
 
-		# calculate how many pages the alert urwid objects have
-		alertPageCount = (len(self.alertUrwidObjects)
+		# calculate how many pages the alert objects have
+		alertPageCount = (len(self.alerts)
 			/ self.maxCountShowAlertsPerPage)
 		if alertPageCount == 0:
 			return
-		if ((len(self.alertUrwidObjects) % self.maxCountShowAlertsPerPage)
+		if ((len(self.alerts) % self.maxCountShowAlertsPerPage)
 			!= 0):
 			alertPageCount += 1
 
@@ -663,16 +842,13 @@ class Console:
 
 
 	# internal function that shows the alert level urwid objects given
-	# by a page index
+	# by a page index (urwid objects are only created for the alert levels
+	# on the shown page and are removed as soon as they are no longer shown)
 	def _showAlertLevelsAtPageIndex(self, pageIndex):
 
-		# calculate how many pages the alert level urwid objects have
-		alertLevelPageCount = (len(self.alertLevelUrwidObjects) 
-			/ self.maxCountShowAlertLevelsPerPage)
-		if ((len(self.alertLevelUrwidObjects)
-			% self.maxCountShowAlertLevelsPerPage) 
-			!= 0):
-			alertLevelPageCount += 1
+		# calculate how many pages the alert level objects have
+		alertLevelPageCount = self._getPageCount(len(self.alertLevels),
+			self.maxCountShowAlertLevelsPerPage)
 
 		# check if the index to show is within the page range
 		if pageIndex >= alertLevelPageCount:
@@ -680,22 +856,42 @@ class Console:
 		elif pageIndex < 0:
 			pageIndex = alertLevelPageCount - 1
 
+		self.currentAlertLevelPage = pageIndex
+		self.alertLevelPageCount = alertLevelPageCount
+
 		logging.debug("[%s]: Update shown alert levels with page index: %d."
 			% (self.fileName, pageIndex))
 
-		# get all alert level urwid objects
-		# that should be shown on the new page
+		# get all alert level objects that should be shown on the new page
+		startIndex = pageIndex * self.maxCountShowAlertLevelsPerPage
+		newShownAlertLevels = self.alertLevels[startIndex:
+			startIndex + self.maxCountShowAlertLevelsPerPage]
+
+		# remove the urwid objects of the alert levels that are no longer shown
+		# => object will be deleted by garbage collector
+		for oldShownAlertLevel in self.shownAlertLevelUrwidObjects:
+			if not oldShownAlertLevel.alertLevel in newShownAlertLevels:
+				oldShownAlertLevel.unlink()
+
+		# get the urwid objects of the alert levels on the new page
 		del self.shownAlertLevelUrwidObjects[:]
-		for i in range(self.maxCountShowAlertLevelsPerPage):
-			tempItemIndex = i + (pageIndex
-				* self.maxCountShowAlertLevelsPerPage)
-			if tempItemIndex >= len(self.alertLevelUrwidObjects):
-				break
-			self.shownAlertLevelUrwidObjects.append(
-				self.alertLevelUrwidObjects[tempItemIndex])
+		for alertLevel in newShownAlertLevels:
+			alertLevelUrwid = alertLevel.alertLevelUrwid
 
-		# delete all old shown alert level objects
-		# and replace them by the new ones
+			# create new urwid object if the alert level was not shown before
+			# (also links urwid object to alert level object)
+			if alertLevelUrwid is None:
+				alertLevelUrwid = AlertLevelUrwid(alertLevel)
+			self.shownAlertLevelUrwidObjects.append(alertLevelUrwid)
+
+			# the urwid object is updated before it is shown
+			alertLevel.dirty = False
+
+		# update the urwid objects before they are shown
+		# (urwid objects that are not shown are not updated)
+		self._updateShownUrwidObjects(self.shownAlertLevelUrwidObjects)
+
+		# delete all old shown alert level objects and replace them by the new ones
 		del self.alertLevelsGrid.contents[:]
 		for newShownAlertLevel in self.shownAlertLevelUrwidObjects:
 			self.alertLevelsGrid.contents.append((newShownAlertLevel.get(),
@@ -711,12 +907,12 @@ class Console:
 
 		logging.debug("[%s]: Show next alert levels page." % self.fileName)
 
-		# calculate how many pages the alert level urwid objects have
-		alertLevelPageCount = (len(self.alertLevelUrwidObjects) 
+		# calculate how many pages the alert level objects have
+		alertLevelPageCount = (len(self.alertLevels) 
 			/ self.maxCountShowAlertLevelsPerPage)
 		if alertLevelPageCount == 0:
 			return
-		if ((len(self.alertLevelUrwidObjects)
+		if ((len(self.alertLevels)
 			% self.maxCountShowAlertLevelsPerPage)
 			!= 0):
 			alertLevelPageCount += 1
@@ -735,12 +931,12 @@ class Console:
 
 		logging.debug("[%s]: Show previous alert levels page." % self.fileName)
 
-		# calculate how many pages the alert level urwid objects have
-		alertLevelPageCount = (len(self.alertLevelUrwidObjects)
+		# calculate how many pages the alert level objects have
+		alertLevelPageCount = (len(self.alertLevels)
 			/ self.maxCountShowAlertLevelsPerPage)
 		if alertLevelPageCount == 0:
 			return
-		if ((len(self.alertLevelUrwidObjects)
+		if ((len(self.alertLevels)
 			% self.maxCountShowAlertLevelsPerPage)
 			!= 0):
 			alertLevelPageCount += 1
@@ -770,7 +966,7 @@ class Console:
 			# search for element for detailed view
 			currentElement = None
 			currentWidgetElement = currentElements.contents[currPos][0]
-			for temp in self.sensorUrwidObjects:
+			for temp in self.shownSensorUrwidObjects:
 				if currentWidgetElement == temp.get():
 					currentElement = temp
 					break
@@ -799,7 +995,7 @@ class Console:
 			# search for element for detailed view
 			currentElement = None
 			currentWidgetElement = currentElements.contents[currPos][0]
-			for temp in self.alertUrwidObjects:
+			for temp in self.shownAlertUrwidObjects:
 				if currentWidgetElement == temp.get():
 					currentElement = temp
 					break
@@ -828,7 +1024,7 @@ class Console:
 			# search for element for detailed view
 			currentElement = None
 			currentWidgetElement = currentElements.contents[currPos][0]
-			for temp in self.managerUrwidObjects:
+			for temp in self.shownManagerUrwidObjects:
 				if currentWidgetElement == temp.get():
 					currentElement = temp
 					break
@@ -853,7 +1049,7 @@ class Console:
 			# search for element for detailed view
 			currentElement = None
 			currentWidgetElement = currentElements.contents[currPos][0]
-			for temp in self.alertLevelUrwidObjects:
+			for temp in self.shownAlertLevelUrwidObjects:
 				if currentWidgetElement == temp.get():
 					currentElement = temp
 					break
@@ -884,15 +1080,13 @@ class Console:
 
 
 	# internal function that shows the manager urwid objects given
-	# by a page index
+	# by a page index (urwid objects are only created for the managers
+	# on the shown page and are removed as soon as they are no longer shown)
 	def _showManagersAtPageIndex(self, pageIndex):
 
-		# calculate how many pages the manager urwid objects have
-		managerPageCount = (len(self.managerUrwidObjects)
-			/ self.maxCountShowManagersPerPage)
-		if ((len(self.managerUrwidObjects) % self.maxCountShowManagersPerPage)
-			!= 0):
-			managerPageCount += 1
+		# calculate how many pages the manager objects have
+		managerPageCount = self._getPageCount(len(self.managers),
+			self.maxCountShowManagersPerPage)
 
 		# check if the index to show is within the page range
 		if pageIndex >= managerPageCount:
@@ -900,17 +1094,42 @@ class Console:
 		elif pageIndex < 0:
 			pageIndex = managerPageCount - 1
 
+		self.currentManagerPage = pageIndex
+		self.managerPageCount = managerPageCount
+
 		logging.debug("[%s]: Update shown managers with page index: %d."
 			% (self.fileName, pageIndex))
 
-		# get all manager urwid objects that should be shown on the new page
+		# get all manager objects that should be shown on the new page
+		startIndex = pageIndex * self.maxCountShowManagersPerPage
+		newShownManagers = self.managers[startIndex:
+			startIndex + self.maxCountShowManagersPerPage]
+
+		# remove the urwid objects of the managers that are no longer shown
+		# => object will be deleted by garbage collector
+		for oldShownManager in self.shownManagerUrwidObjects:
+			if not oldShownManager.manager in newShownManagers:
+				oldShownManager.unlink()
+
+		# get the urwid objects of the managers on the new page
 		del self.shownManagerUrwidObjects[:]
-		for i in range(self.maxCountShowManagersPerPage):
-			tempItemIndex = i + (pageIndex * self.maxCountShowManagersPerPage)
-			if tempItemIndex >= len(self.managerUrwidObjects):
-				break
-			self.shownManagerUrwidObjects.append(
-				self.managerUrwidObjects[tempItemIndex])
+		for manager in newShownManagers:
+			managerUrwid = manager.managerUrwid
+
+			# create new urwid object if the manager was not shown before
+			# (also links urwid object to manager object)
+			if managerUrwid is None:
+				nodeManagerBelongs = self._getNodeOfObj(manager, "manager",
+					["manager"])
+				managerUrwid = ManagerUrwid(manager, nodeManagerBelongs)
+			self.shownManagerUrwidObjects.append(managerUrwid)
+
+			# the urwid object is updated before it is shown
+			manager.dirty = False
+
+		# update the urwid objects before they are shown
+		# (urwid objects that are not shown are not updated)
+		self._updateShownUrwidObjects(self.shownManagerUrwidObjects)
 
 		# delete all old shown manager objects and replace them by the new ones
 		del self.managersGrid.contents[:]
@@ -928,12 +1147,12 @@ class Console:
 
 		logging.debug("[%s]: Show next managers page." % self.fileName)
 
-		# calculate how many pages the manager urwid objects have
-		managerPageCount = (len(self.managerUrwidObjects)
+		# calculate how many pages the manager objects have
+		managerPageCount = (len(self.managers)
 			/ self.maxCountShowManagersPerPage)
 		if managerPageCount == 0:
 			return
-		if ((len(self.managerUrwidObjects) % self.maxCountShowManagersPerPage)
+		if ((len(self.managers) % self.maxCountShowManagersPerPage)
 			!= 0):
 			managerPageCount += 1
 
@@ -951,12 +1170,12 @@ class Console:
 
 		logging.debug("[%s]: Show previous managers page." % self.fileName)
 
-		# calculate how many pages the manager urwid objects have
-		managerPageCount = (len(self.managerUrwidObjects)
+		# calculate how many pages the manager objects have
+		managerPageCount = (len(self.managers)
 			/ self.maxCountShowManagersPerPage)
 		if managerPageCount == 0:
 			return
-		if ((len(self.managerUrwidObjects) % self.maxCountShowManagersPerPage)
+		if ((len(self.managers) % self.maxCountShowManagersPerPage)
 			!= 0):
 			managerPageCount += 1
 
@@ -970,15 +1189,13 @@ class Console:
 
 
 	# internal function that shows the sensor urwid objects given
-	# by a page index
+	# by a page index (urwid objects are only created for the sensors
+	# on the shown page and are removed as soon as they are no longer shown)
 	def _showSensorsAtPageIndex(self, pageIndex):
 
-		# calculate how many pages the sensor urwid objects have
-		sensorPageCount = (len(self.sensorUrwidObjects) 
-			/ self.maxCountShowSensorsPerPage)
-		if ((len(self.sensorUrwidObjects) % self.maxCountShowSensorsPerPage) 
-			!= 0):
-			sensorPageCount += 1
+		# calculate how many pages the sensor objects have
+		sensorPageCount = self._getPageCount(len(self.sensors),
+			self.maxCountShowSensorsPerPage)
 
 		# check if the index to show is within the page range
 		if pageIndex >= sensorPageCount:
@@ -986,17 +1203,43 @@ class Console:
 		elif pageIndex < 0:
 			pageIndex = sensorPageCount - 1
 
+		self.currentSensorPage = pageIndex
+		self.sensorPageCount = sensorPageCount
+
 		logging.debug("[%s]: Update shown sensors with page index: %d."
 			% (self.fileName, pageIndex))
 
-		# get all sensor urwid objects that should be shown on the new page
+		# get all sensor objects that should be shown on the new page
+		startIndex = pageIndex * self.maxCountShowSensorsPerPage
+		newShownSensors = self.sensors[startIndex:
+			startIndex + self.maxCountShowSensorsPerPage]
+
+		# remove the urwid objects of the sensors that are no longer shown
+		# => object will be deleted by garbage collector
+		for oldShownSensor in self.shownSensorUrwidObjects:
+			if not oldShownSensor.sensor in newShownSensors:
+				oldShownSensor.unlink()
+
+		# get the urwid objects of the sensors on the new page
 		del self.shownSensorUrwidObjects[:]
-		for i in range(self.maxCountShowSensorsPerPage):
-			tempItemIndex = i + (pageIndex * self.maxCountShowSensorsPerPage)
-			if tempItemIndex >= len(self.sensorUrwidObjects):
-				break
-			self.shownSensorUrwidObjects.append(
-				self.sensorUrwidObjects[tempItemIndex])
+		for sensor in newShownSensors:
+			sensorUrwid = sensor.sensorUrwid
+
+			# create new urwid object if the sensor was not shown before
+			# (also links urwid object to sensor object)
+			if sensorUrwid is None:
+				nodeSensorBelongs = self._getNodeOfObj(sensor, "sensor",
+					["sensor", "server"])
+				sensorUrwid = SensorUrwid(sensor, nodeSensorBelongs,
+					self.connectionTimeout, self.serverEventHandler)
+			self.shownSensorUrwidObjects.append(sensorUrwid)
+
+			# the urwid object is updated before it is shown
+			sensor.dirty = False
+
+		# update the urwid objects before they are shown
+		# (urwid objects that are not shown are not updated)
+		self._updateShownUrwidObjects(self.shownSensorUrwidObjects)
 
 		# delete all old shown sensor objects and replace them by the new ones
 		del self.sensorsGrid.contents[:]
@@ -1014,12 +1257,12 @@ class Console:
 
 		logging.debug("[%s]: Show next sensors page." % self.fileName)
 
-		# calculate how many pages the sensor urwid objects have
-		sensorPageCount = (len(self.sensorUrwidObjects) 
+		# calculate how many pages the sensor objects have
+		sensorPageCount = (len(self.sensors) 
 			/ self.maxCountShowSensorsPerPage)
 		if sensorPageCount == 0:
 			return
-		if ((len(self.sensorUrwidObjects) % self.maxCountShowSensorsPerPage)
+		if ((len(self.sensors) % self.maxCountShowSensorsPerPage)
 			!= 0):
 			sensorPageCount += 1
 
@@ -1037,12 +1280,12 @@ class Console:
 
 		logging.debug("[%s]: Show previous sensors page." % self.fileName)
 
-		# calculate how many pages the sensor urwid objects have
-		sensorPageCount = (len(self.sensorUrwidObjects)
+		# calculate how many pages the sensor objects have
+		sensorPageCount = (len(self.sensors)
 			/ self.maxCountShowSensorsPerPage)
 		if sensorPageCount == 0:
 			return
-		if ((len(self.sensorUrwidObjects) % self.maxCountShowSensorsPerPage)
+		if ((len(self.sensors) % self.maxCountShowSensorsPerPage)
 			!= 0):
 			sensorPageCount += 1
 
@@ -1056,16 +1299,23 @@ class Console:
 
 
 	# this function is called to update the screen
-	def updateScreen(self, status):
-
-		# write status to the callback file descriptor
-		if self.screenFd != None:
-
-			self._acquireLock()
-
-			os.write(self.screenFd, status)
-			return True
-		return False
+	# (the given updates are merged with the ones that are still pending
+	# and the urwid thread is only woken up if it was not already)
+	def updateScreen(self, updates):
+
+		if self.screenFd == None:
+			return False
+
+		self.pendingUpdatesLock.acquire()
+		self.pendingUpdates |= updates
+		wakeup = not self.wakeupPending
+		self.wakeupPending = True
+		self.pendingUpdatesLock.release()
+
+		# write to the callback file descriptor to wake up the urwid thread
+		if wakeup:
+			os.write(self.screenFd, "u")
+		return True
 
 
 	# this function is called if a key/mouse input was made
@@ -1168,64 +1418,17 @@ class Console:
 	# return unless the client is terminated)
 	def startConsole(self):
 
-		# generate all sensor urwid objects
-		for sensor in self.sensors:
-
-			# get node the sensor belongs to
-			nodeSensorBelongs = None
-			for node in self.nodes:
-				if sensor.nodeId == node.nodeId:
-					nodeSensorBelongs = node
-					break
-			if nodeSensorBelongs is None:
-				raise ValueError(
-					"Could not find a node the sensor belongs to.")
-			elif (nodeSensorBelongs.nodeType != "sensor"
-				and nodeSensorBelongs.nodeType != "server"):
-				raise ValueError(
-					'Node the sensor belongs to is not of type "sensor" '
-					+ 'or "server".')
-
-			# create new sensor urwid object
-			# (also links urwid object to sensor object)
-			sensorUrwid = SensorUrwid(sensor, nodeSensorBelongs,
-				self.connectionTimeout, self.serverEventHandler)
-
-			# append the final sensor urwid object to the list
-			# of sensor objects
-			self.sensorUrwidObjects.append(sensorUrwid)
+		# create empty grid object for the sensors
+		# (it is filled when the first page of sensors is shown)
+		self.sensorsGrid = urwid.GridFlow([], 40, 1, 1, 'left')
 
-		# check if sensor urwid objects list is not empty
-		if self.sensorUrwidObjects:
-
-			# get the sensor objects for the first page
-			for i in range(self.maxCountShowSensorsPerPage):
-				# break if there are less sensor urwid objects than should
-				# be shown
-				if i >= len(self.sensorUrwidObjects):
-					break
-				self.shownSensorUrwidObjects.append(
-					self.sensorUrwidObjects[i])
+		# generate footer text for sensors box
+		# (the page number is set when the page is shown)
+		self.sensorsFooter = urwid.Text("", align='center')
 
-			# create grid object for the sensors
-			self.sensorsGrid = urwid.GridFlow(
-				map(lambda x: x.get(), self.shownSensorUrwidObjects),
-				40, 1, 1, 'left')
+		# show the first page of sensors
+		self._showSensorsAtPageIndex(0)
 
-		else:
-			# create empty grid object for the sensors
-			self.sensorsGrid = urwid.GridFlow([], 40, 1, 1, 'left')
-
-		# calculate how many pages the sensor urwid objects have
-		sensorPageCount = (len(self.sensorUrwidObjects)
-			/ self.maxCountShowSensorsPerPage)
-		if ((len(self.sensorUrwidObjects) % self.maxCountShowSensorsPerPage)
-			!= 0):
-			sensorPageCount += 1
-
-		# generate footer text for sensors box
-		tempText = "Page 1 / %d " % sensorPageCount 
-		self.sensorsFooter = urwid.Text(tempText, align='center')
 		self.sensorsKeyBindings = urwid.Text(
 			"Keys: b - Previous Page, n - Next Page", align='center')
 
@@ -1234,61 +1437,17 @@ class Console:
 			urwid.Divider(), self.sensorsFooter, self.sensorsKeyBindings]),
 			title="Sensors")
 
-		# generate all manager urwid objects
-		for manager in self.managers:
+		# create empty grid object for the managers
+		# (it is filled when the first page of managers is shown)
+		self.managersGrid = urwid.GridFlow([], 40, 1, 1, 'left')
 
-			# get node the manager belongs to
-			nodeManagerBelongs = None
-			for node in self.nodes:
-				if manager.nodeId == node.nodeId:
-					nodeManagerBelongs = node
-					break
-			if nodeManagerBelongs is None:
-				raise ValueError(
-					"Could not find a node the manager belongs to.")
-			elif nodeManagerBelongs.nodeType != "manager":
-				raise ValueError(
-					'Node the manager belongs to is not of '
-					+ 'type "manager"')
-
-			# create new manager urwid object
-			# (also links urwid object to manager object)
-			managerUrwid = ManagerUrwid(manager, nodeManagerBelongs)
+		# generate footer text for managers box
+		# (the page number is set when the page is shown)
+		self.managersFooter = urwid.Text("", align='center')
 
-			# append the final manager urwid object to the list
-			# of manager objects
-			self.managerUrwidObjects.append(managerUrwid)
+		# show the first page of managers
+		self._showManagersAtPageIndex(0)
 
-		# check if manager urwid objects list is not empty
-		if self.managerUrwidObjects:
-
-			# get the manager objects for the first page
-			for i in range(self.maxCountShowManagersPerPage):
-				# break if there are less manager urwid objects than should
-				# be shown
-				if i >= len(self.managerUrwidObjects):
-					break
-				self.shownManagerUrwidObjects.append(
-					self.managerUrwidObjects[i])
-
-			# create grid object for the managers
-			self.managersGrid = urwid.GridFlow(
-				map(lambda x: x.get(), self.shownManagerUrwidObjects),
-				40, 1, 1, 'left')
-		else:
-			# create empty grid object for the managers
-			self.managersGrid = urwid.GridFlow([], 40, 1, 1, 'left')
-
-		# calculate how many pages the manager urwid objects have
-		managerPageCount = (len(self.managerUrwidObjects)
-			/ self.maxCountShowManagersPerPage)
-		if ((len(self.managerUrwidObjects) % self.maxCountShowManagersPerPage)
-			!= 0):
-			managerPageCount += 1
-
-		# generate footer text for sensors box
-		tempText = "Page 1 / %d " % managerPageCount 
-		self.managersFooter = urwid.Text(tempText, align='center')
 		self.managersKeyBindings = urwid.Text(
 			"Keys: None", align='center')
 
@@ -1299,61 +1458,17 @@ class Console:
 
 		self.leftDisplayPart = urwid.Pile([self.sensorsBox, self.managersBox])
 
-		# generate all alert urwid objects
-		for alert in self.alerts:
+		# create empty grid object for the alerts
+		# (it is filled when the first page of alerts is shown)
+		self.alertsGrid = urwid.GridFlow([], 40, 1, 1, 'left')
 
-			# get node the alert belongs to
-			nodeAlertBelongs = None
-			for node in self.nodes:
-				if alert.nodeId == node.nodeId:
-					nodeAlertBelongs = node
-					break
-			if nodeAlertBelongs is None:
-				raise ValueError(
-					"Could not find a node the alert belongs to.")
-			elif nodeAlertBelongs.nodeType != "alert":
-				raise ValueError(
-					'Node the alert belongs to is not of '
-					+ 'type "alert"')					
-
-			# create new alert urwid object
-			# (also links urwid object to alert object)
-			alertUrwid = AlertUrwid(alert, nodeAlertBelongs)
-
-			# append the final alert urwid object to the list
-			# of alert objects
-			self.alertUrwidObjects.append(alertUrwid)
-
-		# check if alert urwid objects list is not empty
-		if self.alertUrwidObjects:
+		# generate footer text for alerts box
+		# (the page number is set when the page is shown)
+		self.alertsFooter = urwid.Text("", align='center')
 
-			# get the alert objects for the first page
-			for i in range(self.maxCountShowAlertsPerPage):
-				# break if there are less alert urwid objects than should
-				# be shown
-				if i >= len(self.alertUrwidObjects):
-					break
-				self.shownAlertUrwidObjects.append(
-					self.alertUrwidObjects[i])
-
-			# create grid object for the alerts
-			self.alertsGrid = urwid.GridFlow(
-				map(lambda x: x.get(), self.shownAlertUrwidObjects),
-				40, 1, 1, 'left')
-		else:
-			# create empty grid object for the alerts
-			self.alertsGrid = urwid.GridFlow([], 40, 1, 1, 'left')
+		# show the first page of alerts
+		self._showAlertsAtPageIndex(0)
 
-		# calculate how many pages the alert urwid objects have
-		alertPageCount = (len(self.alertUrwidObjects)
-			/ self.maxCountShowAlertsPerPage)
-		if ((len(self.alertUrwidObjects) % self.maxCountShowAlertsPerPage)
-			!= 0):
-			alertPageCount += 1
-
-		# generate footer text for sensors box
-		tempText = "Page 1 / %d " % alertPageCount 
-		self.alertsFooter = urwid.Text(tempText, align='center')
 		self.alertsKeyBindings = urwid.Text(
 			"Keys: None", align='center')
 
@@ -1362,47 +1477,17 @@ class Console:
 			urwid.Divider(), self.alertsFooter, self.alertsKeyBindings]),
 			title="Alert Clients")
 
-		# generate all alert level urwid objects
-		for alertLevel in self.alertLevels:
+		# create empty grid object for the alert levels
+		# (it is filled when the first page of alert levels is shown)
+		self.alertLevelsGrid = urwid.GridFlow([], 40, 1, 1, 'left')
 
-			# create new alert level urwid object
-			# (also links urwid object to alert level object)
-			alertLevelUrwid = AlertLevelUrwid(alertLevel)
-
-			# append the final alert level urwid object to the list
-			# of alert level objects
-			self.alertLevelUrwidObjects.append(alertLevelUrwid)
-
-		# check if alert level urwid objects list is not empty
-		if self.alertLevelUrwidObjects:
-
-			# get the alert level objects for the first page
-			for i in range(self.maxCountShowAlertLevelsPerPage):
-				# break if there are less alert level urwid objects than should
-				# be shown
-				if i >= len(self.alertLevelUrwidObjects):
-					break
-				self.shownAlertLevelUrwidObjects.append(
-					self.alertLevelUrwidObjects[i])
-
-			# create grid object for the alert levels
-			self.alertLevelsGrid = urwid.GridFlow(
-				map(lambda x: x.get(), self.shownAlertLevelUrwidObjects),
-				40, 1, 1, 'left')
-		else:
-			# create empty grid object for the alert levels
-			self.alertLevelsGrid = urwid.GridFlow([], 40, 1, 1, 'left')
+		# generate footer text for alert levels box
+		# (the page number is set when the page is shown)
+		self.alertLevelsFooter = urwid.Text("", align='center')
 
-		# calculate how many pages the alert level urwid objects have
-		alertLevelPageCount = (len(self.alertLevelUrwidObjects)
-			/ self.maxCountShowAlertLevelsPerPage)
-		if ((len(self.alertLevelUrwidObjects) 
-			% self.maxCountShowAlertLevelsPerPage) != 0):
-			alertLevelPageCount += 1
+		# show the first page of alert levels
+		self._showAlertLevelsAtPageIndex(0)
 
-		# generate footer text for sensors box
-		tempText = "Page 1 / %d " % alertLevelPageCount 
-		self.alertLevelsFooter = urwid.Text(tempText, align='center')
 		self.alertLevelsKeyBindings = urwid.Text(
 			"Keys: None", align='center')
 
@@ -1513,11 +1598,24 @@ class Console:
 	# gets data written to it and updates the screen elements
 	def screenCallback(self, receivedData):
 
-		# if received data equals "status" or "sensoralert"
+		# get all pending screen updates and reset them
+		# (updates requested from now on wake up the urwid thread again)
+		self.pendingUpdatesLock.acquire()
+		pendingUpdates = self.pendingUpdates
+		self.pendingUpdates = 0
+		self.wakeupPending = False
+		self.pendingUpdatesLock.release()
+
+		# measure the time the screen update takes in debug mode
+		measureTime = logging.getLogger().isEnabledFor(logging.DEBUG)
+		if measureTime:
+			startTime = time.time()
+
+		# if a status or sensor alert update is pending
 		# update the whole screen (in case of a sensor alert it can happen
 		# that also a normal state change was received before and is forgotten
 		# if a normal status update is not made)
-		if receivedData == "status" or receivedData == "sensoralert":
+		if pendingUpdates & (ScreenUpdate.status | ScreenUpdate.sensorAlert):
 			logging.debug("[%s]: Status update received. "  % self.fileName
 				+ "Updating screen elements.")
 
@@ -1538,304 +1636,102 @@ class Console:
 						self.alertSystemActive.turnGreen()
 
 			# remove sensor alerts if they are too old
+			# (the oldest sensor alerts are at the beginning of the list)
+			outdatedCount = 0
 			for sensorAlertUrwid in self.sensorAlertUrwidObjects:
-				if sensorAlertUrwid.sensorAlertOutdated():
-					# search in the pile widget for the
-					# sensor alert widget object
-					# to remove it
-					for pileTuple in self.sensorAlertsPile.contents:
-						if sensorAlertUrwid.get() == pileTuple[0]:
-							self.sensorAlertsPile.contents.remove(pileTuple)
-
-							# remove sensor alert urwid object from
-							# list of objects
-							# to delete all references to object
-							# => object will be deleted by garbage collector
-							self.sensorAlertUrwidObjects.remove(
-								sensorAlertUrwid)
-
-			# update the information of all sensor urwid widgets
-			for sensorUrwidObject in self.sensorUrwidObjects:
-				# if update method returns false
-				# => sensor object no longer exists
-				# => remove it 
-				if not sensorUrwidObject.updateCompleteWidget():
-
-					# remove sensor urwid object from the list of the
-					# current shown objects if it is shown
-					if sensorUrwidObject in self.shownSensorUrwidObjects:
-						self.shownSensorUrwidObjects.remove(sensorUrwidObject)
-
-						# update shown sensors
-						self._showSensorsAtPageIndex(self.currentSensorPage)
-
-					# remove sensor urwid object from list of objects
-					# to delete all references to object
-					# => object will be deleted by garbage collector
-					self.sensorUrwidObjects.remove(sensorUrwidObject)
-
-					# if the detailed view is shown and this sensor
-					# was removed
-					# => close detailed view
-					if (self.inDetailView
-						and not self.detailedView.sensor in self.sensors):
-
-						self._closeDetailedView()
-
-				# if the detailed view is shown of a sensor
-				# => update the information shown for the corresponding sensor
-				else:
-					if (self.inDetailView
-						and self.currentFocused == FocusedElement.sensors
-						and self.detailedView.sensor 
-						== sensorUrwidObject.sensor):
-
-						objAlertLevels = self._getAlertLevelsOfObj(
-							sensorUrwidObject.sensor)
-
-						self.detailedView.updateCompleteWidget(
-							objAlertLevels)
-
-			# add all sensors that were newly added
-			for sensor in self.sensors:
-				# check if a new sensor was added
-				if sensor.sensorUrwid == None:
-					# get node the sensor belongs to
-					nodeSensorBelongs = None
-					for node in self.nodes:
-						if sensor.nodeId == node.nodeId:
-							nodeSensorBelongs = node
-							break
-					if nodeSensorBelongs is None:
-						raise ValueError(
-							"Could not find a node the sensor belongs to.")
-					elif (nodeSensorBelongs.nodeType != "sensor"
-						and nodeSensorBelongs.nodeType != "server"):
-						raise ValueError(
-							'Node the sensor belongs to is not of '
-							+ 'type "sensor" or "server".')
-
-					# create new sensor urwid object
-					# (also links urwid object to sensor object)
-					sensorUrwid = SensorUrwid(sensor, nodeSensorBelongs,
-						self.connectionTimeout, self.serverEventHandler)
-
-					# append the final sensor urwid object to the list
-					# of sensor objects
-					self.sensorUrwidObjects.append(sensorUrwid)
-
-					# update shown sensors
-					self._showSensorsAtPageIndex(self.currentSensorPage)
-
-			# update the information of all alert urwid widgets
-			for alertUrwidObject in self.alertUrwidObjects:
-				# if update method returns false
-				# => alert object no longer exists
-				# => remove it 
-				if not alertUrwidObject.updateCompleteWidget():
-
-					# remove alert urwid object from the list of the
-					# current shown objects if it is shown
-					if alertUrwidObject in self.shownAlertUrwidObjects:
-						self.shownAlertUrwidObjects.remove(alertUrwidObject)
-
-						# update shown alerts
-						self._showAlertsAtPageIndex(self.currentAlertPage)
-
-					# remove alert urwid object from list of objects
-					# to delete all references to object
-					# => object will be deleted by garbage collector
-					self.alertUrwidObjects.remove(alertUrwidObject)
-
-					# if the detailed view is shown and this alert
-					# was removed
-					# => close detailed view
-					if (self.inDetailView
-						and not self.detailedView.alert in self.alerts):
-
-						self._closeDetailedView()
-
-				# if the detailed view is shown of an alert
-				# => update the information shown for the corresponding alert
-				else:
-					if (self.inDetailView
-						and self.currentFocused == FocusedElement.alerts
-						and self.detailedView.alert 
-						== alertUrwidObject.alert):
-
-						objAlertLevels = self._getAlertLevelsOfObj(
-							alertUrwidObject.alert)
-
-						self.detailedView.updateCompleteWidget(
-							objAlertLevels)
-
-			# add all alerts that were newly added
-			for alert in self.alerts:
-				# check if a new alert was added
-				if alert.alertUrwid == None:
-					# get node the alert belongs to
-					nodeAlertBelongs = None
-					for node in self.nodes:
-						if alert.nodeId == node.nodeId:
-							nodeAlertBelongs = node
-							break
-					if nodeAlertBelongs is None:
-						raise ValueError(
-							"Could not find a node the alert belongs to.")
-					elif nodeAlertBelongs.nodeType != "alert":
-						raise ValueError(
-							'Node the alert belongs to is not of '
-							+ 'type "alert"')
-
-					# create new alert urwid object
-					# (also links urwid object to alert object)
-					alertUrwid = AlertUrwid(alert, nodeAlertBelongs)
-
-					# append the final alert urwid object to the list
-					# of alert objects
-					self.alertUrwidObjects.append(alertUrwid)
-
-					# update shown alerts
-					self._showAlertsAtPageIndex(self.currentAlertPage)
-
-			# update the information of all manager urwid widgets
-			for managerUrwidObject in self.managerUrwidObjects:
-				# if update method returns false
-				# => manager object no longer exists
-				# => remove it 
-				if not managerUrwidObject.updateCompleteWidget():
-
-					# remove manager urwid object from the list of the
-					# current shown objects if it is shown
-					if managerUrwidObject in self.shownManagerUrwidObjects:
-						self.shownManagerUrwidObjects.remove(
-							managerUrwidObject)
-
-						# update shown managers
-						self._showManagersAtPageIndex(self.currentManagerPage)
-
-					# remove manager urwid object from list of objects
-					# to delete all references to object
-					# => object will be deleted by garbage collector
-					self.managerUrwidObjects.remove(managerUrwidObject)
-
-					# if the detailed view is shown and this manager
-					# was removed
-					# => close detailed view
-					if (self.inDetailView
-						and not self.detailedView.manager in self.managers):
-
-						self._closeDetailedView()
-
-				# if the detailed view is shown of a manager
-				# => update the information shown for the corresponding manager
-				else:
-					if (self.inDetailView
-						and self.currentFocused == FocusedElement.managers
-						and self.detailedView.manager 
-						== managerUrwidObject.manager):
-
-						self.detailedView.updateCompleteWidget()
-
-			# add all managers that were newly added
-			for manager in self.managers:
-				# check if a new manager was added
-				if manager.managerUrwid == None:
-					# get node the manager belongs to
-					nodeManagerBelongs = None
-					for node in self.nodes:
-						if manager.nodeId == node.nodeId:
-							nodeManagerBelongs = node
-							break
-					if nodeManagerBelongs is None:
-						raise ValueError(
-							"Could not find a node the manager belongs to.")
-					elif nodeManagerBelongs.nodeType != "manager":
-						raise ValueError(
-							'Node the manager belongs to is not of '
-							+ 'type "manager"')
-
-					# create new manager urwid object
-					# (also links urwid object to manager object)
-					managerUrwid = ManagerUrwid(manager, nodeManagerBelongs)
-
-					# append the final manager urwid object to the list
-					# of manager objects
-					self.managerUrwidObjects.append(managerUrwid)
-
-					# update shown managers
-					self._showManagersAtPageIndex(self.currentManagerPage)
-
-			# update the information of all alert level urwid widgets
-			for alertLevelUrwidObject in self.alertLevelUrwidObjects:
-				# if update method returns false
-				# => alert level object no longer exists
-				# => remove it 
-				if not alertLevelUrwidObject.updateCompleteWidget():
-
-					# remove alert level urwid object from the list of the
-					# current shown objects if it is shown
-					if (alertLevelUrwidObject
-						in self.shownAlertLevelUrwidObjects):
-						self.shownAlertLevelUrwidObjects.remove(
-							alertLevelUrwidObject)
-
-						# update shown alert levels
-						self._showAlertLevelsAtPageIndex(
-							self.currentAlertLevelPage)
-
-					# remove alert level urwid object from list of objects
-					# to delete all references to object
-					# => object will be deleted by garbage collector
-					self.alertLevelUrwidObjects.remove(alertLevelUrwidObject)
-
-					# if the detailed view is shown and this alert level
-					# was removed
-					# => close detailed view
-					if (self.inDetailView
-						and not self.detailedView.alertLevel
-						in self.alertLevels):
-
-						self._closeDetailedView()
-
-				# if the detailed view is shown of a manager
-				# => update the information shown for the corresponding manager
-				else:
-					if (self.inDetailView
-						and self.currentFocused == FocusedElement.alertLevels
-						and self.detailedView.alertLevel 
-						== alertLevelUrwidObject.alertLevel):
-
-						# get all sensors that belong to the focused
-						# alert level
-						currentSensors = self._getSensorsOfAlertLevel(
-							alertLevelUrwidObject.alertLevel)
-
-						# get all alerts that belong to the focused alert level
-						currentAlerts = self._getAlertsOfAlertLevel(
-							alertLevelUrwidObject.alertLevel)
-
-						self.detailedView.updateCompleteWidget(currentSensors,
-							currentAlerts)
-
-			# add all alert levels that were newly added
-			for alertLevel in self.alertLevels:
-				# check if a new alert level was added
-				if alertLevel.alertLevelUrwid == None:
-					# create new alert level urwid object
-					# (also links urwid object to alert level object)
-					alertLevelUrwid = AlertLevelUrwid(alertLevel)
-
-					# append the final alert level urwid object to the list
-					# of alert level objects
-					self.alertLevelUrwidObjects.append(alertLevelUrwid)
-
-					# update shown alert levels
-					self._showAlertLevelsAtPageIndex(
-						self.currentAlertLevelPage)
+				if not sensorAlertUrwid.sensorAlertOutdated():
+					break
+				outdatedCount += 1
+			if outdatedCount > 0:
+				# remove sensor alert urwid objects from list of objects
+				# to delete all references to object
+				# => object will be deleted by garbage collector
+				del self.sensorAlertUrwidObjects[:outdatedCount]
+				self._updateSensorAlertsPile()
+
+			# get all nodes that have changed since the last update
+			# (the urwid objects that belong to them have to be updated)
+			changedNodes = set()
+			for node in self.nodes:
+				if node.dirty:
+					node.dirty = False
+					changedNodes.add(node)
+
+			# show the page of sensors again if sensors were added
+			# or removed (this also updates all shown sensor urwid objects)
+			if self._pageChanged(self.sensors,
+				[x.sensor for x in self.shownSensorUrwidObjects],
+				self.currentSensorPage, self.maxCountShowSensorsPerPage,
+				self.sensorPageCount):
+				self._showSensorsAtPageIndex(self.currentSensorPage)
+
+			# update the information of all shown sensor urwid objects
+			# that have changed
+			else:
+				for sensorUrwidObject in self.shownSensorUrwidObjects:
+
+					# the color of a sensor also changes when it times out
+					if self._urwidObjectNeedsUpdate(sensorUrwidObject,
+						sensorUrwidObject.sensor, changedNodes,
+						sensorUrwidObject.timedOutChanged()):
+						sensorUrwidObject.updateCompleteWidget()
+
+			# show the page of alerts again if alerts were added
+			# or removed (this also updates all shown alert urwid objects)
+			if self._pageChanged(self.alerts,
+				[x.alert for x in self.shownAlertUrwidObjects],
+				self.currentAlertPage, self.maxCountShowAlertsPerPage,
+				self.alertPageCount):
+				self._showAlertsAtPageIndex(self.currentAlertPage)
+
+			# update the information of all shown alert urwid objects
+			# that have changed
+			else:
+				for alertUrwidObject in self.shownAlertUrwidObjects:
+					if self._urwidObjectNeedsUpdate(alertUrwidObject,
+						alertUrwidObject.alert, changedNodes):
+						alertUrwidObject.updateCompleteWidget()
+
+			# show the page of managers again if managers were added
+			# or removed (this also updates all shown manager urwid objects)
+			if self._pageChanged(self.managers,
+				[x.manager for x in self.shownManagerUrwidObjects],
+				self.currentManagerPage, self.maxCountShowManagersPerPage,
+				self.managerPageCount):
+				self._showManagersAtPageIndex(self.currentManagerPage)
+
+			# update the information of all shown manager urwid objects
+			# that have changed
+			else:
+				for managerUrwidObject in self.shownManagerUrwidObjects:
+					if self._urwidObjectNeedsUpdate(managerUrwidObject,
+						managerUrwidObject.manager, changedNodes):
+						managerUrwidObject.updateCompleteWidget()
+
+			# show the page of alert levels again if alert levels were
+			# added or removed (this also updates all shown alert level
+			# urwid objects)
+			if self._pageChanged(self.alertLevels,
+				[x.alertLevel for x in self.shownAlertLevelUrwidObjects],
+				self.currentAlertLevelPage,
+				self.maxCountShowAlertLevelsPerPage,
+				self.alertLevelPageCount):
+				self._showAlertLevelsAtPageIndex(self.currentAlertLevelPage)
+
+			# update the information of all shown alert level urwid objects
+			# that have changed
+			else:
+				for alertLevelUrwidObject in self.shownAlertLevelUrwidObjects:
+					if self._urwidObjectNeedsUpdate(alertLevelUrwidObject,
+						alertLevelUrwidObject.alertLevel, changedNodes):
+						alertLevelUrwidObject.updateCompleteWidget()
+
+			# update the detailed view if it is shown
+			if self.inDetailView:
+				self._updateDetailedView()
 
 		# check if the connection to the server failed
-		if receivedData == "connectionfail":
+		if pendingUpdates & ScreenUpdate.connectionFail:
 			logging.debug("[%s]: Status connection failed "  % self.fileName
 				+ "received. Updating screen elements.")
 
@@ -1846,30 +1742,37 @@ class Console:
 			# update alert system active widget
 			self.alertSystemActive.turnGray()
 
-			# update all sensor urwid widgets
-			for sensorUrwidObject in self.sensorUrwidObjects:
+			# update all shown sensor urwid widgets
+			# (urwid objects only exist for the shown objects)
+			for sensorUrwidObject in self.shownSensorUrwidObjects:
 				sensorUrwidObject.setConnectionFail()
 
-			# update all alert urwid widgets
-			for alertUrwidObject in self.alertUrwidObjects:
+			# update all shown alert urwid widgets
+			for alertUrwidObject in self.shownAlertUrwidObjects:
 				alertUrwidObject.setConnectionFail()
 
-			# update all manager urwid widgets
-			for managerUrwidObject in self.managerUrwidObjects:
+			# update all shown manager urwid widgets
+			for managerUrwidObject in self.shownManagerUrwidObjects:
 				managerUrwidObject.setConnectionFail()
 
-			# update all alert level urwid widgets
-			for alertLevelUrwidObject in self.alertLevelUrwidObjects:
+			# update all shown alert level urwid widgets
+			for alertLevelUrwidObject in self.shownAlertLevelUrwidObjects:
 				alertLevelUrwidObject.setConnectionFail()
 
+			# mark all objects as changed
+			# => all shown urwid widgets are updated with the next status
+			for obj in (self.nodes + self.sensors + self.alerts
+				+ self.managers + self.alertLevels):
+				obj.dirty = True
+
 		# check if a sensor alert was received from the server
-		if receivedData == "sensoralert":
+		if pendingUpdates & ScreenUpdate.sensorAlert:
 
 			logging.debug("[%s]: Sensor alert "  % self.fileName
 				+ "received. Updating screen elements.")
 
 			# output all sensor alerts
-			for sensorAlert in self.sensorAlerts:
+			for sensorAlert in list(self.sensorAlerts):
 
 				description = ""
 
@@ -1880,13 +1783,15 @@ class Console:
 						if sensorAlert.sensorId == sensor.sensorId:
 
 							# Only update sensor state information if the flag
-							# was set in the received message.
-							if sensorAlert.changeState:
-								sensor.sensorUrwid.updateState(
-									sensorAlert.state)
+							# was set in the received message (the sensor
+							# only has an urwid object if it is shown).
+							if not sensor.sensorUrwid is None:
+								if sensorAlert.changeState:
+									sensor.sensorUrwid.updateState(
+										sensorAlert.state)
 
-							sensor.sensorUrwid.updateLastUpdated(
-								sensorAlert.timeReceived)
+								sensor.sensorUrwid.updateLastUpdated(
+									sensorAlert.timeReceived)
 
 							# get description for the sensor alert to add
 							description = sensor.description
@@ -1910,53 +1815,37 @@ class Console:
 							description = alertLevel.name
 							break
 
-				# check if more sensor alerts are shown than are received
-				# => there still exists empty sensor alerts
-				#=> remove them first
-				if (len(self.sensorAlertsPile.contents)
-					> len(self.sensorAlertUrwidObjects)):
-
-					# search for an empty sensor alert and remove it
-					for pileTuple in self.sensorAlertsPile.contents:
-						if self.emtpySensorAlert == pileTuple[0]:
-							self.sensorAlertsPile.contents.remove(
-								pileTuple)
-							break
-
-				# remove the first sensor alert object
-				# (the first one is the oldest because of the appending)
-				else:
-					sensorAlertWidgetToRemove = self.sensorAlertUrwidObjects[0]
-					# search in the pile widget for the sensor alert
-					# widget object to remove it
-					for pileTuple in self.sensorAlertsPile.contents:
-						if sensorAlertWidgetToRemove.get() == pileTuple[0]:
-							self.sensorAlertsPile.contents.remove(pileTuple)
-
-							# remove sensor alert urwid object
-							# from list of objects
-							# to delete all references to object
-							# => object will be deleted by garbage collector
-							self.sensorAlertUrwidObjects.remove(
-								sensorAlertWidgetToRemove)
-							break
-
 				# create new sensor alert urwid object
 				sensorAlertUrwid = SensorAlertUrwid(sensorAlert,
 					description, self.timeShowSensorAlert)
 
 				# add sensor alert urwid object to the list of
 				# sensor alerts urwid objects
+				# (new sensor alerts will be displayed on top)
 				self.sensorAlertUrwidObjects.append(sensorAlertUrwid)
 
-				# insert sensor alert as first element in the list
-				# => new sensor alerts will be displayed on top
-				self.sensorAlertsPile.contents.insert(0,
-					(sensorAlertUrwid.get(), self.sensorAlertsPile.options()))
+				# remove the oldest sensor alert urwid objects
+				# if more sensor alerts exist than can be shown
+				# (the first one is the oldest because of the appending)
+				if (len(self.sensorAlertUrwidObjects)
+					> self.maxCountShowSensorAlert):
+					del self.sensorAlertUrwidObjects[0]
 
 				# remove sensor alert from the list of sensor alerts
 				self.sensorAlerts.remove(sensorAlert)
 
+			# show the new sensor alerts
+			self._updateSensorAlertsPile()
+
+		if measureTime:
+			updateTime = time.time() - startTime
+			self.screenUpdateCount += 1
+			self.screenUpdateTime += updateTime
+			logging.debug("[%s]: Screen update took %.2f ms "
+				% (self.fileName, updateTime * 1000)
+				+ "(average %.2f ms over %d updates)."
+				% ((self.screenUpdateTime / self.screenUpdateCount) * 1000,
+				self.screenUpdateCount))
+
 		# return true so the file descriptor will NOT be closed
-		self._releaseLock()
 		return True
\ No newline at end of file
@@ -132,6 +132,18 @@ class SensorUrwid:
 		# if the data type has changed and the urwid object has to be adjusted.
 		self.lastDataType = self.sensor.dataType
 
+		# Store if the sensor has timed out when the urwid object was
+		# updated the last time. This is used to check if the urwid object
+		# has to be updated because the sensor has timed out in the meantime.
+		self.lastTimedOut = self._hasTimedOut()
+
+
+	# internal function that checks if the sensor has timed out
+	def _hasTimedOut(self):
+		return (self.sensor.lastStateUpdated
+			< (self.serverEventHandler.serverTime
+			- (2 * self.connectionTimeout)))
+
 
 	# this function returns the final urwid widget that is used
 	# to render the box of a sensor
@@ -247,10 +259,24 @@ class SensorUrwid:
 		self.updateState(self.sensor.state)
 		self.updateData(self.sensor.data, self.sensor.dataType)
 
+		# Needed to check if the sensor has timed out in the meantime.
+		self.lastTimedOut = self._hasTimedOut()
+
 		# return true if object was updated
 		return True
 
 
+	# this function checks if the sensor has timed out or is no longer
+	# timed out since the object was updated the last time
+	def timedOutChanged(self):
+
+		# check if sensor still exists
+		if self.sensor is None:
+			return False
+
+		return self._hasTimedOut() != self.lastTimedOut
+
+
 	# this functions sets the color when the connection to the server
 	# has failed
 	def setConnectionFail(self):
@@ -258,6 +284,15 @@ class SensorUrwid:
 		self.sensorUrwidMap.set_focus_map({None: "connectionfail_focus"})
 
 
+	# this function removes the reference from the sensor object to this
+	# urwid object (is used when the urwid object is no longer shown
+	# => object will be deleted by garbage collector)
+	def unlink(self):
+		if (not self.sensor is None
+			and self.sensor.sensorUrwid == self):
+			self.sensor.sensorUrwid = None
+
+
 # this class is an urwid object for a detailed sensor output
 class SensorDetailedUrwid:
 
@@ -615,6 +650,15 @@ class AlertUrwid:
 		self.alertUrwidMap.set_focus_map({None: "connectionfail_focus"})
 
 
+	# this function removes the reference from the alert object to this
+	# urwid object (is used when the urwid object is no longer shown
+	# => object will be deleted by garbage collector)
+	def unlink(self):
+		if (not self.alert is None
+			and self.alert.alertUrwid == self):
+			self.alert.alertUrwid = None
+
+
 # this class is an urwid object for a detailed alert output
 class AlertDetailedUrwid:
 
@@ -933,6 +977,15 @@ class ManagerUrwid:
 		self.managerUrwidMap.set_focus_map({None: "connectionfail_focus"})
 
 
+	# this function removes the reference from the manager object to this
+	# urwid object (is used when the urwid object is no longer shown
+	# => object will be deleted by garbage collector)
+	def unlink(self):
+		if (not self.manager is None
+			and self.manager.managerUrwid == self):
+			self.manager.managerUrwid = None
+
+
 # this class is an urwid object for a detailed manager output
 class ManagerDetailedUrwid:
 
@@ -1172,6 +1225,15 @@ class AlertLevelUrwid:
 		self.alertLevelUrwidMap.set_focus_map({None: "connectionfail_focus"})
 
 
+	# this function removes the reference from the alert level object to this
+	# urwid object (is used when the urwid object is no longer shown
+	# => object will be deleted by garbage collector)
+	def unlink(self):
+		if (not self.alertLevel is None
+			and self.alertLevel.alertLevelUrwid == self):
+			self.alertLevel.alertLevelUrwid = None
+
+
 # this class is an urwid object for a detailed alert level output
 class AlertLevelDetailedUrwid:
 
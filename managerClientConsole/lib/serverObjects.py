@@ -13,16 +13,28 @@ import time
 
 
 # this class represents an option of the server
-class Option:
+class Option(object):
+
+	# the attributes of the status objects are stored in slots instead of
+	# a per object dictionary to keep their memory footprint small
+	__slots__ = ("type", "value", "checked")
 
 	def __init__(self):
 		self.type = None
 		self.value = None
 
+		# flag that marks this object as checked
+		# (is used to verify if this object is still received from the server)
+		self.checked = False
+
 
 # this class represents an node/client of the alert system
 # which can be either a sensor, alert or manager
-class Node:
+class Node(object):
+
+	__slots__ = ("nodeId", "hostname", "nodeType", "instance", "connected",
+		"version", "rev", "username", "persistent", "checked", "dirty",
+		"sensorUrwid", "alertUrwid")
 
 	def __init__(self):
 		self.nodeId = None
@@ -39,6 +51,11 @@ class Node:
 		# (is used to verify if this object is still connected to the server)
 		self.checked = False
 
+		# used for urwid only:
+		# flag that marks this object as changed since its urwid object
+		# was updated the last time
+		self.dirty = True
+
 		# used for urwid only:
 		# reference to the sensor urwid object
 		self.sensorUrwid = None
@@ -48,8 +65,19 @@ class Node:
 		self.alertUrwid = None
 
 
-	# This function copies all attributes of the given node to this object.
+	# This function copies all attributes of the given node to this object
+	# (and marks this object as changed if an attribute has changed).
 	def deepCopy(self, node):
+		if (self.hostname != node.hostname
+			or self.nodeType != node.nodeType
+			or self.instance != node.instance
+			or self.connected != node.connected
+			or self.version != node.version
+			or self.rev != node.rev
+			or self.username != node.username
+			or self.persistent != node.persistent):
+			self.dirty = True
+
 		self.nodeId = node.nodeId
 		self.hostname = node.hostname
 		self.nodeType = node.nodeType
@@ -62,7 +90,11 @@ class Node:
 
 
 # this class represents a sensor client of the alert system
-class Sensor:
+class Sensor(object):
+
+	__slots__ = ("nodeId", "sensorId", "remoteSensorId", "alertDelay",
+		"alertLevels", "description", "lastStateUpdated", "state", "dataType",
+		"data", "checked", "dirty", "sensorUrwid")
 
 	def __init__(self):
 		self.nodeId = None
@@ -80,18 +112,37 @@ class Sensor:
 		# (is used to verify if this object is still connected to the server)
 		self.checked = False
 
+		# used for urwid only:
+		# flag that marks this object as changed since its urwid object
+		# was updated the last time
+		self.dirty = True
+
 		# used for urwid only:
 		# reference to the sensor urwid object
 		self.sensorUrwid = None
 
 
-	# This function copies all attributes of the given sensor to this object.
+	# This function copies all attributes of the given sensor to this object
+	# (and marks this object as changed if an attribute has changed).
 	def deepCopy(self, sensor):
+		if (self.nodeId != sensor.nodeId
+			or self.remoteSensorId != sensor.remoteSensorId
+			or self.alertDelay != sensor.alertDelay
+			or self.alertLevels != sensor.alertLevels
+			or self.description != sensor.description
+			or self.lastStateUpdated != sensor.lastStateUpdated
+			or self.state != sensor.state
+			or self.dataType != sensor.dataType
+			or self.data != sensor.data):
+			self.dirty = True
+
 		self.nodeId = sensor.nodeId
 		self.sensorId = sensor.sensorId
 		self.remoteSensorId = sensor.remoteSensorId
 		self.alertDelay = sensor.alertDelay
-		self.alertLevels = list(sensor.alertLevels)
+		# the alert levels list is never modified in place (only replaced)
+		# => it can be shared instead of copied
+		self.alertLevels = sensor.alertLevels
 		self.description = sensor.description
 		self.lastStateUpdated = sensor.lastStateUpdated
 		self.state = sensor.state
@@ -100,7 +151,10 @@ class Sensor:
 
 
 # this class represents a manager client of the alert system
-class Manager:
+class Manager(object):
+
+	__slots__ = ("nodeId", "managerId", "description", "checked", "dirty",
+		"managerUrwid")
 
 	def __init__(self):
 		self.nodeId = None
@@ -111,20 +165,33 @@ class Manager:
 		# (is used to verify if this object is still connected to the server)
 		self.checked = False
 
+		# used for urwid only:
+		# flag that marks this object as changed since its urwid object
+		# was updated the last time
+		self.dirty = True
+
 		# used for urwid only:
 		# reference to the manager urwid object
 		self.managerUrwid = None
 
 
-	# This function copies all attributes of the given manager to this object.
+	# This function copies all attributes of the given manager to this object
+	# (and marks this object as changed if an attribute has changed).
 	def deepCopy(self, manager):
+		if (self.nodeId != manager.nodeId
+			or self.description != manager.description):
+			self.dirty = True
+
 		self.nodeId = manager.nodeId
 		self.managerId = manager.managerId
 		self.description = manager.description
 
 
 # this class represents an alert client of the alert system
-class Alert:
+class Alert(object):
+
+	__slots__ = ("nodeId", "alertId", "remoteAlertId", "alertLevels",
+		"description", "checked", "dirty", "alertUrwid")
 
 	def __init__(self):
 		self.nodeId = None
@@ -137,22 +204,40 @@ class Alert:
 		# (is used to verify if this object is still connected to the server)
 		self.checked = False
 
+		# used for urwid only:
+		# flag that marks this object as changed since its urwid object
+		# was updated the last time
+		self.dirty = True
+
 		# used for urwid only:
 		# reference to the alert urwid object
 		self.alertUrwid = None
 
 
-	# This function copies all attributes of the given alert to this object.
+	# This function copies all attributes of the given alert to this object
+	# (and marks this object as changed if an attribute has changed).
 	def deepCopy(self, alert):
+		if (self.nodeId != alert.nodeId
+			or self.remoteAlertId != alert.remoteAlertId
+			or self.alertLevels != alert.alertLevels
+			or self.description != alert.description):
+			self.dirty = True
+
 		self.nodeId = alert.nodeId
 		self.alertId = alert.alertId
 		self.remoteAlertId = alert.remoteAlertId
-		self.alertLevels = list(alert.alertLevels)
+		# the alert levels list is never modified in place (only replaced)
+		# => it can be shared instead of copied
+		self.alertLevels = alert.alertLevels
 		self.description = alert.description
 
 
 # this class represents a triggered sensor alert of the alert system
-class SensorAlert:
+class SensorAlert(object):
+
+	__slots__ = ("rulesActivated", "sensorId", "state", "description",
+		"timeReceived", "alertLevels", "hasOptionalData", "optionalData",
+		"changeState", "hasLatestData", "dataType", "sensorData")
 
 	def __init__(self):
 
@@ -193,7 +278,10 @@ class SensorAlert:
 
 
 # this class represents an alert level that is configured on the server
-class AlertLevel:
+class AlertLevel(object):
+
+	__slots__ = ("level", "name", "triggerAlways", "rulesActivated", "checked",
+		"dirty", "alertLevelUrwid")
 
 	def __init__(self):
 		self.level = None
@@ -205,6 +293,11 @@ class AlertLevel:
 		# (is used to verify if this object is still connected to the server)
 		self.checked = False
 
+		# used for urwid only:
+		# flag that marks this object as changed since its urwid object
+		# was updated the last time
+		self.dirty = True
+
 		# used for urwid only:
 		# reference to the alert urwid object
 		self.alertLevelUrwid = None
@@ -265,10 +358,10 @@ class ServerEventHandler:
 						# (the objects are double linked)
 						node.alertUrwid.node = None
 
-				# remove sensor from list of sensors
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.nodes.remove(node)
+		# remove all not checked nodes from the list of nodes
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.nodes[:] = [x for x in self.nodes if x.checked]
 
 		for sensor in self.sensors:
 			if sensor.checked is False:
@@ -282,10 +375,10 @@ class ServerEventHandler:
 						# (the objects are double linked)
 						sensor.sensorUrwid.sensor = None
 
-				# remove sensor from list of sensors
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.sensors.remove(sensor)
+		# remove all not checked sensors from the list of sensors
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.sensors[:] = [x for x in self.sensors if x.checked]
 
 		for manager in self.managers:
 			if manager.checked is False:
@@ -300,10 +393,10 @@ class ServerEventHandler:
 						# (the objects are double linked)
 						manager.managerUrwid.manager = None
 
-				# remove manager from list of managers
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.managers.remove(manager)
+		# remove all not checked managers from the list of managers
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.managers[:] = [x for x in self.managers if x.checked]
 
 		for alert in self.alerts:
 			if alert.checked is False:
@@ -317,10 +410,10 @@ class ServerEventHandler:
 						# (the objects are double linked)
 						alert.alertUrwid.alert = None
 
-				# remove alert from list of alerts
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.alerts.remove(alert)
+		# remove all not checked alerts from the list of alerts
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.alerts[:] = [x for x in self.alerts if x.checked]
 
 		for alertLevel in self.alertLevels:
 			if alertLevel.checked is False:
@@ -337,10 +430,10 @@ class ServerEventHandler:
 						# (the objects are double linked)
 						alertLevel.alertLevelUrwid.alertLevel = None
 
-				# remove alert level from list of alert levels
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.alertLevels.remove(alertLevel)
+		# remove all not checked alert levels from the list of alert levels
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.alertLevels[:] = [x for x in self.alertLevels if x.checked]
 
 
 	# internal function that marks all nodes as not checked
@@ -373,36 +466,42 @@ class ServerEventHandler:
 		# mark all nodes as not checked
 		self._markAlertSystemObjectsAsNotChecked()
 
+		# index all known objects by their unique key
+		# (to find the corresponding known object of a received object
+		# without searching the whole list)
+		optionsByType = dict((x.type, x) for x in self.options)
+		nodesByNodeId = dict((x.nodeId, x) for x in self.nodes)
+		sensorsBySensorId = dict((x.sensorId, x) for x in self.sensors)
+		managersByManagerId = dict((x.managerId, x) for x in self.managers)
+		alertsByAlertId = dict((x.alertId, x) for x in self.alerts)
+		alertLevelsByLevel = dict((x.level, x) for x in self.alertLevels)
+
 		# process received options
 		for recvOption in options:
 
-			# search option in list of known options
+			# search option in the known options
 			# => if not known add it
-			found = False
-			for option in self.options:
-				# ignore options that are already checked
-				if option.checked:
+			option = optionsByType.get(recvOption.type)
 
-					# check if the type is unique
-					if option.type == recvOption.type:
-						logging.error("[%s]: Received optionType "
-							% self.fileName
-							+ "'%s' is not unique." % recvOption.type)
+			# check if the type is unique
+			if (not option is None
+				and option.checked):
+				logging.error("[%s]: Received optionType "
+					% self.fileName
+					+ "'%s' is not unique." % recvOption.type)
 
-						return False
+				return False
 
-					continue
+			# when found => mark option as checked and update information
+			if not option is None:
+				option.checked = True
+				option.value = recvOption.value
 
-				# when found => mark option as checked and update information
-				if option.type == recvOption.type:
-					option.checked = True
-					option.value = recvOption.value
-					found = True
-					break
 			# when not found => add option to list
-			if not found:
+			else:
 				recvOption.checked = True
 				self.options.append(recvOption)
+				optionsByType[recvOption.type] = recvOption
 
 		# check if all options are checked
 		# => if not, one was removed on the server
@@ -415,174 +514,160 @@ class ServerEventHandler:
 		# process received nodes
 		for recvNode in nodes:
 
-			# search node in list of known nodes
+			# search node in the known nodes
 			# => if not known add it
-			found = False
-			for node in self.nodes:
-				# ignore nodes that are already checked
-				if node.checked:
+			node = nodesByNodeId.get(recvNode.nodeId)
 
-					# check if the nodeId is unique
-					if node.nodeId == recvNode.nodeId:
-						logging.error("[%s]: Received nodeId " % self.fileName
-							+ "'%d' is not unique." % recvNode.nodeId)
+			# check if the nodeId is unique
+			if (not node is None
+				and node.checked):
+				logging.error("[%s]: Received nodeId " % self.fileName
+					+ "'%d' is not unique." % recvNode.nodeId)
 
-						return False
+				return False
 
-					continue
+			# when found => mark node as checked and update information
+			if not node is None:
+				node.checked = True
+				node.deepCopy(recvNode)
 
-				# when found => mark node as checked and update information
-				if node.nodeId == recvNode.nodeId:
-					node.checked = True
-					node.deepCopy(recvNode)
-					found = True
-					break
 			# when not found => add node to list
-			if not found:
+			else:
 				recvNode.checked = True
 				self.nodes.append(recvNode)
+				nodesByNodeId[recvNode.nodeId] = recvNode
 
 		# process received sensors
 		for recvSensor in sensors:
 
-			# search sensor in list of known sensors
+			# search sensor in the known sensors
 			# => if not known add it
-			found = False
-			for sensor in self.sensors:
-				# ignore sensors that are already checked
-				if sensor.checked:
-
-					# check if the sensorId is unique
-					if sensor.sensorId == recvSensor.sensorId:
-						logging.error("[%s]: Received sensorId "
-							% self.fileName
-							+ "'%d' is not unique." % recvSensor.sensorId)
+			sensor = sensorsBySensorId.get(recvSensor.sensorId)
 
-						return False
+			# check if the sensorId is unique
+			if (not sensor is None
+				and sensor.checked):
+				logging.error("[%s]: Received sensorId "
+					% self.fileName
+					+ "'%d' is not unique." % recvSensor.sensorId)
 
-					continue
+				return False
 
-				# when found => mark sensor as checked and update information
-				if sensor.sensorId == recvSensor.sensorId:
-					sensor.checked = True
-					tempLastStateUpdated = sensor.lastStateUpdated
-					tempState = sensor.state
-					sensor.deepCopy(recvSensor)
+			# when found => mark sensor as checked and update information
+			if not sensor is None:
+				sensor.checked = True
+				tempLastStateUpdated = sensor.lastStateUpdated
+				tempState = sensor.state
+				sensor.deepCopy(recvSensor)
 
-					# Revert change to the state if the old state was newer.
-					if sensor.lastStateUpdated < tempLastStateUpdated:
-						sensor.lastStateUpdated = tempLastStateUpdated
-						sensor.state = tempState
+				# Revert change to the state if the old state was newer.
+				if sensor.lastStateUpdated < tempLastStateUpdated:
+					sensor.lastStateUpdated = tempLastStateUpdated
+					sensor.state = tempState
 
-					found = True
-					break
 			# when not found => add sensor to list
-			if not found:
+			else:
 				recvSensor.checked = True
 				self.sensors.append(recvSensor)
+				sensorsBySensorId[recvSensor.sensorId] = recvSensor
 
 		self.sensors.sort(key=lambda x: x.description.lower())
 
 		# process received managers
 		for recvManager in managers:
 
-			# search manager in list of known managers
+			# search manager in the known managers
 			# => if not known add it
-			found = False
-			for manager in self.managers:
-				# ignore managers that are already checked
-				if manager.checked:
+			manager = managersByManagerId.get(recvManager.managerId)
 
-					# check if the managerId is unique
-					if manager.managerId == recvManager.managerId:
-						logging.error("[%s]: Received managerId "
-							% self.fileName
-							+ "'%d' is not unique." % recvManager.managerId)
+			# check if the managerId is unique
+			if (not manager is None
+				and manager.checked):
+				logging.error("[%s]: Received managerId "
+					% self.fileName
+					+ "'%d' is not unique." % recvManager.managerId)
 
-						return False
+				return False
 
-					continue
+			# when found => mark manager as checked and update information
+			if not manager is None:
+				manager.checked = True
+				manager.deepCopy(recvManager)
 
-				# when found => mark manager as checked and update information
-				if manager.managerId == recvManager.managerId:
-					manager.checked = True
-					manager.deepCopy(recvManager)
-					found = True
-					break
 			# when not found => add manager to list
-			if not found:
+			else:
 				recvManager.checked = True
 				self.managers.append(recvManager)
+				managersByManagerId[recvManager.managerId] = recvManager
 
 		self.managers.sort(key=lambda x: x.description.lower())
 
 		# process received alerts
 		for recvAlert in alerts:
 
-			# search alert in list of known alerts
+			# search alert in the known alerts
 			# => if not known add it
-			found = False
-			for alert in self.alerts:
-				# ignore alerts that are already checked
-				if alert.checked:
+			alert = alertsByAlertId.get(recvAlert.alertId)
 
-					# check if the alertId is unique
-					if alert.alertId == recvAlert.alertId:
-						logging.error("[%s]: Received alertId " % self.fileName
-							+ "'%d' is not unique." % recvAlert.alertId)
+			# check if the alertId is unique
+			if (not alert is None
+				and alert.checked):
+				logging.error("[%s]: Received alertId " % self.fileName
+					+ "'%d' is not unique." % recvAlert.alertId)
 
-						return False
+				return False
 
-					continue
+			# when found => mark alert as checked and update information
+			if not alert is None:
+				alert.checked = True
+				alert.deepCopy(recvAlert)
 
-				# when found => mark alert as checked and update information
-				if alert.alertId == recvAlert.alertId:
-					alert.checked = True
-					alert.deepCopy(recvAlert)
-					found = True
-					break
 			# when not found => add alert to list
-			if not found:
+			else:
 				recvAlert.checked = True
 				self.alerts.append(recvAlert)
+				alertsByAlertId[recvAlert.alertId] = recvAlert
 
 		self.alerts.sort(key=lambda x: x.description.lower())
 
 		# process received alertLevels
 		for recvAlertLevel in alertLevels:
 
-			# search alertLevel in list of known alertLevels
+			# search alertLevel in the known alertLevels
 			# => if not known add it
-			found = False
-			for alertLevel in self.alertLevels:
-				# ignore alertLevels that are already checked
-				if alertLevel.checked:
+			alertLevel = alertLevelsByLevel.get(recvAlertLevel.level)
 
-					# check if the level is unique
-					if alertLevel.level == recvAlertLevel.level:
-						logging.error("[%s]: Received alertLevel "
-							% self.fileName
-							+ "'%d' is not unique." % recvAlertLevel.level)
+			# check if the level is unique
+			if (not alertLevel is None
+				and alertLevel.checked):
+				logging.error("[%s]: Received alertLevel "
+					% self.fileName
+					+ "'%d' is not unique." % recvAlertLevel.level)
 
-						return False
+				return False
 
-					continue
+			# when found => mark alertLevel as checked
+			# and update information
+			if not alertLevel is None:
+				alertLevel.checked = True
 
-				# when found => mark alertLevel as checked
-				# and update information
-				if alertLevel.level == recvAlertLevel.level:
-					alertLevel.checked = True
-					alertLevel.name = recvAlertLevel.name
-					alertLevel.triggerAlways = recvAlertLevel.triggerAlways
-					alertLevel.rulesActivated = recvAlertLevel.rulesActivated
+				# mark alert level as changed if an information has changed
+				if (alertLevel.name != recvAlertLevel.name
+					or alertLevel.triggerAlways
+					!= recvAlertLevel.triggerAlways
+					or alertLevel.rulesActivated
+					!= recvAlertLevel.rulesActivated):
+					alertLevel.dirty = True
 
-					found = True
-					break
+				alertLevel.name = recvAlertLevel.name
+				alertLevel.triggerAlways = recvAlertLevel.triggerAlways
+				alertLevel.rulesActivated = recvAlertLevel.rulesActivated
 
 			# when not found => add alertLevel to list
-			if not found:
+			else:
 				recvAlertLevel.checked = True
 				self.alertLevels.append(recvAlertLevel)
+				alertLevelsByLevel[recvAlertLevel.level] = recvAlertLevel
 
 		self.alertLevels.sort(key=lambda x: x.level)
 
@@ -607,6 +692,7 @@ class ServerEventHandler:
 			for sensor in self.sensors:
 				if sensor.sensorId == sensorAlert.sensorId:
 					sensor.lastStateUpdated = serverTime
+					sensor.dirty = True
 
 					# Only update sensor state information if the flag
 					# was set in the received message.
@@ -656,6 +742,7 @@ class ServerEventHandler:
 		# Change sensor state.
 		sensor.state = state
 		sensor.lastStateUpdated = serverTime
+		sensor.dirty = True
 
 		if dataType == sensor.dataType:
 			sensor.data = sensorData
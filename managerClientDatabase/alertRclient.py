@@ -10,7 +10,7 @@
 import sys
 import os
 from lib import ServerCommunication, ConnectionWatchdog, Receiver
-from lib import LocalServerSession, ThreadedUnixStreamServer
+from lib import LocalServerSession, ThreadedUnixStreamServer, StatusCache
 from lib import Mysql
 from lib import SMTPAlert
 from lib import UpdateChecker
@@ -202,6 +202,31 @@ if __name__ == '__main__':
 			raise ValueError("Option 'eventsLifeSpan' has to be "
 				+ "greater or equal to 0.")
 
+		# the sensor data history options are optional
+		# (the history is deactivated if they are missing)
+		if ("sensorHistoryLifeSpan"
+			in configRoot.find("manager").find("options").attrib.keys()):
+			globalData.sensorHistoryLifeSpan = int(
+				configRoot.find("manager").find("options").attrib[
+				"sensorHistoryLifeSpan"])
+
+		if globalData.sensorHistoryLifeSpan < 0:
+			raise ValueError("Option 'sensorHistoryLifeSpan' has to be "
+				+ "greater or equal to 0.")
+
+		if ("sensorHistoryRawLifeSpan"
+			in configRoot.find("manager").find("options").attrib.keys()):
+			globalData.sensorHistoryRawLifeSpan = int(
+				configRoot.find("manager").find("options").attrib[
+				"sensorHistoryRawLifeSpan"])
+
+		if (globalData.sensorHistoryLifeSpan > 0
+			and (globalData.sensorHistoryRawLifeSpan < 1
+			or globalData.sensorHistoryRawLifeSpan
+			> globalData.sensorHistoryLifeSpan)):
+			raise ValueError("Option 'sensorHistoryRawLifeSpan' has to "
+				+ "be between 1 and the value of 'sensorHistoryLifeSpan'.")
+
 		# configure storage backend (check which backend is configured)
 		userBackendMethod = str(
 			configRoot.find("manager").find("storage").attrib[
@@ -242,6 +267,11 @@ if __name__ == '__main__':
 	else:
 		globalData.smtpAlert = None
 
+	# generate the status cache that answers status requests of local
+	# clients (only needed when the local unix socket server is activated)
+	if not globalData.unixSocketFile is None:
+		globalData.statusCache = StatusCache()
+
 	# generate object for the communication to the server and connect to it
 	globalData.serverComm = ServerCommunication(server, serverPort,
 		serverCAFile, username, password, clientCertFile, clientKeyFile,
@@ -8,7 +8,8 @@
 # Licensed under the GNU Public License, version 2.
 
 from client import ServerCommunication, ConnectionWatchdog, Receiver
-from localServer import LocalServerSession, ThreadedUnixStreamServer
+from localServer import LocalServerSession, ThreadedUnixStreamServer, \
+	StatusCache
 from storage import Mysql
 from smtp import SMTPAlert
 from serverObjects import Option, Node, Sensor, Manager, Alert, AlertLevel, \
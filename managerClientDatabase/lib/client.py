@@ -12,12 +12,15 @@ from serverObjects import Option, Node, Sensor, Manager, Alert, SensorAlert, \
 import socket
 import time
 import ssl
+import select
+import Queue
 import threading
 import logging
 import os
 import base64
 import random
 import json
+import zlib
 from localObjects import SensorDataType
 BUFSIZE = 4096
 
@@ -35,6 +38,10 @@ class Client:
 		self.socket = None
 		self.sslSocket = None
 
+		# this lock is used to not read from and write to the ssl
+		# connection at the same time in different threads
+		self.ioLock = threading.Semaphore(1)
+
 
 	def connect(self):
 		self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -54,19 +61,71 @@ class Client:
 		self.sslSocket.connect((self.host, self.port))
 
 
+	# internal function that waits until data of the server can be read
+	# without holding the lock (a timeout of None waits until data
+	# arrives or the connection is closed)
+	def _waitForData(self, timeout):
+
+		# data that is already decrypted is not seen by select
+		if self.sslSocket.pending() > 0:
+			return
+
+		readable, _, _ = select.select([self.sslSocket], [], [], timeout)
+		if not readable:
+			raise socket.timeout("timed out")
+
+
 	def send(self, data):
-		count = self.sslSocket.send(data)
+		self.ioLock.acquire()
+		try:
+			count = self.sslSocket.send(data)
+		finally:
+			self.ioLock.release()
 
 
 	def recv(self, buffsize, timeout=20.0):
+		self._waitForData(timeout)
+
+		# the data is already available
+		# => the read timeout only applies to incomplete ssl records
+		if timeout is None:
+			timeout = 20.0
+
 		data = None
-		self.sslSocket.settimeout(timeout)
-		data = self.sslSocket.recv(buffsize)
-		self.sslSocket.settimeout(None)
+		self.ioLock.acquire()
+		try:
+			self.sslSocket.settimeout(timeout)
+			data = self.sslSocket.recv(buffsize)
+			self.sslSocket.settimeout(None)
+		finally:
+			self.ioLock.release()
 		return data
 
 
+	# receives data directly into the given buffer
+	# (returns the number of received bytes)
+	def recvInto(self, buff, nbytes, timeout=20.0):
+		self._waitForData(timeout)
+
+		count = 0
+		self.ioLock.acquire()
+		try:
+			self.sslSocket.settimeout(timeout)
+			count = self.sslSocket.recv_into(buff, nbytes)
+			self.sslSocket.settimeout(None)
+		finally:
+			self.ioLock.release()
+		return count
+
+
 	def close(self):
+		# shut down the connection first to wake up the thread
+		# that waits for data of the server
+		try:
+			self.socket.shutdown(socket.SHUT_RDWR)
+		except Exception as e:
+			pass
+
 		# closing SSLSocket will also close the underlying socket
 		self.sslSocket.close()
 
@@ -105,6 +164,15 @@ class ServerCommunication:
 		# this lock is used to only allow one thread to use the communication
 		self.connectionLock = threading.BoundedSemaphore(1)
 
+		# data received by the thread handling the incoming communication
+		# that belongs to the transaction of the thread holding the lock
+		# (None signals that the connection was closed)
+		self.responseQueue = Queue.Queue()
+
+		# this lock is used to hand over received data and release the
+		# connection lock atomically
+		self.responseLock = threading.Semaphore(1)
+
 		# file nme of this file (used for logging)
 		self.fileName = os.path.basename(__file__)
 
@@ -115,6 +183,21 @@ class ServerCommunication:
 		# transaction with the server
 		self.transactionInitiation = False
 
+		# flag that states if the compression of large messages was
+		# negotiated with the server, the minimal size of a message in bytes
+		# that is sent compressed and the maximal size of a
+		# decompressed message
+		self.compression = False
+		self.compressionThreshold = 1024
+		self.maxDecompressedSize = 16777216
+
+		# statistics of the compressed messages of the current connection
+		# (sizes before and after the compression and the time spent
+		# to compress and decompress them)
+		self.compressionRawSize = 0
+		self.compressionSize = 0
+		self.compressionTime = 0.0
+
 
 	# internal function that acquires the lock
 	def _acquireLock(self):
@@ -125,7 +208,64 @@ class ServerCommunication:
 	# internal function that releases the lock
 	def _releaseLock(self):
 		logging.debug("[%s]: Release lock." % self.fileName)
+
+		# discard data that was handed over but not used by the
+		# transaction (together with the release so that no data
+		# of the next transaction is discarded)
+		self.responseLock.acquire()
+		while not self.responseQueue.empty():
+			self.responseQueue.get_nowait()
 		self.connectionLock.release()
+		self.responseLock.release()
+
+
+	# internal function that acquires the lock for the data received by
+	# the thread handling the incoming communication if no other thread
+	# is in a transaction with the server (otherwise the data is handed
+	# over to the thread holding the lock)
+	#
+	# returns True if the lock was acquired
+	def _acquireLockForReceivedData(self, data):
+		self.responseLock.acquire()
+		if not self.connectionLock.acquire(False):
+			self.responseQueue.put(data)
+			self.responseLock.release()
+			return False
+		logging.debug("[%s]: Acquire lock." % self.fileName)
+		self.responseLock.release()
+		return True
+
+
+	# internal function that gets the data the server sent during the
+	# transaction of this thread (it is received and handed over by the
+	# thread handling the incoming communication)
+	def _recvResponse(self, timeout=20.0):
+		data = self.responseQueue.get(True, timeout)
+		if data is None:
+			raise ValueError("Connection to server closed.")
+		return data
+
+
+	# internal function that closes the connection the thread handling
+	# the incoming communication was not able to receive data from
+	def _closeReceivingConnection(self, client):
+
+		# wake up the thread that is in a transaction with the server
+		# => it cleans up the session itself
+		self.responseLock.acquire()
+		if not self.connectionLock.acquire(False):
+			self.responseQueue.put(None)
+			self.responseLock.release()
+			return
+		logging.debug("[%s]: Acquire lock." % self.fileName)
+		self.responseLock.release()
+
+		# clean up session before exiting
+		# (only if the connection was not closed or re-established
+		# in the meantime)
+		if self.client is client and self.isConnected:
+			self._cleanUpSessionForClosing()
+		self._releaseLock()
 
 
 	# Internal function to check sanity of the alertDelay.
@@ -860,8 +1000,11 @@ class ServerCommunication:
 		return True
 
 
-	# Internal function to check sanity of the status alertLevels list.
-	def _checkMsgStatusAlertLevelsList(self, alertLevels, messageType):
+	# Internal function to check sanity of the status alertLevels list
+	# and to build the objects from it in the same pass
+	# (the objects are appended to the given list).
+	def _checkMsgStatusAlertLevelsList(self, alertLevels, messageType,
+		alertLevelObjects):
 
 		isCorrect = True
 		if not isinstance(alertLevels, list):
@@ -874,7 +1017,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "alertLevel" in alertLevel.keys():
+			if not "alertLevel" in alertLevel:
 				isCorrect = False
 				break
 			elif not self._checkMsgAlertLevel(
@@ -884,7 +1027,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "name" in alertLevel.keys():
+			if not "name" in alertLevel:
 				isCorrect = False
 				break
 			elif not self._checkMsgName(
@@ -894,7 +1037,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "triggerAlways" in alertLevel.keys():
+			if not "triggerAlways" in alertLevel:
 				isCorrect = False
 				break
 			elif not self._checkMsgTriggerAlways(
@@ -904,7 +1047,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "rulesActivated" in alertLevel.keys():
+			if not "rulesActivated" in alertLevel:
 				isCorrect = False
 				break
 			elif not self._checkMsgRulesActivated(
@@ -914,6 +1057,18 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
+			logging.debug("[%s]: Received alertLevel " % self.fileName
+				+ "information: %d:'%s':%d:"
+				% (alertLevel["alertLevel"], alertLevel["name"],
+				alertLevel["triggerAlways"]))
+
+			alertLevelObj = AlertLevel()
+			alertLevelObj.level = alertLevel["alertLevel"]
+			alertLevelObj.name = alertLevel["name"]
+			alertLevelObj.triggerAlways = alertLevel["triggerAlways"]
+			alertLevelObj.rulesActivated = alertLevel["rulesActivated"]
+			alertLevelObjects.append(alertLevelObj)
+
 		if not isCorrect:
 			# send error message back
 			try:
@@ -930,8 +1085,11 @@ class ServerCommunication:
 		return True
 
 
-	# Internal function to check sanity of the status alerts list.
-	def _checkMsgStatusAlertsList(self, alerts, messageType):
+	# Internal function to check sanity of the status alerts list
+	# and to build the objects from it in the same pass
+	# (the objects are appended to the given list).
+	def _checkMsgStatusAlertsList(self, alerts, messageType,
+		alertObjects):
 
 		isCorrect = True
 		if not isinstance(alerts, list):
@@ -944,7 +1102,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "nodeId" in alert.keys():
+			if not "nodeId" in alert:
 				isCorrect = False
 				break
 			elif not self._checkMsgNodeId(
@@ -954,7 +1112,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "alertId" in alert.keys():
+			if not "alertId" in alert:
 				isCorrect = False
 				break
 			elif not self._checkMsgAlertId(
@@ -964,7 +1122,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "description" in alert.keys():
+			if not "description" in alert:
 				isCorrect = False
 				break
 			elif not self._checkMsgDescription(
@@ -974,7 +1132,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "alertLevels" in alert.keys():
+			if not "alertLevels" in alert:
 				isCorrect = False
 				break
 			elif not self._checkMsgAlertLevels(
@@ -984,7 +1142,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "remoteAlertId" in alert.keys():
+			if not "remoteAlertId" in alert:
 				isCorrect = False
 				break
 			elif not self._checkMsgRemoteAlertId(
@@ -994,6 +1152,18 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
+			logging.debug("[%s]: Received alert " % self.fileName
+				+ "information: %d:%d:'%s'"
+				% (alert["nodeId"], alert["alertId"], alert["description"]))
+
+			alertObj = Alert()
+			alertObj.nodeId = alert["nodeId"]
+			alertObj.alertId = alert["alertId"]
+			alertObj.remoteAlertId = alert["remoteAlertId"]
+			alertObj.alertLevels = alert["alertLevels"]
+			alertObj.description = alert["description"]
+			alertObjects.append(alertObj)
+
 		if not isCorrect:
 			# send error message back
 			try:
@@ -1010,8 +1180,11 @@ class ServerCommunication:
 		return True
 
 
-	# Internal function to check sanity of the status managers list.
-	def _checkMsgStatusManagersList(self, managers, messageType):
+	# Internal function to check sanity of the status managers list
+	# and to build the objects from it in the same pass
+	# (the objects are appended to the given list).
+	def _checkMsgStatusManagersList(self, managers, messageType,
+		managerObjects):
 
 		isCorrect = True
 		if not isinstance(managers, list):
@@ -1024,7 +1197,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "nodeId" in manager.keys():
+			if not "nodeId" in manager:
 				isCorrect = False
 				break
 			elif not self._checkMsgNodeId(
@@ -1034,7 +1207,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "managerId" in manager.keys():
+			if not "managerId" in manager:
 				isCorrect = False
 				break
 			elif not self._checkMsgManagerId(
@@ -1044,7 +1217,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "description" in manager.keys():
+			if not "description" in manager:
 				isCorrect = False
 				break
 			elif not self._checkMsgDescription(
@@ -1054,6 +1227,17 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
+			logging.debug("[%s]: Received manager " % self.fileName
+				+ "information: %d:%d:'%s'."
+				% (manager["nodeId"], manager["managerId"],
+				manager["description"]))
+
+			managerObj = Manager()
+			managerObj.nodeId = manager["nodeId"]
+			managerObj.managerId = manager["managerId"]
+			managerObj.description = manager["description"]
+			managerObjects.append(managerObj)
+
 		if not isCorrect:
 			# send error message back
 			try:
@@ -1070,8 +1254,11 @@ class ServerCommunication:
 		return True
 
 
-	# Internal function to check sanity of the status nodes list.
-	def _checkMsgStatusNodesList(self, nodes, messageType):
+	# Internal function to check sanity of the status nodes list
+	# and to build the objects from it in the same pass
+	# (the objects are appended to the given list).
+	def _checkMsgStatusNodesList(self, nodes, messageType,
+		nodeObjects):
 
 		isCorrect = True
 		if not isinstance(nodes, list):
@@ -1084,7 +1271,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "nodeId" in node.keys():
+			if not "nodeId" in node:
 				isCorrect = False
 				break
 			elif not self._checkMsgNodeId(
@@ -1094,7 +1281,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "hostname" in node.keys():
+			if not "hostname" in node:
 				isCorrect = False
 				break
 			elif not self._checkMsgHostname(
@@ -1104,7 +1291,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "nodeType" in node.keys():
+			if not "nodeType" in node:
 				isCorrect = False
 				break
 			elif not self._checkMsgNodeType(
@@ -1114,7 +1301,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "instance" in node.keys():
+			if not "instance" in node:
 				isCorrect = False
 				break
 			elif not self._checkMsgInstance(
@@ -1124,7 +1311,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "connected" in node.keys():
+			if not "connected" in node:
 				isCorrect = False
 				break
 			elif not self._checkMsgConnected(
@@ -1134,7 +1321,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "version" in node.keys():
+			if not "version" in node:
 				isCorrect = False
 				break
 			elif not self._checkMsgVersion(
@@ -1144,7 +1331,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "rev" in node.keys():
+			if not "rev" in node:
 				isCorrect = False
 				break
 			elif not self._checkMsgRev(
@@ -1154,7 +1341,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "username" in node.keys():
+			if not "username" in node:
 				isCorrect = False
 				break
 			elif not self._checkMsgUsername(
@@ -1164,7 +1351,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "persistent" in node.keys():
+			if not "persistent" in node:
 				isCorrect = False
 				break
 			elif not self._checkMsgPersistent(
@@ -1174,6 +1361,23 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
+			logging.debug("[%s]: Received node " % self.fileName
+				+ "information: %d:'%s':'%s':%d:%d."
+				% (node["nodeId"], node["hostname"], node["nodeType"],
+				node["connected"], node["persistent"]))
+
+			nodeObj = Node()
+			nodeObj.nodeId = node["nodeId"]
+			nodeObj.hostname = node["hostname"]
+			nodeObj.nodeType = node["nodeType"]
+			nodeObj.instance = node["instance"]
+			nodeObj.connected = node["connected"]
+			nodeObj.version = node["version"]
+			nodeObj.rev = node["rev"]
+			nodeObj.username = node["username"]
+			nodeObj.persistent = node["persistent"]
+			nodeObjects.append(nodeObj)
+
 		if not isCorrect:
 			# send error message back
 			try:
@@ -1190,8 +1394,11 @@ class ServerCommunication:
 		return True
 
 
-	# Internal function to check sanity of the status options list.
-	def _checkMsgStatusOptionsList(self, options, messageType):
+	# Internal function to check sanity of the status options list
+	# and to build the objects from it in the same pass
+	# (the objects are appended to the given list).
+	def _checkMsgStatusOptionsList(self, options, messageType,
+		optionObjects):
 
 		isCorrect = True
 		if not isinstance(options, list):
@@ -1204,7 +1411,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "type" in option.keys():
+			if not "type" in option:
 				isCorrect = False
 				break
 			elif not self._checkMsgOptionType(
@@ -1214,7 +1421,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "value" in option.keys():
+			if not "value" in option:
 				isCorrect = False
 				break
 			elif not self._checkMsgOptionValue(
@@ -1224,6 +1431,15 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
+			logging.debug("[%s]: Received option " % self.fileName
+				+ "information: '%s':%d."
+				% (option["type"], option["value"]))
+
+			optionObj = Option()
+			optionObj.type = option["type"]
+			optionObj.value = option["value"]
+			optionObjects.append(optionObj)
+
 		if not isCorrect:
 			# send error message back
 			try:
@@ -1240,8 +1456,11 @@ class ServerCommunication:
 		return True
 
 
-	# Internal function to check sanity of the status sensors list.
-	def _checkMsgStatusSensorsList(self, sensors, messageType):
+	# Internal function to check sanity of the status sensors list
+	# and to build the objects from it in the same pass
+	# (the objects are appended to the given list).
+	def _checkMsgStatusSensorsList(self, sensors, messageType,
+		sensorObjects):
 
 		isCorrect = True
 		if not isinstance(sensors, list):
@@ -1254,7 +1473,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "nodeId" in sensor.keys():
+			if not "nodeId" in sensor:
 				isCorrect = False
 				break
 			elif not self._checkMsgNodeId(
@@ -1264,7 +1483,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "sensorId" in sensor.keys():
+			if not "sensorId" in sensor:
 				isCorrect = False
 				break
 			elif not self._checkMsgSensorId(
@@ -1274,7 +1493,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "alertDelay" in sensor.keys():
+			if not "alertDelay" in sensor:
 				isCorrect = False
 				break
 			elif not self._checkMsgAlertDelay(
@@ -1284,7 +1503,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "alertLevels" in sensor.keys():
+			if not "alertLevels" in sensor:
 				isCorrect = False
 				break
 			elif not self._checkMsgAlertLevels(
@@ -1294,7 +1513,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "description" in sensor.keys():
+			if not "description" in sensor:
 				isCorrect = False
 				break
 			elif not self._checkMsgDescription(
@@ -1304,7 +1523,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "lastStateUpdated" in sensor.keys():
+			if not "lastStateUpdated" in sensor:
 				isCorrect = False
 				break
 			elif not self._checkMsgLastStateUpdated(
@@ -1314,7 +1533,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "state" in sensor.keys():
+			if not "state" in sensor:
 				isCorrect = False
 				break
 			elif not self._checkMsgState(
@@ -1323,7 +1542,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "remoteSensorId" in sensor.keys():
+			if not "remoteSensorId" in sensor:
 				isCorrect = False
 				break
 			elif not self._checkMsgRemoteSensorId(
@@ -1333,7 +1552,7 @@ class ServerCommunication:
 				isCorrect = False
 				break
 
-			if not "dataType" in sensor.keys():
+			if not "dataType" in sensor:
 				isCorrect = False
 				break
 			elif not self._checkMsgSensorDataType(
@@ -1344,7 +1563,7 @@ class ServerCommunication:
 				break
 
 			if sensor["dataType"] != SensorDataType.NONE:
-				if not "data" in sensor.keys():
+				if not "data" in sensor:
 					isCorrect = False
 					break
 				elif not self._checkMsgSensorData(
@@ -1355,6 +1574,28 @@ class ServerCommunication:
 					isCorrect = False
 					break
 
+			logging.debug("[%s]: Received sensor " % self.fileName
+				+ "information: %d:%d:%d:'%s':%d:%d."
+				% (sensor["nodeId"], sensor["sensorId"],
+				sensor["alertDelay"], sensor["description"],
+				sensor["lastStateUpdated"], sensor["state"]))
+
+			sensorObj = Sensor()
+			sensorObj.nodeId = sensor["nodeId"]
+			sensorObj.sensorId = sensor["sensorId"]
+			sensorObj.remoteSensorId = sensor["remoteSensorId"]
+			sensorObj.alertDelay = sensor["alertDelay"]
+			sensorObj.alertLevels = sensor["alertLevels"]
+			sensorObj.description = sensor["description"]
+			sensorObj.lastStateUpdated = sensor["lastStateUpdated"]
+			sensorObj.state = sensor["state"]
+			sensorObj.dataType = sensor["dataType"]
+			if sensor["dataType"] != SensorDataType.NONE:
+				sensorObj.data = sensor["data"]
+			else:
+				sensorObj.data = None
+			sensorObjects.append(sensorObj)
+
 		if not isCorrect:
 			# send error message back
 			try:
@@ -1449,16 +1690,116 @@ class ServerCommunication:
 		# set client as disconnected
 		self.isConnected = False
 
+		# log the statistics of the compressed messages
+		if self.compressionRawSize > 0:
+			logging.info("[%s]: Compressed messages: %d bytes "
+				% (self.fileName, self.compressionRawSize)
+				+ "as %d bytes (%.1f%%) in %.3f seconds."
+				% (self.compressionSize,
+				100.0 * self.compressionSize / self.compressionRawSize,
+				self.compressionTime))
+			self.compressionRawSize = 0
+			self.compressionSize = 0
+			self.compressionTime = 0.0
+
 		# handle closing event
 		self.serverEventHandler.handleEvent()
 
 		self.client.close()
 
 
+	# Internal function that receives a message of the given size
+	# (announced by the RTS of the server) into a preallocated buffer
+	# (returns None if the connection is dead locked or closed).
+	def _recvMessageData(self, messageSize):
+
+		data = bytearray(messageSize)
+		view = memoryview(data)
+		receivedSize = 0
+		while receivedSize < messageSize:
+			count = self.client.recvInto(view[receivedSize:],
+				messageSize - receivedSize)
+
+			# Check if the size of the received data has changed.
+			# If not we detected a possible dead lock.
+			if count == 0:
+				logging.error("[%s]: Possible dead lock "
+					% self.fileName
+					+ "detected while receiving data. Closing "
+					+ "connection to server.")
+				return None
+			receivedSize += count
+
+		return str(data)
+
+
+	# internal function that compresses the given message with zlib
+	# and records the compression ratio and the time spent
+	def _compressData(self, messageType, message):
+
+		startTime = time.time()
+		data = zlib.compress(message)
+		duration = time.time() - startTime
+
+		self.compressionRawSize += len(message)
+		self.compressionSize += len(data)
+		self.compressionTime += duration
+
+		logging.debug("[%s]: Compressed %s message from %d to %d "
+			% (self.fileName, messageType, len(message), len(data))
+			+ "bytes in %.2f ms." % (duration * 1000))
+
+		return data
+
+
+	# internal function that compresses the given message if the
+	# compression was negotiated with the server and the message is large
+	# enough (returns a tuple of the data to send and its encoding
+	# which is None if the message is not compressed)
+	def _compressMessage(self, messageType, message):
+
+		if (not self.compression
+			or len(message) < self.compressionThreshold):
+			return message, None
+
+		return self._compressData(messageType, message), "zlib"
+
+
+	# internal function that decompresses the given received data
+	# with the given encoding (None if the data is not compressed)
+	def _decompressMessage(self, messageType, data, encoding):
+
+		if encoding is None:
+			return data
+
+		if not self.compression or encoding != "zlib":
+			raise ValueError("Encoding '%s' was not negotiated."
+				% encoding)
+
+		startTime = time.time()
+		decompressor = zlib.decompressobj()
+		message = decompressor.decompress(data, self.maxDecompressedSize)
+		if decompressor.unconsumed_tail:
+			raise ValueError("Decompressed message is larger than %d bytes."
+				% self.maxDecompressedSize)
+		duration = time.time() - startTime
+
+		self.compressionRawSize += len(message)
+		self.compressionSize += len(data)
+		self.compressionTime += duration
+
+		logging.debug("[%s]: Decompressed %s message from %d to %d "
+			% (self.fileName, messageType, len(data), len(message))
+			+ "bytes in %.2f ms." % (duration * 1000))
+
+		return message
+
+
 	# this internal function that tries to initiate a transaction with
 	# the server (and acquires a lock if it is told to do so)
+	# (the encoding of the message is announced if it is compressed)
 	def _initiateTransaction(self, messageType, messageSize,
-		acquireLock=False):
+		acquireLock=False, encoding=None):
 
 		# try to get the exclusive state to be allowed to initiate a
 		# transaction with the server
@@ -1517,6 +1858,8 @@ class ServerCommunication:
 					"size": messageSize,
 					"message": messageType,
 					"payload": payload}
+				if encoding is not None:
+					message["encoding"] = encoding
 				self.client.send(json.dumps(message))
 			except Exception as e:
 				logging.exception("[%s]: Sending RTS " % self.fileName
@@ -1536,7 +1879,7 @@ class ServerCommunication:
 			logging.debug("[%s]: Receiving CTS." % self.fileName)
 
 			try:
-				data = self.client.recv(BUFSIZE)
+				data = self._recvResponse()
 				message = json.loads(data)
 
 				# check if an error was received
@@ -1602,19 +1945,25 @@ class ServerCommunication:
 		return True
 
 
-	# Internal function that builds the client authentication message.
-	def _buildAuthenticationMessage(self, regMessageSize):
+	# Internal function that builds the client authentication message
+	# (offers the compression of large messages and the size of the
+	# compressed registration message if it is large enough).
+	def _buildAuthenticationMessage(self, regMessageSize,
+		compressedRegMessageSize=None):
 
 		payload = {"type": "request",
 			"version": self.version,
 			"rev": self.rev,
 			"username": self.username,
-			"password": self.password}
+			"password": self.password,
+			"compression": "zlib"}
 		utcTimestamp = int(time.time())
 		message = {"clientTime": utcTimestamp,
 			"size": regMessageSize,
 			"message": "initialization",
 			"payload": payload}
+		if compressedRegMessageSize is not None:
+			message["compressedSize"] = compressedRegMessageSize
 		return json.dumps(message)
 
 	# Internal function that builds the option message.
@@ -1663,9 +2012,13 @@ class ServerCommunication:
 
 
 	# internal function to verify the server/client version and authenticate
-	def _verifyVersionAndAuthenticate(self, regMessageSize):
+	def _verifyVersionAndAuthenticate(self, regMessageSize,
+		compressedRegMessageSize=None):
+
+		self.compression = False
 
-		authMessage = self._buildAuthenticationMessage(regMessageSize)
+		authMessage = self._buildAuthenticationMessage(regMessageSize,
+			compressedRegMessageSize)
 
 		# send user credentials and version
 		try:
@@ -1778,6 +2131,10 @@ class ServerCommunication:
 
 			return False
 
+		# check if the server accepted the compression of large messages
+		self.compression = (
+			message["payload"].get("compression", None) == "zlib")
+
 		return True
 
 
@@ -1875,54 +2232,54 @@ class ServerCommunication:
 				return False
 			if not self._checkMsgStatusOptionsList(
 				incomingMessage["payload"]["options"],
-				incomingMessage["message"]):
+				incomingMessage["message"],
+				options):
 
 				logging.error("[%s]: Received options invalid."
 					% self.fileName)
 				return False
 			if not self._checkMsgStatusNodesList(
 				incomingMessage["payload"]["nodes"],
-				incomingMessage["message"]):
+				incomingMessage["message"],
+				nodes):
 
 				logging.error("[%s]: Received nodes invalid."
 					% self.fileName)
 				return False
 			if not self._checkMsgStatusSensorsList(
 				incomingMessage["payload"]["sensors"],
-				incomingMessage["message"]):
+				incomingMessage["message"],
+				sensors):
 
 				logging.error("[%s]: Received sensors invalid."
 					% self.fileName)
 				return False
 			if not self._checkMsgStatusManagersList(
 				incomingMessage["payload"]["managers"],
-				incomingMessage["message"]):
+				incomingMessage["message"],
+				managers):
 
 				logging.error("[%s]: Received managers invalid."
 					% self.fileName)
 				return False
 			if not self._checkMsgStatusAlertsList(
 				incomingMessage["payload"]["alerts"],
-				incomingMessage["message"]):
+				incomingMessage["message"],
+				alerts):
 
 				logging.error("[%s]: Received alerts invalid."
 					% self.fileName)
 				return False
 			if not self._checkMsgStatusAlertLevelsList(
 				incomingMessage["payload"]["alertLevels"],
-				incomingMessage["message"]):
+				incomingMessage["message"],
+				alertLevels):
 
 				logging.error("[%s]: Received alertLevels invalid."
 					% self.fileName)
 				return False
 
 			serverTime = incomingMessage["serverTime"]
-			optionsRaw = incomingMessage["payload"]["options"]
-			nodesRaw = incomingMessage["payload"]["nodes"]
-			sensorsRaw = incomingMessage["payload"]["sensors"]
-			managersRaw = incomingMessage["payload"]["managers"]
-			alertsRaw = incomingMessage["payload"]["alerts"]
-			alertLevelsRaw = incomingMessage["payload"]["alertLevels"]
 
 		except Exception as e:
 			logging.exception("[%s]: Received status " % self.fileName
@@ -1940,261 +2297,13 @@ class ServerCommunication:
 
 			return False
 
-		logging.debug("[%s]: Received option count: %d."
-				% (self.fileName, len(optionsRaw)))
-
-		# process received options
-		for i in range(len(optionsRaw)):
-
-			try:
-				optionType = optionsRaw[i]["type"]
-				optionValue = optionsRaw[i]["value"]
-			except Exception as e:
-				logging.exception("[%s]: Received option " % self.fileName
-				+ "invalid.")
-
-				# send error message back
-				try:
-					utcTimestamp = int(time.time())
-					message = {"clientTime": utcTimestamp,
-						"message": incomingMessage["message"],
-						"error": "received option invalid"}
-					self.client.send(json.dumps(message))
-				except Exception as e:
-					pass
-
-				return False
-
-			logging.debug("[%s]: Received option " % self.fileName
-				+ "information: '%s':%d."
-				% (optionType, optionValue))
-
-			option = Option()
-			option.type = optionType
-			option.value = optionValue
-			options.append(option)
-
-		logging.debug("[%s]: Received node count: %d."
-				% (self.fileName, len(nodesRaw)))
-
-		# process received nodes
-		for i in range(len(nodesRaw)):
-
-			try:
-				nodeId = nodesRaw[i]["nodeId"]
-				hostname = nodesRaw[i]["hostname"]
-				nodeType = nodesRaw[i]["nodeType"]
-				instance = nodesRaw[i]["instance"]
-				connected = nodesRaw[i]["connected"]
-				version = nodesRaw[i]["version"]
-				rev = nodesRaw[i]["rev"]
-				username = nodesRaw[i]["username"]
-				persistent = nodesRaw[i]["persistent"]
-
-			except Exception as e:
-				logging.exception("[%s]: Received node " % self.fileName
-				+ "invalid.")
-
-				# send error message back
-				try:
-					utcTimestamp = int(time.time())
-					message = {"clientTime": utcTimestamp,
-						"message": incomingMessage["message"],
-						"error": "received node invalid"}
-					self.client.send(json.dumps(message))
-				except Exception as e:
-					pass
-
-				return False
-
-			logging.debug("[%s]: Received node " % self.fileName
-				+ "information: %d:'%s':'%s':%d:%d."
-				% (nodeId, hostname, nodeType, connected, persistent))
-
-			node = Node()
-			node.nodeId = nodeId
-			node.hostname = hostname
-			node.nodeType = nodeType
-			node.instance = instance
-			node.connected = connected
-			node.version = version
-			node.rev = rev
-			node.username = username
-			node.persistent = persistent
-			nodes.append(node)
-
-		logging.debug("[%s]: Received sensor count: %d."
-				% (self.fileName, len(sensorsRaw)))
-
-		# process received sensors
-		for i in range(len(sensorsRaw)):
-
-			try:
-				nodeId = sensorsRaw[i]["nodeId"]
-				sensorId = sensorsRaw[i]["sensorId"]
-				remoteSensorId = sensorsRaw[i]["remoteSensorId"]
-				alertDelay = sensorsRaw[i]["alertDelay"]
-				dataType = sensorsRaw[i]["dataType"]
-
-				sensorData = None
-				if dataType != SensorDataType.NONE:
-					sensorData = sensorsRaw[i]["data"]
-
-				sensorAlertLevels = sensorsRaw[i]["alertLevels"]
-				description = sensorsRaw[i]["description"]
-				lastStateUpdated = sensorsRaw[i]["lastStateUpdated"]
-				state = sensorsRaw[i]["state"]
-			except Exception as e:
-				logging.exception("[%s]: Received sensor " % self.fileName
-				+ "invalid.")
-
-				# send error message back
-				try:
-					utcTimestamp = int(time.time())
-					message = {"clientTime": utcTimestamp,
-						"message": incomingMessage["message"],
-						"error": "received sensor invalid"}
-					self.client.send(json.dumps(message))
-				except Exception as e:
-					pass
-
-				return False
-
-			logging.debug("[%s]: Received sensor " % self.fileName
-				+ "information: %d:%d:%d:'%s':%d:%d."
-				% (nodeId, sensorId, alertDelay, description,
-				lastStateUpdated, state))
-
-			sensor = Sensor()
-			sensor.nodeId = nodeId
-			sensor.sensorId = sensorId
-			sensor.remoteSensorId = remoteSensorId
-			sensor.alertDelay = alertDelay
-			sensor.alertLevels = sensorAlertLevels
-			sensor.description = description
-			sensor.lastStateUpdated = lastStateUpdated
-			sensor.state = state
-			sensor.dataType = dataType
-			sensor.data = sensorData
-
-			sensors.append(sensor)
-
-		logging.debug("[%s]: Received manager count: %d."
-				% (self.fileName, len(managersRaw)))
-
-		# process received managers
-		for i in range(len(managersRaw)):
-
-			try:
-				nodeId = managersRaw[i]["nodeId"]
-				managerId = managersRaw[i]["managerId"]
-				description = managersRaw[i]["description"]
-			except Exception as e:
-				logging.exception("[%s]: Received manager " % self.fileName
-				+ "invalid.")
-
-				# send error message back
-				try:
-					utcTimestamp = int(time.time())
-					message = {"clientTime": utcTimestamp,
-						"message": incomingMessage["message"],
-						"error": "received manager invalid"}
-					self.client.send(json.dumps(message))
-				except Exception as e:
-					pass
-
-				return False
-
-			logging.debug("[%s]: Received manager " % self.fileName
-				+ "information: %d:%d:'%s'."
-				% (nodeId, managerId, description))
-
-			manager = Manager()
-			manager.nodeId = nodeId
-			manager.managerId = managerId
-			manager.description = description
-			managers.append(manager)
-
-		logging.debug("[%s]: Received alert count: %d."
-				% (self.fileName, len(alertsRaw)))
-
-		# process received alerts
-		for i in range(len(alertsRaw)):
-
-			try:
-				nodeId = alertsRaw[i]["nodeId"]
-				alertId = alertsRaw[i]["alertId"]
-				remoteAlertId = alertsRaw[i]["remoteAlertId"]
-				description = alertsRaw[i]["description"]
-				alertAlertLevels = alertsRaw[i]["alertLevels"]
-
-			except Exception as e:
-				logging.exception("[%s]: Received alert " % self.fileName
-				+ "invalid.")
-
-				# send error message back
-				try:
-					utcTimestamp = int(time.time())
-					message = {"clientTime": utcTimestamp,
-						"message": incomingMessage["message"],
-						"error": "received alert invalid"}
-					self.client.send(json.dumps(message))
-				except Exception as e:
-					pass
-
-				return False
-
-			logging.debug("[%s]: Received alert " % self.fileName
-				+ "information: %d:%d:'%s'"
-				% (nodeId, alertId, description))
-
-			alert = Alert()
-			alert.nodeId = nodeId
-			alert.alertId = alertId
-			alert.remoteAlertId = remoteAlertId
-			alert.alertLevels = alertAlertLevels
-			alert.description = description
-			alerts.append(alert)
-
-		logging.debug("[%s]: Received alertLevel count: %d."
-				% (self.fileName, len(alertLevelsRaw)))
-
-		# process received alertLevels
-		for i in range(len(alertLevelsRaw)):
-
-			try:
-				level = alertLevelsRaw[i]["alertLevel"]
-				name = alertLevelsRaw[i]["name"]
-				triggerAlways = alertLevelsRaw[i]["triggerAlways"]
-				rulesActivated = alertLevelsRaw[i]["rulesActivated"]
-
-			except Exception as e:
-				logging.exception("[%s]: Received alertLevel " % self.fileName
-				+ "invalid.")
-
-				# send error message back
-				try:
-					utcTimestamp = int(time.time())
-					message = {"clientTime": utcTimestamp,
-						"message": incomingMessage["message"],
-						"error": "received alertLevel invalid"}
-					self.client.send(json.dumps(message))
-				except Exception as e:
-					pass
-
-				return False
-
-			logging.debug("[%s]: Received alertLevel " % self.fileName
-				+ "information: %d:'%s':%d:"
-				% (level, name, triggerAlways))
-
-			alertLevel = AlertLevel()
-			alertLevel.level = level
-			alertLevel.name = name
-			alertLevel.triggerAlways = triggerAlways
-			alertLevel.rulesActivated = rulesActivated
-			alertLevels.append(alertLevel)
-
+		logging.debug("[%s]: Received option count: %d, "
+			% (self.fileName, len(options))
+			+ "node count: %d, sensor count: %d, "
+			% (len(nodes), len(sensors))
+			+ "manager count: %d, alert count: %d, "
+			% (len(managers), len(alerts))
+			+ "alertLevel count: %d." % len(alertLevels))
 
 		# handle received status update
 		if not self.serverEventHandler.receivedStatusUpdate(serverTime,
@@ -2526,11 +2635,19 @@ class ServerCommunication:
 
 			return False
 
-		# Build registration message.
+		# Build registration message (and offer the server to send it
+		# compressed if it is large enough).
 		regMessage = self._buildRegistrationMessage()
+		compressedRegMessage = None
+		compressedRegMessageSize = None
+		if len(regMessage) >= self.compressionThreshold:
+			compressedRegMessage = self._compressData("registration",
+				regMessage)
+			compressedRegMessageSize = len(compressedRegMessage)
 
 		# First check version and authenticate.
-		if not self._verifyVersionAndAuthenticate(len(regMessage)):
+		if not self._verifyVersionAndAuthenticate(len(regMessage),
+			compressedRegMessageSize):
 			self.client.close()
 			logging.error("[%s]: Version verification and " % self.fileName
 				+ "authentication failed.")
@@ -2539,7 +2656,10 @@ class ServerCommunication:
 
 			return False
 
-		# Second register node.
+		# Second register node
+		# (compressed if the server accepted the compression).
+		if self.compression and compressedRegMessage is not None:
+			regMessage = compressedRegMessage
 		if not self._registerNode(regMessage):
 			self.client.close()
 			logging.error("[%s]: Registration failed."
@@ -2586,23 +2706,10 @@ class ServerCommunication:
 				self.client.send(json.dumps(message))
 
 				# After initiating transaction receive actual command.
-				data = ""
-				lastSize = 0
-				while len(data) < messageSize:
-					data += self.client.recv(BUFSIZE)
-
-					# Check if the size of the received data has changed.
-					# If not we detected a possible dead lock.
-					if lastSize != len(data):
-						lastSize = len(data)
-					else:
-						logging.error("[%s]: Possible dead lock "
-							% self.fileName
-							+ "detected while receiving data. Closing "
-							+ "connection to server.")
-
-						self._releaseLock()
-						return False
+				data = self._recvMessageData(messageSize)
+				if data is None:
+					self._releaseLock()
+					return False
 
 			# if no RTS was received
 			# => server does not stick to protocol
@@ -2702,25 +2809,44 @@ class ServerCommunication:
 	# this function handles the incoming messages from the server
 	def handleCommunication(self):
 
-		self._acquireLock()
+		# only handle the connection that is currently established
+		# (a connection that is re-established in the meantime
+		# is handled by the next call)
+		if not self.isConnected:
+			return
+		client = self.client
 
 		# handle commands in an infinity loop
 		while True:
 
 			messageSize = 0
 
+			# wait for data of the server without holding the lock
+			# (other threads can start their transactions with the server
+			# in the meantime and get the data they wait for handed over)
 			try:
-				# try to receive data for 0.5 seconds and then
-				# timeout to give other threads the possibility
-				# to send acquire the lock and send data to the server
-				data = self.client.recv(BUFSIZE, timeout=0.5)
-				if not data:
+				data = client.recv(BUFSIZE, timeout=None)
+			except Exception as e:
+				logging.exception("[%s]: Receiving failed." % self.fileName)
 
-					# clean up session before exiting
-					self._cleanUpSessionForClosing()
-					self._releaseLock()
-					return
+				self._closeReceivingConnection(client)
+				return
+
+			if not data:
+				self._closeReceivingConnection(client)
+				return
+
+			# data that does not belong to a transaction of another thread
+			# starts a transaction of the server
+			if not self._acquireLockForReceivedData(data):
+				continue
+
+			# connection was re-established in the meantime
+			if self.client is not client:
+				self._releaseLock()
+				return
 
+			try:
 				data = data.strip()
 				message = json.loads(data)
 				# check if an error was received
@@ -2738,6 +2864,7 @@ class ServerCommunication:
 				if str(message["payload"]["type"]).upper() == "RTS":
 					receivedTransactionId = int(message["payload"]["id"])
 					messageSize = int(message["size"])
+					encoding = message.get("encoding", None)
 
 					# received RTS (request to send) message
 					logging.debug("[%s]: Received RTS %s message."
@@ -2755,25 +2882,17 @@ class ServerCommunication:
 					self.client.send(json.dumps(message))
 
 					# After initiating transaction receive actual command
-					data = ""
-					lastSize = 0
-					while len(data) < messageSize:
-						data += self.client.recv(BUFSIZE)
-
-						# Check if the size of the received data has changed.
-						# If not we detected a possible dead lock.
-						if lastSize != len(data):
-							lastSize = len(data)
-						else:
-							logging.error("[%s]: Possible dead lock "
-								% self.fileName
-								+ "detected while receiving data. Closing "
-								+ "connection to server.")
-
-							# clean up session before exiting
-							self._cleanUpSessionForClosing()
-							self._releaseLock()
-							return
+					data = self._recvMessageData(messageSize)
+					if data is None:
+
+						# clean up session before exiting
+						self._cleanUpSessionForClosing()
+						self._releaseLock()
+						return
+
+					# decompress the message if it was sent compressed
+					data = self._decompressMessage(str(message["message"]),
+						data, encoding)
 
 				# if no RTS was received
 				# => server does not stick to protocol
@@ -2788,33 +2907,6 @@ class ServerCommunication:
 					self._releaseLock()
 					return
 
-			except ssl.SSLError as e:
-
-				# catch receive timeouts
-				err = e.args[0]
-				if err == "The read operation timed out":
-
-					# release lock and acquire to let other threads send
-					# data to the server
-					# (wait 0.5 seconds in between, because semaphore
-					# are released in random order => other threads could be
-					# unlucky and not be chosen => this has happened when
-					# loglevel was not debug => hdd I/O has slowed this process
-					# down)
-					self._releaseLock()
-					time.sleep(0.5)
-					self._acquireLock()
-
-					# continue receiving
-					continue
-
-				logging.exception("[%s]: Receiving failed." % self.fileName)
-
-				# clean up session before exiting
-				self._cleanUpSessionForClosing()
-				self._releaseLock()
-				return
-
 			except Exception as e:
 				logging.exception("[%s]: Receiving failed." % self.fileName)
 
@@ -2936,6 +3028,8 @@ class ServerCommunication:
 
 			self.lastRecv = int(time.time())
 
+			self._releaseLock()
+
 
 	# this function sends an option change to the server for example
 	# to activate the alert system or deactivate it
@@ -2965,7 +3059,7 @@ class ServerCommunication:
 
 		# get option response from server
 		try:
-			data = self.client.recv(BUFSIZE)
+			data = self._recvResponse()
 			message = json.loads(data)
 			# check if an error was received
 			if "error" in message.keys():
@@ -3096,7 +3190,7 @@ class ServerCommunication:
 
 		# get ping response from server
 		try:
-			data = self.client.recv(BUFSIZE)
+			data = self._recvResponse()
 			message = json.loads(data)
 			# check if an error was received
 			if "error" in message.keys():
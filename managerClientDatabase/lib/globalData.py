@@ -83,6 +83,11 @@ class GlobalData:
 		# this variable holds the object of the server communication
 		self.serverComm = None
 
+		# instance of the status cache that holds the current state
+		# of the alert system for local clients (only set when the local
+		# unix socket server is activated)
+		self.statusCache = None
+
 		# instance of the storage backend
 		self.storage = None
 
@@ -102,7 +107,27 @@ class GlobalData:
 		# (an event is anything that has happened on the
 		# alert system for example a sensor alert, a state change
 		# of an sensor, an option change etc.)
-		self.events = collections.deque()
+		# (bounded in order to not grow without limit if the database
+		# is not reachable for a long time, the oldest events are dropped)
+		self.events = collections.deque(maxlen=100000)
+
+		# the amount of days the hourly roll ups of the sensor data history
+		# are kept in the database before they are removed
+		# (value 0 will not store any sensor data history; used if the
+		# configuration does not contain this option)
+		self.sensorHistoryLifeSpan = 0
+
+		# the amount of days the single sensor data samples and the
+		# roll ups per minute are kept in the database before
+		# they are removed
+		self.sensorHistoryRawLifeSpan = 0
+
+		# a (thread safe) list of sensor data samples that are not
+		# written to the sensor data history yet
+		# (tuples of sensorId, time received and data; bounded in order to
+		# not grow without limit if the database is not reachable for a
+		# long time, the oldest samples are dropped)
+		self.sensorHistory = collections.deque(maxlen=100000)
 
 		# Flag that indicates if this node is registered as persistent
 		# (0 or 1).
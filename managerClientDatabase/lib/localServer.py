@@ -8,15 +8,193 @@
 # Licensed under the GNU Public License, version 2.
 
 import SocketServer
+import socket
 import logging
 import os
 import json
 import time
+import threading
+import collections
+import Queue
 BUFSIZE = 1024
 
 
+# this class holds a pre-serialized snapshot of the alert system state
+# and a feed of the latest events in memory (it is kept up to date by the
+# server event handler and is used to answer status requests of local
+# clients without querying the database)
+class StatusCache:
+
+	def __init__(self):
+
+		# maximal number of events that are kept for the event feed
+		self.maxEvents = 1000
+
+		# maximal time in seconds a client can wait for changes
+		self.maxPollTimeout = 60
+
+		# used to wake up clients that wait for changes
+		self.changed = threading.Condition()
+
+		# serialized snapshot of the alert system state and its version
+		# (the version is increased each time the snapshot changes)
+		self.snapshot = json.dumps(None)
+		self.snapshotVersion = 0
+
+		# last received server time (not part of the snapshot
+		# because it changes with every update)
+		self.serverTime = 0.0
+
+		# list of (eventId, event dictionary) tuples of the latest events
+		self.events = collections.deque(maxlen=self.maxEvents)
+		self.lastEventId = 0
+
+
+	# internal function that converts the given event into a dictionary
+	def _eventToDict(self, event):
+		eventDict = dict(event.__dict__)
+
+		# the type of the event is given by its class name
+		# (i.e., EventSensorAlert => sensorAlert)
+		eventType = event.__class__.__name__[5:]
+		eventDict["type"] = eventType[0].lower() + eventType[1:]
+
+		return eventDict
+
+
+	# internal function that waits until the given condition is met
+	# or the given timeout is reached (has to be called with the lock held)
+	def _waitFor(self, condition, timeout):
+		timeout = min(max(timeout, 0), self.maxPollTimeout)
+		endTime = time.time() + timeout
+		while not condition():
+			remainingTime = endTime - time.time()
+			if remainingTime <= 0:
+				break
+			self.changed.wait(remainingTime)
+
+
+	# adds an occurred event to the event feed
+	def addEvent(self, event):
+		eventDict = self._eventToDict(event)
+
+		self.changed.acquire()
+		self.lastEventId += 1
+		eventDict["eventId"] = self.lastEventId
+		self.events.append( (self.lastEventId, eventDict) )
+		self.changed.notifyAll()
+		self.changed.release()
+
+
+	# updates the snapshot of the alert system state
+	def update(self, serverTime, options, nodes, sensors, managers, alerts,
+		alertLevels):
+
+		status = {"options": [{"type": x.type,
+				"value": x.value} for x in options],
+			"nodes": [{"nodeId": x.nodeId,
+				"hostname": x.hostname,
+				"nodeType": x.nodeType,
+				"instance": x.instance,
+				"connected": x.connected,
+				"version": x.version,
+				"rev": x.rev,
+				"newestVersion": x.newestVersion,
+				"newestRev": x.newestRev,
+				"username": x.username,
+				"persistent": x.persistent} for x in nodes],
+			"sensors": [{"sensorId": x.sensorId,
+				"nodeId": x.nodeId,
+				"remoteSensorId": x.remoteSensorId,
+				"description": x.description,
+				"state": x.state,
+				"lastStateUpdated": x.lastStateUpdated,
+				"alertDelay": x.alertDelay,
+				"alertLevels": x.alertLevels,
+				"dataType": x.dataType,
+				"data": x.data} for x in sensors],
+			"managers": [{"managerId": x.managerId,
+				"nodeId": x.nodeId,
+				"description": x.description} for x in managers],
+			"alerts": [{"alertId": x.alertId,
+				"nodeId": x.nodeId,
+				"remoteAlertId": x.remoteAlertId,
+				"description": x.description,
+				"alertLevels": x.alertLevels} for x in alerts],
+			"alertLevels": [{"level": x.level,
+				"name": x.name,
+				"triggerAlways": x.triggerAlways,
+				"rulesActivated": x.rulesActivated} for x in alertLevels]}
+
+		# serialize the snapshot outside of the lock
+		snapshot = json.dumps(status)
+
+		self.changed.acquire()
+		self.serverTime = serverTime
+		if snapshot != self.snapshot:
+			self.snapshot = snapshot
+			self.snapshotVersion += 1
+			self.changed.notifyAll()
+		self.changed.release()
+
+
+	# returns the version, the last server time and the serialized snapshot
+	# of the alert system state (if the given version is the current one,
+	# it waits until the snapshot changes or the timeout is reached)
+	def getStatus(self, version=None, timeout=0):
+		self.changed.acquire()
+		if not version is None:
+			self._waitFor(lambda: self.snapshotVersion != version, timeout)
+		result = (self.snapshotVersion, self.serverTime, self.snapshot)
+		self.changed.release()
+		return result
+
+
+	# returns the id of the last event and the serialized list of all
+	# events that occurred after the given event id (if no such event
+	# exists, it waits until one occurs or the timeout is reached)
+	def getEvents(self, since=0, timeout=0):
+		self.changed.acquire()
+		self._waitFor(lambda: self.lastEventId > since, timeout)
+		events = [eventDict for eventId, eventDict in self.events
+			if eventId > since]
+		lastEventId = self.lastEventId
+		self.changed.release()
+		return (lastEventId, json.dumps(events))
+
+
+# this class is a worker thread that processes the requests that
+# were received by the local client connections
+class LocalRequestWorker(threading.Thread):
+
+	def __init__(self, requestQueue):
+		threading.Thread.__init__(self)
+
+		# file nme of this file (used for logging)
+		self.fileName = os.path.basename(__file__)
+
+		# queue of (session, request data) tuples to process
+		self.requestQueue = requestQueue
+
+
+	def run(self):
+
+		while True:
+			session, data = self.requestQueue.get()
+
+			try:
+				session.processRequest(data)
+			except Exception as e:
+				logging.exception("[%s]: Processing request failed."
+					% self.fileName)
+
+			session.requestDone()
+
+
 # this class is used for the threaded unix stream server and 
 # extends the constructor to pass the global configured data to all threads
+# (each connection is handled by its own thread while the received
+# requests are processed by a fixed number of worker threads)
 class ThreadedUnixStreamServer(SocketServer.ThreadingMixIn,
 	SocketServer.UnixStreamServer):
 	
@@ -25,6 +203,25 @@ class ThreadedUnixStreamServer(SocketServer.ThreadingMixIn,
 		# get reference to global data object
 		self.globalData = globalData
 
+		# number of worker threads that process the received requests
+		# (a long polling request occupies one worker until it is answered)
+		self.numberWorkers = 8
+
+		# maximal number of long polling requests that wait concurrently
+		# (further long polling requests are answered directly to always
+		# leave workers for the other requests)
+		self.maxLongPolls = self.numberWorkers / 2
+		self.longPollSlots = threading.Semaphore(self.maxLongPolls)
+
+		# start worker threads that process the received requests
+		self.requestQueue = Queue.Queue()
+		for i in range(self.numberWorkers):
+			worker = LocalRequestWorker(self.requestQueue)
+			# set thread to daemon
+			# => threads terminates when main thread terminates
+			worker.daemon = True
+			worker.start()
+
 		SocketServer.TCPServer.__init__(self, serverAddress, 
 			RequestHandlerClass)
 
@@ -40,22 +237,390 @@ class LocalServerSession(SocketServer.BaseRequestHandler):
 		# get reference to global data object
 		self.globalData = server.globalData
 		self.serverComm = self.globalData.serverComm
+		self.statusCache = self.globalData.statusCache
+		self.storage = self.globalData.storage
+		self.sensorHistoryLifeSpan = self.globalData.sensorHistoryLifeSpan
+
+		# maximal size of a single request in bytes
+		self.maxRequestSize = 65536
+
+		# time in seconds the client has to send the first request
+		# completely
+		self.requestTimeout = 5.0
+
+		# flag that indicates if the client uses newline-delimited
+		# requests on a persistent connection (requested by the client
+		# with the attribute "framing": "line" in its first request,
+		# otherwise the client sends a single request and waits for
+		# the response)
+		self.lineMode = False
+
+		# lock that serializes the responses of concurrently processed
+		# requests of this connection
+		self.sendLock = threading.Semaphore(1)
+
+		# number of requests of this connection that are not answered yet
+		self.pendingRequests = 0
+		self.pendingRequestsDone = threading.Condition()
 
 		SocketServer.BaseRequestHandler.__init__(self, request, 
 			clientAddress, server)
 
+
+	# internal function that sends the given message (a dictionary or an
+	# already serialized json object) as response to the given request
+	# (the id of the request is added to the response so that the client
+	# can assign responses of pipelined requests)
+	def _sendMessage(self, incomingMessage, message):
+
+		requestId = None
+		if (isinstance(incomingMessage, dict)
+			and "id" in incomingMessage):
+			requestId = incomingMessage["id"]
+
+		if isinstance(message, dict):
+			if not requestId is None:
+				message["id"] = requestId
+			data = json.dumps(message)
+		else:
+			data = message
+			if not requestId is None:
+				data = data[:-1] + ", \"id\": %s}" % json.dumps(requestId)
+
+		if self.lineMode:
+			data += "\n"
+
+		self.sendLock.acquire()
+		try:
+			self.request.sendall(data)
+		finally:
+			self.sendLock.release()
+
+
+	# marks a queued request of this connection as answered
+	def requestDone(self):
+		self.pendingRequestsDone.acquire()
+		self.pendingRequests -= 1
+		self.pendingRequestsDone.notifyAll()
+		self.pendingRequestsDone.release()
+
+
+	# internal function that answers a status or events request
+	# with the data of the status cache
+	def _handleStatusRequest(self, incomingMessage):
+
+		# extract the optional request attributes from message
+		# (a given version or event id and timeout results in a long poll
+		# that returns as soon as newer data is available)
+		try:
+			payload = incomingMessage.get("payload", {})
+			timeout = float(payload.get("timeout", 0))
+			if incomingMessage["message"] == "status":
+				version = payload.get("version", None)
+				if not version is None:
+					version = int(version)
+			else:
+				since = int(payload.get("since", 0))
+		except Exception as e:
+
+			logging.exception("[%s]: Attributes of %s " 
+				% (self.fileName, incomingMessage["message"])
+				+ "message invalid.")
+
+			# send error message back
+			try:
+				utcTimestamp = int(time.time())
+				message = {"serverTime": utcTimestamp,
+					"message": incomingMessage["message"],
+					"error": "received attributes invalid"}
+				self._sendMessage(incomingMessage, message)
+			except Exception as e:
+				pass
+
+			return
+
+		# only wait for changes if a long polling slot is free
+		# (otherwise the current data is returned directly and the client
+		# polls again)
+		longPoll = False
+		if timeout > 0:
+			longPoll = self.server.longPollSlots.acquire(False)
+			if not longPoll:
+				timeout = 0
+
+		# the cached data is already serialized
+		# => embed it into the response without serializing it again
+		try:
+			if incomingMessage["message"] == "status":
+				version, serverTime, snapshot = self.statusCache.getStatus(
+					version, timeout)
+				payload = "{\"type\": \"response\", " \
+					+ "\"version\": %d, " % version \
+					+ "\"lastServerTime\": %s, " % json.dumps(serverTime) \
+					+ "\"status\": %s}" % snapshot
+			else:
+				lastEventId, events = self.statusCache.getEvents(since,
+					timeout)
+				payload = "{\"type\": \"response\", " \
+					+ "\"lastEventId\": %d, " % lastEventId \
+					+ "\"events\": %s}" % events
+		finally:
+			if longPoll:
+				self.server.longPollSlots.release()
+
+		# send response to client
+		try:
+			utcTimestamp = int(time.time())
+			self._sendMessage(incomingMessage,
+				"{\"serverTime\": %d, " % utcTimestamp
+				+ "\"message\": %s, " 
+				% json.dumps(incomingMessage["message"])
+				+ "\"payload\": %s}" % payload)
+		except Exception as e:
+			logging.exception("[%s]: Sending response " % self.fileName
+				+ "message failed.")
+
+
+	# internal function that answers a sensor history request
+	# with the sensor data history stored in the database
+	def _handleSensorHistoryRequest(self, incomingMessage):
+
+		# check if it is activated to store the sensor data history
+		if self.sensorHistoryLifeSpan == 0:
+
+			# send error message back
+			try:
+				utcTimestamp = int(time.time())
+				message = {"serverTime": utcTimestamp,
+					"message": incomingMessage["message"],
+					"error": "sensor history not activated"}
+				self._sendMessage(incomingMessage, message)
+			except Exception as e:
+				pass
+
+			return
+
+		# extract the request attributes from message
+		try:
+			sensorId = int(incomingMessage["payload"]["sensorId"])
+			startTime = int(incomingMessage["payload"]["start"])
+			endTime = int(incomingMessage["payload"]["end"])
+			resolution = str(incomingMessage["payload"].get("resolution",
+				"auto"))
+			if not resolution in ["raw", "minute", "hour", "auto"]:
+				raise ValueError("Resolution '%s' not valid." % resolution)
+		except Exception as e:
+
+			logging.exception("[%s]: Attributes of sensorhistory "
+				% self.fileName
+				+ "message invalid.")
+
+			# send error message back
+			try:
+				utcTimestamp = int(time.time())
+				message = {"serverTime": utcTimestamp,
+					"message": incomingMessage["message"],
+					"error": "received attributes invalid"}
+				self._sendMessage(incomingMessage, message)
+			except Exception as e:
+				pass
+
+			return
+
+		result = self.storage.getSensorHistory(sensorId, startTime, endTime,
+			resolution)
+		if result is None:
+
+			# send error message back
+			try:
+				utcTimestamp = int(time.time())
+				message = {"serverTime": utcTimestamp,
+					"message": incomingMessage["message"],
+					"error": "getting sensor history failed"}
+				self._sendMessage(incomingMessage, message)
+			except Exception as e:
+				pass
+
+			return
+
+		resolution, samples = result
+
+		# send response to client
+		try:
+			utcTimestamp = int(time.time())
+			message = {"serverTime": utcTimestamp,
+				"message": incomingMessage["message"],
+				"payload":
+					{"type": "response",
+					"sensorId": sensorId,
+					"resolution": resolution,
+					"samples": samples}
+				}
+			self._sendMessage(incomingMessage, message)
+		except Exception as e:
+			logging.exception("[%s]: Sending response " % self.fileName
+				+ "message failed.")
+
+
+	# internal function that receives the first request of the client
+	# (it is complete as soon as a newline is received or the received
+	# data is a valid json message)
+	# returns a tuple (first request, remaining received data)
+	# or None if the client does not send a complete request
+	def _receiveFirstRequest(self):
+
+		data = ""
+		self.request.settimeout(self.requestTimeout)
+		while True:
+
+			try:
+				receivedData = self.request.recv(BUFSIZE)
+			except socket.timeout:
+				logging.error("[%s]: Receiving request timed out."
+					% self.fileName)
+
+				break
+			except Exception as e:
+				logging.exception("[%s]: Receiving data failed."
+					% self.fileName)
+
+				return None
+
+			if not receivedData:
+				break
+			data += receivedData
+
+			if "\n" in data:
+				request, data = data.split("\n", 1)
+				return (request.strip(), data)
+
+			try:
+				json.loads(data)
+				return (data.strip(), "")
+			except ValueError:
+				pass
+
+			if len(data) > self.maxRequestSize:
+				logging.error("[%s]: Received request too large."
+					% self.fileName)
+
+				break
+
+		# the received data is not a complete request
+		# => answer it as invalid request
+		if data.strip() != "":
+			self.processRequest(data.strip()[:self.maxRequestSize])
+
+		return None
+
+
 	def handle(self):
 
 		logging.info("[%s]: Client connected." % self.fileName)
 
-		# get received data
-		data = self.request.recv(BUFSIZE).strip()
+		result = self._receiveFirstRequest()
+		if result is None:
+			logging.info("[%s]: Client disconnected." % self.fileName)
+			return
+		request, data = result
+
+		# check if the client requests newline-delimited requests on
+		# a persistent connection
+		try:
+			incomingMessage = json.loads(request)
+			self.lineMode = (isinstance(incomingMessage, dict)
+				and incomingMessage.get("framing", None) == "line")
+		except ValueError:
+			pass
+
+		# clients that do not use newline-delimited requests send
+		# a single request and wait for the response
+		# => process it directly
+		if not self.lineMode:
+			self.processRequest(request)
+
+			logging.info("[%s]: Client disconnected." % self.fileName)
+			return
+
+		# the connection is kept open until the client closes it
+		self.request.settimeout(None)
+		self.pendingRequestsDone.acquire()
+		self.pendingRequests += 1
+		self.pendingRequestsDone.release()
+		self.server.requestQueue.put( (self, request) )
+
+		# read requests until the client closes the connection
+		while True:
+
+			# split newline-delimited requests and queue them
+			# for the worker threads (the responses are sent as soon
+			# as they are processed and may arrive out of order)
+			requests = data.split("\n")
+			data = requests.pop()
+			if len(data) > self.maxRequestSize:
+				logging.error("[%s]: Received request too large."
+					% self.fileName)
+
+				break
+
+			for request in requests:
+				request = request.strip()
+				if request == "":
+					continue
+
+				self.pendingRequestsDone.acquire()
+				self.pendingRequests += 1
+				self.pendingRequestsDone.release()
+
+				self.server.requestQueue.put( (self, request) )
+
+			try:
+				receivedData = self.request.recv(BUFSIZE)
+			except Exception as e:
+				logging.exception("[%s]: Receiving data failed."
+					% self.fileName)
+
+				break
+
+			if not receivedData:
+				break
+			data += receivedData
+
+		# wait until all queued requests of this connection are answered
+		# before the connection is closed
+		self.pendingRequestsDone.acquire()
+		while self.pendingRequests > 0:
+			self.pendingRequestsDone.wait()
+		self.pendingRequestsDone.release()
+
+		logging.info("[%s]: Client disconnected." 
+			% self.fileName)
+
+
+	# processes a single received request and sends the response
+	def processRequest(self, data):
 
 		# convert data to json
+		incomingMessage = dict()
 		try:
 			incomingMessage = json.loads(data)
 
-			# at the moment only option messages are allowed
+			# status and event requests are answered from the status cache
+			if (incomingMessage["message"] in ["status", "events"]
+				and not self.statusCache is None):
+
+				self._handleStatusRequest(incomingMessage)
+
+				return
+
+			# sensor history requests are answered from the database
+			if incomingMessage["message"] == "sensorhistory":
+
+				self._handleSensorHistoryRequest(incomingMessage)
+
+				return
+
+			# besides them only option messages are allowed
 			if incomingMessage["message"] != "option":
 
 				# send error message back
@@ -63,8 +628,9 @@ class LocalServerSession(SocketServer.BaseRequestHandler):
 					utcTimestamp = int(time.time())
 					message = {"serverTime": utcTimestamp,
 						"message": incomingMessage["message"],
-						"error": "only option message valid"}
-					self.request.send(json.dumps(message))
+						"error": "only option, status, events and "
+							+ "sensorhistory message valid"}
+					self._sendMessage(incomingMessage, message)
 				except Exception as e:
 					pass
 
@@ -78,9 +644,9 @@ class LocalServerSession(SocketServer.BaseRequestHandler):
 			try:
 				utcTimestamp = int(time.time())
 				message = {"serverTime": utcTimestamp,
-					"message": incomingMessage["message"],
+					"message": incomingMessage.get("message", None),
 					"error": "received json message invalid"}
-				self.request.send(json.dumps(message))
+				self._sendMessage(incomingMessage, message)
 			except Exception as e:
 				pass
 
@@ -102,7 +668,7 @@ class LocalServerSession(SocketServer.BaseRequestHandler):
 				message = {"serverTime": utcTimestamp,
 					"message": incomingMessage["message"],
 					"error": "received attributes invalid"}
-				self.request.send(json.dumps(message))
+				self._sendMessage(incomingMessage, message)
 			except Exception as e:
 				pass
 
@@ -117,7 +683,7 @@ class LocalServerSession(SocketServer.BaseRequestHandler):
 				message = {"serverTime": utcTimestamp,
 					"message": incomingMessage["message"],
 					"error": "only option type 'alertSystemActive' allowed"}
-				self.request.send(json.dumps(message))
+				self._sendMessage(incomingMessage, message)
 			except Exception as e:
 				pass
 
@@ -136,7 +702,7 @@ class LocalServerSession(SocketServer.BaseRequestHandler):
 						{"type": "response",
 						"result": "ok"}
 					}
-				self.request.send(json.dumps(message))
+				self._sendMessage(incomingMessage, message)
 			except Exception as e:
 				logging.exception("[%s]: Sending response " % self.fileName
 					+ "message failed.")
@@ -154,11 +720,8 @@ class LocalServerSession(SocketServer.BaseRequestHandler):
 				message = {"serverTime": utcTimestamp,
 					"message": incomingMessage["message"],
 					"error": "sending message to server failed"}
-				self.request.send(json.dumps(message))
+				self._sendMessage(incomingMessage, message)
 			except Exception as e:
 				pass
 
 			return
-
-		logging.info("[%s]: Client disconnected." 
-			% self.fileName)
\ No newline at end of file
@@ -22,16 +22,28 @@ from events import EventDeleteManager
 
 
 # this class represents an option of the server
-class Option:
+class Option(object):
+
+	# the attributes of the status objects are stored in slots instead of
+	# a per object dictionary to keep their memory footprint small
+	__slots__ = ("type", "value", "checked")
 
 	def __init__(self):
 		self.type = None
 		self.value = None
 
+		# flag that marks this object as checked
+		# (is used to verify if this object is still received from the server)
+		self.checked = False
+
 
 # this class represents an node/client of the alert system
 # which can be either a sensor, alert or manager
-class Node:
+class Node(object):
+
+	__slots__ = ("nodeId", "hostname", "nodeType", "instance", "connected",
+		"version", "rev", "username", "persistent", "newestVersion",
+		"newestRev", "checked")
 
 	def __init__(self):
 		self.nodeId = None
@@ -68,7 +80,11 @@ class Node:
 
 
 # this class represents a sensor client of the alert system
-class Sensor:
+class Sensor(object):
+
+	__slots__ = ("nodeId", "sensorId", "remoteSensorId", "alertDelay",
+		"alertLevels", "description", "lastStateUpdated", "state", "dataType",
+		"data", "checked")
 
 	def __init__(self):
 		self.nodeId = None
@@ -93,7 +109,9 @@ class Sensor:
 		self.sensorId = sensor.sensorId
 		self.remoteSensorId = sensor.remoteSensorId
 		self.alertDelay = sensor.alertDelay
-		self.alertLevels = list(sensor.alertLevels)
+		# the alert levels list is never modified in place (only replaced)
+		# => it can be shared instead of copied
+		self.alertLevels = sensor.alertLevels
 		self.description = sensor.description
 		self.lastStateUpdated = sensor.lastStateUpdated
 		self.state = sensor.state
@@ -102,7 +120,9 @@ class Sensor:
 
 
 # this class represents a manager client of the alert system
-class Manager:
+class Manager(object):
+
+	__slots__ = ("nodeId", "managerId", "description", "checked")
 
 	def __init__(self):
 		self.nodeId = None
@@ -122,7 +142,10 @@ class Manager:
 
 
 # this class represents an alert client of the alert system
-class Alert:
+class Alert(object):
+
+	__slots__ = ("nodeId", "alertId", "remoteAlertId", "alertLevels",
+		"description", "checked")
 
 	def __init__(self):
 		self.nodeId = None
@@ -141,12 +164,18 @@ class Alert:
 		self.nodeId = alert.nodeId
 		self.alertId = alert.alertId
 		self.remoteAlertId = alert.remoteAlertId
-		self.alertLevels = list(alert.alertLevels)
+		# the alert levels list is never modified in place (only replaced)
+		# => it can be shared instead of copied
+		self.alertLevels = alert.alertLevels
 		self.description = alert.description
 
 
 # this class represents a triggered sensor alert of the alert system
-class SensorAlert:
+class SensorAlert(object):
+
+	__slots__ = ("rulesActivated", "sensorId", "state", "description",
+		"timeReceived", "alertLevels", "hasOptionalData", "optionalData",
+		"changeState", "hasLatestData", "dataType", "sensorData")
 
 	def __init__(self):
 
@@ -187,7 +216,9 @@ class SensorAlert:
 
 
 # this class represents an alert level that is configured on the server
-class AlertLevel:
+class AlertLevel(object):
+
+	__slots__ = ("level", "name", "triggerAlways", "rulesActivated", "checked")
 
 	def __init__(self):
 		self.level = None
@@ -224,11 +255,37 @@ class ServerEventHandler:
 		self.versionInformer = self.globalData.versionInformer
 		self.events = self.globalData.events
 		self.connectionTimeout = self.globalData.connectionTimeout
+		self.statusCache = self.globalData.statusCache
+		self.sensorHistoryLifeSpan = self.globalData.sensorHistoryLifeSpan
+		self.sensorHistory = self.globalData.sensorHistory
 
 		# keep track of the server time
 		self.serverTime = 0.0
 
 
+	# internal function that adds an occurred event to the event queue
+	# (only if events are stored) and to the event feed of the
+	# status cache if it is used
+	def _addEvent(self, event):
+		if self.eventsLifeSpan != 0:
+			self.events.append(event)
+
+		if not self.statusCache is None:
+			self.statusCache.addEvent(event)
+
+
+	# internal function that adds the current data of the given sensor
+	# as sample to the queue of the sensor data history
+	# (only if the history is activated and the sensor has numeric data)
+	def _addSensorHistorySample(self, sensor, timeReceived):
+		if self.sensorHistoryLifeSpan == 0:
+			return
+		if (sensor.dataType == SensorDataType.INT
+			or sensor.dataType == SensorDataType.FLOAT):
+			self.sensorHistory.append(
+				(sensor.sensorId, timeReceived, sensor.data) )
+
+
 	# internal function that checks if all options are checked
 	def _checkAllOptionsAreChecked(self):
 		for option in self.options:
@@ -250,12 +307,12 @@ class ServerEventHandler:
 				tempEvent.hostname = node.hostname
 				tempEvent.nodeType = node.nodeType
 				tempEvent.instance = node.instance
-				self.events.append(tempEvent)
+				self._addEvent(tempEvent)
 
-				# remove node from list of nodes
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.nodes.remove(node)
+		# remove all not checked nodes from the list of nodes
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.nodes[:] = [x for x in self.nodes if x.checked]
 
 		for sensor in self.sensors:
 			if sensor.checked is False:
@@ -263,12 +320,12 @@ class ServerEventHandler:
 				# create delete sensor event
 				tempEvent = EventDeleteSensor(timeReceived)
 				tempEvent.description = sensor.description
-				self.events.append(tempEvent)
+				self._addEvent(tempEvent)
 
-				# remove sensor from list of sensors
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.sensors.remove(sensor)
+		# remove all not checked sensors from the list of sensors
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.sensors[:] = [x for x in self.sensors if x.checked]
 
 		for manager in self.managers:
 			if manager.checked is False:
@@ -276,12 +333,12 @@ class ServerEventHandler:
 				# create delete manager event
 				tempEvent = EventDeleteManager(timeReceived)
 				tempEvent.description = manager.description
-				self.events.append(tempEvent)
+				self._addEvent(tempEvent)
 
-				# remove manager from list of managers
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.managers.remove(manager)
+		# remove all not checked managers from the list of managers
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.managers[:] = [x for x in self.managers if x.checked]
 
 		for alert in self.alerts:
 			if alert.checked is False:
@@ -289,20 +346,17 @@ class ServerEventHandler:
 				# create delete alert event
 				tempEvent = EventDeleteAlert(timeReceived)
 				tempEvent.description = alert.description
-				self.events.append(tempEvent)
-
-				# remove alert from list of alerts
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.alerts.remove(alert)
+				self._addEvent(tempEvent)
 
-		for alertLevel in self.alertLevels:
-			if alertLevel.checked is False:
+		# remove all not checked alerts from the list of alerts
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.alerts[:] = [x for x in self.alerts if x.checked]
 
-				# remove alert level from list of alert levels
-				# to delete all references to object
-				# => object will be deleted by garbage collector
-				self.alertLevels.remove(alertLevel)
+		# remove all not checked alert levels from the list of alert levels
+		# to delete all references to the objects
+		# => objects will be deleted by garbage collector
+		self.alertLevels[:] = [x for x in self.alertLevels if x.checked]
 
 
 	# internal function that marks all nodes as not checked
@@ -336,54 +390,59 @@ class ServerEventHandler:
 		# mark all nodes as not checked
 		self._markAlertSystemObjectsAsNotChecked()
 
+		# index all known objects by their unique key
+		# (to find the corresponding known object of a received object
+		# without searching the whole list)
+		optionsByType = dict((x.type, x) for x in self.options)
+		nodesByNodeId = dict((x.nodeId, x) for x in self.nodes)
+		sensorsBySensorId = dict((x.sensorId, x) for x in self.sensors)
+		managersByManagerId = dict((x.managerId, x) for x in self.managers)
+		alertsByAlertId = dict((x.alertId, x) for x in self.alerts)
+		alertLevelsByLevel = dict((x.level, x) for x in self.alertLevels)
+
 		# process received options
 		for recvOption in options:
 
-			# search option in list of known options
+			# search option in the known options
 			# => if not known add it
-			found = False
-			for option in self.options:
-				# ignore options that are already checked
-				if option.checked:
-
-					# check if the type is unique
-					if option.type == recvOption.type:
-						logging.error("[%s]: Received optionType "
-							% self.fileName
-							+ "'%s' is not unique." % recvOption.type)
+			option = optionsByType.get(recvOption.type)
 
-						return False
+			# check if the type is unique
+			if (not option is None
+				and option.checked):
+				logging.error("[%s]: Received optionType "
+					% self.fileName
+					+ "'%s' is not unique." % recvOption.type)
 
-					continue
+				return False
 
-				# when found => mark option as checked and update information
-				if option.type == recvOption.type:
-					option.checked = True
+			# when found => mark option as checked and update information
+			if not option is None:
+				option.checked = True
 
-					# only change value when it has changed
-					if option.value != recvOption.value:
+				# only change value when it has changed
+				if option.value != recvOption.value:
 
-						# create change option event
-						tempEvent = EventChangeOption(timeReceived)
-						tempEvent.type = option.type
-						tempEvent.oldValue = option.value
-						tempEvent.newValue = recvOption.value
-						self.events.append(tempEvent)
+					# create change option event
+					tempEvent = EventChangeOption(timeReceived)
+					tempEvent.type = option.type
+					tempEvent.oldValue = option.value
+					tempEvent.newValue = recvOption.value
+					self._addEvent(tempEvent)
 
-						option.value = recvOption.value
+					option.value = recvOption.value
 
-					found = True
-					break
 			# when not found => add option to list
-			if not found:
+			else:
 				recvOption.checked = True
 				self.options.append(recvOption)
+				optionsByType[recvOption.type] = recvOption
 
 				# create new option event
 				tempEvent = EventNewOption(timeReceived)
 				tempEvent.type = recvOption.type
 				tempEvent.value = recvOption.value
-				self.events.append(tempEvent)
+				self._addEvent(tempEvent)
 
 		# check if all options are checked
 		# => if not, one was removed on the server
@@ -396,170 +455,163 @@ class ServerEventHandler:
 		# process received nodes
 		for recvNode in nodes:
 
-			# search node in list of known nodes
+			# search node in the known nodes
 			# => if not known add it
-			found = False
-			for node in self.nodes:
-				# ignore nodes that are already checked
-				if node.checked:
+			node = nodesByNodeId.get(recvNode.nodeId)
 
-					# check if the nodeId is unique
-					if node.nodeId == recvNode.nodeId:
-						logging.error("[%s]: Received nodeId " % self.fileName
-							+ "'%d' is not unique." % recvNode.nodeId)
+			# check if the nodeId is unique
+			if (not node is None
+				and node.checked):
+				logging.error("[%s]: Received nodeId " % self.fileName
+					+ "'%d' is not unique." % recvNode.nodeId)
 
-						return False
+				return False
 
-					continue
+			# when found => mark node as checked and update information
+			if not node is None:
+				node.checked = True
+
+				# create change node event (only add it if an information
+				# has changed)
+				changed = False
+				tempEvent = EventChangeNode(timeReceived)
+
+				# only update information if they have changed
+				tempEvent.oldHostname = node.hostname
+				tempEvent.newHostname = recvNode.hostname
+				if node.hostname != recvNode.hostname:
+					changed = True
+
+				tempEvent.oldNodeType = node.nodeType
+				tempEvent.newNodeType = recvNode.nodeType
+				if node.nodeType != recvNode.nodeType:
+					changed = True
+
+				tempEvent.oldInstance = node.instance
+				tempEvent.newInstance = recvNode.instance
+				if node.instance != recvNode.instance:
+					changed = True
+
+				tempEvent.oldVersion = node.version
+				tempEvent.newVersion = recvNode.version
+				if node.version != recvNode.version:
+					changed = True
+
+				tempEvent.oldRev = node.rev
+				tempEvent.newRev = recvNode.rev
+				if node.rev != recvNode.rev:
+					changed = True
+
+				tempEvent.oldUsername = node.username
+				tempEvent.newUsername = recvNode.username
+				if node.username != recvNode.username:
+					changed = True
+
+				tempEvent.oldPersistent = node.persistent
+				tempEvent.newPersistent = recvNode.persistent
+				if node.persistent != recvNode.persistent:
+					changed = True
+
+				# add event to event queue if an information has changed
+				if changed:
+					self._addEvent(tempEvent)
+
+				# only change connected value when it has changed
+				if node.connected != recvNode.connected:
+
+					# create connected change event
+					tempEvent = EventConnectedChange(timeReceived)
+					tempEvent.hostname = node.hostname
+					tempEvent.nodeType = node.nodeType
+					tempEvent.instance = node.instance
+					tempEvent.connected = recvNode.connected
+					self._addEvent(tempEvent)
+
+				node.deepCopy(recvNode)
 
-				# when found => mark node as checked and update information
-				if node.nodeId == recvNode.nodeId:
-					node.checked = True
-
-					# create change node event (only add it if an information
-					# has changed)
-					changed = False
-					tempEvent = EventChangeNode(timeReceived)
-
-					# only update information if they have changed
-					tempEvent.oldHostname = node.hostname
-					tempEvent.newHostname = recvNode.hostname
-					if node.hostname != recvNode.hostname:
-						changed = True
-
-					tempEvent.oldNodeType = node.nodeType
-					tempEvent.newNodeType = recvNode.nodeType
-					if node.nodeType != recvNode.nodeType:
-						changed = True
-
-					tempEvent.oldInstance = node.instance
-					tempEvent.newInstance = recvNode.instance
-					if node.instance != recvNode.instance:
-						changed = True
-
-					tempEvent.oldVersion = node.version
-					tempEvent.newVersion = recvNode.version
-					if node.version != recvNode.version:
-						changed = True
-
-					tempEvent.oldRev = node.rev
-					tempEvent.newRev = recvNode.rev
-					if node.rev != recvNode.rev:
-						changed = True
-
-					tempEvent.oldUsername = node.username
-					tempEvent.newUsername = recvNode.username
-					if node.username != recvNode.username:
-						changed = True
-
-					tempEvent.oldPersistent = node.persistent
-					tempEvent.newPersistent = recvNode.persistent
-					if node.persistent != recvNode.persistent:
-						changed = True
-
-					# add event to event queue if an information has changed
-					if changed:
-						self.events.append(tempEvent)
-
-					# only change connected value when it has changed
-					if node.connected != recvNode.connected:
-						
-						# create connected change event
-						tempEvent = EventConnectedChange(timeReceived)
-						tempEvent.hostname = node.hostname
-						tempEvent.nodeType = node.nodeType
-						tempEvent.instance = node.instance
-						tempEvent.connected = recvNode.connected
-						self.events.append(tempEvent)
-
-					node.deepCopy(recvNode)
-					found = True
-					break
 			# when not found => add node to list
-			if not found:
+			else:
 				recvNode.checked = True
 				self.nodes.append(recvNode)
+				nodesByNodeId[recvNode.nodeId] = recvNode
 
 				# create new node event
 				tempEvent = EventNewNode(timeReceived)
 				tempEvent.hostname = recvNode.hostname
 				tempEvent.nodeType = recvNode.nodeType
 				tempEvent.instance = recvNode.instance
-				self.events.append(tempEvent)
+				self._addEvent(tempEvent)
 
 		# process received sensors
 		for recvSensor in sensors:
 
-			# search sensor in list of known sensors
+			# search sensor in the known sensors
 			# => if not known add it
-			found = False
-			for sensor in self.sensors:
-
-				# ignore sensors that are already checked
-				if sensor.checked:
-
-					# check if the sensorId is unique
-					if sensor.sensorId == recvSensor.sensorId:
-						logging.error("[%s]: Received sensorId "
-							% self.fileName
-							+ "'%d' is not unique." % recvSensor.sensorId)
-
-						return False
-
-					continue
-
-				# when found => mark sensor as checked and update information
-				if sensor.sensorId == recvSensor.sensorId:
-					sensor.checked = True
-					tempLastStateUpdated = sensor.lastStateUpdated
-					tempState = sensor.state
-
-					# create change sensor event (only add it if an information
-					# has changed)
-					changed = False
-					tempEvent = EventChangeSensor(timeReceived)
-
-					# only update information if they have changed
-					tempEvent.oldAlertDelay = sensor.alertDelay
-					tempEvent.newAlertDelay = recvSensor.alertDelay
-					if sensor.alertDelay != recvSensor.alertDelay:
-						changed = True
-
-					tempEvent.oldDescription = sensor.description
-					tempEvent.newDescription = recvSensor.description
-					if sensor.description != recvSensor.description:
-						changed = True
+			sensor = sensorsBySensorId.get(recvSensor.sensorId)
 
-					tempEvent.oldRemoteSensorId = sensor.remoteSensorId
-					tempEvent.newRemoteSensorId = recvSensor.remoteSensorId
-					if sensor.remoteSensorId != recvSensor.remoteSensorId:
-						changed = True
-
-					# add event to event queue if an information has changed
-					if changed:
-						self.events.append(tempEvent)
-
-					sensor.deepCopy(recvSensor)
+			# check if the sensorId is unique
+			if (not sensor is None
+				and sensor.checked):
+				logging.error("[%s]: Received sensorId "
+					% self.fileName
+					+ "'%d' is not unique." % recvSensor.sensorId)
 
-					# Revert change to the state if the old state was newer.
-					if sensor.lastStateUpdated < tempLastStateUpdated:
-						sensor.lastStateUpdated = tempLastStateUpdated
-						sensor.state = tempState
+				return False
 
-					found = True
-					break
+			# when found => mark sensor as checked and update information
+			if not sensor is None:
+				sensor.checked = True
+				tempLastStateUpdated = sensor.lastStateUpdated
+				tempState = sensor.state
+				tempDataType = sensor.dataType
+				tempData = sensor.data
+
+				# create change sensor event (only add it if an information
+				# has changed)
+				changed = False
+				tempEvent = EventChangeSensor(timeReceived)
+
+				# only update information if they have changed
+				tempEvent.oldAlertDelay = sensor.alertDelay
+				tempEvent.newAlertDelay = recvSensor.alertDelay
+				if sensor.alertDelay != recvSensor.alertDelay:
+					changed = True
+
+				tempEvent.oldDescription = sensor.description
+				tempEvent.newDescription = recvSensor.description
+				if sensor.description != recvSensor.description:
+					changed = True
+
+				tempEvent.oldRemoteSensorId = sensor.remoteSensorId
+				tempEvent.newRemoteSensorId = recvSensor.remoteSensorId
+				if sensor.remoteSensorId != recvSensor.remoteSensorId:
+					changed = True
+
+				# add event to event queue if an information has changed
+				if changed:
+					self._addEvent(tempEvent)
+
+				sensor.deepCopy(recvSensor)
+
+				# Revert change to the state if the old state was newer.
+				if sensor.lastStateUpdated < tempLastStateUpdated:
+					sensor.lastStateUpdated = tempLastStateUpdated
+					sensor.state = tempState
+
+				# add the sensor data to the history if it has changed
+				if (sensor.dataType != tempDataType
+					or sensor.data != tempData):
+					self._addSensorHistorySample(sensor, timeReceived)
 
 			# when not found => add sensor to list
-			if not found:
+			else:
 				recvSensor.checked = True
 				self.sensors.append(recvSensor)
+				sensorsBySensorId[recvSensor.sensorId] = recvSensor
+				self._addSensorHistorySample(recvSensor, timeReceived)
 
 				# create new sensor event
-				foundNode = None
-				for node in self.nodes:
-					if node.nodeId == recvSensor.nodeId:
-						foundNode = node
-						break
+				foundNode = nodesByNodeId.get(recvSensor.nodeId)
 				if foundNode is None:
 					logging.error("[%s]: Could not find node with id "
 						% self.fileName
@@ -571,61 +623,53 @@ class ServerEventHandler:
 				tempEvent.hostname = foundNode.hostname
 				tempEvent.description = recvSensor.description
 				tempEvent.state = recvSensor.state
-				self.events.append(tempEvent)
+				self._addEvent(tempEvent)
 
 		# process received managers
 		for recvManager in managers:
 
-			# search manager in list of known managers
+			# search manager in the known managers
 			# => if not known add it
-			found = False
-			for manager in self.managers:
-				# ignore managers that are already checked
-				if manager.checked:
+			manager = managersByManagerId.get(recvManager.managerId)
 
-					# check if the managerId is unique
-					if manager.managerId == recvManager.managerId:
-						logging.error("[%s]: Received managerId "
-							% self.fileName
-							+ "'%d' is not unique." % recvManager.managerId)
+			# check if the managerId is unique
+			if (not manager is None
+				and manager.checked):
+				logging.error("[%s]: Received managerId "
+					% self.fileName
+					+ "'%d' is not unique." % recvManager.managerId)
 
-						return False
+				return False
 
-					continue
+			# when found => mark manager as checked and update information
+			if not manager is None:
+				manager.checked = True
 
-				# when found => mark manager as checked and update information
-				if manager.managerId == recvManager.managerId:
-					manager.checked = True
+				# create change manager event
+				# (only add it if an information has changed)
+				changed = False
+				tempEvent = EventChangeManager(timeReceived)
 
-					# create change manager event
-					# (only add it if an information has changed)
-					changed = False
-					tempEvent = EventChangeManager(timeReceived)
+				# only update information if they have changed
+				tempEvent.oldDescription = manager.description
+				tempEvent.newDescription = recvManager.description
+				if manager.description != recvManager.description:
+					changed = True
 
-					# only update information if they have changed
-					tempEvent.oldDescription = manager.description
-					tempEvent.newDescription = recvManager.description
-					if manager.description != recvManager.description:
-						changed = True
+				# add event to event queue if an information has changed
+				if changed:
+					self._addEvent(tempEvent)
 
-					# add event to event queue if an information has changed
-					if changed:
-						self.events.append(tempEvent)
+				manager.deepCopy(recvManager)
 
-					manager.deepCopy(recvManager)
-					found = True
-					break
 			# when not found => add manager to list
-			if not found:
+			else:
 				recvManager.checked = True
 				self.managers.append(recvManager)
+				managersByManagerId[recvManager.managerId] = recvManager
 
 				# create new manager event
-				foundNode = None
-				for node in self.nodes:
-					if node.nodeId == recvManager.nodeId:
-						foundNode = node
-						break
+				foundNode = nodesByNodeId.get(recvManager.nodeId)
 				if foundNode is None:
 					logging.error("[%s]: Could not find node with id "
 						% self.fileName
@@ -636,66 +680,57 @@ class ServerEventHandler:
 				tempEvent = EventNewManager(timeReceived)
 				tempEvent.hostname = foundNode.hostname
 				tempEvent.description = recvManager.description
-				self.events.append(tempEvent)
+				self._addEvent(tempEvent)
 
 		# process received alerts
 		for recvAlert in alerts:
 
-			# search alert in list of known alerts
+			# search alert in the known alerts
 			# => if not known add it
-			found = False
-			for alert in self.alerts:
-				# ignore alerts that are already checked
-				if alert.checked:
-
-					# check if the alertId is unique
-					if alert.alertId == recvAlert.alertId:
-						logging.error("[%s]: Received alertId " % self.fileName
-							+ "'%d' is not unique." % recvAlert.alertId)
+			alert = alertsByAlertId.get(recvAlert.alertId)
 
-						return False
+			# check if the alertId is unique
+			if (not alert is None
+				and alert.checked):
+				logging.error("[%s]: Received alertId " % self.fileName
+					+ "'%d' is not unique." % recvAlert.alertId)
 
-					continue
+				return False
 
-				# when found => mark alert as checked and update information
-				if alert.alertId == recvAlert.alertId:
-					alert.checked = True
+			# when found => mark alert as checked and update information
+			if not alert is None:
+				alert.checked = True
 
-					# create change alert event (only add it if an information
-					# has changed)
-					changed = False
-					tempEvent = EventChangeAlert(timeReceived)
+				# create change alert event (only add it if an information
+				# has changed)
+				changed = False
+				tempEvent = EventChangeAlert(timeReceived)
 
-					# only update information if they have changed
-					tempEvent.oldDescription = alert.description
-					tempEvent.newDescription = recvAlert.description
-					if alert.description != recvAlert.description:
-						changed = True
+				# only update information if they have changed
+				tempEvent.oldDescription = alert.description
+				tempEvent.newDescription = recvAlert.description
+				if alert.description != recvAlert.description:
+					changed = True
 
-					tempEvent.oldRemoteAlertId = alert.remoteAlertId
-					tempEvent.newRemoteAlertId = recvAlert.remoteAlertId
-					if alert.remoteAlertId != recvAlert.remoteAlertId:
-						changed = True
+				tempEvent.oldRemoteAlertId = alert.remoteAlertId
+				tempEvent.newRemoteAlertId = recvAlert.remoteAlertId
+				if alert.remoteAlertId != recvAlert.remoteAlertId:
+					changed = True
 
-					# add event to event queue if an information has changed
-					if changed:
-						self.events.append(tempEvent)
+				# add event to event queue if an information has changed
+				if changed:
+					self._addEvent(tempEvent)
 
-					alert.deepCopy(recvAlert)
-					found = True
-					break
+				alert.deepCopy(recvAlert)
 
 			# when not found => add alert to list
-			if not found:
+			else:
 				recvAlert.checked = True
 				self.alerts.append(recvAlert)
+				alertsByAlertId[recvAlert.alertId] = recvAlert
 
 				# create new alert event
-				foundNode = None
-				for node in self.nodes:
-					if node.nodeId == recvAlert.nodeId:
-						foundNode = node
-						break
+				foundNode = nodesByNodeId.get(recvAlert.nodeId)
 				if foundNode is None:
 					logging.error("[%s]: Could not find node with id "
 						% self.fileName
@@ -706,43 +741,37 @@ class ServerEventHandler:
 				tempEvent = EventNewAlert(timeReceived)
 				tempEvent.hostname = foundNode.hostname
 				tempEvent.description = recvAlert.description
-				self.events.append(tempEvent)
+				self._addEvent(tempEvent)
 
 		# process received alertLevels
 		for recvAlertLevel in alertLevels:
 
-			# search alertLevel in list of known alertLevels
+			# search alertLevel in the known alertLevels
 			# => if not known add it
-			found = False
-			for alertLevel in self.alertLevels:
-				# ignore alertLevels that are already checked
-				if alertLevel.checked:
+			alertLevel = alertLevelsByLevel.get(recvAlertLevel.level)
 
-					# check if the level is unique
-					if alertLevel.level == recvAlertLevel.level:
-						logging.error("[%s]: Received alertLevel "
-							% self.fileName
-							+ "'%d' is not unique." % recvAlertLevel.level)
-
-						return False
+			# check if the level is unique
+			if (not alertLevel is None
+				and alertLevel.checked):
+				logging.error("[%s]: Received alertLevel "
+					% self.fileName
+					+ "'%d' is not unique." % recvAlertLevel.level)
 
-					continue
+				return False
 
-				# when found => mark alertLevel as checked
-				# and update information
-				if alertLevel.level == recvAlertLevel.level:
-					alertLevel.checked = True
-					alertLevel.name = recvAlertLevel.name
-					alertLevel.triggerAlways = recvAlertLevel.triggerAlways
-					alertLevel.rulesActivated = recvAlertLevel.rulesActivated
-
-					found = True
-					break
+			# when found => mark alertLevel as checked
+			# and update information
+			if not alertLevel is None:
+				alertLevel.checked = True
+				alertLevel.name = recvAlertLevel.name
+				alertLevel.triggerAlways = recvAlertLevel.triggerAlways
+				alertLevel.rulesActivated = recvAlertLevel.rulesActivated
 
 			# when not found => add alertLevel to list
-			if not found:
+			else:
 				recvAlertLevel.checked = True
 				self.alertLevels.append(recvAlertLevel)
+				alertLevelsByLevel[recvAlertLevel.level] = recvAlertLevel
 
 		# remove all nodes that are not checked
 		self._removeNotCheckedNodes()
@@ -769,7 +798,7 @@ class ServerEventHandler:
 			tempEvent.sensorData = sensorAlert.sensorData
 
 			tempEvent.alertLevels = list(sensorAlert.alertLevels)
-			self.events.append(tempEvent)
+			self._addEvent(tempEvent)
 
 			# When rules are not activated and change state flag is set.
 			# => Create state change event.
@@ -795,7 +824,7 @@ class ServerEventHandler:
 					for node in self.nodes:
 						if node.nodeId == sensor.nodeId:
 							tempStateEvent.hostname = node.hostname
-							self.events.append(tempStateEvent)
+							self._addEvent(tempStateEvent)
 							break
 					if tempStateEvent.hostname is None:
 						logging.error("[%s]: Unable to find corresponding " 
@@ -825,6 +854,8 @@ class ServerEventHandler:
 					if sensorAlert.hasLatestData:
 						if sensorAlert.dataType == sensor.dataType:
 							sensor.data = sensorAlert.sensorData
+							self._addSensorHistorySample(sensor,
+								timeReceived)
 						else:
 							logging.error("[%s]: Sensor data type different. "
 								% self.fileName
@@ -873,7 +904,7 @@ class ServerEventHandler:
 			for node in self.nodes:
 				if node.nodeId == sensor.nodeId:
 					tempStateEvent.hostname = node.hostname
-					self.events.append(tempStateEvent)
+					self._addEvent(tempStateEvent)
 					break
 			if not tempStateEvent.hostname:
 				logging.error("[%s]: Unable to find corresponding " 
@@ -886,6 +917,7 @@ class ServerEventHandler:
 
 		if dataType == sensor.dataType:
 			sensor.data = sensorData
+			self._addSensorHistorySample(sensor, int(time.time()))
 		else:
 			logging.error("[%s]: Sensor data type different. "
 				% self.fileName
@@ -935,7 +967,7 @@ class ServerEventHandler:
 							tempEvent.instance = node.instance
 							tempEvent.hostname = node.hostname
 							if self.eventsLifeSpan != 0:
-								self.events.append(tempEvent)
+								self._addEvent(tempEvent)
 
 						# check if a newer revision for this version is
 						# available than the currently used
@@ -953,7 +985,7 @@ class ServerEventHandler:
 								tempEvent.instance = node.instance
 								tempEvent.hostname = node.hostname
 								if self.eventsLifeSpan != 0:
-									self.events.append(tempEvent)
+									self._addEvent(tempEvent)
 
 						node.newestVersion \
 							= self.versionInformer.repoVersions[
@@ -997,7 +1029,7 @@ class ServerEventHandler:
 					tempEvent.hostname = foundNode.hostname
 					tempEvent.description = sensor.description
 					tempEvent.state = sensor.state
-					self.events.append(tempEvent)
+					self._addEvent(tempEvent)
 
 
 		# update the local server information
@@ -1011,4 +1043,10 @@ class ServerEventHandler:
 		else:
 			# empty sensor alerts list to prevent it
 			# from getting too big
-			del self.sensorAlerts[:]
\ No newline at end of file
+			del self.sensorAlerts[:]
+
+		# update the snapshot of the status cache
+		if not self.statusCache is None:
+			self.statusCache.update(self.serverTime, self.options,
+				self.nodes, self.sensors, self.managers, self.alerts,
+				self.alertLevels)
\ No newline at end of file
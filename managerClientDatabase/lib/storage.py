@@ -51,692 +51,795 @@ class _Storage():
 		raise NotImplemented("Function not implemented yet.")
 
 
-# class for using mysql as storage backend
-class Mysql(_Storage):
+# internal class that is the base for all threads that work with
+# their own persistent connection on the mysql database
+class _MysqlWorker(threading.Thread):
 
-	def __init__(self, host, port, database, username, password, globalData):
+	def __init__(self, storage):
+		threading.Thread.__init__(self)
 
 		# file nme of this file (used for logging)
 		self.fileName = os.path.basename(__file__)
 
-		# needed mysql parameters
-		self.host = host
-		self.port = port
-		self.database = database
-		self.username = username
-		self.password = password
+		self.storage = storage
 
-		# get global configured data
-		self.globalData = globalData
-		self.sensorAlertLifeSpan = self.globalData.sensorAlertLifeSpan
-		self.events = self.globalData.events
-		self.eventsLifeSpan = self.globalData.eventsLifeSpan
-		self.version = self.globalData.version
-		self.rev = self.globalData.rev
-		self.options = self.globalData.options
-		self.nodes = self.globalData.nodes
-		self.sensors = self.globalData.sensors
-		self.alerts = self.globalData.alerts
-		self.managers = self.globalData.managers
-		self.alertLevels = self.globalData.alertLevels
-		self.storageBackendMysqlRetries = \
-			self.globalData.storageBackendMysqlRetries
+		self.conn = None
+		self.cursor = None
 
-		# local copy of elements in the database (to make the update faster)
-		self.optionsCopy = list()
-		self.nodesCopy = list()
-		self.sensorsCopy = list()
-		self.alertsCopy = list()
-		self.managersCopy = list()
-		self.alertLevelsCopy = list()
 
-		# mysql lock
-		self.dbLock = threading.Semaphore(1)
+	# internal function that connects to the mysql server
+	def _openConnection(self):
+		# import the needed package
+		import MySQLdb
 
-		self.conn = None
+		self.conn = MySQLdb.connect(host=self.storage.host,
+			port=self.storage.port, user=self.storage.username,
+			passwd=self.storage.password, db=self.storage.database)
+		self.cursor = self.conn.cursor()
+
+
+	# internal function that closes the connection to the mysql server
+	def _closeConnection(self):
+		try:
+			self.cursor.close()
+			self.conn.close()
+		except Exception as e:
+			pass
 		self.cursor = None
+		self.conn = None
 
-		# connect to the database
-		self._openConnection()
 
-		# check if version of database is the same as version of client
-		self.cursor.execute("SHOW TABLES LIKE 'internals'")
-		result = self.cursor.fetchall()
-		if len(result) != 0:
+# internal class that writes the occurred events in batches to the
+# mysql database (uses its own persistent connection and runs in its
+# own thread in order to not block the thread handling the server events)
+class _MysqlEventWriter(_MysqlWorker):
+
+	# type name, table and columns of each event
+	# (the values of the columns are the attributes of the event
+	# with the same names)
+	eventSpecs = {
+		EventSensorAlert: ("sensorAlert", "eventsSensorAlert",
+			("description", "state", "dataType")),
+		EventNewVersion: ("newVersion", "eventsNewVersion",
+			("usedVersion", "usedRev", "newVersion", "newRev", "instance",
+			"hostname")),
+		EventStateChange: ("stateChange", "eventsStateChange",
+			("hostname", "description", "state", "dataType")),
+		EventConnectedChange: ("connectedChange", "eventsConnectedChange",
+			("hostname", "nodeType", "instance", "connected")),
+		EventSensorTimeOut: ("sensorTimeOut", "eventsSensorTimeOut",
+			("hostname", "description", "state")),
+		EventNewOption: ("newOption", "eventsNewOption",
+			("type", "value")),
+		EventNewNode: ("newNode", "eventsNewNode",
+			("hostname", "nodeType", "instance")),
+		EventNewSensor: ("newSensor", "eventsNewSensor",
+			("hostname", "description", "state")),
+		EventNewAlert: ("newAlert", "eventsNewAlert",
+			("hostname", "description")),
+		EventNewManager: ("newManager", "eventsNewManager",
+			("hostname", "description")),
+		EventChangeOption: ("changeOption", "eventsChangeOption",
+			("type", "oldValue", "newValue")),
+		EventChangeNode: ("changeNode", "eventsChangeNode",
+			("oldHostname", "oldNodeType", "oldInstance", "oldVersion",
+			"oldRev", "oldUsername", "oldPersistent", "newHostname",
+			"newNodeType", "newInstance", "newVersion", "newRev",
+			"newUsername", "newPersistent")),
+		EventChangeSensor: ("changeSensor", "eventsChangeSensor",
+			("oldAlertDelay", "oldDescription", "oldRemoteSensorId",
+			"newAlertDelay", "newDescription", "newRemoteSensorId")),
+		EventChangeAlert: ("changeAlert", "eventsChangeAlert",
+			("oldDescription", "oldRemoteAlertId", "newDescription",
+			"newRemoteAlertId")),
+		EventChangeManager: ("changeManager", "eventsChangeManager",
+			("oldDescription", "newDescription")),
+		EventDeleteNode: ("deleteNode", "eventsDeleteNode",
+			("hostname", "nodeType", "instance")),
+		EventDeleteSensor: ("deleteSensor", "eventsDeleteSensor",
+			("description", )),
+		EventDeleteAlert: ("deleteAlert", "eventsDeleteAlert",
+			("description", )),
+		EventDeleteManager: ("deleteManager", "eventsDeleteManager",
+			("description", )),
+		}
+
+	def __init__(self, storage):
+		_MysqlWorker.__init__(self, storage)
+
+		self.events = storage.events
+
+		# maximal number of events that are written in one transaction
+		self.batchSize = 500
+
+		# number of times a batch is retried before it is discarded
+		self.maxBatchRetries = 3
+
+		# used to wake up the writer when new events were queued
+		self.eventQueued = threading.Event()
+
+		# statistics
+		self.eventsWritten = 0
+
+
+	# signals the writer that new events are queued
+	def flush(self):
+		self.eventQueued.set()
+
+
+	# internal function that inserts the given events in one transaction
+	# (the base rows are inserted one by one in order to get the id
+	# of each event, the data rows with one multi-row insert per table)
+	#
+	# no return value but raise exception if it fails
+	def _writeBatch(self, batch):
+
+		# insert base rows of all events and get their ids
+		# (ids of a multi-row insert are not necessarily consecutive,
+		# for example with auto_increment_increment > 1)
+		eventIds = list()
+		for event in batch:
+			self.cursor.execute("INSERT INTO events ("
+				+ "timeOccurred, "
+				+ "type) "
+				+ "VALUES (%s, %s)",
+				(event.timeOccurred, self.eventSpecs[event.__class__][0]))
+			eventIds.append(self.cursor.lastrowid)
+
+		# group rows by table
+		rowsByTable = dict()
+		dataInt = list()
+		dataFloat = list()
+		for eventId, event in zip(eventIds, batch):
+			_, table, columns = self.eventSpecs[event.__class__]
+			rowsByTable.setdefault(table, list()).append(
+				(eventId, ) + tuple(getattr(event, x) for x in columns))
+
+			# Only store data if the event carries it.
+			if isinstance(event, EventSensorAlert):
+				data = event.sensorData
+			elif isinstance(event, EventStateChange):
+				data = event.data
+			else:
+				continue
+			if event.dataType == SensorDataType.INT:
+				dataInt.append( (eventId, data) )
+			elif event.dataType == SensorDataType.FLOAT:
+				dataFloat.append( (eventId, data) )
+
+		for spec in self.eventSpecs.values():
+			table, columns = spec[1], spec[2]
+			if not table in rowsByTable:
+				continue
+			self.cursor.executemany("INSERT INTO " + table + " ("
+				+ "eventId, "
+				+ ", ".join(columns)
+				+ ") VALUES ("
+				+ ", ".join(["%s"] * (len(columns) + 1))
+				+ ")",
+				rowsByTable[table])
+
+		if dataInt:
+			self.cursor.executemany("INSERT INTO eventsDataInt ("
+				+ "eventId, "
+				+ "data) "
+				+ "VALUES (%s, %s)",
+				dataInt)
+		if dataFloat:
+			self.cursor.executemany("INSERT INTO eventsDataFloat ("
+				+ "eventId, "
+				+ "data) "
+				+ "VALUES (%s, %s)",
+				dataFloat)
 
-			self.cursor.execute("SELECT type, value FROM internals")
-			result = self.cursor.fetchall()
 
-			dbVersion = 0.0
-			dbRev = 0.0
-			for internalTuple in result: 
-				internalType = internalTuple[0]
-				internalValue = internalTuple[1]
+	# internal function that takes the next batch of events from the queue
+	def _getBatch(self):
+		batch = list()
+		while self.events and len(batch) < self.batchSize:
+			event = self.events.popleft()
+			if not event.__class__ in self.eventSpecs:
+				logging.error("[%s]: Used event not known."
+					% self.fileName)
+				continue
+			batch.append(event)
+		return batch
 
-				if internalType.upper() == "VERSION":
-					dbVersion = internalValue
-					continue
-				elif internalType.upper() == "REV":
-					dbRev = internalValue
-					continue
 
-			# if version is not the same of db and client
-			# => delete event tables
-			if (dbVersion != self.version
-				or dbRev != self.rev):
-				
-				self.cursor.execute("DROP TABLE IF EXISTS eventsNewVersion")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsSensorAlert")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsStateChange")
-				self.cursor.execute(
-					"DROP TABLE IF EXISTS eventsConnectedChange")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsSensorTimeOut")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsNewOption")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsNewNode")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsNewSensor")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsNewAlert")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsNewManager")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeOption")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeNode")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeSensor")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeAlert")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeManager")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsDeleteNode")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsDeleteSensor")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsDeleteAlert")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsDeleteManager")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsDataInt")
-				self.cursor.execute("DROP TABLE IF EXISTS eventsDataFloat")
-				self.cursor.execute("DROP TABLE IF EXISTS events")
-				self.cursor.execute("DROP TABLE IF EXISTS internals")
-				self.cursor.execute("DROP TABLE IF EXISTS options")
-				self.cursor.execute("DROP TABLE IF EXISTS sensorsAlertLevels")
-				self.cursor.execute(
-					"DROP TABLE IF EXISTS sensorAlertsAlertLevels")
-				self.cursor.execute(
-					"DROP TABLE IF EXISTS sensorAlertsDataInt")
-				self.cursor.execute(
-					"DROP TABLE IF EXISTS sensorAlertsDataFloat")
-				self.cursor.execute("DROP TABLE IF EXISTS sensorAlerts")
-				self.cursor.execute("DROP TABLE IF EXISTS sensorsDataInt")
-				self.cursor.execute("DROP TABLE IF EXISTS sensorsDataFloat")
-				self.cursor.execute("DROP TABLE IF EXISTS sensors")
-				self.cursor.execute("DROP TABLE IF EXISTS alertsAlertLevels")
-				self.cursor.execute("DROP TABLE IF EXISTS alerts")
-				self.cursor.execute("DROP TABLE IF EXISTS managers")
-				self.cursor.execute("DROP TABLE IF EXISTS alertLevels")
-				self.cursor.execute("DROP TABLE IF EXISTS nodes")
+	def run(self):
 
-				# commit all changes
-				self.conn.commit()
+		batch = list()
+		batchRetries = 0
 
-				# close connection to the database
-				self._closeConnection()
+		while True:
 
-				self.createStorage()
+			if not batch:
+				batch = self._getBatch()
+				batchRetries = 0
 
-			else:
+			if not batch:
+				self.eventQueued.wait()
+				self.eventQueued.clear()
+				continue
 
-				# commit all changes
+			try:
+				if self.conn is None:
+					self._openConnection()
+
+				self._writeBatch(batch)
 				self.conn.commit()
 
-				# close connection to the database
+				self.eventsWritten += len(batch)
+				logging.debug("[%s]: Added %d events (%d in total)."
+					% (self.fileName, len(batch), self.eventsWritten))
+
+				batch = list()
+
+			except Exception as e:
+				logging.exception("[%s]: Not able to add events."
+					% self.fileName)
+
+				try:
+					self.conn.rollback()
+				except Exception as e:
+					pass
 				self._closeConnection()
 
-				self.createObjectsFromDb()
+				batchRetries += 1
+				if batchRetries >= self.maxBatchRetries:
+					logging.error("[%s]: Discarding %d events."
+						% (self.fileName, len(batch)))
+					batch = list()
 
-		# tables do not exist yet
-		# => create them
-		else:
-			
-			# close connection to the database
-			self._closeConnection()
+				time.sleep(5)
 
-			self.createStorage()
 
+# internal class that writes the sensor data samples in batches to the
+# sensor data history of the mysql database and rolls them up into
+# buckets per minute and per hour in the same transaction (uses its own
+# persistent connection and runs in its own thread)
+class _MysqlSensorHistoryWriter(_MysqlWorker):
 
+	# tables of the roll ups and the length of their buckets in seconds
+	rollUpTables = [("sensorsHistoryMinute", 60),
+		("sensorsHistoryHour", 3600)]
 
-	# internal function that acquires the lock
-	def _acquireLock(self):
-		logging.debug("[%s]: Acquire lock." % self.fileName)
-		self.dbLock.acquire()
+	def __init__(self, storage):
+		_MysqlWorker.__init__(self, storage)
+
+		self.samples = storage.sensorHistory
+
+		# maximal number of samples that are written in one transaction
+		self.batchSize = 1000
+
+		# number of times a batch is retried before it is discarded
+		self.maxBatchRetries = 3
+
+		# used to wake up the writer when new samples were queued
+		self.sampleQueued = threading.Event()
 
+		# statistics
+		self.samplesWritten = 0
 
-	# internal function that adds all events from the queue to the database
+
+	# signals the writer that new samples are queued
+	def flush(self):
+		self.sampleQueued.set()
+
+
+	# internal function that inserts the given samples and adds them
+	# to the buckets of the roll ups
 	#
-	# return True or False
-	def _addEventsToDb(self):
+	# no return value but raise exception if it fails
+	def _writeBatch(self, batch):
+
+		self.cursor.executemany("INSERT INTO sensorsHistory ("
+			+ "sensorId, "
+			+ "timeReceived, "
+			+ "data) "
+			+ "VALUES (%s, %s, %s)",
+			batch)
+
+		for table, bucketLength in self.rollUpTables:
+
+			# aggregate the samples of the batch per sensor and bucket
+			# (list of sample count, minimum, maximum, sum and last value;
+			# the samples are ordered by the time they were received)
+			buckets = dict()
+			for sensorId, timeReceived, data in batch:
+				key = (sensorId, timeReceived - (timeReceived % bucketLength))
+				bucket = buckets.get(key)
+				if bucket is None:
+					buckets[key] = [1, data, data, data, data]
+				else:
+					bucket[0] += 1
+					bucket[1] = min(bucket[1], data)
+					bucket[2] = max(bucket[2], data)
+					bucket[3] += data
+					bucket[4] = data
+
+			# merge the aggregated samples into the stored buckets
+			self.cursor.executemany("INSERT INTO " + table + " ("
+				+ "sensorId, "
+				+ "timeStart, "
+				+ "samples, "
+				+ "minData, "
+				+ "maxData, "
+				+ "sumData, "
+				+ "lastData) "
+				+ "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+				+ "ON DUPLICATE KEY UPDATE "
+				+ "samples = samples + VALUES(samples), "
+				+ "minData = LEAST(minData, VALUES(minData)), "
+				+ "maxData = GREATEST(maxData, VALUES(maxData)), "
+				+ "sumData = sumData + VALUES(sumData), "
+				+ "lastData = VALUES(lastData)",
+				[bucketKey + tuple(bucketValues)
+				for bucketKey, bucketValues in buckets.iteritems()])
+
+
+	# internal function that takes the next batch of samples from the queue
+	def _getBatch(self):
+		batch = list()
+		while self.samples and len(batch) < self.batchSize:
+			batch.append(self.samples.popleft())
+		return batch
+
+
+	def run(self):
+
+		batch = list()
+		batchRetries = 0
 
-		# add all events to the database (if any exists)
-		while len(self.events) != 0:
+		while True:
 
-			event = self.events.pop()
+			if not batch:
+				batch = self._getBatch()
+				batchRetries = 0
 
-			# insert event into the database
-			if isinstance(event, EventSensorAlert):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "sensorAlert"))
+			if not batch:
+				self.sampleQueued.wait()
+				self.sampleQueued.clear()
+				continue
 
-					eventId = self.cursor.lastrowid
+			try:
+				if self.conn is None:
+					self._openConnection()
 
-					self.cursor.execute("INSERT INTO eventsSensorAlert ("
-						+ "eventId, "
-						+ "description, "
-						+ "state, "
-						+ "dataType) "
-						+ "VALUES (%s, %s, %s, %s)",
-						(eventId, event.description, event.state,
-						event.dataType))
-
-					# Only store data if sensor alert event carries it.
-					if event.dataType == SensorDataType.INT:
-						self.cursor.execute("INSERT INTO eventsDataInt ("
-							+ "eventId, "
-							+ "data) "
-							+ "VALUES (%s, %s)",
-							(eventId, event.sensorData))
-					elif event.dataType == SensorDataType.FLOAT:
-						self.cursor.execute("INSERT INTO eventsDataFloat ("
-							+ "eventId, "
-							+ "data) "
-							+ "VALUES (%s, %s)",
-							(eventId, event.sensorData))
+				self._writeBatch(batch)
+				self.conn.commit()
 
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "sensor alert event.")
+				self.samplesWritten += len(batch)
+				logging.debug("[%s]: Added %d sensor data samples "
+					% (self.fileName, len(batch))
+					+ "(%d in total)."
+					% self.samplesWritten)
 
-					return False
+				batch = list()
+
+			except Exception as e:
+				logging.exception("[%s]: Not able to add sensor data "
+					% self.fileName
+					+ "samples.")
 
-			elif isinstance(event, EventNewVersion):
 				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "newVersion"))
+					self.conn.rollback()
+				except Exception as e:
+					pass
+				self._closeConnection()
 
-					eventId = self.cursor.lastrowid
+				batchRetries += 1
+				if batchRetries >= self.maxBatchRetries:
+					logging.error("[%s]: Discarding %d sensor data samples."
+						% (self.fileName, len(batch)))
+					batch = list()
 
-					self.cursor.execute("INSERT INTO eventsNewVersion ("
-						+ "eventId, "
-						+ "usedVersion, "
-						+ "usedRev, "
-						+ "newVersion, "
-						+ "newRev, "
-						+ "instance, "
-						+ "hostname) "
-						+ "VALUES (%s, %s, %s, %s, %s, %s, %s)",
-						(eventId, event.usedVersion, event.usedRev,
-						event.newVersion, event.newRev, event.instance,
-						event.hostname))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "new version event.")
+				time.sleep(5)
 
-					return False
 
-			elif isinstance(event, EventStateChange):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "stateChange"))
+# internal class that removes all events, sensor alerts and sensor data
+# history from the mysql database that are older than the configured
+# life spans
+# (deletes them set-based in bounded chunks in its own thread in order
+# to not hold the storage lock during the purge)
+class _MysqlPurger(_MysqlWorker):
 
-					eventId = self.cursor.lastrowid
+	# tables that reference events
+	eventSubTables = [spec[1] for spec in
+		_MysqlEventWriter.eventSpecs.values()] \
+		+ ["eventsDataInt", "eventsDataFloat"]
 
-					self.cursor.execute("INSERT INTO eventsStateChange ("
-						+ "eventId, "
-						+ "hostname, "
-						+ "description, "
-						+ "state, "
-						+ "dataType) "
-						+ "VALUES (%s, %s, %s, %s, %s)",
-						(eventId, event.hostname, event.description,
-						event.state, event.dataType))
-
-					# Only store data if state change event carries it.
-					if event.dataType == SensorDataType.INT:
-						self.cursor.execute("INSERT INTO eventsDataInt ("
-							+ "eventId, "
-							+ "data) "
-							+ "VALUES (%s, %s)",
-							(eventId, event.data))
-					elif event.dataType == SensorDataType.FLOAT:
-						self.cursor.execute("INSERT INTO eventsDataFloat ("
-							+ "eventId, "
-							+ "data) "
-							+ "VALUES (%s, %s)",
-							(eventId, event.data))
+	# tables that reference sensor alerts
+	sensorAlertSubTables = ["sensorAlertsAlertLevels",
+		"sensorAlertsDataInt", "sensorAlertsDataFloat"]
 
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "state changed event.")
+	def __init__(self, storage):
+		_MysqlWorker.__init__(self, storage)
 
-					return False
+		self.sensorAlertLifeSpan = storage.sensorAlertLifeSpan
+		self.eventsLifeSpan = storage.eventsLifeSpan
+		self.sensorHistoryLifeSpan = storage.sensorHistoryLifeSpan
+		self.sensorHistoryRawLifeSpan = storage.sensorHistoryRawLifeSpan
 
-			elif isinstance(event, EventConnectedChange):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "connectedChange"))
+		# interval in seconds in which the purge is executed
+		self.purgeInterval = 60
 
-					eventId = self.cursor.lastrowid
+		# maximal number of rows of the main table that are deleted
+		# in one transaction
+		self.chunkSize = 1000
 
-					self.cursor.execute("INSERT INTO eventsConnectedChange ("
-						+ "eventId, "
-						+ "hostname, "
-						+ "nodeType, "
-						+ "instance, "
-						+ "connected) "
-						+ "VALUES (%s, %s, %s, %s, %s)",
-						(eventId, event.hostname, event.nodeType,
-						event.instance, event.connected))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "connection changed event.")
+		# flag if the indexes needed for the purge were checked
+		self.indexesChecked = False
 
-					return False
 
-			elif isinstance(event, EventSensorTimeOut):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "sensorTimeOut"))
+	# internal function that creates the indexes on the time columns
+	# if they do not exist (databases created by older versions do
+	# not have them)
+	def _createIndexes(self):
 
-					eventId = self.cursor.lastrowid
+		for table, timeColumn in [("sensorAlerts", "timeReceived"),
+			("events", "timeOccurred")]:
 
-					self.cursor.execute("INSERT INTO eventsSensorTimeOut ("
-						+ "eventId, "
-						+ "hostname, "
-						+ "description, "
-						+ "state) "
-						+ "VALUES (%s, %s, %s, %s)",
-						(eventId, event.hostname, event.description,
-						event.state))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "sensor timed out event.")
+			self.cursor.execute("SHOW INDEX FROM " + table + " "
+				+ "WHERE Column_name = %s",
+				(timeColumn, ))
+			result = self.cursor.fetchall()
+			if len(result) == 0:
 
-					return False
+				logging.info("[%s]: Creating index for column '%s' "
+					% (self.fileName, timeColumn)
+					+ "of table '%s'."
+					% table)
 
-			elif isinstance(event, EventNewOption):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "newOption"))
+				self.cursor.execute("CREATE INDEX "
+					+ timeColumn + "Index "
+					+ "ON " + table + " (" + timeColumn + ")")
 
-					eventId = self.cursor.lastrowid
+		self.indexesChecked = True
 
-					self.cursor.execute("INSERT INTO eventsNewOption ("
-						+ "eventId, "
-						+ "type, "
-						+ "value) "
-						+ "VALUES (%s, %s, %s)",
-						(eventId, event.type, event.value))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "new option event.")
 
-					return False
+	# internal function that removes all expired rows of the given main
+	# table and the rows referencing them in the given sub tables
+	# in chunks (each chunk is committed on its own)
+	#
+	# returns the number of removed rows of the main table
+	def _purgeTable(self, table, timeColumn, subTables, foreignKey,
+		cutoffTime):
 
-			elif isinstance(event, EventNewNode):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "newNode"))
+		rowsRemoved = 0
+		while True:
 
-					eventId = self.cursor.lastrowid
+			# get the highest id of the next chunk of expired rows
+			# (the rows of the chunk are all expired rows with
+			# an id up to this one)
+			self.cursor.execute("SELECT MAX(id) FROM "
+				+ "(SELECT id FROM " + table + " "
+				+ "WHERE " + timeColumn + " <= %s "
+				+ "ORDER BY id ASC LIMIT %s) AS chunk",
+				(cutoffTime, self.chunkSize))
+			result = self.cursor.fetchall()
+			maxId = result[0][0]
+			if maxId is None:
+				break
 
-					self.cursor.execute("INSERT INTO eventsNewNode ("
-						+ "eventId, "
-						+ "hostname, "
-						+ "nodeType, "
-						+ "instance) "
-						+ "VALUES (%s, %s, %s, %s)",
-						(eventId, event.hostname, event.nodeType,
-						event.instance))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "new node event.")
+			for subTable in subTables:
+				self.cursor.execute("DELETE " + subTable + " "
+					+ "FROM " + subTable + " "
+					+ "INNER JOIN " + table + " "
+					+ "ON " + subTable + "." + foreignKey
+					+ " = " + table + ".id "
+					+ "WHERE " + table + ".id <= %s "
+					+ "AND " + table + "." + timeColumn + " <= %s",
+					(maxId, cutoffTime))
 
-					return False
+			self.cursor.execute("DELETE FROM " + table + " "
+				+ "WHERE id <= %s "
+				+ "AND " + timeColumn + " <= %s",
+				(maxId, cutoffTime))
+			rowsRemoved += self.cursor.rowcount
 
-			elif isinstance(event, EventNewSensor):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "newSensor"))
+			self.conn.commit()
 
-					eventId = self.cursor.lastrowid
+		return rowsRemoved
 
-					self.cursor.execute("INSERT INTO eventsNewSensor ("
-						+ "eventId, "
-						+ "hostname, "
-						+ "description, "
-						+ "state) "
-						+ "VALUES (%s, %s, %s, %s)",
-						(eventId, event.hostname, event.description,
-						event.state))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "new sensor event.")
 
-					return False
+	# internal function that removes all expired buckets of the given
+	# roll up table in chunks (each chunk is committed on its own)
+	#
+	# returns the number of removed buckets
+	def _purgeRollUpTable(self, table, cutoffTime):
 
-			elif isinstance(event, EventNewAlert):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "newAlert"))
+		rowsRemoved = 0
+		while True:
 
-					eventId = self.cursor.lastrowid
+			self.cursor.execute("DELETE FROM " + table + " "
+				+ "WHERE timeStart <= %s "
+				+ "LIMIT %s",
+				(cutoffTime, self.chunkSize))
+			chunkRemoved = self.cursor.rowcount
+			rowsRemoved += chunkRemoved
 
-					self.cursor.execute("INSERT INTO eventsNewAlert ("
-						+ "eventId, "
-						+ "hostname, "
-						+ "description) "
-						+ "VALUES (%s, %s, %s)",
-						(eventId, event.hostname, event.description))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "new alert event.")
+			self.conn.commit()
 
-					return False
+			if chunkRemoved < self.chunkSize:
+				break
 
-			elif isinstance(event, EventNewManager):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "newManager"))
+		return rowsRemoved
 
-					eventId = self.cursor.lastrowid
 
-					self.cursor.execute("INSERT INTO eventsNewManager ("
-						+ "eventId, "
-						+ "hostname, "
-						+ "description) "
-						+ "VALUES (%s, %s, %s)",
-						(eventId, event.hostname, event.description))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "new manager event.")
+	# removes all events, sensor alerts and sensor data history
+	# that are too old
+	#
+	# no return value but raise exception if it fails
+	def purge(self):
 
-					return False
+		if self.conn is None:
+			self._openConnection()
 
-			elif isinstance(event, EventChangeOption):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "changeOption"))
+		if not self.indexesChecked:
+			self._createIndexes()
 
-					eventId = self.cursor.lastrowid
+		startTime = time.time()
+		utcTimestamp = int(startTime)
 
-					self.cursor.execute("INSERT INTO eventsChangeOption ("
-						+ "eventId, "
-						+ "type, "
-						+ "oldValue, "
-						+ "newValue) "
-						+ "VALUES (%s, %s, %s, %s)",
-						(eventId, event.type, event.oldValue, event.newValue))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "option changed event.")
+		# delete all sensor alerts that are older than the configured
+		# life span
+		sensorAlertsRemoved = self._purgeTable("sensorAlerts",
+			"timeReceived", self.sensorAlertSubTables, "sensorAlertId",
+			utcTimestamp - (self.sensorAlertLifeSpan * 86400))
 
-					return False
+		# delete all events that are older than the configured life span
+		# (if it is activated to store events)
+		eventsRemoved = 0
+		if self.eventsLifeSpan > 0:
+			eventsRemoved = self._purgeTable("events",
+				"timeOccurred", self.eventSubTables, "eventId",
+				utcTimestamp - (self.eventsLifeSpan * 86400))
+
+		# delete all sensor data samples and roll ups that are older
+		# than the configured life spans
+		# (if it is activated to store the sensor data history)
+		historyRemoved = 0
+		if self.sensorHistoryLifeSpan > 0:
+			rawCutoffTime = utcTimestamp \
+				- (self.sensorHistoryRawLifeSpan * 86400)
+			historyRemoved += self._purgeTable("sensorsHistory",
+				"timeReceived", [], None, rawCutoffTime)
+			historyRemoved += self._purgeRollUpTable("sensorsHistoryMinute",
+				rawCutoffTime)
+			historyRemoved += self._purgeRollUpTable("sensorsHistoryHour",
+				utcTimestamp - (self.sensorHistoryLifeSpan * 86400))
+
+		rowsRemoved = sensorAlertsRemoved + eventsRemoved + historyRemoved
+		if rowsRemoved > 0:
+			duration = max(time.time() - startTime, 0.001)
+			logging.info("[%s]: Removed %d old sensor alerts, "
+				% (self.fileName, sensorAlertsRemoved)
+				+ "%d old events and %d old sensor data history rows "
+				% (eventsRemoved, historyRemoved)
+				+ "in %.2f seconds (%.0f rows/s)."
+				% (duration, rowsRemoved / duration))
+
+
+	def run(self):
 
-			elif isinstance(event, EventChangeNode):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "changeNode"))
-
-					eventId = self.cursor.lastrowid
-
-					self.cursor.execute("INSERT INTO eventsChangeNode ("
-						+ "eventId, "
-						+ "oldHostname, "
-						+ "oldNodeType, "
-						+ "oldInstance, "
-						+ "oldVersion, "
-						+ "oldRev, "
-						+ "oldUsername, "
-						+ "oldPersistent, "
-						+ "newHostname, "
-						+ "newNodeType, "
-						+ "newInstance, "
-						+ "newVersion, "
-						+ "newRev, "
-						+ "newUsername, "
-						+ "newPersistent) "
-						+ "VALUES "
-						+ "(%s, %s, %s, %s, %s, %s, %s, %s, %s, "
-						+ "%s, %s, %s, %s, %s, %s)",
-						(eventId, event.oldHostname, event.oldNodeType,
-						event.oldInstance, event.oldVersion,
-						event.oldRev, event.oldUsername, event.oldPersistent,
-						event.newHostname, event.newNodeType,
-						event.newInstance, event.newVersion, event.newRev,
-						event.newUsername, event.newPersistent))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "node changed event.")
+		while True:
 
-					return False
+			try:
+				self.purge()
+
+			except Exception as e:
+				logging.exception("[%s]: Not able to remove old "
+					% self.fileName
+					+ "sensor alerts, events and sensor data history.")
 
-			elif isinstance(event, EventChangeSensor):
 				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "changeSensor"))
-
-					eventId = self.cursor.lastrowid
-
-					self.cursor.execute("INSERT INTO eventsChangeSensor ("
-						+ "eventId, "
-						+ "oldAlertDelay, "
-						+ "oldDescription, "
-						+ "oldRemoteSensorId, "
-						+ "newAlertDelay, "
-						+ "newDescription, "
-						+ "newRemoteSensorId) "
-						+ "VALUES "
-						+ "(%s, %s, %s, %s, %s, %s, %s)",
-						(eventId, event.oldAlertDelay, event.oldDescription,
-						event.oldRemoteSensorId,
-						event.newAlertDelay, event.newDescription,
-						event.newRemoteSensorId))
+					self.conn.rollback()
 				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "sensor changed event.")
+					pass
+				self._closeConnection()
 
-					return False
+			time.sleep(self.purgeInterval)
 
-			elif isinstance(event, EventChangeAlert):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "changeAlert"))
 
-					eventId = self.cursor.lastrowid
+# class for using mysql as storage backend
+class Mysql(_Storage):
 
-					self.cursor.execute("INSERT INTO eventsChangeAlert ("
-						+ "eventId, "
-						+ "oldDescription, "
-						+ "oldRemoteAlertId, "
-						+ "newDescription, "
-						+ "newRemoteAlertId) "
-						+ "VALUES "
-						+ "(%s, %s, %s, %s, %s)",
-						(eventId, event.oldDescription, event.oldRemoteAlertId,
-						event.newDescription, event.newRemoteAlertId))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "alert changed event.")
+	def __init__(self, host, port, database, username, password, globalData):
 
-					return False
+		# file nme of this file (used for logging)
+		self.fileName = os.path.basename(__file__)
 
-			elif isinstance(event, EventChangeManager):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "changeManager"))
+		# needed mysql parameters
+		self.host = host
+		self.port = port
+		self.database = database
+		self.username = username
+		self.password = password
 
-					eventId = self.cursor.lastrowid
+		# get global configured data
+		self.globalData = globalData
+		self.sensorAlertLifeSpan = self.globalData.sensorAlertLifeSpan
+		self.events = self.globalData.events
+		self.eventsLifeSpan = self.globalData.eventsLifeSpan
+		self.sensorHistory = self.globalData.sensorHistory
+		self.sensorHistoryLifeSpan = self.globalData.sensorHistoryLifeSpan
+		self.sensorHistoryRawLifeSpan = \
+			self.globalData.sensorHistoryRawLifeSpan
+		self.version = self.globalData.version
+		self.rev = self.globalData.rev
+		self.options = self.globalData.options
+		self.nodes = self.globalData.nodes
+		self.sensors = self.globalData.sensors
+		self.alerts = self.globalData.alerts
+		self.managers = self.globalData.managers
+		self.alertLevels = self.globalData.alertLevels
+		self.storageBackendMysqlRetries = \
+			self.globalData.storageBackendMysqlRetries
 
-					self.cursor.execute("INSERT INTO eventsChangeManager ("
-						+ "eventId, "
-						+ "oldDescription, "
-						+ "newDescription) "
-						+ "VALUES "
-						+ "(%s, %s, %s)",
-						(eventId, event.oldDescription, event.newDescription))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "manager changed event.")
+		# local copy of elements in the database (to make the update faster)
+		self.optionsCopy = list()
+		self.nodesCopy = list()
+		self.sensorsCopy = list()
+		self.alertsCopy = list()
+		self.managersCopy = list()
+		self.alertLevelsCopy = list()
 
-					return False
+		# mysql lock
+		self.dbLock = threading.Semaphore(1)
 
-			elif isinstance(event, EventDeleteNode):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "deleteNode"))
+		# thread that writes the events to the database
+		# (only used if it is activated to store events)
+		self.eventWriter = None
+
+		# thread that writes the sensor data history to the database
+		# (only used if it is activated to store the sensor data history)
+		self.sensorHistoryWriter = None
+
+		# maximal number of rows a sensor data history query returns
+		self.maxSensorHistoryRows = 10000
+
+		# thread that removes old sensor alerts, events and
+		# sensor data history
+		self.purger = None
+
+		self.conn = None
+		self.cursor = None
+
+		# connect to the database
+		self._openConnection()
 
-					eventId = self.cursor.lastrowid
+		# check if version of database is the same as version of client
+		self.cursor.execute("SHOW TABLES LIKE 'internals'")
+		result = self.cursor.fetchall()
+		if len(result) != 0:
 
-					self.cursor.execute("INSERT INTO eventsDeleteNode ("
-						+ "eventId, "
-						+ "hostname, "
-						+ "nodeType, "
-						+ "instance) "
-						+ "VALUES (%s, %s, %s, %s)",
-						(eventId, event.hostname, event.nodeType,
-						event.instance))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "node deleted event.")
+			self.cursor.execute("SELECT type, value FROM internals")
+			result = self.cursor.fetchall()
 
-					return False
+			dbVersion = 0.0
+			dbRev = 0.0
+			for internalTuple in result: 
+				internalType = internalTuple[0]
+				internalValue = internalTuple[1]
 
-			elif isinstance(event, EventDeleteSensor):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "deleteSensor"))
+				if internalType.upper() == "VERSION":
+					dbVersion = internalValue
+					continue
+				elif internalType.upper() == "REV":
+					dbRev = internalValue
+					continue
 
-					eventId = self.cursor.lastrowid
+			# if version is not the same of db and client
+			# => delete event tables
+			if (dbVersion != self.version
+				or dbRev != self.rev):
+				
+				self.cursor.execute("DROP TABLE IF EXISTS eventsNewVersion")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsSensorAlert")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsStateChange")
+				self.cursor.execute(
+					"DROP TABLE IF EXISTS eventsConnectedChange")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsSensorTimeOut")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsNewOption")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsNewNode")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsNewSensor")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsNewAlert")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsNewManager")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeOption")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeNode")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeSensor")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeAlert")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsChangeManager")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsDeleteNode")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsDeleteSensor")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsDeleteAlert")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsDeleteManager")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsDataInt")
+				self.cursor.execute("DROP TABLE IF EXISTS eventsDataFloat")
+				self.cursor.execute("DROP TABLE IF EXISTS events")
+				self.cursor.execute("DROP TABLE IF EXISTS internals")
+				self.cursor.execute("DROP TABLE IF EXISTS options")
+				self.cursor.execute("DROP TABLE IF EXISTS sensorsAlertLevels")
+				self.cursor.execute(
+					"DROP TABLE IF EXISTS sensorAlertsAlertLevels")
+				self.cursor.execute(
+					"DROP TABLE IF EXISTS sensorAlertsDataInt")
+				self.cursor.execute(
+					"DROP TABLE IF EXISTS sensorAlertsDataFloat")
+				self.cursor.execute("DROP TABLE IF EXISTS sensorAlerts")
+				self.cursor.execute("DROP TABLE IF EXISTS sensorsDataInt")
+				self.cursor.execute("DROP TABLE IF EXISTS sensorsDataFloat")
+				self.cursor.execute("DROP TABLE IF EXISTS sensors")
+				self.cursor.execute("DROP TABLE IF EXISTS alertsAlertLevels")
+				self.cursor.execute("DROP TABLE IF EXISTS alerts")
+				self.cursor.execute("DROP TABLE IF EXISTS managers")
+				self.cursor.execute("DROP TABLE IF EXISTS alertLevels")
+				self.cursor.execute("DROP TABLE IF EXISTS nodes")
 
-					self.cursor.execute("INSERT INTO eventsDeleteSensor ("
-						+ "eventId, "
-						+ "description) "
-						+ "VALUES (%s, %s)",
-						(eventId, event.description))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "sensor deleted event.")
+				# commit all changes
+				self.conn.commit()
 
-					return False
+				# close connection to the database
+				self._closeConnection()
 
-			elif isinstance(event, EventDeleteAlert):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "deleteAlert"))
+				self.createStorage()
 
-					eventId = self.cursor.lastrowid
+			else:
 
-					self.cursor.execute("INSERT INTO eventsDeleteAlert ("
-						+ "eventId, "
-						+ "description) "
-						+ "VALUES (%s, %s)",
-						(eventId, event.description))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "alert deleted event.")
+				# commit all changes
+				self.conn.commit()
 
-					return False
+				# close connection to the database
+				self._closeConnection()
 
-			elif isinstance(event, EventDeleteManager):
-				try:
-					self.cursor.execute("INSERT INTO events ("
-						+ "timeOccurred, "
-						+ "type) "
-						+ "VALUES (%s, %s)",
-						(event.timeOccurred, "deleteManager"))
+				self.createObjectsFromDb()
 
-					eventId = self.cursor.lastrowid
+		# tables do not exist yet
+		# => create them
+		else:
+			
+			# close connection to the database
+			self._closeConnection()
 
-					self.cursor.execute("INSERT INTO eventsDeleteManager ("
-						+ "eventId, "
-						+ "description) "
-						+ "VALUES (%s, %s)",
-						(eventId, event.description))
-				except Exception as e:
-					logging.exception("[%s]: Not able to add "
-						% self.fileName
-						+ "manager deleted event.")
+			self.createStorage()
 
-					return False
+		# create the tables of the sensor data history if they do not exist
+		# (they are kept when the other tables are re-created
+		# because of a version change)
+		if self.sensorHistoryLifeSpan > 0:
+			self._createSensorHistoryStorage()
+
+		# start the thread that removes old sensor alerts, events
+		# and sensor data history
+		self.purger = _MysqlPurger(self)
+		# set thread to daemon
+		# => threads terminates when main thread terminates
+		self.purger.daemon = True
+		self.purger.start()
+
+		# start the thread that writes the events to the database
+		if self.eventsLifeSpan > 0:
+			self.eventWriter = _MysqlEventWriter(self)
+			# set thread to daemon
+			# => threads terminates when main thread terminates
+			self.eventWriter.daemon = True
+			self.eventWriter.start()
+
+		# start the thread that writes the sensor data history
+		# to the database
+		if self.sensorHistoryLifeSpan > 0:
+			self.sensorHistoryWriter = _MysqlSensorHistoryWriter(self)
+			# set thread to daemon
+			# => threads terminates when main thread terminates
+			self.sensorHistoryWriter.daemon = True
+			self.sensorHistoryWriter.start()
 
-			else:
-				logging.error("[%s]: Used event not known."
-					% self.fileName)
 
-		return True
+	# internal function that acquires the lock
+	def _acquireLock(self):
+		logging.debug("[%s]: Acquire lock." % self.fileName)
+		self.dbLock.acquire()
 
 
 	# Internal function that adds the data of the sensor to the database.
@@ -771,6 +874,22 @@ class Mysql(_Storage):
 		self.conn = None
 
 
+	# internal function that discards the connection to the mysql server
+	# after an error (a new connection is established on the next use)
+	def _resetConnection(self):
+		if self.conn is None:
+			return
+		try:
+			self.conn.rollback()
+			self._closeConnection()
+		except Exception as e:
+			logging.exception("[%s]: Not able to close connection "
+				% self.fileName
+				+ "to MySQL server.")
+			self.cursor = None
+			self.conn = None
+
+
 	# internal function that connects to the mysql server
 	# (needed because direct changes to the database by another program
 	# are not seen if the connection to the mysql server is kept alive)
@@ -803,137 +922,84 @@ class Mysql(_Storage):
 				time.sleep(5)
 
 
-	# internal function that releases the lock
-	def _releaseLock(self):
-		logging.debug("[%s]: Release lock." % self.fileName)
-		self.dbLock.release()
+	# internal function that creates the tables of the sensor data history
+	# if they do not exist
+	#
+	# no return value but raise exception if it fails
+	def _createSensorHistoryStorage(self):
 
+		self._acquireLock()
 
-	# internal function that removes all events from the database
-	# that are too old
-	#
-	# return True or False
-	def _removeEventsFromDb(self):
+		# connect to the database
+		try:
+			self._openConnection()
+		except Exception as e:
+			logging.exception("[%s]: Not able to connect to MySQL server." 
+				% self.fileName)
+
+			self._releaseLock()
+
+			# remember to pass the exception
+			raise
 
-		# delete all events that are older than the configured life span 
 		try:
-			utcTimestamp = int(time.time())
-			self.cursor.execute("SELECT id, type FROM events "
-				+ "WHERE (timeOccurred + "
-				+ str(self.eventsLifeSpan * 86400)
-				+ ")"
-				+ "<= %s",
-				(utcTimestamp, ))
+			# create sensorsHistory table if it does not exist
+			# (holds the single sensor data samples)
+			self.cursor.execute("SHOW TABLES LIKE 'sensorsHistory'")
 			result = self.cursor.fetchall()
-			
-			for idTuple in result:
-				eventId = idTuple[0]
-				eventType = idTuple[1]
-
-				if eventType.upper() == "sensorAlert".upper():
-					self.cursor.execute("DELETE FROM eventsSensorAlert "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-					self.cursor.execute("DELETE FROM eventsDataInt "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-					self.cursor.execute("DELETE FROM eventsDataFloat "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "newVersion".upper():
-					self.cursor.execute("DELETE FROM eventsNewVersion "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "stateChange".upper():
-					self.cursor.execute("DELETE FROM eventsStateChange "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-					self.cursor.execute("DELETE FROM eventsDataInt "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-					self.cursor.execute("DELETE FROM eventsDataFloat "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "connectedChange".upper():
-					self.cursor.execute("DELETE FROM eventsConnectedChange "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "sensorTimeOut".upper():
-					self.cursor.execute("DELETE FROM eventsSensorTimeOut "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "newOption".upper():
-					self.cursor.execute("DELETE FROM eventsNewOption "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "newNode".upper():
-					self.cursor.execute("DELETE FROM eventsNewNode "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "newSensor".upper():
-					self.cursor.execute("DELETE FROM eventsNewSensor "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "newAlert".upper():
-					self.cursor.execute("DELETE FROM eventsNewAlert "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "newManager".upper():
-					self.cursor.execute("DELETE FROM eventsNewManager "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "changeOption".upper():
-					self.cursor.execute("DELETE FROM eventsChangeOption "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "changeNode".upper():
-					self.cursor.execute("DELETE FROM eventsChangeNode "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "changeSensor".upper():
-					self.cursor.execute("DELETE FROM eventsChangeSensor "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "changeAlert".upper():
-					self.cursor.execute("DELETE FROM eventsChangeAlert "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "changeManager".upper():
-					self.cursor.execute("DELETE FROM eventsChangeManager "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "deleteNode".upper():
-					self.cursor.execute("DELETE FROM eventsDeleteNode "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "deleteSensor".upper():
-					self.cursor.execute("DELETE FROM eventsDeleteSensor "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "deleteAlert".upper():
-					self.cursor.execute("DELETE FROM eventsDeleteAlert "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				elif eventType.upper() == "deleteManager".upper():
-					self.cursor.execute("DELETE FROM eventsDeleteManager "
-						+ "WHERE eventId = %s",
-						(eventId, ))
-				else:
-					logging.error("[%s]: Stored event not known."
-						% self.fileName)
+			if len(result) == 0:
+				self.cursor.execute("CREATE TABLE sensorsHistory ("
+					+ "id INTEGER PRIMARY KEY AUTO_INCREMENT, "
+					+ "sensorId INTEGER NOT NULL, "
+					+ "timeReceived INTEGER NOT NULL, "
+					+ "data DOUBLE NOT NULL, "
+					+ "INDEX sensorTimeIndex (sensorId, timeReceived), "
+					+ "INDEX timeReceivedIndex (timeReceived))")
+
+			# create the roll up tables if they do not exist
+			# (hold the sample count, minimum, maximum, sum and
+			# last value of the sensor data per bucket)
+			for table, _ in _MysqlSensorHistoryWriter.rollUpTables:
+				self.cursor.execute("SHOW TABLES LIKE %s", (table, ))
+				result = self.cursor.fetchall()
+				if len(result) == 0:
+					self.cursor.execute("CREATE TABLE " + table + " ("
+						+ "sensorId INTEGER NOT NULL, "
+						+ "timeStart INTEGER NOT NULL, "
+						+ "samples INTEGER NOT NULL, "
+						+ "minData DOUBLE NOT NULL, "
+						+ "maxData DOUBLE NOT NULL, "
+						+ "sumData DOUBLE NOT NULL, "
+						+ "lastData DOUBLE NOT NULL, "
+						+ "PRIMARY KEY(sensorId, timeStart), "
+						+ "INDEX timeStartIndex (timeStart))")
+
+			# commit all changes
+			self.conn.commit()
 
-				self.cursor.execute("DELETE FROM events "
-					+ "WHERE id = %s",
-					(eventId, ))
 		except Exception as e:
-			logging.exception("[%s]: Not able to delete old events."
-				% self.fileName)
+			logging.exception("[%s]: Not able to create sensor data "
+				% self.fileName
+				+ "history tables.")
 
-			return False
+			self._closeConnection()
 
-		return True
+			self._releaseLock()
+
+			# remember to pass the exception
+			raise
+
+		# close connection to the database
+		self._closeConnection()
+
+		self._releaseLock()
 
 
+	# internal function that releases the lock
+	def _releaseLock(self):
+		logging.debug("[%s]: Release lock." % self.fileName)
+		self.dbLock.release()
+
 
 	# Internal function that removes the data of the sensor in the database.
 	# Does not catch exceptions.
@@ -1027,7 +1093,6 @@ class Mysql(_Storage):
 			tempSensor.lastStateUpdated = sensorTuple[5]
 			tempSensor.alertDelay = sensorTuple[6]
 			tempSensor.dataType = sensorTuple[7]
-			tempSensor.serverTime = serverTime
 
 			self.cursor.execute("SELECT "
 				+ "alertLevel "
@@ -1244,7 +1309,8 @@ class Mysql(_Storage):
 				+ "description TEXT NOT NULL,"
 				+ "timeReceived INTEGER NOT NULL, "
 				+ "dataJson TEXT NOT NULL, "
-				+ "dataType INTEGER NOT NULL)")
+				+ "dataType INTEGER NOT NULL, "
+				+ "INDEX timeReceivedIndex (timeReceived))")
 
 		# Create sensorAlertsDataInt table if it does not exist.
 		self.cursor.execute("SHOW TABLES LIKE 'sensorAlertsDataInt'")
@@ -1331,7 +1397,8 @@ class Mysql(_Storage):
 			self.cursor.execute("CREATE TABLE events ("
 				+ "id INTEGER PRIMARY KEY AUTO_INCREMENT, "
 				+ "timeOccurred INTEGER NOT NULL, "
-				+ "type VARCHAR(255) NOT NULL)")
+				+ "type VARCHAR(255) NOT NULL, "
+				+ "INDEX timeOccurredIndex (timeOccurred))")
 
 		# create eventsSensorAlert table if it does not exist
 		self.cursor.execute("SHOW TABLES LIKE 'eventsSensorAlert'")
@@ -1587,9 +1654,12 @@ class Mysql(_Storage):
 
 		self._acquireLock()
 
-		# connect to the database
+		# connect to the database if no connection is kept open
+		# (the connection is kept for the following updates and only
+		# re-established after an error)
 		try:
-			self._openConnection()
+			if self.conn is None:
+				self._openConnection()
 		except Exception as e:
 			logging.exception("[%s]: Not able to connect to MySQL server." 
 				% self.fileName)
@@ -1609,6 +1679,8 @@ class Mysql(_Storage):
 			logging.exception("[%s]: Not able to update server time." 
 				% self.fileName)
 
+			self._resetConnection()
+
 			self._releaseLock()
 
 			return False
@@ -1634,48 +1706,14 @@ class Mysql(_Storage):
 						+ "of type %s."
 						% option.type)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
 
 				self.optionsCopy.remove(option)
 
-		# delete all sensor alerts that are older than the configured
-		# life span
-		try:
-			# delete all sensor alerts with the returned id
-			utcTimestamp = int(time.time())
-			self.cursor.execute("SELECT id FROM sensorAlerts "
-				+ "WHERE (timeReceived + "
-				+ str(self.sensorAlertLifeSpan * 86400)
-				+ ")"
-				+ "<= %s",
-				(utcTimestamp, ))
-			result = self.cursor.fetchall()
-			for idTuple in result:
-				self.cursor.execute("DELETE FROM sensorAlertsAlertLevels "
-					+ "WHERE sensorAlertId = %s",
-					(idTuple[0], ))
-				self.cursor.execute("DELETE FROM sensorAlertsDataInt "
-					+ "WHERE sensorAlertId = %s",
-					(idTuple[0], ))
-				self.cursor.execute("DELETE FROM sensorAlertsDataFloat "
-					+ "WHERE sensorAlertId = %s",
-					(idTuple[0], ))
-				self.cursor.execute("DELETE FROM sensorAlerts "
-					+ "WHERE id = %s",
-					(idTuple[0], ))
-
-		except Exception as e:
-			logging.exception("[%s]: Not able to delete sensor alert " 
-				% self.fileName
-				+ "with id %d."
-				% idTuple[0])
-
-			self._releaseLock()
-
-			return False
-
 		for sensor in list(self.sensorsCopy):
 			# check if sensors stored in the database do
 			# not exist anymore in the received data
@@ -1720,6 +1758,8 @@ class Mysql(_Storage):
 						+ "with id %d."
 						% sensor.sensorId)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -1745,6 +1785,8 @@ class Mysql(_Storage):
 						+ "with id %d."
 						% alert.alertId)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -1766,6 +1808,8 @@ class Mysql(_Storage):
 						+ "with id %d."
 						% manager.managerId)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -1787,6 +1831,8 @@ class Mysql(_Storage):
 						+ "with id %d." 
 						% node.nodeId)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -1808,24 +1854,14 @@ class Mysql(_Storage):
 						+ " %d."
 						% alertLevel.level)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
 
 				self.alertLevelsCopy.remove(alertLevel)
 
-		# delete all events that are older than the configured life span
-		if self.eventsLifeSpan > 0:
-			if not self._removeEventsFromDb():
-
-				logging.error("[%s]: Not able to remove old events."
-					% self.fileName)
-
-				self._releaseLock()
-
-				return False
-
-
 		# step two: update all existing objects
 		for option in options:
 			# when the option was found
@@ -1839,6 +1875,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to update option."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -1868,6 +1906,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to update node."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -1912,6 +1952,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to update sensor."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -1944,6 +1986,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to update alert."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -1963,6 +2007,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to update manager."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -1982,6 +2028,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to update alert level."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -2004,6 +2052,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to add option."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -2037,6 +2087,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to add node."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -2077,6 +2129,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to add sensor."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -2132,6 +2186,8 @@ class Mysql(_Storage):
 				logging.exception("[%s]: Not able to add sensor alert."
 					% self.fileName)
 
+				self._resetConnection()
+
 				self._releaseLock()
 
 				return False
@@ -2161,6 +2217,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to add alert."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -2183,6 +2241,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to add manager."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -2205,6 +2265,8 @@ class Mysql(_Storage):
 					logging.exception("[%s]: Not able to add alert level."
 						% self.fileName)
 
+					self._resetConnection()
+
 					self._releaseLock()
 
 					return False
@@ -2212,24 +2274,123 @@ class Mysql(_Storage):
 				self.alertLevelsCopy.append(alertLevel)
 
 
-		# add all events to the database (if it is activated to store events)
-		if self.eventsLifeSpan > 0:
-			if not self._addEventsToDb():
+		# wake up the event writer to add all events to the database
+		# (if it is activated to store events)
+		if self.eventWriter is not None:
+			self.eventWriter.flush()
 
-				logging.error("[%s]: Not able to add events."
-					% self.fileName)
+		# wake up the sensor history writer to add all sensor data samples
+		# to the database (if it is activated to store the history)
+		if self.sensorHistoryWriter is not None:
+			self.sensorHistoryWriter.flush()
 
-				self._releaseLock()
 
-				return False
+		# commit all changes
+		try:
+			self.conn.commit()
+		except Exception as e:
+			logging.exception("[%s]: Not able to commit server information."
+				% self.fileName)
 
+			self._resetConnection()
 
-		# commit all changes
-		self.conn.commit()
+			self._releaseLock()
 
-		# close connection to the database
-		self._closeConnection()
+			return False
 
 		self._releaseLock()
 
-		return True
\ No newline at end of file
+		return True
+
+	# gets the sensor data history of the given sensor in the given
+	# time range with the given resolution ("raw", "minute", "hour" or
+	# "auto" to choose the resolution by the time range)
+	#
+	# returns a tuple of the used resolution and a list of tuples
+	# (timeReceived, data) for the raw samples or (timeStart, samples,
+	# minData, maxData, averageData, lastData) for the roll ups
+	# or None if it fails
+	def getSensorHistory(self, sensorId, startTime, endTime, resolution):
+
+		if resolution == "auto":
+
+			# the raw samples and roll ups per minute are only available
+			# for the configured raw life span
+			utcTimestamp = int(time.time())
+			rawStartTime = utcTimestamp \
+				- (self.sensorHistoryRawLifeSpan * 86400)
+			if startTime < rawStartTime:
+				resolution = "hour"
+			elif (endTime - startTime) <= 3 * 3600:
+				resolution = "raw"
+			elif (endTime - startTime) <= 2 * 86400:
+				resolution = "minute"
+			else:
+				resolution = "hour"
+
+		# import the needed package
+		import MySQLdb
+
+		# the query uses its own connection in order to not block
+		# the update of the server information
+		conn = None
+		cursor = None
+		try:
+			conn = MySQLdb.connect(host=self.host, port=self.port,
+				user=self.username, passwd=self.password, db=self.database)
+			cursor = conn.cursor()
+
+			if resolution == "raw":
+				cursor.execute("SELECT "
+					+ "timeReceived, "
+					+ "data "
+					+ "FROM sensorsHistory "
+					+ "WHERE sensorId = %s "
+					+ "AND timeReceived >= %s "
+					+ "AND timeReceived <= %s "
+					+ "ORDER BY timeReceived ASC, id ASC "
+					+ "LIMIT %s",
+					(sensorId, startTime, endTime,
+					self.maxSensorHistoryRows))
+
+			else:
+				if resolution == "minute":
+					table = "sensorsHistoryMinute"
+				else:
+					table = "sensorsHistoryHour"
+				cursor.execute("SELECT "
+					+ "timeStart, "
+					+ "samples, "
+					+ "minData, "
+					+ "maxData, "
+					+ "sumData / samples, "
+					+ "lastData "
+					+ "FROM " + table + " "
+					+ "WHERE sensorId = %s "
+					+ "AND timeStart >= %s "
+					+ "AND timeStart <= %s "
+					+ "ORDER BY timeStart ASC "
+					+ "LIMIT %s",
+					(sensorId, startTime, endTime,
+					self.maxSensorHistoryRows))
+
+			result = cursor.fetchall()
+
+		except Exception as e:
+			logging.exception("[%s]: Not able to get sensor data history "
+				% self.fileName
+				+ "of sensor with id %d." % sensorId)
+
+			return None
+
+		# close the connection also if the query failed
+		finally:
+			try:
+				if not cursor is None:
+					cursor.close()
+				if not conn is None:
+					conn.close()
+			except Exception as e:
+				pass
+
+		return (resolution, list(result))
\ No newline at end of file
@@ -16,6 +16,15 @@ from audio import AudioOptions
 from screenElements import PinUrwid, StatusUrwid, WarningUrwid
 
 
+# bit flags of the screen updates that can be pending
+# (are coalesced into one screen update by the urwid thread)
+class ScreenUpdate:
+	status = 1
+	sensorAlert = 2
+	connectionFail = 4
+	lockScreen = 8
+
+
 # this class is used by the urwid console thread
 # to process actions concurrently and do not block the console thread
 class ScreenActionExecuter(threading.Thread):
@@ -119,6 +128,13 @@ class ScreenUpdater(threading.Thread):
 		self.screenUpdaterEvent = threading.Event()
 		self.screenUpdaterEvent.clear()
 
+		# minimal time in seconds between two screen updates
+		# (all update requests during this interval are merged into one)
+		self.frameInterval = 0.1
+
+		# time of the last screen update request to the console
+		self.lastScreenUpdate = 0.0
+
 		# set exit flag as false
 		self.exitFlag = False
 
@@ -132,7 +148,16 @@ class ScreenUpdater(threading.Thread):
 			# wait until thread is woken up by an event to update the screen
 			# or 5 seconds elapsed
 			self.screenUpdaterEvent.wait(5)
+
+			# wait until the current frame interval is over before clearing
+			# the event => all update requests that arrive in the meantime
+			# are coalesced into one screen update
+			timeToNextFrame = (self.lastScreenUpdate + self.frameInterval
+				- time.time())
+			if 0 < timeToNextFrame <= self.frameInterval:
+				time.sleep(timeToNextFrame)
 			self.screenUpdaterEvent.clear()
+			self.lastScreenUpdate = time.time()
 
 			# if reference to console object does not exist
 			# => get it from global data or if it does not exist continue loop
@@ -145,6 +170,7 @@ class ScreenUpdater(threading.Thread):
 			# check if the screen is unlocked
 			# and the screen unlocked time has timed out
 			# => lock screen
+			pendingUpdates = 0
 			utcTimestamp = int(time.time())
 			if (not self.console.inPinView
 				and (utcTimestamp - self.console.screenUnlockedTime)
@@ -153,44 +179,37 @@ class ScreenUpdater(threading.Thread):
 				logging.info("[%s]: Timeout for unlocked screen."
 					% self.fileName)
 
-				if not self.console.updateScreen("lockscreen"):
-					logging.error("[%s]: Locking screen " % self.fileName
-						+ "failed.")
+				pendingUpdates |= ScreenUpdate.lockScreen
 
 			# check if a sensor alert was received
 			# => update screen with sensor alert
+			# (the sensor alert also updates the status of the screen,
+			# a connection failure is shown with the next status update)
 			if len(self.sensorAlerts) != 0:
 				logging.info("[%s]: Updating screen with sensor alert."
 					% self.fileName)
-				if not self.console.updateScreen("sensoralert"):
-					logging.error("[%s]: Updating screen " % self.fileName
-						+ "with sensor alert failed.")
+				pendingUpdates |= ScreenUpdate.sensorAlert
 
-				# do not use the old status information from the server
-				# to update the screen => wait for new status update
-				continue
-
-			# update screen normally
-			logging.debug("[%s]: Updating screen." % self.fileName)
-			if not self.console.updateScreen("status"):
-				logging.error("[%s]: Updating screen failed." % self.fileName)
+			else:
+				# update screen normally
+				logging.debug("[%s]: Updating screen." % self.fileName)
+				pendingUpdates |= ScreenUpdate.status
 
-			# if reference to server communication object does not exist
-			# => get it from global data or if it does not exist continue loop 
-			if self.serverComm == None:
-				if self.globalData.serverComm != None:
+				# if reference to server communication object does not exist
+				# => get it from global data
+				if self.serverComm == None:
 					self.serverComm = self.globalData.serverComm
-				else:
-					continue
 
-			# check if the client is not connected to the server
-			# => update screen to connection failure
-			if not self.serverComm.isConnected:
-				logging.debug("[%s]: Updating screen " % self.fileName
-					+ "for connection failure.")
-				if not self.console.updateScreen("connectionfail"):
-					logging.error("[%s]: Updating screen failed."
-						% self.fileName)
+				# check if the client is not connected to the server
+				# => update screen to connection failure
+				if (self.serverComm != None
+					and not self.serverComm.isConnected):
+					logging.debug("[%s]: Updating screen " % self.fileName
+						+ "for connection failure.")
+					pendingUpdates |= ScreenUpdate.connectionFail
+
+			if not self.console.updateScreen(pendingUpdates):
+				logging.error("[%s]: Updating screen failed." % self.fileName)
 
 
 	# sets the exit flag to shut down the thread
@@ -219,8 +238,12 @@ class Console:
 		self.audioOutput = self.globalData.audioOutput
 		self.sensorWarningStates = self.globalData.sensorWarningStates
 
-		# lock that is being used so only one thread can update the screen
-		self.consoleLock = threading.BoundedSemaphore(1)
+		# bit mask of the screen updates that are pending
+		# (see ScreenUpdate) and a flag that signalizes if the urwid
+		# thread was already woken up to process them
+		self.pendingUpdates = 0
+		self.wakeupPending = False
+		self.pendingUpdatesLock = threading.Semaphore(1)
 
 		# urwid object that shows the connection status
 		self.connectionStatus = None
@@ -275,12 +298,6 @@ class Console:
 		self.sensorsToWarn = list()
 
 
-	# internal function that acquires the lock
-	def _acquireLock(self):
-		logging.debug("[%s]: Acquire lock." % self.fileName)
-		self.consoleLock.acquire()
-
-
 	# internal function that clears the edit/menu part of the screen
 	def _clearEditPartScreen(self):
 
@@ -516,12 +533,6 @@ class Console:
 			self.showPinView()
 
 
-	# internal function that releases the lock
-	def _releaseLock(self):
-		logging.debug("[%s]: Release lock." % self.fileName)
-		self.consoleLock.release()
-
-
 	# this function checks if the given pin is in the list of allowed pins
 	def checkPin(self, inputPin):
 		if inputPin in self.pins:
@@ -577,11 +588,19 @@ class Console:
 	# gets data written to it and updates the screen elements
 	def screenCallback(self, receivedData):
 
-		# if received data equals "status" or "sensoralert"
+		# get all pending screen updates and reset them
+		# (updates requested from now on wake up the urwid thread again)
+		self.pendingUpdatesLock.acquire()
+		pendingUpdates = self.pendingUpdates
+		self.pendingUpdates = 0
+		self.wakeupPending = False
+		self.pendingUpdatesLock.release()
+
+		# if a status or sensor alert update is pending
 		# update the whole screen (in case of a sensor alert it can happen
 		# that also a normal state change was received before and is forgotten
 		# if a normal status update is not made)
-		if receivedData == "status" or receivedData == "sensoralert":
+		if pendingUpdates & (ScreenUpdate.status | ScreenUpdate.sensorAlert):
 			logging.debug("[%s]: Status update received. "  % self.fileName
 				+ "Updating screen elements.")
 
@@ -602,7 +621,7 @@ class Console:
 						self.alertSystemActive.turnGreen()
 
 		# check if the connection to the server failed
-		if receivedData == "connectionfail":
+		if pendingUpdates & ScreenUpdate.connectionFail:
 			logging.debug("[%s]: Status connection failed "  % self.fileName
 				+ "received. Updating screen elements.")
 
@@ -614,7 +633,7 @@ class Console:
 			self.alertSystemActive.turnGray()
 
 		# check if a sensor alert was received from the server
-		if receivedData == "sensoralert":
+		if pendingUpdates & ScreenUpdate.sensorAlert:
 
 			logging.debug("[%s]: Sensor alert "  % self.fileName
 				+ "received. Removing it.")
@@ -623,14 +642,13 @@ class Console:
 			del self.sensorAlerts[:]
 
 		# check if the screen should be locked
-		if receivedData == "lockscreen":
+		if pendingUpdates & ScreenUpdate.lockScreen:
 
 			logging.debug("[%s]: Locking screen."  % self.fileName)
 
 			self.showPinView()
 
 		# return true so the file descriptor will NOT be closed
-		self._releaseLock()
 		return True
 
 
@@ -789,13 +807,20 @@ class Console:
 
 
 	# this function is called to update the screen
-	def updateScreen(self, status):
-
-		# write status to the callback file descriptor
-		if self.screenFd != None:
-
-			self._acquireLock()
-
-			os.write(self.screenFd, status)
-			return True
-		return False
\ No newline at end of file
+	# (the given updates are merged with the ones that are still pending
+	# and the urwid thread is only woken up if it was not already)
+	def updateScreen(self, updates):
+
+		if self.screenFd == None:
+			return False
+
+		self.pendingUpdatesLock.acquire()
+		self.pendingUpdates |= updates
+		wakeup = not self.wakeupPending
+		self.wakeupPending = True
+		self.pendingUpdatesLock.release()
+
+		# write to the callback file descriptor to wake up the urwid thread
+		if wakeup:
+			os.write(self.screenFd, "u")
+		return True
\ No newline at end of file
@@ -11,7 +11,7 @@ import sys
 import os
 from lib import ServerCommunication, ConnectionWatchdog
 from lib import SMTPAlert
-from lib import SensorFIFO, SensorExecuter
+from lib import SensorFIFO, FIFOReader, SensorExecuter
 from lib import UpdateChecker
 from lib import GlobalData
 from lib import SensorDataType
@@ -201,6 +201,37 @@ if __name__ == '__main__':
 				raise ValueError("Illegal data type for sensor %d."
 					% sensor.id)
 
+			# Data filter settings are only needed if the sensor holds data
+			# (optional, without them every data change is reported).
+			dataFilter = item.find("dataFilter")
+			if (sensor.sensorDataType != SensorDataType.NONE
+				and dataFilter is not None):
+				if "deadband" in dataFilter.attrib.keys():
+					sensor.deadband = float(dataFilter.attrib["deadband"])
+				if "deadbandType" in dataFilter.attrib.keys():
+					deadbandTypeStr = str(
+						dataFilter.attrib["deadbandType"]).upper()
+					if deadbandTypeStr == "ABSOLUTE":
+						sensor.deadbandRelative = False
+					elif deadbandTypeStr == "RELATIVE":
+						sensor.deadbandRelative = True
+					else:
+						raise ValueError("Type of deadband '%s' not valid."
+							% deadbandTypeStr)
+				if "minReportInterval" in dataFilter.attrib.keys():
+					sensor.minReportInterval = int(
+						dataFilter.attrib["minReportInterval"])
+				if "smoothingWindow" in dataFilter.attrib.keys():
+					sensor.smoothingWindow = int(
+						dataFilter.attrib["smoothingWindow"])
+
+				# Check sanity of the data filter settings.
+				if (sensor.deadband < 0.0
+					or sensor.minReportInterval < 0
+					or sensor.smoothingWindow < 1):
+					raise ValueError("Illegal data filter for sensor %d."
+						% sensor.id)
+
 			# check if description is empty
 			if len(sensor.description) == 0:
 				raise ValueError("Description of sensor %d is empty."
@@ -289,11 +320,13 @@ if __name__ == '__main__':
 	watchdog.daemon = True
 	watchdog.start()
 
-	logging.info("[%s] Starting sensor threads." % fileName)
-	# start all sensor threads
-	for sensor in globalData.sensors:
-		sensor.daemon = True
-		sensor.start()
+	logging.info("[%s] Starting FIFO reader thread." % fileName)
+	# start one thread that reads the FIFO files of all sensors
+	fifoReader = FIFOReader(globalData.sensors)
+	# set thread to daemon
+	# => threads terminates when main thread terminates
+	fifoReader.daemon = True
+	fifoReader.start()
 
 	# only start update checker if it is activated
 	if updateActivated is True:
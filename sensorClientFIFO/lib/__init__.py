@@ -9,7 +9,7 @@
 
 from client import ServerCommunication, ConnectionWatchdog, AsynchronousSender
 from smtp import SMTPAlert
-from sensor import SensorFIFO, SensorExecuter
+from sensor import SensorFIFO, FIFOReader, SensorExecuter
 from update import UpdateChecker, Updater
 from localObjects import SensorDataType
 from globalData import GlobalData
\ No newline at end of file
@@ -13,6 +13,9 @@ import os
 import logging
 import json
 import threading
+import select
+import errno
+import collections
 from client import AsynchronousSender
 from localObjects import SensorDataType, SensorAlert, StateChange
 
@@ -86,6 +89,27 @@ class _PollingSensor:
 		self.hasOptionalData = False
 		self.optionalData = None
 
+		# Filter for the data updates of the sensor that are sent to the
+		# server. Updates are suppressed if the data stays in the deadband
+		# around the data last reported (relative deadbands are a fraction of
+		# the data last reported, i.e., 0.05 = 5%) and reported at most once
+		# every "minReportInterval" seconds. The data can be smoothed by a
+		# moving average over the last "smoothingWindow" samples
+		# (1 = no smoothing).
+		self.deadband = 0.0
+		self.deadbandRelative = False
+		self.minReportInterval = 0
+		self.smoothingWindow = 1
+
+		# Internal values of the data filter. The number of suppressed
+		# updates is sent to the server with the next reported update.
+		self._smoothingSamples = collections.deque()
+		self._lastReportedData = None
+		self._lastReportTime = 0.0
+		self._pendingData = None
+		self._hasPendingData = False
+		self._suppressedUpdates = 0
+
 
 	# this function returns the current state of the sensor
 	def getState(self):
@@ -124,11 +148,81 @@ class _PollingSensor:
 		raise NotImplementedError("Function not implemented yet.")
 
 
+	# Internal function that adds the given sample to the moving average
+	# of the sensor data.
+	#
+	# Returns the smoothed sensor data.
+	def _smoothData(self, sensorData):
+		if self.smoothingWindow <= 1:
+			return sensorData
+
+		self._smoothingSamples.append(sensorData)
+		while len(self._smoothingSamples) > self.smoothingWindow:
+			self._smoothingSamples.popleft()
+
+		smoothedData = (sum(self._smoothingSamples)
+			/ float(len(self._smoothingSamples)))
+		if self.sensorDataType == SensorDataType.INT:
+			return int(round(smoothedData))
+		return smoothedData
+
+
+	# Internal function that adds a new data update of the sensor that
+	# should be reported to the server. Updates in the deadband are
+	# suppressed, all others are kept pending until the minimum report
+	# interval has passed (a newer update supersedes a pending one).
+	def _addDataUpdate(self, sensorData):
+
+		if self._hasPendingData:
+			self._hasPendingData = False
+			self._suppressedUpdates += 1
+
+		if self._lastReportedData is not None:
+			deadband = self.deadband
+			if self.deadbandRelative:
+				deadband *= abs(self._lastReportedData)
+			if abs(sensorData - self._lastReportedData) < deadband:
+				self._suppressedUpdates += 1
+				return
+
+		self._pendingData = sensorData
+		self._hasPendingData = True
+
+
+	# Internal function that returns the pending data update of the sensor
+	# if the minimum report interval has passed.
+	#
+	# Returns an object of class StateChange or None.
+	def _getDataUpdate(self, state):
+		if not self._hasPendingData:
+			return None
+
+		utcTimestamp = time.time()
+		if (utcTimestamp - self._lastReportTime) < self.minReportInterval:
+			return None
+
+		self._hasPendingData = False
+		self._lastReportedData = self._pendingData
+		self._lastReportTime = utcTimestamp
+
+		stateChange = StateChange()
+		stateChange.clientSensorId = self.id
+		if state == self.triggerState:
+			stateChange.state = 1
+		else:
+			stateChange.state = 0
+		stateChange.dataType = self.sensorDataType
+		stateChange.sensorData = self._pendingData
+		stateChange.suppressedUpdates = self._suppressedUpdates
+		self._suppressedUpdates = 0
+
+		return stateChange
+
+
 # class that represents one FIFO sensor
-class SensorFIFO(_PollingSensor, threading.Thread):
+class SensorFIFO(_PollingSensor):
 
 	def __init__(self):
-		threading.Thread.__init__(self)
 		_PollingSensor.__init__(self)
 
 		# used for logging
@@ -141,14 +235,33 @@ class SensorFIFO(_PollingSensor, threading.Thread):
 		self.temporaryState = None
 
 		# Used to force a state change to be sent to the server.
+		# Only the latest data update is kept since it supersedes
+		# all data updates received before.
 		self.forceSendStateLock = threading.Semaphore(1)
-		self.shouldForceSendState = False
-		self.stateChange = None
 
 		# Used to force a sensor alert to be sent to the server.
+		# All received sensor alerts are queued since writers can send
+		# multiple sensor alerts back-to-back.
 		self.forceSendAlertLock = threading.Semaphore(1)
-		self.shouldForceSendAlert = False
-		self.sensorAlert = None
+		self.sensorAlertQueue = collections.deque()
+		self.maxSensorAlertQueueSize = 1000
+
+		# File descriptor of the opened FIFO file and the data read
+		# from it that does not form a complete message yet
+		# (handled by the FIFO reader).
+		self.fifoFd = None
+		self.readBuffer = ""
+
+		# Maximal size in bytes of one message. Data of a message that
+		# exceeds it is discarded until the next newline.
+		self.maxMessageSize = 65536
+		self.discardMessage = False
+
+		# Counters of the data received via the FIFO file.
+		self.bytesReceived = 0
+		self.messagesReceived = 0
+		self.messagesInvalid = 0
+		self.messagesDropped = 0
 
 
 	def _checkDataType(self, dataType):
@@ -185,6 +298,257 @@ class SensorFIFO(_PollingSensor, threading.Thread):
 		return True
 
 
+	# Internal function that processes a single received message.
+	#
+	# Returns True if the message was valid or False.
+	def _processMessage(self, message):
+
+		# Parse message depending on type.
+		# Type: statechange
+		if str(message["message"]).upper() == "STATECHANGE":
+
+			# Check if state is valid.
+			tempInputState = message["payload"]["state"]
+			if not self._checkState(tempInputState):
+				logging.error("[%s]: Received state "
+					% self.fileName
+					+ "from FIFO file of sensor with id '%d' "
+					% self.id
+					+ "invalid. Ignoring message.")
+				return False
+
+			# Check if data type is valid.
+			tempDataType = message["payload"]["dataType"]
+			if not self._checkDataType(tempDataType):
+				logging.error("[%s]: Received data type "
+					% self.fileName
+					+ "from FIFO file of sensor with id '%d' "
+					% self.id
+					+ "invalid. Ignoring message.")
+				return False
+
+			# Set new data (smoothed if activated).
+			if self.sensorDataType == SensorDataType.NONE:
+				self.sensorData = None
+			elif self.sensorDataType == SensorDataType.INT:
+				self.sensorData = self._smoothData(
+					int(message["payload"]["data"]))
+			elif self.sensorDataType == SensorDataType.FLOAT:
+				self.sensorData = self._smoothData(
+					float(message["payload"]["data"]))
+
+			# Set state.
+			self.temporaryState = tempInputState
+
+			# Force state change sending if the data could be changed
+			# (as long as the data passes the data filter).
+			if self.sensorDataType != SensorDataType.NONE:
+				self.forceSendStateLock.acquire()
+				self._addDataUpdate(self.sensorData)
+				self.forceSendStateLock.release()
+
+		# Type: sensoralert
+		elif str(message["message"]).upper() == "SENSORALERT":
+
+			# Check if state is valid.
+			tempInputState = message["payload"]["state"]
+			if not self._checkState(tempInputState):
+				logging.error("[%s]: Received state "
+					% self.fileName
+					+ "from FIFO file of sensor with id '%d' "
+					% self.id
+					+ "invalid. Ignoring message.")
+				return False
+
+			# Check if hasOptionalData field is valid.
+			tempHasOptionalData = message[
+				"payload"]["hasOptionalData"]
+			if not self._checkHasOptionalData(tempHasOptionalData):
+				logging.error("[%s]: Received hasOptionalData field "
+					% self.fileName
+					+ "from FIFO file of sensor with id '%d' "
+					% self.id
+					+ "invalid. Ignoring message.")
+				return False
+
+			# Check if data type is valid.
+			tempDataType = message["payload"]["dataType"]
+			if not self._checkDataType(tempDataType):
+				logging.error("[%s]: Received data type "
+					% self.fileName
+					+ "from FIFO file of sensor with id '%d' "
+					% self.id
+					+ "invalid. Ignoring message.")
+				return False
+
+			if self.sensorDataType == SensorDataType.NONE:
+				tempSensorData = None
+			elif self.sensorDataType == SensorDataType.INT:
+				tempSensorData = int(message["payload"]["data"])
+			elif self.sensorDataType == SensorDataType.FLOAT:
+				tempSensorData = float(message["payload"]["data"])
+
+			# Check if hasLatestData field is valid.
+			tempHasLatestData = message[
+				"payload"]["hasLatestData"]
+			if not self._checkHasLatestData(tempHasLatestData):
+				logging.error("[%s]: Received hasLatestData field "
+					% self.fileName
+					+ "from FIFO file of sensor with id '%d' "
+					% self.id
+					+ "invalid. Ignoring message.")
+				return False
+
+			# Check if changeState field is valid.
+			tempChangeState = message[
+				"payload"]["changeState"]
+			if not self._checkChangeState(tempChangeState):
+				logging.error("[%s]: Received changeState field "
+					% self.fileName
+					+ "from FIFO file of sensor with id '%d' "
+					% self.id
+					+ "invalid. Ignoring message.")
+				return False
+
+			# Check if data should be transfered with the sensor alert
+			# => if it should parse it
+			tempOptionalData = None
+			if tempHasOptionalData:
+
+				tempOptionalData = message["payload"]["optionalData"]
+
+				# check if data is of type dict
+				if not isinstance(tempOptionalData, dict):
+					logging.warning("[%s]: Received optional data "
+						% self.fileName
+						+ "from FIFO file of sensor with id '%d' "
+						% self.id
+						+ "invalid. Ignoring message.")
+					return False
+
+			# Set optional data.
+			self.hasOptionalData = tempHasOptionalData
+			self.optionalData = tempOptionalData
+
+			# Set new data.
+			if tempHasLatestData:
+				self.sensorData = tempSensorData
+
+			# Set state.
+			if tempChangeState:
+				self.temporaryState = tempInputState
+
+			# Create sensor alert object that is send to the server.
+			sensorAlert = SensorAlert()
+			sensorAlert.clientSensorId = self.id
+			if tempInputState == self.triggerState:
+				sensorAlert.state = 1
+			else:
+				sensorAlert.state = 0
+			sensorAlert.hasOptionalData = tempHasOptionalData
+			sensorAlert.optionalData = tempOptionalData
+			sensorAlert.changeState = tempChangeState
+			sensorAlert.hasLatestData = tempHasLatestData
+			sensorAlert.dataType = tempDataType
+			sensorAlert.sensorData = tempSensorData
+
+			# Queue sensor alert (drop the oldest one if the
+			# queue is full).
+			self.forceSendAlertLock.acquire()
+			if len(self.sensorAlertQueue) >= self.maxSensorAlertQueueSize:
+				self.sensorAlertQueue.popleft()
+				self.messagesDropped += 1
+				logging.warning("[%s]: Sensor alert queue of sensor "
+					% self.fileName
+					+ "with id '%d' full. Dropping oldest sensor alert."
+					% self.id)
+			self.sensorAlertQueue.append(sensorAlert)
+			self.forceSendAlertLock.release()
+
+		# Type: invalid
+		else:
+			raise ValueError("Received invalid message type.")
+
+		return True
+
+
+	# Creates the FIFO file of this sensor (an already existing file
+	# is removed first).
+	def createFifo(self):
+
+		# check if FIFO file exists
+		# => remove it if it does
+		if os.path.exists(self.fifoFile):
+			os.remove(self.fifoFile)
+
+		# create a new FIFO file
+		os.umask(self.umask)
+		os.mkfifo(self.fifoFile)
+
+
+	# Processes the given data that was read from the FIFO file.
+	# The data is seen as a stream of newline-delimited json messages.
+	# Incomplete messages are kept until the rest of the message arrives
+	# or the writer closes the FIFO file ("eof" flag). Messages that exceed
+	# the maximal message size are discarded.
+	def processData(self, data, eof=False):
+
+		self.bytesReceived += len(data)
+
+		# skip the rest of a discarded message
+		if self.discardMessage:
+			position = data.find("\n")
+			if position == -1:
+				if eof:
+					self.discardMessage = False
+				return
+			data = data[position + 1:]
+			self.discardMessage = False
+
+		self.readBuffer += data
+
+		lines = self.readBuffer.split("\n")
+		if eof:
+			self.readBuffer = ""
+		else:
+			self.readBuffer = lines.pop()
+
+		if len(self.readBuffer) > self.maxMessageSize:
+			self.readBuffer = ""
+			self.discardMessage = True
+			self.messagesDropped += 1
+			logging.warning("[%s]: Message received via FIFO file of sensor "
+				% self.fileName
+				+ "with id '%d' exceeds %d bytes. Discarding it."
+				% (self.id, self.maxMessageSize))
+
+		for line in lines:
+
+			line = line.strip()
+			if not line:
+				continue
+
+			logging.debug("[%s]: Received data '%s' from "
+				% (self.fileName, line)
+				+ "FIFO file of sensor with id '%d'."
+				% self.id)
+
+			self.messagesReceived += 1
+
+			# parse received data
+			try:
+				message = json.loads(line)
+				if not self._processMessage(message):
+					self.messagesInvalid += 1
+
+			except Exception as e:
+				self.messagesInvalid += 1
+				logging.exception("[%s]: Could not parse received data from "
+					% self.fileName
+					+ "FIFO file of sensor with id '%d'."
+					% self.id)
+
+
 	def initializeSensor(self):
 		self.changeState = True
 		self.hasLatestData = False
@@ -210,248 +574,252 @@ class SensorFIFO(_PollingSensor, threading.Thread):
 	def forceSendAlert(self):
 		self.forceSendAlertLock.acquire()
 		returnValue = None
-		if self.shouldForceSendAlert:
-			returnValue = self.sensorAlert
-			self.sensorAlert = None
-			self.shouldForceSendAlert = False
+		if self.sensorAlertQueue:
+			returnValue = self.sensorAlertQueue.popleft()
 		self.forceSendAlertLock.release()
 		return returnValue
 
 
 	def forceSendState(self):
 		self.forceSendStateLock.acquire()
-		returnValue = None
-		if self.shouldForceSendState:
-			returnValue = self.stateChange
-			self.stateChange = None
-			self.shouldForceSendState = False
+		returnValue = self._getDataUpdate(self.temporaryState)
 		self.forceSendStateLock.release()
 		return returnValue
 
 
+# this class reads the FIFO files of all sensors in one thread
+# (all FIFO files are kept open and are multiplexed via epoll)
+class FIFOReader(threading.Thread):
+
+	def __init__(self, sensors):
+		threading.Thread.__init__(self)
+
+		# used for logging
+		self.fileName = os.path.basename(__file__)
+
+		self.sensors = sensors
+
+		# size of the chunks that are read from a FIFO file
+		self.bufferSize = 4096
+
+		# interval in seconds in which the counters are logged
+		# (only done in log level DEBUG)
+		self.statisticsInterval = 300
+
+		self.epoll = None
+
+		# maps the file descriptor of an opened FIFO file to its sensor
+		self.fdMap = dict()
+
+
+	# Internal function that opens the FIFO file of the given sensor
+	# (non-blocking) and registers it.
+	def _openFifo(self, sensor):
+		sensor.fifoFd = os.open(sensor.fifoFile, os.O_RDONLY | os.O_NONBLOCK)
+		self.fdMap[sensor.fifoFd] = sensor
+		self.epoll.register(sensor.fifoFd, select.EPOLLIN)
+
+
+	# Internal function that unregisters and closes the FIFO file of
+	# the given sensor.
+	def _closeFifo(self, sensor):
+		if sensor.fifoFd is None:
+			return
+		try:
+			self.epoll.unregister(sensor.fifoFd)
+		except Exception as e:
+			pass
+		try:
+			os.close(sensor.fifoFd)
+		except Exception as e:
+			pass
+		del self.fdMap[sensor.fifoFd]
+		sensor.fifoFd = None
+
+
+	# Internal function that creates and opens the FIFO file of
+	# the given sensor.
+	#
+	# Returns True if successful or False.
+	def _setupFifo(self, sensor):
+		try:
+			sensor.createFifo()
+		except Exception as e:
+			logging.exception("[%s]: Could not create "
+				% self.fileName
+				+ "FIFO file of sensor with id '%d'."
+				% sensor.id)
+			return False
+
+		try:
+			self._openFifo(sensor)
+		except Exception as e:
+			logging.exception("[%s]: Could not open "
+				% self.fileName
+				+ "FIFO file of sensor with id '%d'."
+				% sensor.id)
+			return False
+		return True
+
+
+	# Internal function that reads all available data from the FIFO
+	# file of the given sensor.
+	def _readFifo(self, sensor):
+
+		while True:
+			try:
+				data = os.read(sensor.fifoFd, self.bufferSize)
+			except OSError as e:
+				if e.errno == errno.EAGAIN or e.errno == errno.EINTR:
+					return
+				raise
+
+			# All writers closed the FIFO file
+			# => process remaining data and re-open the FIFO file
+			# (otherwise epoll would report the hang up endlessly).
+			if not data:
+				sensor.processData("", eof=True)
+				self._closeFifo(sensor)
+				self._openFifo(sensor)
+				return
+
+			sensor.processData(data)
+
+
+	def _logStatistics(self):
+		for sensor in self.sensors:
+			logging.debug("[%s]: FIFO file of sensor with id '%d': "
+				% (self.fileName, sensor.id)
+				+ "%d bytes, %d messages received, "
+				% (sensor.bytesReceived, sensor.messagesReceived)
+				+ "%d invalid, %d dropped."
+				% (sensor.messagesInvalid, sensor.messagesDropped))
+
+
 	def run(self):
 
+		self.epoll = select.epoll()
+
+		# Create and open the FIFO files of all sensors. Sensors
+		# whose FIFO file could not be set up are retried later.
+		setupPending = list()
+		for sensor in self.sensors:
+			if not self._setupFifo(sensor):
+				setupPending.append(sensor)
+
+		lastSetupRetry = time.time()
+		lastStatistics = time.time()
+
 		while True:
 
-			# check if FIFO file exists
-			# => remove it if it does
-			if os.path.exists(self.fifoFile):
+			# retry the set up of failed FIFO files every 10 seconds
+			if setupPending and (time.time() - lastSetupRetry) > 10:
+				for sensor in list(setupPending):
+					if self._setupFifo(sensor):
+						setupPending.remove(sensor)
+				lastSetupRetry = time.time()
+
+			try:
+				events = self.epoll.poll(1.0)
+			except IOError as e:
+				if e.errno == errno.EINTR:
+					continue
+				raise
+
+			for fd, event in events:
+
+				sensor = self.fdMap.get(fd)
+				if sensor is None:
+					continue
+
 				try:
-					os.remove(self.fifoFile)
+					self._readFifo(sensor)
 				except Exception as e:
-					logging.exception("[%s]: Could not delete "
+					logging.exception("[%s]: Could not read data from "
 						% self.fileName
 						+ "FIFO file of sensor with id '%d'."
-						% self.id)
-					time.sleep(10)
-					continue
+						% sensor.id)
+					self._closeFifo(sensor)
+					sensor.readBuffer = ""
+					setupPending.append(sensor)
 
-			# create a new FIFO file
-			try:
-				os.umask(self.umask)
-				os.mkfifo(self.fifoFile)
-			except Exception as e:
-				logging.exception("[%s]: Could not create "
-					% self.fileName
-					+ "FIFO file of sensor with id '%d'."
-					% self.id)
-				time.sleep(10)
-				continue
+			if (time.time() - lastStatistics) > self.statisticsInterval:
+				self._logStatistics()
+				lastStatistics = time.time()
 
-			# read FIFO for data
-			data = ""
-			try:
-				fifo = open(self.fifoFile, "r")
-				data = fifo.read()
-				fifo.close()
-			except Exception as e:
-				logging.exception("[%s]: Could not read data from "
-					% self.fileName
-					+ "FIFO file of sensor with id '%d'."
-					% self.id)
-				time.sleep(10)
-				continue
 
-			logging.debug("[%s]: Received data '%s' from "
-				% (self.fileName, data)
-				+ "FIFO file of sensor with id '%d'."
-				% self.id)
+# this class sends the sensor alerts and state changes of all sensors
+# to the server in one thread (in the order they were queued instead of
+# starting one thread for each of them)
+class _MessageSender(threading.Thread):
 
-			# parse received data
-			try:
+	def __init__(self, connection):
+		threading.Thread.__init__(self)
+
+		# used for logging
+		self.fileName = os.path.basename(__file__)
+
+		self.connection = connection
+
+		# queued sensor alerts and state changes (the oldest one is
+		# dropped if the queue is full) and the event that wakes up
+		# the sender thread
+		self.queueLock = threading.Semaphore(1)
+		self.queueEvent = threading.Event()
+		self.messageQueue = collections.deque()
+		self.maxQueueSize = 1000
+
+
+	# queues the given sensor alert or state change object
+	def queueMessage(self, message):
+
+		self.queueLock.acquire()
+		if len(self.messageQueue) >= self.maxQueueSize:
+			self.messageQueue.popleft()
+			logging.warning("[%s]: Send queue full. Dropping oldest "
+				% self.fileName
+				+ "sensor alert or state change.")
+		self.messageQueue.append(message)
+		self.queueLock.release()
+
+		self.queueEvent.set()
+
+
+	def run(self):
+
+		while True:
 
-				message = json.loads(data)
-
-				# Parse message depending on type.
-				# Type: statechange
-				if str(message["message"]).upper() == "STATECHANGE":
-
-					# Check if state is valid.
-					tempInputState = message["payload"]["state"]
-					if not self._checkState(tempInputState):
-						logging.error("[%s]: Received state "
-							% self.fileName
-							+ "from FIFO file of sensor with id '%d' "
-							% self.id
-							+ "invalid. Ignoring message.")
-						continue
-
-					# Check if data type is valid.
-					tempDataType = message["payload"]["dataType"]
-					if not self._checkDataType(tempDataType):
-						logging.error("[%s]: Received data type "
-							% self.fileName
-							+ "from FIFO file of sensor with id '%d' "
-							% self.id
-							+ "invalid. Ignoring message.")
-						continue
-
-					# Set new data.
-					if self.sensorDataType == SensorDataType.NONE:
-						self.sensorData = None
-					elif self.sensorDataType == SensorDataType.INT:
-						self.sensorData = int(message["payload"]["data"])
-					elif self.sensorDataType == SensorDataType.FLOAT:
-						self.sensorData = float(message["payload"]["data"])
-
-					# Set state.
-					self.temporaryState = tempInputState
-
-					# Force state change sending if the data could be changed.
-					if self.sensorDataType != SensorDataType.NONE:
-
-						# Create state change object that is
-						# send to the server.
-						self.forceSendStateLock.acquire()
-						self.stateChange = StateChange()
-						self.stateChange.clientSensorId = self.id
-						if tempInputState == self.triggerState:
-							self.stateChange.state = 1
-						else:
-							self.stateChange.state = 0
-						self.stateChange.dataType = tempDataType
-						self.stateChange.sensorData = self.sensorData
-						self.shouldForceSendState = True
-						self.forceSendStateLock.release()
-
-				# Type: sensoralert
-				elif str(message["message"]).upper() == "SENSORALERT":
-
-					# Check if state is valid.
-					tempInputState = message["payload"]["state"]
-					if not self._checkState(tempInputState):
-						logging.error("[%s]: Received state "
-							% self.fileName
-							+ "from FIFO file of sensor with id '%d' "
-							% self.id
-							+ "invalid. Ignoring message.")
-						continue
-
-					# Check if hasOptionalData field is valid.
-					tempHasOptionalData = message[
-						"payload"]["hasOptionalData"]
-					if not self._checkHasOptionalData(tempHasOptionalData):
-						logging.error("[%s]: Received hasOptionalData field "
-							% self.fileName
-							+ "from FIFO file of sensor with id '%d' "
-							% self.id
-							+ "invalid. Ignoring message.")
-						continue
-
-					# Check if data type is valid.
-					tempDataType = message["payload"]["dataType"]
-					if not self._checkDataType(tempDataType):
-						logging.error("[%s]: Received data type "
-							% self.fileName
-							+ "from FIFO file of sensor with id '%d' "
-							% self.id
-							+ "invalid. Ignoring message.")
-						continue
-
-					if self.sensorDataType == SensorDataType.NONE:
-						tempSensorData = None
-					elif self.sensorDataType == SensorDataType.INT:
-						tempSensorData = int(message["payload"]["data"])
-					elif self.sensorDataType == SensorDataType.FLOAT:
-						tempSensorData = float(message["payload"]["data"])
-
-					# Check if hasLatestData field is valid.
-					tempHasLatestData = message[
-						"payload"]["hasLatestData"]
-					if not self._checkHasLatestData(tempHasLatestData):
-						logging.error("[%s]: Received hasLatestData field "
-							% self.fileName
-							+ "from FIFO file of sensor with id '%d' "
-							% self.id
-							+ "invalid. Ignoring message.")
-						continue
-
-					# Check if changeState field is valid.
-					tempChangeState = message[
-						"payload"]["changeState"]
-					if not self._checkChangeState(tempChangeState):
-						logging.error("[%s]: Received changeState field "
-							% self.fileName
-							+ "from FIFO file of sensor with id '%d' "
-							% self.id
-							+ "invalid. Ignoring message.")
-						continue
-
-					# Check if data should be transfered with the sensor alert
-					# => if it should parse it
-					tempOptionalData = None
-					if tempHasOptionalData:
-
-						tempOptionalData = message["payload"]["optionalData"]
-
-						# check if data is of type dict
-						if not isinstance(tempOptionalData, dict):
-							logging.warning("[%s]: Received optional data "
+			self.queueEvent.wait()
+			self.queueEvent.clear()
+
+			while True:
+
+				self.queueLock.acquire()
+				message = None
+				if self.messageQueue:
+					message = self.messageQueue.popleft()
+				self.queueLock.release()
+
+				if message is None:
+					break
+
+				try:
+					if isinstance(message, SensorAlert):
+						if not self.connection.sendSensorAlert(message):
+							logging.error("[%s]: Sending sensor "
 								% self.fileName
-								+ "from FIFO file of sensor with id '%d' "
-								% self.id
-								+ "invalid. Ignoring message.")
-							continue
-
-					# Set optional data.
-					self.hasOptionalData = tempHasOptionalData
-					self.optionalData = tempOptionalData
-
-					# Set new data.
-					if tempHasLatestData:
-						self.sensorData = tempSensorData
-
-					# Set state.
-					if tempChangeState:
-						self.temporaryState = tempInputState
-
-					# Create sensor alert object that is send to the server.
-					self.forceSendAlertLock.acquire()
-					self.sensorAlert = SensorAlert()
-					self.sensorAlert.clientSensorId = self.id
-					if tempInputState == self.triggerState:
-						self.sensorAlert.state = 1
+								+ "alert to the server failed.")
+
 					else:
-						self.sensorAlert.state = 0
-					self.sensorAlert.hasOptionalData = tempHasOptionalData
-					self.sensorAlert.optionalData = tempOptionalData
-					self.sensorAlert.changeState = tempChangeState
-					self.sensorAlert.hasLatestData = tempHasLatestData
-					self.sensorAlert.dataType = tempDataType
-					self.sensorAlert.sensorData = tempSensorData
-					self.shouldForceSendAlert = True
-					self.forceSendAlertLock.release()
-
-				# Type: invalid
-				else:
-					raise ValueError("Received invalid message type.")
+						if not self.connection.sendStateChange(message):
+							logging.error("[%s]: Sending sensor "
+								% self.fileName
+								+ "state change to the server failed.")
 
-			except Exception as e:
-				logging.exception("[%s]: Could not parse received data from "
-					% self.fileName
-					+ "FIFO file of sensor with id '%d'."
-					% self.id)
-				continue
+				except Exception as e:
+					logging.exception("[%s]: Sending message to the "
+						% self.fileName
+						+ "server failed.")
 
 
 # this class polls the sensor states and triggers alerts and state changes
@@ -466,6 +834,9 @@ class SensorExecuter:
 		# Flag indicates if the thread is initialized.
 		self._isInitialized = False
 
+		# Thread that sends the sensor alerts and state changes.
+		self.sender = None
+
 
 	def isInitialized(self):
 		return self._isInitialized
@@ -482,6 +853,12 @@ class SensorExecuter:
 			time.sleep(0.5)
 			self.connection = self.globalData.serverComm
 
+		self.sender = _MessageSender(self.connection)
+		# set thread to daemon
+		# => threads terminates when main thread terminates
+		self.sender.daemon = True
+		self.sender.start()
+
 		self._isInitialized = True
 
 		while True:
@@ -499,20 +876,17 @@ class SensorExecuter:
 				sensor.updateState()
 				currentState = sensor.getState()
 
-				# Check if a sensor alert is forced to send to the server.
+				# Check if sensor alerts are forced to send to the server
+				# (send all queued sensor alerts).
 				# => update already known state and continue
 				sensorAlert = sensor.forceSendAlert()
 				if sensorAlert:
 					oldState = currentState
 
-					asyncSenderProcess = AsynchronousSender(
-						self.connection, self.globalData)
-					# set thread to daemon
-					# => threads terminates when main thread terminates	
-					asyncSenderProcess.daemon = True
-					asyncSenderProcess.sendSensorAlert = True
-					asyncSenderProcess.sendSensorAlertSensorAlert = sensorAlert
-					asyncSenderProcess.start()
+					while sensorAlert:
+						self.sender.queueMessage(sensorAlert)
+
+						sensorAlert = sensor.forceSendAlert()
 
 					continue
 
@@ -542,15 +916,7 @@ class SensorExecuter:
 						sensorAlert.dataType = sensor.sensorDataType
 						sensorAlert.sensorData = sensor.sensorData
 
-						asyncSenderProcess = AsynchronousSender(
-							self.connection, self.globalData)
-						# set thread to daemon
-						# => threads terminates when main thread terminates	
-						asyncSenderProcess.daemon = True
-						asyncSenderProcess.sendSensorAlert = True
-						asyncSenderProcess.sendSensorAlertSensorAlert = \
-							sensorAlert
-						asyncSenderProcess.start()
+						self.sender.queueMessage(sensorAlert)
 
 					# if sensor does not trigger sensor alert
 					# => just send changed state to server
@@ -566,15 +932,7 @@ class SensorExecuter:
 						stateChange.dataType = sensor.sensorDataType
 						stateChange.sensorData = sensor.sensorData
 
-						asyncSenderProcess = AsynchronousSender(
-							self.connection, self.globalData)
-						# set thread to daemon
-						# => threads terminates when main thread terminates	
-						asyncSenderProcess.daemon = True
-						asyncSenderProcess.sendStateChange = True
-						asyncSenderProcess.sendStateChangeStateChange = \
-							stateChange
-						asyncSenderProcess.start()
+						self.sender.queueMessage(stateChange)
 
 				# only possible situation left => sensor changed
 				# back from triggering state to a normal state
@@ -600,15 +958,7 @@ class SensorExecuter:
 						sensorAlert.dataType = sensor.sensorDataType
 						sensorAlert.sensorData = sensor.sensorData
 
-						asyncSenderProcess = AsynchronousSender(
-							self.connection, self.globalData)
-						# set thread to daemon
-						# => threads terminates when main thread terminates	
-						asyncSenderProcess.daemon = True
-						asyncSenderProcess.sendSensorAlert = True
-						asyncSenderProcess.sendSensorAlertSensorAlert = \
-							sensorAlert
-						asyncSenderProcess.start()
+						self.sender.queueMessage(sensorAlert)
 
 					# if sensor does not trigger sensor alert when
 					# state is back to normal
@@ -625,15 +975,7 @@ class SensorExecuter:
 						stateChange.dataType = sensor.sensorDataType
 						stateChange.sensorData = sensor.sensorData
 
-						asyncSenderProcess = AsynchronousSender(
-							self.connection, self.globalData)
-						# set thread to daemon
-						# => threads terminates when main thread terminates	
-						asyncSenderProcess.daemon = True
-						asyncSenderProcess.sendStateChange = True
-						asyncSenderProcess.sendStateChangeStateChange = \
-							stateChange
-						asyncSenderProcess.start()
+						self.sender.queueMessage(stateChange)
 
 			# Poll all sensors if they want to force an update that should
 			# be send to the server.
@@ -641,14 +983,7 @@ class SensorExecuter:
 
 				stateChange = sensor.forceSendState()
 				if stateChange:
-					asyncSenderProcess = AsynchronousSender(
-						self.connection, self.globalData)
-					# set thread to daemon
-					# => threads terminates when main thread terminates	
-					asyncSenderProcess.daemon = True
-					asyncSenderProcess.sendStateChange = True
-					asyncSenderProcess.sendStateChangeStateChange = stateChange
-					asyncSenderProcess.start()
+					self.sender.queueMessage(stateChange)
 
 			# check if the last state that was sent to the server
 			# is older than 60 seconds => send state update
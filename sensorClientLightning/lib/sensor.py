@@ -15,6 +15,7 @@ import os
 import logging
 import threading
 import calendar
+import math
 from client import AsynchronousSender
 from localObjects import SensorDataType, SensorAlert, StateChange
 
@@ -561,94 +562,62 @@ class LightningmapSensor(_PollingSensor, threading.Thread):
 		return None
 
 
-	def processData(self, data):
+	# Processes a single lightning stroke (already decoded from the
+	# received json data).
+	def processStroke(self, stroke):
 
-		# parse received data
-		try:
-			dataJson = json.loads(data)
-		except Exception as e:
-			logging.exception("[%s]: Received data not in json format."
-				% self.fileName)
-			return
+		# utc time stamp is given in ms => lower the precision
+		strokeTime = stroke["time"] / 1000
 
-		# check if the key "strokes" exist
-		if not "strokes" in dataJson.keys():
-			logging.warning("[%s]: Received data does "
-				% self.fileName
-				+ "not contain 'strokes'.")
-			return
+		# get current utc time stamp
+		now = calendar.timegm(time.gmtime())
 
+		# skip stroke if it is too old
+		if (now - strokeTime) > self.strokeTimeTolerance:
+			logging.warning("[%s]: Received lightning is too old (%ds)."
+				% (self.fileName, (now - strokeTime)))
+			return
 
-		# process each lightning of the received data
-		for stroke in dataJson["strokes"]:
 
-			# utc time stamp is given in ms => lower the precision
-			strokeTime = stroke["time"] / 1000
+		# check if stroke occurred in home quadrant
+		# => thunderstorm reached home quadrant
+		if self._checkCoordInQuadrant(self.innerHull.innerQuadrant,
+			stroke["lat"], stroke["lon"]):
 
-			# get current utc time stamp
-			now = calendar.timegm(time.gmtime())
+			logging.debug("[%s]: Sensor '%s': "
+				% (self.fileName, self.description)
+				+ "Stroke hit home quadrant.")
 
-			# skip stroke if it is too old
-			if (now - strokeTime) > self.strokeTimeTolerance:
-				logging.warning("[%s]: Received lightning is too old (%ds)."
-					% (self.fileName, (now - strokeTime)))
-				continue
+			# check if last occured lightning in home quadrant
+			# is older than the configured lightning time
+			if ((strokeTime - self.innerHull.innerQuadrant.timeHit)
+				> self.lightningTime):
 
-
-			# check if stroke occurred in home quadrant
-			# => thunderstorm reached home quadrant
-			if self._checkCoordInQuadrant(self.innerHull.innerQuadrant,
-				stroke["lat"], stroke["lon"]):
-
-				logging.debug("[%s]: Sensor '%s': "
-					% (self.fileName, self.description)
-					+ "Stroke hit home quadrant.")
-
-				# check if last occured lightning in home quadrant
+				# check if last occured lightning in hull of home quadrant
 				# is older than the configured lightning time
-				if ((strokeTime - self.innerHull.innerQuadrant.timeHit)
+				# => thunderstorm could have started in home quadrant
+				if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
 					> self.lightningTime):
 
-					# check if last occured lightning in hull of home quadrant
+					# check if last occured lightning in outer hull
 					# is older than the configured lightning time
-					# => thunderstorm could have started in home quadrant
-					if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					# => thunderstorm started in home quadrant
+					if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
 						> self.lightningTime):
 
-						# check if last occured lightning in outer hull
-						# is older than the configured lightning time
-						# => thunderstorm started in home quadrant
-						if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
-							> self.lightningTime):
-
-							self._currentHomeMessage = \
-								"Thunderstorm started in home quadrant"
-
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "started in home quadrant.")
-
-						# => thunderstorm skipped hull of home quadrant
-						else:
-
-							# get direction from which thunderstorm approached
-							direction = self._getDirectionOfLastHit(
-								self.outerHull)
-
-							self._currentHomeMessage = \
-								"Thunderstorm reached from the %s" \
-								% self._convertDirectionToString(direction)
+						self._currentHomeMessage = \
+							"Thunderstorm started in home quadrant"
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "reached home quadrant from the %s."
-								% self._convertDirectionToString(direction))
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "started in home quadrant.")
 
-					# => thunderstorm reached home quadrant
+					# => thunderstorm skipped hull of home quadrant
 					else:
 
 						# get direction from which thunderstorm approached
-						direction = self._getDirectionOfLastHit(self.innerHull)
+						direction = self._getDirectionOfLastHit(
+							self.outerHull)
 
 						self._currentHomeMessage = \
 							"Thunderstorm reached from the %s" \
@@ -659,393 +628,444 @@ class LightningmapSensor(_PollingSensor, threading.Thread):
 							+ "reached home quadrant from the %s."
 							% self._convertDirectionToString(direction))
 
-				self.outerHull.outerQuadrant.timeHit = strokeTime
-				self.innerHull.outerQuadrant.timeHit = strokeTime
-				self.innerHull.innerQuadrant.timeHit = strokeTime
+				# => thunderstorm reached home quadrant
+				else:
 
+					# get direction from which thunderstorm approached
+					direction = self._getDirectionOfLastHit(self.innerHull)
 
-			# check if stroke occured in hull of home quadrant
-			# => thunderstorm approaching home quadrant
-			elif self._checkCoordInQuadrant(self.innerHull.outerQuadrant,
-				stroke["lat"], stroke["lon"]):
+					self._currentHomeMessage = \
+						"Thunderstorm reached from the %s" \
+						% self._convertDirectionToString(direction)
+
+					logging.info("[%s]: Sensor '%s': Thunderstorm "
+						% (self.fileName, self.description)
+						+ "reached home quadrant from the %s."
+						% self._convertDirectionToString(direction))
+
+			self.outerHull.outerQuadrant.timeHit = strokeTime
+			self.innerHull.outerQuadrant.timeHit = strokeTime
+			self.innerHull.innerQuadrant.timeHit = strokeTime
 
-				logging.debug("[%s]: Sensor '%s': "
-					% (self.fileName, self.description)
-					+ "Stroke hit inner hull.")
 
-				# check if sw quadrant was hit
-				if self._checkCoordInQuadrant(self.innerHull.sw,
-					stroke["lat"], stroke["lon"]):
+		# check if stroke occured in hull of home quadrant
+		# => thunderstorm approaching home quadrant
+		elif self._checkCoordInQuadrant(self.innerHull.outerQuadrant,
+			stroke["lat"], stroke["lon"]):
 
-					# check if last occured lightning in hull of home quadrant
+			logging.debug("[%s]: Sensor '%s': "
+				% (self.fileName, self.description)
+				+ "Stroke hit inner hull.")
+
+			# check if sw quadrant was hit
+			if self._checkCoordInQuadrant(self.innerHull.sw,
+				stroke["lat"], stroke["lon"]):
+
+				# check if last occured lightning in hull of home quadrant
+				# is older than the configured lightning time
+				if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					> self.lightningTime):
+
+					# check if last occured lightning in outer hull
 					# is older than the configured lightning time
-					if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					# => thunderstorm started in hull of home quadrant
+					if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
 						> self.lightningTime):
 
-						# check if last occured lightning in outer hull
-						# is older than the configured lightning time
-						# => thunderstorm started in hull of home quadrant
-						if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
-							> self.lightningTime):
+						self._currentHullMessage = \
+							"Thunderstorm started in the southwest"
 
-							self._currentHullMessage = \
-								"Thunderstorm started in the southwest"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "started in hull in the southwest.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "started in hull in the southwest.")
+					# => thunderstorm approaching
+					else:
 
-						# => thunderstorm approaching
-						else:
+						self._currentHullMessage = \
+							"Thunderstorm approaches from the southwest"
 
-							self._currentHullMessage = \
-								"Thunderstorm approaches from the southwest"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "approaches from the southwest.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "approaches from the southwest.")
+				# update hit time
+				self.innerHull.sw.timeHit = strokeTime
 
-					# update hit time
-					self.innerHull.sw.timeHit = strokeTime
 
+			# check if s quadrant was hit
+			elif self._checkCoordInQuadrant(self.innerHull.s,
+				stroke["lat"], stroke["lon"]):
 
-				# check if s quadrant was hit
-				elif self._checkCoordInQuadrant(self.innerHull.s,
-					stroke["lat"], stroke["lon"]):
+				# check if last occured lightning in hull of home quadrant
+				# is older than the configured lightning time
+				if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					> self.lightningTime):
 
-					# check if last occured lightning in hull of home quadrant
+					# check if last occured lightning in outer hull
 					# is older than the configured lightning time
-					if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					# => thunderstorm started in hull of home quadrant
+					if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
 						> self.lightningTime):
 
-						# check if last occured lightning in outer hull
-						# is older than the configured lightning time
-						# => thunderstorm started in hull of home quadrant
-						if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
-							> self.lightningTime):
+						self._currentHullMessage = \
+							"Thunderstorm started in the south"
 
-							self._currentHullMessage = \
-								"Thunderstorm started in the south"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "started in hull in the south.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "started in hull in the south.")
+					# => thunderstorm approaching
+					else:
 
-						# => thunderstorm approaching
-						else:
+						self._currentHullMessage = \
+							"Thunderstorm approaches from the south"
 
-							self._currentHullMessage = \
-								"Thunderstorm approaches from the south"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "approaches from the south.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "approaches from the south.")
+				# update hit time
+				self.innerHull.s.timeHit = strokeTime
 
-					# update hit time
-					self.innerHull.s.timeHit = strokeTime
 
+			# check if se quadrant was hit
+			elif self._checkCoordInQuadrant(self.innerHull.se,
+				stroke["lat"], stroke["lon"]):
 
-				# check if se quadrant was hit
-				elif self._checkCoordInQuadrant(self.innerHull.se,
-					stroke["lat"], stroke["lon"]):
+				# check if last occured lightning in hull of home quadrant
+				# is older than the configured lightning time
+				if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					> self.lightningTime):
 
-					# check if last occured lightning in hull of home quadrant
+					# check if last occured lightning in outer hull
 					# is older than the configured lightning time
-					if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					# => thunderstorm started in hull of home quadrant
+					if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
 						> self.lightningTime):
 
-						# check if last occured lightning in outer hull
-						# is older than the configured lightning time
-						# => thunderstorm started in hull of home quadrant
-						if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
-							> self.lightningTime):
+						self._currentHullMessage = \
+							"Thunderstorm started in the southeast"
 
-							self._currentHullMessage = \
-								"Thunderstorm started in the southeast"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "started in hull in the southeast.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "started in hull in the southeast.")
+					# => thunderstorm approaching
+					else:
 
-						# => thunderstorm approaching
-						else:
+						self._currentHullMessage = \
+							"Thunderstorm approaches from the southeast"
 
-							self._currentHullMessage = \
-								"Thunderstorm approaches from the southeast"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "approaches from the southeast.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "approaches from the southeast.")
+				# update hit time
+				self.innerHull.se.timeHit = strokeTime
 
-					# update hit time
-					self.innerHull.se.timeHit = strokeTime
 
+			# check if w quadrant was hit
+			elif self._checkCoordInQuadrant(self.innerHull.w,
+				stroke["lat"], stroke["lon"]):
 
-				# check if w quadrant was hit
-				elif self._checkCoordInQuadrant(self.innerHull.w,
-					stroke["lat"], stroke["lon"]):
+				# check if last occured lightning in hull of home quadrant
+				# is older than the configured lightning time
+				if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					> self.lightningTime):
 
-					# check if last occured lightning in hull of home quadrant
+					# check if last occured lightning in outer hull
 					# is older than the configured lightning time
-					if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					# => thunderstorm started in hull of home quadrant
+					if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
 						> self.lightningTime):
 
-						# check if last occured lightning in outer hull
-						# is older than the configured lightning time
-						# => thunderstorm started in hull of home quadrant
-						if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
-							> self.lightningTime):
+						self._currentHullMessage = \
+							"Thunderstorm started in the west"
 
-							self._currentHullMessage = \
-								"Thunderstorm started in the west"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "started in hull in the west.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "started in hull in the west.")
+					# => thunderstorm approaching
+					else:
 
-						# => thunderstorm approaching
-						else:
+						self._currentHullMessage = \
+							"Thunderstorm approaches from the west"
 
-							self._currentHullMessage = \
-								"Thunderstorm approaches from the west"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "approaches from the west.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "approaches from the west.")
+				# update hit time
+				self.innerHull.w.timeHit = strokeTime
 
-					# update hit time
-					self.innerHull.w.timeHit = strokeTime
 
+			# check if e quadrant was hit
+			elif self._checkCoordInQuadrant(self.innerHull.e,
+				stroke["lat"], stroke["lon"]):
 
-				# check if e quadrant was hit
-				elif self._checkCoordInQuadrant(self.innerHull.e,
-					stroke["lat"], stroke["lon"]):
+				# check if last occured lightning in hull of home quadrant
+				# is older than the configured lightning time
+				if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					> self.lightningTime):
 
-					# check if last occured lightning in hull of home quadrant
+					# check if last occured lightning in outer hull
 					# is older than the configured lightning time
-					if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					# => thunderstorm started in hull of home quadrant
+					if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
 						> self.lightningTime):
 
-						# check if last occured lightning in outer hull
-						# is older than the configured lightning time
-						# => thunderstorm started in hull of home quadrant
-						if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
-							> self.lightningTime):
+						self._currentHullMessage = \
+							"Thunderstorm started in the east"
 
-							self._currentHullMessage = \
-								"Thunderstorm started in the east"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "started in hull in the east.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "started in hull in the east.")
+					# => thunderstorm approaching
+					else:
 
-						# => thunderstorm approaching
-						else:
+						self._currentHullMessage = \
+							"Thunderstorm approaches from the east"
 
-							self._currentHullMessage = \
-								"Thunderstorm approaches from the east"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "approaches from the east.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "approaches from the east.")
+				# update hit time
+				self.innerHull.e.timeHit = strokeTime
 
-					# update hit time
-					self.innerHull.e.timeHit = strokeTime
 
+			# check if nw quadrant was hit
+			elif self._checkCoordInQuadrant(self.innerHull.nw,
+				stroke["lat"], stroke["lon"]):
 
-				# check if nw quadrant was hit
-				elif self._checkCoordInQuadrant(self.innerHull.nw,
-					stroke["lat"], stroke["lon"]):
+				# check if last occured lightning in hull of home quadrant
+				# is older than the configured lightning time
+				if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					> self.lightningTime):
 
-					# check if last occured lightning in hull of home quadrant
+					# check if last occured lightning in outer hull
 					# is older than the configured lightning time
-					if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					# => thunderstorm started in hull of home quadrant
+					if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
 						> self.lightningTime):
 
-						# check if last occured lightning in outer hull
-						# is older than the configured lightning time
-						# => thunderstorm started in hull of home quadrant
-						if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
-							> self.lightningTime):
+						self._currentHullMessage = \
+							"Thunderstorm started in the northwest"
 
-							self._currentHullMessage = \
-								"Thunderstorm started in the northwest"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "started in hull in the northwest.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "started in hull in the northwest.")
+					# => thunderstorm approaching
+					else:
 
-						# => thunderstorm approaching
-						else:
+						self._currentHullMessage = \
+							"Thunderstorm approaches from the northwest"
 
-							self._currentHullMessage = \
-								"Thunderstorm approaches from the northwest"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "approaches from the northwest.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "approaches from the northwest.")
+				# update hit time
+				self.innerHull.nw.timeHit = strokeTime
 
-					# update hit time
-					self.innerHull.nw.timeHit = strokeTime
 
+			# check if n quadrant was hit
+			elif self._checkCoordInQuadrant(self.innerHull.n,
+				stroke["lat"], stroke["lon"]):
 
-				# check if n quadrant was hit
-				elif self._checkCoordInQuadrant(self.innerHull.n,
-					stroke["lat"], stroke["lon"]):
+				# check if last occured lightning in hull of home quadrant
+				# is older than the configured lightning time
+				if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					> self.lightningTime):
 
-					# check if last occured lightning in hull of home quadrant
+					# check if last occured lightning in outer hull
 					# is older than the configured lightning time
-					if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					# => thunderstorm started in hull of home quadrant
+					if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
 						> self.lightningTime):
 
-						# check if last occured lightning in outer hull
-						# is older than the configured lightning time
-						# => thunderstorm started in hull of home quadrant
-						if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
-							> self.lightningTime):
+						self._currentHullMessage = \
+							"Thunderstorm started in the north"
 
-							self._currentHullMessage = \
-								"Thunderstorm started in the north"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "started in hull in the north.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "started in hull in the north.")
+					# => thunderstorm approaching
+					else:
 
-						# => thunderstorm approaching
-						else:
+						self._currentHullMessage = \
+							"Thunderstorm approaches from the north"
 
-							self._currentHullMessage = \
-								"Thunderstorm approaches from the north"
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "approaches from the north.")
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "approaches from the north.")
+				# update hit time
+				self.innerHull.n.timeHit = strokeTime
 
-					# update hit time
-					self.innerHull.n.timeHit = strokeTime
 
+			# check if ne quadrant was hit
+			elif self._checkCoordInQuadrant(self.innerHull.ne,
+				stroke["lat"], stroke["lon"]):
 
-				# check if ne quadrant was hit
-				elif self._checkCoordInQuadrant(self.innerHull.ne,
-					stroke["lat"], stroke["lon"]):
+				# check if last occured lightning in hull of home quadrant
+				# is older than the configured lightning time
+				if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					> self.lightningTime):
 
-					# check if last occured lightning in hull of home quadrant
+					# check if last occured lightning in outer hull
 					# is older than the configured lightning time
-					if ((strokeTime - self.innerHull.outerQuadrant.timeHit)
+					# => thunderstorm started in hull of home quadrant
+					if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
 						> self.lightningTime):
 
-						# check if last occured lightning in outer hull
-						# is older than the configured lightning time
-						# => thunderstorm started in hull of home quadrant
-						if ((strokeTime - self.outerHull.outerQuadrant.timeHit)
-							> self.lightningTime):
+						self._currentHullMessage = \
+							"Thunderstorm started in the northeast"
+
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "started in hull in the northeast.")
+
+					# => thunderstorm approaching
+					else:
 
-							self._currentHullMessage = \
-								"Thunderstorm started in the northeast"
+						self._currentHullMessage = \
+							"Thunderstorm approaches from the northeast"
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "started in hull in the northeast.")
+						logging.info("[%s]: Sensor '%s': Thunderstorm "
+							% (self.fileName, self.description)
+							+ "approaches from the northeast.")
 
-						# => thunderstorm approaching
-						else:
+				# update hit time
+				self.innerHull.ne.timeHit = strokeTime
 
-							self._currentHullMessage = \
-								"Thunderstorm approaches from the northeast"
 
-							logging.info("[%s]: Sensor '%s': Thunderstorm "
-								% (self.fileName, self.description)
-								+ "approaches from the northeast.")
+			else:
 
-					# update hit time
-					self.innerHull.ne.timeHit = strokeTime
+				logging.error("[%s]: Sensor '%s': No "
+					% (self.fileName, self.description)
+					+ "direction in inner hull found.")
 
 
-				else:
+			# update time when hit
+			self.outerHull.outerQuadrant.timeHit = strokeTime
+			self.innerHull.outerQuadrant.timeHit = strokeTime
 
-					logging.error("[%s]: Sensor '%s': No "
-						% (self.fileName, self.description)
-						+ "direction in inner hull found.")
 
+		# check if stroke occured in outer hull
+		# => thunderstorm not yet at home quadrant
+		elif self._checkCoordInQuadrant(self.outerHull.outerQuadrant,
+			stroke["lat"], stroke["lon"]):
+
+			logging.debug("[%s]: Sensor '%s': "
+				% (self.fileName, self.description)
+				+ "Stroke hit outer hull.")
 
-				# update time when hit
-				self.outerHull.outerQuadrant.timeHit = strokeTime
-				self.innerHull.outerQuadrant.timeHit = strokeTime
+			# check if sw quadrant was hit
+			if self._checkCoordInQuadrant(self.outerHull.sw,
+				stroke["lat"], stroke["lon"]):
 
+				# update hit time
+				self.outerHull.sw.timeHit = strokeTime
 
-			# check if stroke occured in outer hull
-			# => thunderstorm not yet at home quadrant
-			elif self._checkCoordInQuadrant(self.outerHull.outerQuadrant,
+			# check if s quadrant was hit
+			elif self._checkCoordInQuadrant(self.outerHull.s,
 				stroke["lat"], stroke["lon"]):
 
-				logging.debug("[%s]: Sensor '%s': "
-					% (self.fileName, self.description)
-					+ "Stroke hit outer hull.")
+				# update hit time
+				self.outerHull.s.timeHit = strokeTime
 
-				# check if sw quadrant was hit
-				if self._checkCoordInQuadrant(self.outerHull.sw,
-					stroke["lat"], stroke["lon"]):
+			# check if se quadrant was hit
+			elif self._checkCoordInQuadrant(self.outerHull.se,
+				stroke["lat"], stroke["lon"]):
 
-					# update hit time
-					self.outerHull.sw.timeHit = strokeTime
+				# update hit time
+				self.outerHull.se.timeHit = strokeTime
 
-				# check if s quadrant was hit
-				elif self._checkCoordInQuadrant(self.outerHull.s,
-					stroke["lat"], stroke["lon"]):
+			# check if w quadrant was hit
+			elif self._checkCoordInQuadrant(self.outerHull.w,
+				stroke["lat"], stroke["lon"]):
+
+				# update hit time
+				self.outerHull.w.timeHit = strokeTime
 
-					# update hit time
-					self.outerHull.s.timeHit = strokeTime
+			# check if e quadrant was hit
+			elif self._checkCoordInQuadrant(self.outerHull.e,
+				stroke["lat"], stroke["lon"]):
 
-				# check if se quadrant was hit
-				elif self._checkCoordInQuadrant(self.outerHull.se,
-					stroke["lat"], stroke["lon"]):
+				# update hit time
+				self.outerHull.e.timeHit = strokeTime
+
+			# check if nw quadrant was hit
+			elif self._checkCoordInQuadrant(self.outerHull.nw,
+				stroke["lat"], stroke["lon"]):
 
-					# update hit time
-					self.outerHull.se.timeHit = strokeTime
+				# update hit time
+				self.outerHull.nw.timeHit = strokeTime
 
-				# check if w quadrant was hit
-				elif self._checkCoordInQuadrant(self.outerHull.w,
-					stroke["lat"], stroke["lon"]):
+			# check if n quadrant was hit
+			elif self._checkCoordInQuadrant(self.outerHull.n,
+				stroke["lat"], stroke["lon"]):
 
-					# update hit time
-					self.outerHull.w.timeHit = strokeTime
+				# update hit time
+				self.outerHull.n.timeHit = strokeTime
 
-				# check if e quadrant was hit
-				elif self._checkCoordInQuadrant(self.outerHull.e,
-					stroke["lat"], stroke["lon"]):
+			# check if ne quadrant was hit
+			elif self._checkCoordInQuadrant(self.outerHull.ne,
+				stroke["lat"], stroke["lon"]):
 
-					# update hit time
-					self.outerHull.e.timeHit = strokeTime
+				# update hit time
+				self.outerHull.ne.timeHit = strokeTime
 
-				# check if nw quadrant was hit
-				elif self._checkCoordInQuadrant(self.outerHull.nw,
-					stroke["lat"], stroke["lon"]):
+			else:
 
-					# update hit time
-					self.outerHull.nw.timeHit = strokeTime
+				logging.error("[%s]: Sensor '%s': No "
+					% (self.fileName, self.description)
+					+ "direction in outer hull found.")
 
-				# check if n quadrant was hit
-				elif self._checkCoordInQuadrant(self.outerHull.n,
-					stroke["lat"], stroke["lon"]):
 
-					# update hit time
-					self.outerHull.n.timeHit = strokeTime
+			self.outerHull.outerQuadrant.timeHit = strokeTime
 
-				# check if ne quadrant was hit
-				elif self._checkCoordInQuadrant(self.outerHull.ne,
-					stroke["lat"], stroke["lon"]):
 
-					# update hit time
-					self.outerHull.ne.timeHit = strokeTime
 
-				else:
+# internal class that indexes the sensors by the area they watch
+# (a grid over all outer hulls) in order to only hand strokes to the
+# sensors whose outer hull could contain them
+class _SensorGrid:
 
-					logging.error("[%s]: Sensor '%s': No "
-						% (self.fileName, self.description)
-						+ "direction in outer hull found.")
+	def __init__(self, sensors, cellSize=1.0):
 
+		# size of a grid cell in degrees
+		self.cellSize = cellSize
 
-				self.outerHull.outerQuadrant.timeHit = strokeTime
+		# maps a grid cell (lat index, lon index) to the list of sensors
+		# whose outer hull intersects this cell
+		self.cells = dict()
+
+		for sensor in sensors:
+			quadrant = sensor.outerHull.outerQuadrant
+			latStart, lonStart = self._getCell(quadrant.y1, quadrant.x1)
+			latEnd, lonEnd = self._getCell(quadrant.y2, quadrant.x2)
+			for latIdx in range(latStart, latEnd + 1):
+				for lonIdx in range(lonStart, lonEnd + 1):
+					self.cells.setdefault((latIdx, lonIdx), list()).append(
+						sensor)
+
+
+	def _getCell(self, lat, lon):
+		return (int(math.floor(lat / self.cellSize)),
+			int(math.floor(lon / self.cellSize)))
+
+
+	# Returns a list of sensors whose outer hull could contain
+	# the given coordinates.
+	def getSensors(self, lat, lon):
+		return self.cells.get(self._getCell(lat, lon), [])
 
 
 # class that collects lightning data from lightningmaps.org
@@ -1060,6 +1080,18 @@ class LightningmapDataCollector(threading.Thread):
 		self.connection = None
 		self.sensors = sensors
 
+		# spatial index over the watched areas of all sensors
+		# (built when the thread starts since the sensors have to be
+		# initialized first)
+		self.sensorGrid = None
+
+		# how old (in seconds) a lightning can be before it is discarded
+		# (the largest tolerance of all sensors)
+		self.strokeTimeTolerance = 0
+		for sensor in self.sensors:
+			if sensor.strokeTimeTolerance > self.strokeTimeTolerance:
+				self.strokeTimeTolerance = sensor.strokeTimeTolerance
+
 		# addresses for websocket connections to lightningmaps.org
 		self.addresses = ["ws://ws.lightningmaps.org:8081",
 			"ws://ws.lightningmaps.org:8080",
@@ -1091,8 +1123,54 @@ class LightningmapDataCollector(threading.Thread):
 				time.sleep(5)
 
 
+	# Decodes the received data once and hands each stroke only to the
+	# sensors whose watched area could contain it.
+	def processData(self, data):
+
+		# parse received data
+		try:
+			dataJson = json.loads(data)
+		except Exception as e:
+			logging.exception("[%s]: Received data not in json format."
+				% self.fileName)
+			return
+
+		# check if the key "strokes" exist
+		if not "strokes" in dataJson.keys():
+			logging.warning("[%s]: Received data does "
+				% self.fileName
+				+ "not contain 'strokes'.")
+			return
+
+		# get current utc time stamp
+		now = calendar.timegm(time.gmtime())
+
+		for stroke in dataJson["strokes"]:
+
+			try:
+				# utc time stamp is given in ms => lower the precision
+				strokeTime = stroke["time"] / 1000
+				lat = stroke["lat"]
+				lon = stroke["lon"]
+			except Exception as e:
+				logging.exception("[%s]: Received stroke is malformed."
+					% self.fileName)
+				continue
+
+			# skip stroke if it is too old
+			if (now - strokeTime) > self.strokeTimeTolerance:
+				logging.warning("[%s]: Received lightning is too old (%ds)."
+					% (self.fileName, (now - strokeTime)))
+				continue
+
+			for sensor in self.sensorGrid.getSensors(lat, lon):
+				sensor.processStroke(stroke)
+
+
 	def run(self):
 
+		self.sensorGrid = _SensorGrid(self.sensors)
+
 		while True:
 
 			self.connect()
@@ -1111,9 +1189,9 @@ class LightningmapDataCollector(threading.Thread):
 				if data == "":
 					break
 
-				# give received data to each sensor for processing
-				for sensor in self.sensors:
-					sensor.processData(data)
+				# decode received data and dispatch the strokes
+				# to the affected sensors
+				self.processData(data)
 
 			# close websocket connection and reconnect
 			try:
@@ -53,4 +53,8 @@ class StateChange:
 
 		# The sensor data type and data that is connected to this sensor alert.
 		self.dataType = None
-		self.sensorData = None
\ No newline at end of file
+		self.sensorData = None
+
+		# Number of data updates of the sensor that were suppressed
+		# since the last state change was sent.
+		self.suppressedUpdates = 0
\ No newline at end of file
@@ -12,7 +12,7 @@ import os
 from lib import ServerCommunication, ConnectionWatchdog
 from lib import SMTPAlert
 from lib import RaspberryPiGPIOPollingSensor, RaspberryPiGPIOInterruptSensor, \
-	RaspberryPiDS18b20Sensor, SensorExecuter
+	RaspberryPiDS18b20Sensor, SensorExecuter, DeviceSampler
 from lib import UpdateChecker
 from lib import GlobalData
 from lib import Ordering
@@ -40,6 +40,9 @@ if __name__ == '__main__':
 	# generate object of the global needed data
 	globalData = GlobalData()
 
+	# Create sampler thread for the slow devices (ds18b20 sensors).
+	deviceSampler = DeviceSampler()
+
 	fileName = os.path.basename(__file__)
 
 	# parse config file, get logfile configurations
@@ -254,6 +257,7 @@ if __name__ == '__main__':
 					sensor.alertLevels.append(int(alertLevelXml.text))
 
 				# ds18b20 specific settings
+				sensor.sampler = deviceSampler
 				sensor.sensorName = str(item.find("gpio").attrib["sensorName"])
 				sensor.interval = int(item.find("gpio").attrib["interval"])
 				sensor.hasThreshold = (str(item.find("gpio").attrib[
@@ -271,6 +275,36 @@ if __name__ == '__main__':
 					raise ValueError("Type of ordering '%s' not valid."
 						% orderingStr)
 
+				# Data filter settings of the sensor (optional, without them
+				# every data change is reported).
+				dataFilter = item.find("dataFilter")
+				if dataFilter is not None:
+					if "deadband" in dataFilter.attrib.keys():
+						sensor.deadband = float(dataFilter.attrib["deadband"])
+					if "deadbandType" in dataFilter.attrib.keys():
+						deadbandTypeStr = str(
+							dataFilter.attrib["deadbandType"]).upper()
+						if deadbandTypeStr == "ABSOLUTE":
+							sensor.deadbandRelative = False
+						elif deadbandTypeStr == "RELATIVE":
+							sensor.deadbandRelative = True
+						else:
+							raise ValueError("Type of deadband '%s' not valid."
+								% deadbandTypeStr)
+					if "minReportInterval" in dataFilter.attrib.keys():
+						sensor.minReportInterval = int(
+							dataFilter.attrib["minReportInterval"])
+					if "smoothingWindow" in dataFilter.attrib.keys():
+						sensor.smoothingWindow = int(
+							dataFilter.attrib["smoothingWindow"])
+
+				# Check sanity of the data filter settings.
+				if (sensor.deadband < 0.0
+					or sensor.minReportInterval < 0
+					or sensor.smoothingWindow < 1):
+					raise ValueError("Illegal data filter for sensor %d."
+						% sensor.id)
+
 			else:
 				raise ValueError("Type of sensor '%s' not valid."
 					% sensorType)
@@ -325,6 +359,15 @@ if __name__ == '__main__':
 				% fileName)
 			sys.exit(1)
 
+	# Start sampler thread if devices are registered (this is done by the
+	# sensors during the initialization).
+	# Set thread to daemon.
+	# => Thread terminates when main thread terminates.
+	if deviceSampler.devices:
+		logging.info("[%s] Starting device sampler thread." % fileName)
+		deviceSampler.daemon = True
+		deviceSampler.start()
+
 	# generate object for the communication to the server and connect to it
 	globalData.serverComm = ServerCommunication(server, serverPort,
 		serverCAFile, username, password, clientCertFile, clientKeyFile,
@@ -10,7 +10,8 @@
 from client import ServerCommunication, ConnectionWatchdog, AsynchronousSender
 from smtp import SMTPAlert
 from sensor import RaspberryPiGPIOPollingSensor, \
-	RaspberryPiGPIOInterruptSensor, RaspberryPiDS18b20Sensor, SensorExecuter
+	RaspberryPiGPIOInterruptSensor, RaspberryPiDS18b20Sensor, SensorExecuter, \
+	DeviceSampler
 from update import UpdateChecker, Updater
 from globalData import GlobalData
 from localObjects import Ordering
\ No newline at end of file
@@ -17,6 +17,7 @@ import base64
 import xml.etree.cElementTree
 import random
 import json
+import zlib
 from localObjects import SensorDataType
 BUFSIZE = 4096
 
@@ -111,6 +112,21 @@ class ServerCommunication:
 		# transaction with the server
 		self.transactionInitiation = False
 
+		# flag that states if the compression of large messages was
+		# negotiated with the server, the minimal size of a message in bytes
+		# that is sent compressed and the maximal size of a
+		# decompressed message
+		self.compression = False
+		self.compressionThreshold = 1024
+		self.maxDecompressedSize = 16777216
+
+		# statistics of the compressed messages of the current connection
+		# (sizes before and after the compression and the time spent
+		# to compress and decompress them)
+		self.compressionRawSize = 0
+		self.compressionSize = 0
+		self.compressionTime = 0.0
+
 
 	# internal function that acquires the lock
 	def _acquireLock(self):
@@ -130,13 +146,58 @@ class ServerCommunication:
 		# set client as disconnected
 		self._isConnected = False
 
+		# log the statistics of the compressed messages
+		if self.compressionRawSize > 0:
+			logging.info("[%s]: Compressed messages: %d bytes "
+				% (self.fileName, self.compressionRawSize)
+				+ "as %d bytes (%.1f%%) in %.3f seconds."
+				% (self.compressionSize,
+				100.0 * self.compressionSize / self.compressionRawSize,
+				self.compressionTime))
+			self.compressionRawSize = 0
+			self.compressionSize = 0
+			self.compressionTime = 0.0
+
 		self.client.close()
 
 
+	# internal function that compresses the given message with zlib
+	# and records the compression ratio and the time spent
+	def _compressData(self, messageType, message):
+
+		startTime = time.time()
+		data = zlib.compress(message)
+		duration = time.time() - startTime
+
+		self.compressionRawSize += len(message)
+		self.compressionSize += len(data)
+		self.compressionTime += duration
+
+		logging.debug("[%s]: Compressed %s message from %d to %d "
+			% (self.fileName, messageType, len(message), len(data))
+			+ "bytes in %.2f ms." % (duration * 1000))
+
+		return data
+
+
+	# internal function that compresses the given message if the
+	# compression was negotiated with the server and the message is large
+	# enough (returns a tuple of the data to send and its encoding
+	# which is None if the message is not compressed)
+	def _compressMessage(self, messageType, message):
+
+		if (not self.compression
+			or len(message) < self.compressionThreshold):
+			return message, None
+
+		return self._compressData(messageType, message), "zlib"
+
+
 	# this internal function that tries to initiate a transaction with
 	# the server (and acquires a lock if it is told to do so)
+	# (the encoding of the message is announced if it is compressed)
 	def _initiateTransaction(self, messageType, messageSize,
-		acquireLock=False):
+		acquireLock=False, encoding=None):
 
 		# try to get the exclusive state to be allowed to initiate a
 		# transaction with the server
@@ -195,6 +256,8 @@ class ServerCommunication:
 					"size": messageSize,
 					"message": messageType,
 					"payload": payload}
+				if encoding is not None:
+					message["encoding"] = encoding
 				self.client.send(json.dumps(message))
 			except Exception as e:
 				logging.exception("[%s]: Sending RTS " % self.fileName
@@ -280,19 +343,25 @@ class ServerCommunication:
 		return True
 
 
-	# Internal function that builds the client authentication message.
-	def _buildAuthenticationMessage(self, regMessageSize):
+	# Internal function that builds the client authentication message
+	# (offers the compression of large messages and the size of the
+	# compressed registration message if it is large enough).
+	def _buildAuthenticationMessage(self, regMessageSize,
+		compressedRegMessageSize=None):
 
 		payload = {"type": "request",
 			"version": self.version,
 			"rev": self.rev,
 			"username": self.username,
-			"password": self.password}
+			"password": self.password,
+			"compression": "zlib"}
 		utcTimestamp = int(time.time())
 		message = {"clientTime": utcTimestamp,
 			"size": regMessageSize,
 			"message": "initialization",
 			"payload": payload}
+		if compressedRegMessageSize is not None:
+			message["compressedSize"] = compressedRegMessageSize
 		return json.dumps(message)
 
 
@@ -419,6 +488,10 @@ class ServerCommunication:
 		if stateChange.dataType != SensorDataType.NONE:
 			payload["data"] = stateChange.sensorData
 
+		# Only add the number of suppressed data updates if there are any.
+		if stateChange.suppressedUpdates > 0:
+			payload["suppressed"] = stateChange.suppressedUpdates
+
 		utcTimestamp = int(time.time())
 		message = {"clientTime": utcTimestamp,
 			"message": "statechange",
@@ -427,9 +500,13 @@ class ServerCommunication:
 
 
 	# internal function to verify the server/client version and authenticate
-	def _verifyVersionAndAuthenticate(self, regMessageSize):
+	def _verifyVersionAndAuthenticate(self, regMessageSize,
+		compressedRegMessageSize=None):
+
+		self.compression = False
 
-		authMessage = self._buildAuthenticationMessage(regMessageSize)
+		authMessage = self._buildAuthenticationMessage(regMessageSize,
+			compressedRegMessageSize)
 
 		# send user credentials and version
 		try:
@@ -542,6 +619,10 @@ class ServerCommunication:
 
 			return False
 
+		# check if the server accepted the compression of large messages
+		self.compression = (
+			message["payload"].get("compression", None) == "zlib")
+
 		return True
 
 
@@ -637,11 +718,19 @@ class ServerCommunication:
 
 			return False
 
-		# Build registration message.
+		# Build registration message (and offer the server to send it
+		# compressed if it is large enough).
 		regMessage = self._buildRegistrationMessage()
+		compressedRegMessage = None
+		compressedRegMessageSize = None
+		if len(regMessage) >= self.compressionThreshold:
+			compressedRegMessage = self._compressData("registration",
+				regMessage)
+			compressedRegMessageSize = len(compressedRegMessage)
 
 		# First check version and authenticate.
-		if not self._verifyVersionAndAuthenticate(len(regMessage)):
+		if not self._verifyVersionAndAuthenticate(len(regMessage),
+			compressedRegMessageSize):
 			self.client.close()
 			logging.error("[%s]: Version verification and " % self.fileName
 				+ "authentication failed.")
@@ -650,7 +739,10 @@ class ServerCommunication:
 
 			return False
 
-		# Second register node.
+		# Second register node
+		# (compressed if the server accepted the compression).
+		if self.compression and compressedRegMessage is not None:
+			regMessage = compressedRegMessage
 		if not self._registerNode(regMessage):
 			self.client.close()
 			logging.error("[%s]: Registration failed."
@@ -933,9 +1025,12 @@ class ServerCommunication:
 
 		sensorAlertMessage = self._buildSensorAlertMessage(sensorAlert)
 
+		sensorAlertMessage, encoding = self._compressMessage("sensoralert",
+			sensorAlertMessage)
+
 		# initiate transaction with server and acquire lock
 		if not self._initiateTransaction("sensoralert",
-			len(sensorAlertMessage), acquireLock=True):
+			len(sensorAlertMessage), acquireLock=True, encoding=encoding):
 
 			# clean up session before exiting
 			self._cleanUpSessionForClosing()
@@ -14,6 +14,8 @@ import os
 import logging
 import re
 import threading
+import collections
+import Queue
 from client import AsynchronousSender
 from localObjects import SensorDataType, Ordering, SensorAlert, StateChange
 
@@ -87,6 +89,27 @@ class _PollingSensor:
 		self.hasOptionalData = False
 		self.optionalData = None
 
+		# Filter for the data updates of the sensor that are sent to the
+		# server. Updates are suppressed if the data stays in the deadband
+		# around the data last reported (relative deadbands are a fraction of
+		# the data last reported, i.e., 0.05 = 5%) and reported at most once
+		# every "minReportInterval" seconds. The data can be smoothed by a
+		# moving average over the last "smoothingWindow" samples
+		# (1 = no smoothing).
+		self.deadband = 0.0
+		self.deadbandRelative = False
+		self.minReportInterval = 0
+		self.smoothingWindow = 1
+
+		# Internal values of the data filter. The number of suppressed
+		# updates is sent to the server with the next reported update.
+		self._smoothingSamples = collections.deque()
+		self._lastReportedData = None
+		self._lastReportTime = 0.0
+		self._pendingData = None
+		self._hasPendingData = False
+		self._suppressedUpdates = 0
+
 
 	# this function returns the current state of the sensor
 	def getState(self):
@@ -125,6 +148,77 @@ class _PollingSensor:
 		raise NotImplementedError("Function not implemented yet.")
 
 
+	# Internal function that adds the given sample to the moving average
+	# of the sensor data.
+	#
+	# Returns the smoothed sensor data.
+	def _smoothData(self, sensorData):
+		if self.smoothingWindow <= 1:
+			return sensorData
+
+		self._smoothingSamples.append(sensorData)
+		while len(self._smoothingSamples) > self.smoothingWindow:
+			self._smoothingSamples.popleft()
+
+		smoothedData = (sum(self._smoothingSamples)
+			/ float(len(self._smoothingSamples)))
+		if self.sensorDataType == SensorDataType.INT:
+			return int(round(smoothedData))
+		return smoothedData
+
+
+	# Internal function that adds a new data update of the sensor that
+	# should be reported to the server. Updates in the deadband are
+	# suppressed, all others are kept pending until the minimum report
+	# interval has passed (a newer update supersedes a pending one).
+	def _addDataUpdate(self, sensorData):
+
+		if self._hasPendingData:
+			self._hasPendingData = False
+			self._suppressedUpdates += 1
+
+		if self._lastReportedData is not None:
+			deadband = self.deadband
+			if self.deadbandRelative:
+				deadband *= abs(self._lastReportedData)
+			if abs(sensorData - self._lastReportedData) < deadband:
+				self._suppressedUpdates += 1
+				return
+
+		self._pendingData = sensorData
+		self._hasPendingData = True
+
+
+	# Internal function that returns the pending data update of the sensor
+	# if the minimum report interval has passed.
+	#
+	# Returns an object of class StateChange or None.
+	def _getDataUpdate(self, state):
+		if not self._hasPendingData:
+			return None
+
+		utcTimestamp = time.time()
+		if (utcTimestamp - self._lastReportTime) < self.minReportInterval:
+			return None
+
+		self._hasPendingData = False
+		self._lastReportedData = self._pendingData
+		self._lastReportTime = utcTimestamp
+
+		stateChange = StateChange()
+		stateChange.clientSensorId = self.id
+		if state == self.triggerState:
+			stateChange.state = 1
+		else:
+			stateChange.state = 0
+		stateChange.dataType = self.sensorDataType
+		stateChange.sensorData = self._pendingData
+		stateChange.suppressedUpdates = self._suppressedUpdates
+		self._suppressedUpdates = 0
+
+		return stateChange
+
+
 # class that controls one sensor at a gpio pin of the raspberry pi
 class RaspberryPiGPIOPollingSensor(_PollingSensor):
 
@@ -345,46 +439,34 @@ class RaspberryPiDS18b20Sensor(_PollingSensor):
 		# (lower than, equal, greater than).
 		self.ordering = None
 
-		# To keep the traffic on the bus low, only allow temperature refreshes
-		# every 60 seconds. 
-		self.refreshInterval = 60
-		self.lastTemperatureUpdate = 0.0
-
-		# Locks temperature value in order to be thread safe.
-		self.updateLock = threading.Semaphore(1)
-
-		# Internal sensor data value only accessed when locked.
-		self._sensorData = None
+		# Location of the 1-Wire devices (sysfs).
+		self.devicesLocation = "/sys/bus/w1/devices/"
 
+		# Instance of the sampler that reads the sensor file in the
+		# background and the time of the last sample that was processed.
+		self.sampler = None
+		self._lastSampleTime = None
 
-	# Internal function that reads the data of the sensor.
-	def _updateData(self):
 
-		try:
-			with open(self.sensorFile, 'r') as fp:
-
-				# File content looks like this:
-				# 2d 00 4b 46 ff ff 04 10 b3 : crc=b3 YES
-				# 2d 00 4b 46 ff ff 04 10 b3 t=22500
-				fp.readline()
-				line = fp.readline()
+	# Internal function that reads the data of the sensor (called by the
+	# sampler, reading the sensor file can take 750 ms and more).
+	#
+	# Returns the temperature or raises an exception.
+	def _readSensorFile(self):
 
-				reMatch = re.match("([0-9a-f]{2} ){9}t=([+-]?[0-9]+)",
-					line)
-				if reMatch:
+		with open(self.sensorFile, 'r') as fp:
 
-					temp = float(reMatch.group(2)) / 1000
-					self.updateLock.acquire()
-					self._sensorData = temp
-					self.updateLock.release()
+			# File content looks like this:
+			# 2d 00 4b 46 ff ff 04 10 b3 : crc=b3 YES
+			# 2d 00 4b 46 ff ff 04 10 b3 t=22500
+			fp.readline()
+			line = fp.readline()
 
-				else:
-					logging.error("[%s]: Could not parse sensor file."
-						% self.fileName)
+		reMatch = re.match("([0-9a-f]{2} ){9}t=([+-]?[0-9]+)", line)
+		if not reMatch:
+			raise ValueError("Could not parse sensor file.")
 
-		except Exception as e:
-			logging.exception("[%s]: Could not read sensor file."
-				% self.fileName)
+		return float(reMatch.group(2)) / 1000
 
 
 	def initializeSensor(self):
@@ -393,22 +475,21 @@ class RaspberryPiDS18b20Sensor(_PollingSensor):
 
 		self.state = 1 - self.triggerState
 
-		self.sensorFile = "/sys/bus/w1/devices/" \
+		self.sensorFile = self.devicesLocation \
 			+ self.sensorName \
 			+ "/w1_slave"
 
-		# First time the temperature is updated is done in a blocking way.
-		utcTimestamp = int(time.time())
-		self._updateData()
-		self.lastTemperatureUpdate = utcTimestamp
-		self.updateLock.acquire()
-		self.sensorData = self._sensorData
-		self.updateLock.release()
-
-		if not self.sensorData:
+		# Register the sensor at the sampler. The first time the
+		# temperature is read is done in a blocking way.
+		self.sampler.addDevice(self.sensorName, self._readSensorFile,
+			self.interval)
+		temp = self.sampler.sampleDevice(self.sensorName)
+		if temp is None:
 			return False
 
-		self.lastUpdate = utcTimestamp
+		self.sensorData = self._smoothData(temp)
+		self._lastSampleTime = self.sampler.getSample(self.sensorName)[1]
+		self.lastUpdate = int(time.time())
 
 		return True
 
@@ -419,21 +500,13 @@ class RaspberryPiDS18b20Sensor(_PollingSensor):
 
 	def updateState(self):
 
-		# Restrict the times the temperature is actually read from the sensor
-		# to keep the traffic on the bus relatively low.
-		utcTimestamp = int(time.time())
-		if (utcTimestamp - self.lastTemperatureUpdate) > self.interval:
-			self.lastTemperatureUpdate = utcTimestamp
-
-			# Update temperature in a non-blocking way
-			# (this means also, that the current temperature value will
-			# not be the updated one, but one of the next rounds will have it)
-			thread = threading.Thread(target=self._updateData)
-			thread.start()
-
-		self.updateLock.acquire()
-		self.sensorData = self._sensorData
-		self.updateLock.release()
+		# The temperature is read by the sampler in the background
+		# (in the interval of the sensor to keep the traffic on the bus
+		# relatively low) => only process a new sample.
+		temp, sampleTime = self.sampler.getSample(self.sensorName)
+		if sampleTime != self._lastSampleTime:
+			self._lastSampleTime = sampleTime
+			self.sensorData = self._smoothData(temp)
 
 		logging.debug("[%s]: Current temperature of sensor '%s': %.3f."
 			% (self.fileName, self.description, self.sensorData))
@@ -514,18 +587,208 @@ class RaspberryPiDS18b20Sensor(_PollingSensor):
 		utcTimestamp = int(time.time())
 		if (utcTimestamp - self.lastUpdate) > self.interval:
 			self.lastUpdate = utcTimestamp
+			self._addDataUpdate(self.sensorData)
 
-			stateChange = StateChange()
-			stateChange.clientSensorId = self.id
-			if self.state == self.triggerState:
-				stateChange.state = 1
-			else:
-				stateChange.state = 0
-			stateChange.dataType = self.sensorDataType
-			stateChange.sensorData = self.sensorData
+		# Send the update if it passed the data filter.
+		return self._getDataUpdate(self.state)
 
-			return stateChange
-		return None
+
+# Internal class that holds the latest sample and the read statistics
+# of one device handled by the sampler.
+class _SampledDevice:
+
+	def __init__(self):
+
+		# Name of the device and the function that reads a sample of it
+		# (returns the sample or raises an exception).
+		self.name = None
+		self.readFunction = None
+
+		# Interval in seconds in which the device is sampled and the time
+		# the next sample is due.
+		self.interval = None
+		self.nextSampleTime = 0.0
+
+		# Flag that indicates if the device is waiting for or is in
+		# the process of being read.
+		self.isQueued = False
+
+		# Latest sample of the device and the time it was read.
+		self.sample = None
+		self.sampleTime = None
+
+		# Statistics of the reads of the device (latencies in seconds).
+		self.reads = 0
+		self.readErrors = 0
+		self.totalLatency = 0.0
+		self.maxLatency = 0.0
+
+
+# Internal class that reads the devices handed over by the sampler.
+class _DeviceReader(threading.Thread):
+
+	def __init__(self, sampler):
+		threading.Thread.__init__(self)
+		self.sampler = sampler
+
+
+	def run(self):
+		while True:
+			name = self.sampler.readQueue.get()
+			try:
+				self.sampler.sampleDevice(name)
+			finally:
+				self.sampler.readQueue.task_done()
+
+
+# Class that samples slow devices (i.e., ds18b20 sensors on the 1-Wire bus)
+# concurrently on a bounded number of reader threads in the interval of
+# each device. The latest samples are cached so that polling the sensors
+# never blocks on a device.
+class DeviceSampler(threading.Thread):
+
+	def __init__(self):
+		threading.Thread.__init__(self)
+
+		# Used for logging.
+		self.fileName = os.path.basename(__file__)
+
+		# Maximal number of devices that are read concurrently.
+		self.maxReaders = 4
+
+		# interval in seconds in which the read statistics are logged
+		# (only done in log level DEBUG)
+		self.statisticsInterval = 300
+
+		# Queue of the names of the devices that have to be read.
+		self.readQueue = Queue.Queue()
+
+		# Dictionary of the handled devices in the form:
+		# devices[<name>] = <_SampledDevice>
+		self.devices = dict()
+		self.devicesLock = threading.Semaphore(1)
+
+
+	# Adds a device that is sampled with the given read function
+	# in the given interval (in seconds).
+	def addDevice(self, name, readFunction, interval):
+		device = _SampledDevice()
+		device.name = name
+		device.readFunction = readFunction
+		device.interval = interval
+
+		self.devicesLock.acquire()
+		self.devices[name] = device
+		self.devicesLock.release()
+
+
+	# Reads a sample of the given device (blocking) and caches it.
+	#
+	# Returns the sample or None if the read failed.
+	def sampleDevice(self, name):
+
+		self.devicesLock.acquire()
+		device = self.devices[name]
+		self.devicesLock.release()
+
+		sample = None
+		startTime = time.time()
+		try:
+			sample = device.readFunction()
+		except Exception as e:
+			logging.exception("[%s]: Could not read device '%s'."
+				% (self.fileName, name))
+		latency = time.time() - startTime
+
+		self.devicesLock.acquire()
+		device.reads += 1
+		device.totalLatency += latency
+		device.maxLatency = max(device.maxLatency, latency)
+		if sample is None:
+			device.readErrors += 1
+		else:
+			device.sample = sample
+			device.sampleTime = startTime
+		device.nextSampleTime = startTime + device.interval
+		device.isQueued = False
+		self.devicesLock.release()
+
+		return sample
+
+
+	# Returns the latest sample of the given device and the time it was
+	# read as tuple (sample, sampleTime).
+	def getSample(self, name):
+		self.devicesLock.acquire()
+		device = self.devices[name]
+		sampleTuple = (device.sample, device.sampleTime)
+		self.devicesLock.release()
+		return sampleTuple
+
+
+	# Returns the read statistics of all devices as a list of tuples in
+	# the form [(name, reads, readErrors, averageLatency, maxLatency), ...].
+	def getStatistics(self):
+		statistics = list()
+		self.devicesLock.acquire()
+		for name in sorted(self.devices.keys()):
+			device = self.devices[name]
+			averageLatency = 0.0
+			if device.reads > 0:
+				averageLatency = device.totalLatency / device.reads
+			statistics.append( (name, device.reads, device.readErrors,
+				averageLatency, device.maxLatency) )
+		self.devicesLock.release()
+		return statistics
+
+
+	def _logStatistics(self):
+		for statistic in self.getStatistics():
+			logging.debug("[%s]: Device '%s': %d reads, %d failed, "
+				% (self.fileName, statistic[0], statistic[1], statistic[2])
+				+ "latency %.3f seconds average, %.3f seconds maximum."
+				% (statistic[3], statistic[4]))
+
+
+	def run(self):
+
+		logging.info("[%s]: Starting device sampler thread."
+			% self.fileName)
+
+		# Start the reader threads that read the devices concurrently.
+		numberReaders = min(self.maxReaders, len(self.devices))
+		for i in range(max(numberReaders, 1)):
+			reader = _DeviceReader(self)
+			# set thread to daemon
+			# => threads terminates when main thread terminates
+			reader.daemon = True
+			reader.start()
+
+		lastStatistics = time.time()
+
+		while True:
+
+			# Queue all devices whose next sample is due and compute the
+			# time until the next device is due.
+			utcTimestamp = time.time()
+			sleepTime = 1.0
+			self.devicesLock.acquire()
+			for device in self.devices.values():
+				if device.isQueued:
+					continue
+				if device.nextSampleTime <= utcTimestamp:
+					device.isQueued = True
+					self.readQueue.put(device.name)
+				else:
+					sleepTime = min(sleepTime,
+						device.nextSampleTime - utcTimestamp)
+			self.devicesLock.release()
+
+			if (time.time() - lastStatistics) > self.statisticsInterval:
+				self._logStatistics()
+				lastStatistics = time.time()
+
+			time.sleep(max(sleepTime, 0.1))
 
 
 # this class polls the sensor states and triggers alerts and state changes
@@ -174,6 +174,15 @@ if __name__ == '__main__':
 		sensorDataCollector.apiKey = str(tempConf.attrib["apiKey"])
 		sensorDataCollector.interval = int(tempConf.attrib["interval"])
 
+		# Parse the optional address of the web server of the provider
+		# (used to point the data collector at a local stand-in server).
+		if "providerHost" in tempConf.attrib.keys():
+			sensorDataCollector.providerHost = str(
+				tempConf.attrib["providerHost"])
+		if "providerPort" in tempConf.attrib.keys():
+			sensorDataCollector.providerPort = int(
+				tempConf.attrib["providerPort"])
+
 		# parse all sensors
 		for item in configRoot.find("sensors").iterfind("sensor"):
 
@@ -396,6 +405,32 @@ if __name__ == '__main__':
 				raise ValueError("Type of sensor '%s' not valid."
 					% sensorType)
 
+			# Data filter settings of the sensor (optional, without them
+			# every data change is reported).
+			dataFilter = item.find("dataFilter")
+			if dataFilter is not None:
+				if "deadband" in dataFilter.attrib.keys():
+					sensor.deadband = float(dataFilter.attrib["deadband"])
+				if "deadbandType" in dataFilter.attrib.keys():
+					deadbandTypeStr = str(
+						dataFilter.attrib["deadbandType"]).upper()
+					if deadbandTypeStr == "ABSOLUTE":
+						sensor.deadbandRelative = False
+					elif deadbandTypeStr == "RELATIVE":
+						sensor.deadbandRelative = True
+					else:
+						raise ValueError("Type of deadband '%s' not valid."
+							% deadbandTypeStr)
+				if "minReportInterval" in dataFilter.attrib.keys():
+					sensor.minReportInterval = int(
+						dataFilter.attrib["minReportInterval"])
+
+			# Check sanity of the data filter settings.
+			if (sensor.deadband < 0.0
+				or sensor.minReportInterval < 0):
+				raise ValueError("Illegal data filter for sensor %d."
+					% sensor.id)
+
 			# check if description is empty
 			if len(sensor.description) == 0:
 				raise ValueError("Description of sensor %d is empty."
@@ -11,7 +11,7 @@ from client import ServerCommunication, ConnectionWatchdog, AsynchronousSender
 from smtp import SMTPAlert
 from sensor import WundergroundDataCollector, WundergroundTempPollingSensor, \
 	WundergroundHumidityPollingSensor, WundergroundForecastTempPollingSensor, \
-	WundergroundForecastRainPollingSensor, SensorExecuter
+	WundergroundForecastRainPollingSensor, WundergroundProvider, SensorExecuter
 from update import UpdateChecker, Updater
 from globalData import GlobalData
 from localObjects import Ordering
\ No newline at end of file
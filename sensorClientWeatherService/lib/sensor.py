@@ -13,7 +13,10 @@ import os
 import logging
 import json
 import httplib
+import socket
 import threading
+import collections
+import Queue
 from client import AsynchronousSender
 from localObjects import SensorDataType, Ordering, SensorAlert, StateChange
 
@@ -87,6 +90,27 @@ class _PollingSensor:
 		self.hasOptionalData = False
 		self.optionalData = None
 
+		# Filter for the data updates of the sensor that are sent to the
+		# server. Updates are suppressed if the data stays in the deadband
+		# around the data last reported (relative deadbands are a fraction of
+		# the data last reported, i.e., 0.05 = 5%) and reported at most once
+		# every "minReportInterval" seconds. The data can be smoothed by a
+		# moving average over the last "smoothingWindow" samples
+		# (1 = no smoothing).
+		self.deadband = 0.0
+		self.deadbandRelative = False
+		self.minReportInterval = 0
+		self.smoothingWindow = 1
+
+		# Internal values of the data filter. The number of suppressed
+		# updates is sent to the server with the next reported update.
+		self._smoothingSamples = collections.deque()
+		self._lastReportedData = None
+		self._lastReportTime = 0.0
+		self._pendingData = None
+		self._hasPendingData = False
+		self._suppressedUpdates = 0
+
 
 	# this function returns the current state of the sensor
 	def getState(self):
@@ -125,6 +149,77 @@ class _PollingSensor:
 		raise NotImplementedError("Function not implemented yet.")
 
 
+	# Internal function that adds the given sample to the moving average
+	# of the sensor data.
+	#
+	# Returns the smoothed sensor data.
+	def _smoothData(self, sensorData):
+		if self.smoothingWindow <= 1:
+			return sensorData
+
+		self._smoothingSamples.append(sensorData)
+		while len(self._smoothingSamples) > self.smoothingWindow:
+			self._smoothingSamples.popleft()
+
+		smoothedData = (sum(self._smoothingSamples)
+			/ float(len(self._smoothingSamples)))
+		if self.sensorDataType == SensorDataType.INT:
+			return int(round(smoothedData))
+		return smoothedData
+
+
+	# Internal function that adds a new data update of the sensor that
+	# should be reported to the server. Updates in the deadband are
+	# suppressed, all others are kept pending until the minimum report
+	# interval has passed (a newer update supersedes a pending one).
+	def _addDataUpdate(self, sensorData):
+
+		if self._hasPendingData:
+			self._hasPendingData = False
+			self._suppressedUpdates += 1
+
+		if self._lastReportedData is not None:
+			deadband = self.deadband
+			if self.deadbandRelative:
+				deadband *= abs(self._lastReportedData)
+			if abs(sensorData - self._lastReportedData) < deadband:
+				self._suppressedUpdates += 1
+				return
+
+		self._pendingData = sensorData
+		self._hasPendingData = True
+
+
+	# Internal function that returns the pending data update of the sensor
+	# if the minimum report interval has passed.
+	#
+	# Returns an object of class StateChange or None.
+	def _getDataUpdate(self, state):
+		if not self._hasPendingData:
+			return None
+
+		utcTimestamp = time.time()
+		if (utcTimestamp - self._lastReportTime) < self.minReportInterval:
+			return None
+
+		self._hasPendingData = False
+		self._lastReportedData = self._pendingData
+		self._lastReportTime = utcTimestamp
+
+		stateChange = StateChange()
+		stateChange.clientSensorId = self.id
+		if state == self.triggerState:
+			stateChange.state = 1
+		else:
+			stateChange.state = 0
+		stateChange.dataType = self.sensorDataType
+		stateChange.sensorData = self._pendingData
+		stateChange.suppressedUpdates = self._suppressedUpdates
+		self._suppressedUpdates = 0
+
+		return stateChange
+
+
 # Class that controls one temperature sensor for Wunderground.
 class WundergroundTempPollingSensor(_PollingSensor):
 
@@ -140,8 +235,6 @@ class WundergroundTempPollingSensor(_PollingSensor):
 		self.host = "api.wunderground.com"
 		self.port = 80
 
-		self._forceSendState = False
-
 		# Instance of data collector thread.
 		self.dataCollector = None
 
@@ -179,7 +272,7 @@ class WundergroundTempPollingSensor(_PollingSensor):
 		temp = self.dataCollector.getTemperature(self.country, self.city)
 		if temp != self.sensorData:
 			self.sensorData = temp
-			self._forceSendState = True
+			self._addDataUpdate(temp)
 
 		# Only check if threshold is reached if it is activated.
 		if self.hasThreshold:
@@ -256,20 +349,7 @@ class WundergroundTempPollingSensor(_PollingSensor):
 
 
 	def forceSendState(self):
-		if self._forceSendState:
-			self._forceSendState = False
-
-			stateChange = StateChange()
-			stateChange.clientSensorId = self.id
-			if self.state == self.triggerState:
-				stateChange.state = 1
-			else:
-				stateChange.state = 0
-			stateChange.dataType = self.sensorDataType
-			stateChange.sensorData = self.sensorData
-
-			return stateChange
-		return None
+		return self._getDataUpdate(self.state)
 
 
 # Class that controls one humidity sensor for Wunderground.
@@ -284,8 +364,6 @@ class WundergroundHumidityPollingSensor(_PollingSensor):
 		# Set sensor to hold float data.
 		self.sensorDataType = SensorDataType.INT
 
-		self._forceSendState = False
-
 		# Instance of data collector thread.
 		self.dataCollector = None
 
@@ -323,7 +401,7 @@ class WundergroundHumidityPollingSensor(_PollingSensor):
 		temp = self.dataCollector.getHumidity(self.country, self.city)
 		if temp != self.sensorData:
 			self.sensorData = temp
-			self._forceSendState = True
+			self._addDataUpdate(temp)
 
 		# Only check if threshold is reached if it is activated.
 		if self.hasThreshold:
@@ -400,20 +478,7 @@ class WundergroundHumidityPollingSensor(_PollingSensor):
 
 
 	def forceSendState(self):
-		if self._forceSendState:
-			self._forceSendState = False
-
-			stateChange = StateChange()
-			stateChange.clientSensorId = self.id
-			if self.state == self.triggerState:
-				stateChange.state = 1
-			else:
-				stateChange.state = 0
-			stateChange.dataType = self.sensorDataType
-			stateChange.sensorData = self.sensorData
-
-			return stateChange
-		return None
+		return self._getDataUpdate(self.state)
 
 
 # Class that controls one forecast temperature sensor for Wunderground.
@@ -431,8 +496,6 @@ class WundergroundForecastTempPollingSensor(_PollingSensor):
 		self.host = "api.wunderground.com"
 		self.port = 80
 
-		self._forceSendState = False
-
 		# Instance of data collector thread.
 		self.dataCollector = None
 
@@ -477,7 +540,7 @@ class WundergroundForecastTempPollingSensor(_PollingSensor):
 				self.country, self.city, self.day)
 		if temp != self.sensorData:
 			self.sensorData = temp
-			self._forceSendState = True
+			self._addDataUpdate(temp)
 
 		# Only check if threshold is reached if it is activated.
 		if self.hasThreshold:
@@ -554,20 +617,7 @@ class WundergroundForecastTempPollingSensor(_PollingSensor):
 
 
 	def forceSendState(self):
-		if self._forceSendState:
-			self._forceSendState = False
-
-			stateChange = StateChange()
-			stateChange.clientSensorId = self.id
-			if self.state == self.triggerState:
-				stateChange.state = 1
-			else:
-				stateChange.state = 0
-			stateChange.dataType = self.sensorDataType
-			stateChange.sensorData = self.sensorData
-
-			return stateChange
-		return None
+		return self._getDataUpdate(self.state)
 
 
 # Class that controls one forecast rain sensor for Wunderground.
@@ -582,8 +632,6 @@ class WundergroundForecastRainPollingSensor(_PollingSensor):
 		# Set sensor to hold float data.
 		self.sensorDataType = SensorDataType.INT
 
-		self._forceSendState = False
-
 		# Instance of data collector thread.
 		self.dataCollector = None
 
@@ -623,7 +671,7 @@ class WundergroundForecastRainPollingSensor(_PollingSensor):
 			self.country, self.city, self.day)
 		if temp != self.sensorData:
 			self.sensorData = temp
-			self._forceSendState = True
+			self._addDataUpdate(temp)
 
 		# Only check if threshold is reached if it is activated.
 		if self.hasThreshold:
@@ -700,20 +748,185 @@ class WundergroundForecastRainPollingSensor(_PollingSensor):
 
 
 	def forceSendState(self):
-		if self._forceSendState:
-			self._forceSendState = False
+		return self._getDataUpdate(self.state)
+
+
+# Class that describes how the weather data is fetched from a provider
+# (this class must be inherited by the used provider class).
+class _WeatherProvider:
+
+	def __init__(self):
+
+		# Name of the provider (used for logging).
+		self.name = None
+
+		# Address and port of the web server of the provider.
+		self.host = None
+		self.port = None
+
+
+	# This function returns the location on the web server that is
+	# requested for the given location.
+	def getRequestLocation(self, country, city):
+		raise NotImplementedError("Function not implemented yet.")
+
+
+	# This function parses the received response body.
+	#
+	# Returns a dictionary in the form of the collected data of a
+	# location (keys "temp", "humidity" and "forecast").
+	def parseData(self, data):
+		raise NotImplementedError("Function not implemented yet.")
+
+
+# Class that fetches the weather data from Wunderground.
+class WundergroundProvider(_WeatherProvider):
+
+	def __init__(self, apiKey):
+		_WeatherProvider.__init__(self)
+
+		self.name = "Wunderground"
+		self.host = "api.wunderground.com"
+		self.port = 80
+
+		# Api key of wunderground.
+		self.apiKey = apiKey
+
+
+	def getRequestLocation(self, country, city):
+		return "/api/" + self.apiKey \
+			+ "/geolookup/conditions/forecast/q/" + country \
+			+ "/" + city + ".json"
+
+
+	def parseData(self, data):
+		jsonData = json.loads(data)
+
+		locationData = dict()
+		locationData["humidity"] = int(jsonData["current_observation"][
+			"relative_humidity"].replace("%", ""))
+		locationData["temp"] = float(
+			jsonData["current_observation"]["temp_c"])
+		locationData["forecast"] = list()
+		for i in range(3):
+			forecastDay = jsonData["forecast"]["simpleforecast"][
+				"forecastday"][i]
+			forecast = dict()
+			forecast["tempHigh"] = float(forecastDay["high"]["celsius"])
+			forecast["tempLow"] = float(forecastDay["low"]["celsius"])
+			forecast["rain"] = int(forecastDay["pop"])
+			locationData["forecast"].append(forecast)
+
+		return locationData
+
+
+# Internal class that fetches the weather data of the locations
+# handed over by the data collector. Each fetcher keeps its own
+# keep-alive connection to the provider.
+class _WeatherFetcher(threading.Thread):
+
+	def __init__(self, dataCollector):
+		threading.Thread.__init__(self)
+		self.fileName = os.path.basename(__file__)
+		self.dataCollector = dataCollector
+		self.provider = dataCollector.provider
+
+		self.conn = None
+
+
+	def _closeConnection(self):
+		if self.conn is not None:
+			try:
+				self.conn.close()
+			except Exception as e:
+				pass
+		self.conn = None
+
+
+	# Internal function that sends a (conditional) request for the
+	# given location and returns the response. A request on a
+	# connection that was closed by the server is repeated once with
+	# a new connection.
+	def _request(self, location, headers):
+		for i in range(2):
+			if self.conn is None:
+				self.conn = httplib.HTTPConnection(self.provider.host,
+					self.provider.port, timeout=30)
+			try:
+				self.conn.request("GET", location, headers=headers)
+				response = self.conn.getresponse()
+				# Read the body completely in order to be able to reuse
+				# the connection.
+				data = response.read()
+				if response.getheader("connection", "").lower() == "close":
+					self._closeConnection()
+				return response, data
+
+			except (httplib.HTTPException, socket.error) as e:
+				self._closeConnection()
+				if i == 1:
+					raise
+
+
+	def _fetch(self, country, city):
+
+		logging.debug("[%s]: Getting weather data from "
+			% self.fileName
+			+ "%s for %s in %s."
+			% (self.provider.name, city, country))
+
+		location = self.provider.getRequestLocation(country, city)
+
+		# Make request conditional if the provider gave us validators
+		# for the last response.
+		headers = dict()
+		etag, lastModified = self.dataCollector.getValidators(country, city)
+		if etag is not None:
+			headers["If-None-Match"] = etag
+		if lastModified is not None:
+			headers["If-Modified-Since"] = lastModified
+
+		try:
+			response, data = self._request(location, headers)
+
+			# Data did not change since the last request.
+			if response.status == 304:
+				logging.debug("[%s]: Weather data for %s in %s "
+					% (self.fileName, city, country)
+					+ "not modified.")
+				self.dataCollector.updateLock.acquire()
+				self.dataCollector.cacheHits += 1
+				self.dataCollector.updateLock.release()
+
+			elif response.status == 200:
+				locationData = self.provider.parseData(data)
+				self.dataCollector.updateLocationData(country, city,
+					locationData, response.getheader("etag"),
+					response.getheader("last-modified"))
 
-			stateChange = StateChange()
-			stateChange.clientSensorId = self.id
-			if self.state == self.triggerState:
-				stateChange.state = 1
 			else:
-				stateChange.state = 0
-			stateChange.dataType = self.sensorDataType
-			stateChange.sensorData = self.sensorData
+				logging.error("[%s]: Received response code %d "
+					% (self.fileName, response.status)
+					+ "from %s." % self.provider.name)
+
+				self.dataCollector.setErrorData(country, city, -998)
+
+		except Exception as e:
+			logging.exception("[%s]: Could not get weather data "
+				% self.fileName
+				+ "for %s in %s."
+				% (city, country))
+			self._closeConnection()
+			self.dataCollector.setErrorData(country, city, -999)
 
-			return stateChange
-		return None
+
+	def run(self):
+		while True:
+			country, city = self.dataCollector.fetchQueue.get()
+			try:
+				self._fetch(country, city)
+			finally:
+				self.dataCollector.fetchQueue.task_done()
 
 
 # Class that collects data from Wunderground.
@@ -726,15 +939,29 @@ class WundergroundDataCollector(threading.Thread):
 
 		self.updateLock = threading.Semaphore(1)
 
-		self.host = "api.wunderground.com"
-		self.port = 80
-
 		# Api key of wunderground.
 		self.apiKey = None
 
 		# Interval in seconds in which the data is fetched.
 		self.interval = None
 
+		# The provider from which the data is fetched (if not set
+		# before the thread is started, Wunderground is used).
+		self.provider = None
+
+		# Address and port of the web server of the provider that
+		# replace the default ones of the provider if set (for example
+		# to use a local stand-in server for testing).
+		self.providerHost = None
+		self.providerPort = None
+
+		# Maximal number of locations that are fetched concurrently
+		# (each fetcher thread holds one keep-alive connection).
+		self.maxConnections = 4
+
+		# Queue of locations that have to be fetched in the current cycle.
+		self.fetchQueue = Queue.Queue()
+
 		# List of tuples in the form [(country, city), ...]
 		self.locations = list()
 
@@ -742,6 +969,14 @@ class WundergroundDataCollector(threading.Thread):
 		# collectedData[<country>][<city>]["temp"/"humidity"]
 		self.collectedData = dict()
 
+		# Dictionary that holds the validators of the last response for
+		# each location in the form:
+		# validators[(<country>, <city>)] = (<etag>, <last-modified>)
+		self.validators = dict()
+
+		# Number of requests that were answered with "not modified".
+		self.cacheHits = 0
+
 
 	def addLocation(self, country, city):
 		tempCountry = country.lower()
@@ -840,171 +1075,114 @@ class WundergroundDataCollector(threading.Thread):
 		return humidity
 
 
+	# Returns the validators (etag, last-modified) of the last response
+	# for the given location.
+	def getValidators(self, country, city):
+		self.updateLock.acquire()
+		validators = self.validators.get((country, city), (None, None))
+		self.updateLock.release()
+		return validators
+
+
+	# Sets the given error code as data for the given location.
+	def setErrorData(self, country, city, errorCode):
+		self.updateLock.acquire()
+		self.collectedData[country][city]["humidity"] = errorCode
+		self.collectedData[country][city]["temp"] = float(errorCode)
+		# Do not send conditional requests after an error.
+		self.validators.pop((country, city), None)
+		self.updateLock.release()
+
+
+	# Updates the collected data of the given location with the
+	# data received from the provider.
+	def updateLocationData(self, country, city, locationData, etag,
+		lastModified):
+
+		self.updateLock.acquire()
+		self.collectedData[country][city]["humidity"] \
+			= locationData["humidity"]
+		self.collectedData[country][city]["temp"] \
+			= locationData["temp"]
+		for i in range(3):
+			self.collectedData[country][city]["forecast"][i].update(
+				locationData["forecast"][i])
+		self.validators[(country, city)] = (etag, lastModified)
+		self.updateLock.release()
+
+		logging.info("[%s]: Received new humidity data "
+			% self.fileName
+			+ "from %s: %d%% for %s in %s."
+			% (self.provider.name, locationData["humidity"], city, country))
+
+		logging.info("[%s]: Received new temperature data "
+			% self.fileName
+			+ "from %s: %.1f degrees Celsius "
+			% (self.provider.name, locationData["temp"])
+			+ "for %s in %s."
+			% (city, country))
+
+		for i in range(3):
+			forecast = locationData["forecast"][i]
+
+			logging.info("[%s]: Received new temperature forecast "
+				% self.fileName
+				+ "from %s for day %d: min %.1f max %.1f "
+				% (self.provider.name, i, forecast["tempLow"],
+				forecast["tempHigh"])
+				+ "degrees Celsius for %s in %s."
+				% (city, country))
+
+			logging.info("[%s]: Received new rain forecast "
+				% self.fileName
+				+ "from %s for day %d: %d%% "
+				% (self.provider.name, i, forecast["rain"])
+				+ "chance of rain for %s in %s."
+				% (city, country))
+
+
 	def run(self):
 
-		logging.info("[%s]: Starting Wunderground data collector thread."
-			% self.fileName)
+		if self.provider is None:
+			self.provider = WundergroundProvider(self.apiKey)
+		if self.providerHost is not None:
+			self.provider.host = self.providerHost
+		if self.providerPort is not None:
+			self.provider.port = self.providerPort
+
+		logging.info("[%s]: Starting %s data collector thread."
+			% (self.fileName, self.provider.name))
+
+		# Start the fetcher threads that process the locations
+		# concurrently.
+		numberFetchers = min(self.maxConnections, len(self.locations))
+		for i in range(max(numberFetchers, 1)):
+			fetcher = _WeatherFetcher(self)
+			# set thread to daemon
+			# => threads terminates when main thread terminates
+			fetcher.daemon = True
+			fetcher.start()
 
 		while True:
 
+			cycleStart = time.time()
+
 			for locationTuple in self.locations:
+				self.fetchQueue.put(locationTuple)
 
-				country = locationTuple[0]
-				city = locationTuple[1]
-
-				logging.debug("[%s]: Getting weather data from "
-					% self.fileName
-					+ "Wunderground for %s in %s."
-					% (city, country))
-
-				try:
-					# Get weather data from Wunderground
-					conn = httplib.HTTPConnection(self.host, self.port)
-					location = "/api/" + self.apiKey \
-						+ "/geolookup/conditions/forecast/q/" + country \
-						+ "/" + city + ".json"
-					conn.request("GET", location)
-					response = conn.getresponse()
-
-					# Extract data.
-					if response.status == 200:
-						jsonData =  json.loads(response.read())
-
-						humidity = int(jsonData["current_observation"][
-							"relative_humidity"].replace("%", ""))
-						temp = float(jsonData["current_observation"]["temp_c"])
-						forecastDay0TempHigh = float(
-							jsonData["forecast"]["simpleforecast"][
-							"forecastday"][0]["high"]["celsius"])
-						forecastDay0TempLow = float(
-							jsonData["forecast"]["simpleforecast"][
-							"forecastday"][0]["low"]["celsius"])
-						forecastDay0Rain = int(jsonData["forecast"][
-							"simpleforecast"]["forecastday"][0]["pop"])
-						forecastDay1TempHigh = float(
-							jsonData["forecast"]["simpleforecast"][
-							"forecastday"][1]["high"]["celsius"])
-						forecastDay1TempLow = float(
-							jsonData["forecast"]["simpleforecast"][
-							"forecastday"][1]["low"]["celsius"])
-						forecastDay1Rain = int(
-							jsonData["forecast"]["simpleforecast"][
-							"forecastday"][1]["pop"])
-						forecastDay2TempHigh = float(
-							jsonData["forecast"]["simpleforecast"][
-							"forecastday"][2]["high"]["celsius"])
-						forecastDay2TempLow = float(
-							jsonData["forecast"]["simpleforecast"][
-							"forecastday"][2]["low"]["celsius"])
-						forecastDay2Rain = int(
-							jsonData["forecast"]["simpleforecast"][
-							"forecastday"][2]["pop"])
-
-						self.updateLock.acquire()
-						self.collectedData[country][city]["humidity"] \
-							= humidity
-						self.collectedData[country][city]["temp"] \
-							= temp
-						self.collectedData[country][city][
-							"forecast"][0]["tempHigh"] = forecastDay0TempHigh
-						self.collectedData[country][city][
-							"forecast"][0]["tempLow"] = forecastDay0TempLow
-						self.collectedData[country][city][
-							"forecast"][0]["rain"] = forecastDay0Rain
-						self.collectedData[country][city][
-							"forecast"][1]["tempHigh"] = forecastDay1TempHigh
-						self.collectedData[country][city][
-							"forecast"][1]["tempLow"] = forecastDay1TempLow
-						self.collectedData[country][city][
-							"forecast"][1]["rain"] = forecastDay1Rain
-						self.collectedData[country][city][
-							"forecast"][2]["tempHigh"] = forecastDay2TempHigh
-						self.collectedData[country][city][
-							"forecast"][2]["tempLow"] = forecastDay2TempLow
-						self.collectedData[country][city][
-							"forecast"][2]["rain"] = forecastDay2Rain
-						self.updateLock.release()
-
-						logging.info("[%s]: Received new humidity data "
-							% self.fileName
-							+ "from Wunderground: %d%% for %s in %s."
-							% (humidity, city, country))
-
-						logging.info("[%s]: Received new temperature data "
-							% self.fileName
-							+ "from Wunderground: %.1f degrees Celsius "
-							% temp
-							+ "for %s in %s."
-							% (city, country))
-
-						logging.info("[%s]: Received new temperature forecast "
-							% self.fileName
-							+ "from Wunderground for day 0: min %.1f max %.1f "
-							% (forecastDay0TempLow, forecastDay0TempHigh)
-							+ "degrees Celsius for %s in %s."
-							% (city, country))
-
-						logging.info("[%s]: Received new rain forecast "
-							% self.fileName
-							+ "from Wunderground for day 0: %d%% "
-							% forecastDay0Rain
-							+ "chance of rain for %s in %s."
-							% (city, country))
-
-						logging.info("[%s]: Received new temperature forecast "
-							% self.fileName
-							+ "from Wunderground for day 1: min %.1f max %.1f "
-							% (forecastDay1TempLow, forecastDay1TempHigh)
-							+ "degrees Celsius for %s in %s."
-							% (city, country))
-
-						logging.info("[%s]: Received new rain forecast "
-							% self.fileName
-							+ "from Wunderground for day 1: %d%% "
-							% forecastDay1Rain
-							+ "chance of rain for %s in %s."
-							% (city, country))
-
-						logging.info("[%s]: Received new temperature forecast "
-							% self.fileName
-							+ "from Wunderground for day 2: min %.1f max %.1f "
-							% (forecastDay2TempLow, forecastDay2TempHigh)
-							+ "degrees Celsius for %s in %s."
-							% (city, country))
-
-						logging.info("[%s]: Received new rain forecast "
-							% self.fileName
-							+ "from Wunderground for day 2: %d%% "
-							% forecastDay2Rain
-							+ "chance of rain for %s in %s."
-							% (city, country))
+			# Wait until all locations are fetched.
+			self.fetchQueue.join()
 
-					else:
-						logging.error("[%s]: Received response code %d "
-							% (self.fileName, response.status)
-							+ "from Wunderground.")
-
-						self.updateLock.acquire()
-						self.collectedData[country][city]["humidity"] \
-							= -998
-						self.collectedData[country][city]["temp"] \
-							= float(-998)
-						self.updateLock.release()
-
-				except Exception as e:
-					logging.exception("[%s]: Could not get weather data "
-						% self.fileName
-						+ "for %s in %s."
-						% (city, country))
-					self.updateLock.acquire()
-					self.collectedData[country][city]["humidity"] \
-						= -999
-					self.collectedData[country][city]["temp"] \
-						= float(-999)
-					self.updateLock.release()
+			cycleTime = time.time() - cycleStart
+
+			logging.debug("[%s]: Fetched weather data for %d location(s) "
+				% (self.fileName, len(self.locations))
+				+ "in %.2f seconds (%d not modified in total)."
+				% (cycleTime, self.cacheHits))
 
 			# Sleep until next update cycle.
-			time.sleep(self.interval)
+			if cycleTime < self.interval:
+				time.sleep(self.interval - cycleTime)
 
 
 # this class polls the sensor states and triggers alerts and state changes
@@ -18,15 +18,14 @@ from lib import SensorAlertExecuter
 from lib import RuleStart, RuleElement, RuleBoolean, RuleSensor, RuleWeekday, \
 	RuleMonthday, RuleHour, RuleMinute, RuleSecond
 from lib import CSVBackend
-from lib import SMTPAlert
 from lib import ManagerUpdateExecuter
-from lib import UpdateChecker
 from lib import GlobalData
-from lib import SurveyExecuter
 import logging
 import time
 import threading
 import random
+import hashlib
+import cPickle
 import xml.etree.ElementTree
 
 
@@ -42,6 +41,94 @@ def makePath(inputLocation):
 	return os.path.dirname(os.path.abspath(__file__)) + "/" + inputLocation
 
 
+# Function returns the key of the config snapshot for the given content of
+# the configuration file (changes with the configuration and the
+# server version).
+def getConfigSnapshotKey(globalData, configData):
+	sha256 = hashlib.sha256()
+	sha256.update(configData)
+	sha256.update("%.3f-%d" % (globalData.version, globalData.rev))
+	return sha256.hexdigest()
+
+
+# Function loads the alert levels from the config snapshot.
+# Returns a list of alert levels or None if no snapshot with the given key
+# exists.
+def loadConfigSnapshot(globalData, snapshotKey, fileName):
+
+	if not os.path.exists(globalData.configSnapshotFile):
+		return None
+
+	try:
+		with open(globalData.configSnapshotFile, 'rb') as fp:
+			snapshot = cPickle.load(fp)
+
+		if snapshot["key"] != snapshotKey:
+			globalData.logger.info("[%s]: Configuration file changed. "
+				% fileName
+				+ "Ignoring config snapshot.")
+			return None
+
+		return snapshot["alertLevels"]
+
+	except Exception as e:
+		globalData.logger.exception("[%s]: Could not load config snapshot."
+			% fileName)
+
+	return None
+
+
+# Function stores the parsed alert levels as config snapshot (a failure is
+# not fatal, the configuration is just parsed again on the next start).
+def storeConfigSnapshot(globalData, snapshotKey, fileName):
+
+	tempFile = globalData.configSnapshotFile + ".tmp"
+	try:
+		with open(tempFile, 'wb') as fp:
+			cPickle.dump({"key": snapshotKey,
+				"alertLevels": globalData.alertLevels}, fp,
+				cPickle.HIGHEST_PROTOCOL)
+
+		# replace the old snapshot atomically
+		os.rename(tempFile, globalData.configSnapshotFile)
+
+	except Exception as e:
+		globalData.logger.exception("[%s]: Could not store config snapshot."
+			% fileName)
+
+
+# Function loads the runtime state of the last run of the server.
+# Returns the state snapshot or None if it does not exist.
+def loadStateSnapshot(globalData, fileName):
+
+	if not os.path.exists(globalData.stateSnapshotFile):
+		return None
+
+	try:
+		with open(globalData.stateSnapshotFile, 'rb') as fp:
+			stateSnapshot = cPickle.load(fp)
+
+		snapshotAge = time.time() - stateSnapshot["time"]
+		if (snapshotAge < 0.0
+			or snapshotAge > globalData.stateSnapshotMaxAge):
+			globalData.logger.info("[%s]: State snapshot is too old. "
+				% fileName
+				+ "Ignoring it.")
+			return None
+
+		globalData.logger.info("[%s]: Loaded state snapshot from %s."
+			% (fileName, time.strftime("%D %H:%M:%S",
+			time.localtime(stateSnapshot["time"]))))
+
+		return stateSnapshot
+
+	except Exception as e:
+		globalData.logger.exception("[%s]: Could not load state snapshot."
+			% fileName)
+
+	return None
+
+
 # function is used to parse a rule of an alert level recursively
 def parseRuleRecursively(currentRoot, currentRule):
 
@@ -742,8 +829,9 @@ if __name__ == '__main__':
 	# parse config file, get logfile configurations
 	# and initialize logging
 	try:
-		configRoot = xml.etree.ElementTree.parse(
-			globalData.configFile).getroot()
+		with open(globalData.configFile, 'rb') as fp:
+			configData = fp.read()
+		configRoot = xml.etree.ElementTree.fromstring(configData)
 
 		globalData.logdir = makePath(str(configRoot.find("general").find(
 			"log").attrib["dir"]))
@@ -809,6 +897,7 @@ if __name__ == '__main__':
 				configRoot.find("smtp").find("general").attrib["fromAddr"])
 			smtpToAddr = str(
 				configRoot.find("smtp").find("general").attrib["toAddr"])
+			from lib.smtp import SMTPAlert
 			globalData.smtpAlert = SMTPAlert(globalData, smtpServer, smtpPort,
 			smtpFromAddr, smtpToAddr)
 
@@ -917,10 +1006,58 @@ if __name__ == '__main__':
 			if os.path.exists(globalData.clientCAFile) is False:
 				raise ValueError("Client CA file does not exist.")
 
-		# parse all alert levels
-		globalData.logger.debug("[%s]: Parsing alert levels configuration."
-			% fileName)
-		for item in configRoot.find("alertLevels").iterfind("alertLevel"):
+		# get compression configurations (optional, compression is
+		# deactivated if they are missing)
+		compression = configRoot.find("general").find("compression")
+		if compression is not None:
+			if "activated" in compression.attrib.keys():
+				globalData.compressionActivated = (str(
+					compression.attrib["activated"]).upper() == "TRUE")
+			if "threshold" in compression.attrib.keys():
+				globalData.compressionThreshold = int(
+					compression.attrib["threshold"])
+
+		if globalData.compressionThreshold < 0:
+			raise ValueError("Compression threshold has to be positive.")
+
+		# use the alert levels of the config snapshot if the configuration
+		# file has not changed since it was created
+		# => parse all alert levels otherwise
+		snapshotKey = getConfigSnapshotKey(globalData, configData)
+		globalData.configSnapshotKey = snapshotKey
+		snapshotAlertLevels = loadConfigSnapshot(globalData, snapshotKey,
+			fileName)
+		if snapshotAlertLevels is None:
+			globalData.logger.debug("[%s]: Parsing alert levels "
+				% fileName
+				+ "configuration.")
+			alertLevelsCfg = list(
+				configRoot.find("alertLevels").iterfind("alertLevel"))
+
+		else:
+			globalData.logger.info("[%s]: Using alert levels of "
+				% fileName
+				+ "config snapshot.")
+			globalData.alertLevels = snapshotAlertLevels
+			alertLevelsCfg = list()
+
+			# check if loaded rules should be logged
+			if (globalData.loglevel == logging.INFO
+				or globalData.loglevel == logging.DEBUG):
+
+				for alertLevel in globalData.alertLevels:
+					if not alertLevel.rulesActivated:
+						continue
+
+					globalData.logger.info("[%s]: Parsed rules for alert "
+						% fileName
+						+ "level %d."
+						% alertLevel.level)
+
+					for ruleElement in alertLevel.rules:
+						logRule(ruleElement, 0, fileName)
+
+		for item in alertLevelsCfg:
 
 			alertLevel = AlertLevel()
 
@@ -1430,12 +1567,37 @@ if __name__ == '__main__':
 	globalData.logger.debug("[%s]: Parsing configuration succeeded."
 		% fileName)
 
+	# store the parsed alert levels to skip parsing them on the next start
+	if snapshotAlertLevels is None:
+		storeConfigSnapshot(globalData, snapshotKey, fileName)
+
+	# load the runtime state of the last run to restore it
+	# (the registrations of the nodes are restored directly, the rest
+	# by the sensor alert executer and connection watchdog)
+	globalData.stateSnapshot = loadStateSnapshot(globalData, fileName)
+
+	# restore the registrations of the nodes only if the configuration
+	# (and server version) has not changed and the database is still
+	# the same (it is re-created with a new unique id on a version change)
+	if (not globalData.stateSnapshot is None
+		and globalData.stateSnapshot["configKey"] == snapshotKey
+		and globalData.stateSnapshot.get("uniqueID")
+		== globalData.storage.getUniqueID()):
+		globalData.registrationCache.update(
+			globalData.stateSnapshot["registrationCache"])
+
 	random.seed()
 
 	# start the thread that handles all sensor alerts
 	globalData.logger.info("[%s] Starting sensor alert manage thread."
 		% fileName)
 	globalData.sensorAlertExecuter = SensorAlertExecuter(globalData)
+	# restore the state of the rules only if the configuration
+	# has not changed
+	if (not globalData.stateSnapshot is None
+		and globalData.stateSnapshot["configKey"] == snapshotKey):
+		globalData.sensorAlertExecuter.setRuleStates(
+			globalData.stateSnapshot["ruleStates"])
 	# set thread to daemon
 	# => threads terminates when main thread terminates
 	globalData.sensorAlertExecuter.daemon = True
@@ -1481,6 +1643,7 @@ if __name__ == '__main__':
 	# only start update checker if it is activated
 	if updateActivated is True:
 		globalData.logger.info("[%s] Starting update check thread." % fileName)
+		from lib.update import UpdateChecker
 		updateChecker = UpdateChecker(updateServer, updatePort, updateLocation,
 			updateCaFile, updateInterval, updateEmailNotification, globalData)
 		# set thread to daemon
@@ -1492,6 +1655,7 @@ if __name__ == '__main__':
 	if surveyActivated:
 		globalData.logger.info("[%s] Starting survey executer thread."
 			% fileName)
+		from lib.survey import SurveyExecuter
 		surveyExecuter = SurveyExecuter(updateActivated, updateServer,
 			updateLocation, globalData)
 		# set thread to daemon
@@ -10,8 +10,7 @@
 import sys
 import os
 from lib import GlobalData
-from lib import UpdateChecker
-from lib import Updater
+from lib.update import UpdateChecker, Updater
 import xml.etree.ElementTree
 import logging
 import optparse
@@ -16,8 +16,9 @@ from localObjects import SensorDataType, Sensor, AlertLevel, \
 from ruleObjects import RuleStart, RuleElement, RuleBoolean, RuleSensor, \
 	RuleWeekday, RuleMonthday, RuleHour, RuleMinute, RuleSecond
 from userBackend import CSVBackend
-from smtp import SMTPAlert
 from manager import ManagerUpdateExecuter
-from update import UpdateChecker, Updater
 from globalData import GlobalData
-from survey import SurveyExecuter
\ No newline at end of file
+
+# NOTE: smtp, update and survey are not imported here in order to not
+# load them (and the packages they need) during the start of the server
+# if they are not activated (import them directly from their modules)
\ No newline at end of file
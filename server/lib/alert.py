@@ -14,6 +14,7 @@ import logging
 import json
 from server import AsynchronousSender
 from localObjects import SensorAlert, SensorDataType
+from ruleObjects import RuleStart
 
 
 # this class is woken up if a sensor alert is received
@@ -42,6 +43,97 @@ class SensorAlertExecuter(threading.Thread):
 		# set exit flag as false
 		self.exitFlag = False
 
+		# lock that is held while the runtime state of the rules
+		# (triggered, timeWhenTriggered, counterList) is changed
+		self.ruleStateLock = threading.Semaphore(1)
+
+
+	# this internal function collects all rule elements of the given
+	# rule element recursively (always in the same order)
+	def _getRuleElementsRecursively(self, currentRuleElement, ruleElements):
+
+		ruleElements.append(currentRuleElement)
+
+		if currentRuleElement.type == "boolean":
+			for ruleElement in currentRuleElement.element.elements:
+				self._getRuleElementsRecursively(ruleElement, ruleElements)
+
+
+	# this internal function returns all rule elements of the
+	# given alert level
+	def _getRuleElements(self, alertLevel):
+
+		ruleElements = list()
+		for ruleElement in alertLevel.rules:
+			self._getRuleElementsRecursively(ruleElement, ruleElements)
+
+		return ruleElements
+
+
+	# this function returns the runtime state of the rules of all
+	# alert levels in the form:
+	# ruleStates[<alert level>] = [(<triggered>, <timeWhenTriggered>,
+	# <counterList or None>), ...]
+	def getRuleStates(self):
+
+		ruleStates = dict()
+
+		self.ruleStateLock.acquire()
+		try:
+			for alertLevel in self.alertLevels:
+				if not alertLevel.rulesActivated:
+					continue
+
+				states = list()
+				for ruleElement in self._getRuleElements(alertLevel):
+					counterList = None
+					if isinstance(ruleElement, RuleStart):
+						counterList = list(ruleElement.counterList)
+					states.append( (ruleElement.triggered,
+						ruleElement.timeWhenTriggered, counterList) )
+
+				ruleStates[alertLevel.level] = states
+
+		finally:
+			self.ruleStateLock.release()
+
+		return ruleStates
+
+
+	# this function restores the runtime state of the rules of all
+	# alert levels (given in the form returned by getRuleStates();
+	# alert levels whose rules do not match the given state are ignored)
+	def setRuleStates(self, ruleStates):
+
+		self.ruleStateLock.acquire()
+		try:
+			for alertLevel in self.alertLevels:
+				if (not alertLevel.rulesActivated
+					or not alertLevel.level in ruleStates.keys()):
+					continue
+
+				ruleElements = self._getRuleElements(alertLevel)
+				states = ruleStates[alertLevel.level]
+				if len(ruleElements) != len(states):
+					self.logger.warning("[%s]: Rule state of alert level "
+						% self.fileName
+						+ "%d does not match its rules. Ignoring it."
+						% alertLevel.level)
+					continue
+
+				for ruleElement, state in zip(ruleElements, states):
+					ruleElement.triggered = state[0]
+					ruleElement.timeWhenTriggered = state[1]
+					if isinstance(ruleElement, RuleStart):
+						ruleElement.counterList = list(state[2])
+
+				self.logger.debug("[%s]: Restored rule state of alert "
+					% self.fileName
+					+ "level %d." % alertLevel.level)
+
+		finally:
+			self.ruleStateLock.release()
+
 
 	# this internal function recursively updates all values of
 	# the rule elements it processes received sensor alerts,
@@ -1622,7 +1714,12 @@ class SensorAlertExecuter(threading.Thread):
 			# Process sensor alerts that affect rules.
 			# NOTE: argument "sensorAlertsToHandleWithRules" is updated
 			# by this function
-			self._processSensorAlertsRules(sensorAlertsToHandleWithRules)
+			self.ruleStateLock.acquire()
+			try:
+				self._processSensorAlertsRules(
+					sensorAlertsToHandleWithRules)
+			finally:
+				self.ruleStateLock.release()
 
 			time.sleep(0.5)
 
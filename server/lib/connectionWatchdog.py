@@ -12,6 +12,7 @@ import time
 import logging
 import os
 import json
+import cPickle
 from localObjects import SensorDataType, SensorTimeoutSensor, NodeTimeoutSensor
 
 
@@ -59,6 +60,12 @@ class ConnectionWatchdog(threading.Thread):
 		self.gracePeriodTimeout = self.globalData.gracePeriodTimeout
 		self._nodeTimeoutLock = threading.BoundedSemaphore(1)
 
+		# Set up needed data for the snapshot of the runtime state.
+		self.stateSnapshotFile = self.globalData.stateSnapshotFile
+		self.stateSnapshotInterval = self.globalData.stateSnapshotInterval
+		self._lastStateSnapshot = 0.0
+		self._uniqueID = None
+
 		# Get activated internal sensors.
 		for internalSensor in self.globalData.internalSensors:
 			if isinstance(internalSensor, SensorTimeoutSensor):
@@ -85,6 +92,111 @@ class ConnectionWatchdog(threading.Thread):
 		self._nodeTimeoutLock.release()
 
 
+	# Internal function that restores the timed out nodes and sensors
+	# of the given state snapshot (only nodes that are still persistent and
+	# sensors that are still timed out are restored; nodes that were
+	# in the pre-timeout set get a new grace period starting now).
+	# Returns a set of node ids that were restored.
+	def _restoreTimeouts(self, stateSnapshot, persistentNodes):
+
+		restoredNodeIds = set()
+
+		self._acquireNodeTimeoutLock()
+
+		for nodeId in stateSnapshot["timeoutNodeIds"]:
+			if nodeId in persistentNodes:
+				self._timeoutNodeIds.add(nodeId)
+				restoredNodeIds.add(nodeId)
+
+		utcTimestamp = int(time.time())
+		for preTuple in stateSnapshot["preTimeoutNodeIds"]:
+			if (preTuple[0] in persistentNodes
+				and not preTuple[0] in restoredNodeIds):
+				self._preTimeoutNodeIds.add( (preTuple[0], utcTimestamp) )
+				restoredNodeIds.add(preTuple[0])
+
+		if self._timeoutNodeIds:
+			self._lastNodeTimeoutReminder = \
+				stateSnapshot["lastNodeTimeoutReminder"]
+
+		self._releaseNodeTimeoutLock()
+
+		utcTimestamp = int(time.time())
+		sensorsTimeoutList = self.storage.getSensorsUpdatedOlderThan(
+			utcTimestamp - int(1.5 * self.gracePeriodTimeout))
+		for sensorTuple in sensorsTimeoutList:
+			if sensorTuple[0] in stateSnapshot["timeoutSensorIds"]:
+				self.timeoutSensorIds.add(sensorTuple[0])
+
+		if self.timeoutSensorIds:
+			self.lastSensorTimeoutReminder = \
+				stateSnapshot["lastSensorTimeoutReminder"]
+
+		# Set the internal sensors to the state they had before.
+		stateList = list()
+		if self.nodeTimeoutSensor and self._timeoutNodeIds:
+			self.nodeTimeoutSensor.state = 1
+			stateList.append( (self.nodeTimeoutSensor.remoteSensorId, 1) )
+		if self.sensorTimeoutSensor and self.timeoutSensorIds:
+			self.sensorTimeoutSensor.state = 1
+			stateList.append( (self.sensorTimeoutSensor.remoteSensorId, 1) )
+		if (stateList
+			and not self.storage.updateSensorState(self.serverNodeId,
+			stateList)):
+
+			self.logger.error("[%s]: Not able to restore state "
+				% self.fileName
+				+ "of internal sensors.")
+
+		self.logger.info("[%s]: Restored %d timed out node(s) and "
+			% (self.fileName, len(self._timeoutNodeIds))
+			+ "%d timed out sensor(s) from state snapshot."
+			% len(self.timeoutSensorIds))
+
+		return restoredNodeIds
+
+
+	# Internal function that stores the runtime state of the server
+	# (timed out nodes and sensors, rule states, registrations) in order
+	# to restore it after a restart (a failure is not fatal).
+	def _storeStateSnapshot(self):
+
+		stateSnapshot = dict()
+		stateSnapshot["time"] = int(time.time())
+		stateSnapshot["configKey"] = self.globalData.configSnapshotKey
+		stateSnapshot["uniqueID"] = self._uniqueID
+
+		self._acquireNodeTimeoutLock()
+		stateSnapshot["timeoutNodeIds"] = set(self._timeoutNodeIds)
+		stateSnapshot["preTimeoutNodeIds"] = set(self._preTimeoutNodeIds)
+		stateSnapshot["lastNodeTimeoutReminder"] = \
+			self._lastNodeTimeoutReminder
+		self._releaseNodeTimeoutLock()
+
+		stateSnapshot["timeoutSensorIds"] = set(self.timeoutSensorIds)
+		stateSnapshot["lastSensorTimeoutReminder"] = \
+			self.lastSensorTimeoutReminder
+
+		stateSnapshot["ruleStates"] = self.sensorAlertExecuter.getRuleStates()
+
+		self.globalData.registrationCacheLock.acquire()
+		stateSnapshot["registrationCache"] = dict(
+			self.globalData.registrationCache)
+		self.globalData.registrationCacheLock.release()
+
+		tempFile = self.stateSnapshotFile + ".tmp"
+		try:
+			with open(tempFile, 'wb') as fp:
+				cPickle.dump(stateSnapshot, fp, cPickle.HIGHEST_PROTOCOL)
+
+			# replace the old snapshot atomically
+			os.rename(tempFile, self.stateSnapshotFile)
+
+		except Exception as e:
+			self.logger.exception("[%s]: Could not store state snapshot."
+				% self.fileName)
+
+
 	# Internal function that processes new occurred node timeouts
 	# and raises alarm.
 	def _processNewNodeTimeouts(self):
@@ -826,6 +938,7 @@ class ConnectionWatchdog(threading.Thread):
 	def run(self):
 
 		uniqueID = self.storage.getUniqueID()
+		self._uniqueID = uniqueID
 		self.serverNodeId = self.storage.getNodeId(uniqueID)
 
 		# Since we just started no node is connected to this server instance,
@@ -836,11 +949,19 @@ class ConnectionWatchdog(threading.Thread):
 				continue
 			self.storage.markNodeAsNotConnected(nodeId)
 
-		# Add all persistent nodes to the pre-timeout set in order to give
-		# them time to reconnect to the server.
+		# Restore the timed out nodes and sensors of the last state snapshot
+		# (if one exists) to not raise them again.
 		persistentNodes = self.storage.getAllPersistentNodeIds()
+		restoredNodeIds = set()
+		if not self.globalData.stateSnapshot is None:
+			restoredNodeIds = self._restoreTimeouts(
+				self.globalData.stateSnapshot, persistentNodes)
+
+		# Add all other persistent nodes to the pre-timeout set in order
+		# to give them time to reconnect to the server.
 		for nodeId in persistentNodes:
-			if nodeId == self.serverNodeId:
+			if (nodeId == self.serverNodeId
+				or nodeId in restoredNodeIds):
 				continue
 			self.addNodePreTimeout(nodeId)
 
@@ -848,6 +969,11 @@ class ConnectionWatchdog(threading.Thread):
 		# start and accept connections.
 		self._isInitialized = True
 
+		# Do not store the state snapshot before the nodes had the
+		# chance to reconnect (otherwise a restart directly after this
+		# one would restore all persistent nodes as pre-timed out).
+		self._lastStateSnapshot = time.time()
+
 		while 1:
 			# wait 5 seconds before checking time of last received data
 			for i in range(5):
@@ -903,6 +1029,13 @@ class ConnectionWatchdog(threading.Thread):
 			# Process reminder of timeouts.
 			self._processTimeoutReminder()
 
+			# Store the runtime state of the server periodically.
+			utcTimestamp = int(time.time())
+			if ((utcTimestamp - self._lastStateSnapshot)
+				>= self.stateSnapshotInterval):
+				self._lastStateSnapshot = utcTimestamp
+				self._storeStateSnapshot()
+
 
 	# sets the exit flag to shut down the thread
 	def exit(self):
@@ -62,6 +62,33 @@ class GlobalData:
 		self.configFile = os.path.dirname(os.path.abspath(__file__)) \
 			+ "/../config/config.xml"
 
+		# path to the snapshot of the parsed configuration file
+		# (used to skip parsing the alert levels on start if the
+		# configuration file has not changed)
+		self.configSnapshotFile = os.path.dirname(os.path.abspath(
+			__file__)) + "/../config/config.snapshot"
+
+		# key of the config snapshot of the currently used configuration
+		# (changes with the configuration and the server version)
+		self.configSnapshotKey = None
+
+		# path to the snapshot of the runtime state of the server
+		# (timed out nodes and sensors, rule states, registrations)
+		# that is used to restore the state after a restart and the
+		# interval in seconds in which it is stored
+		self.stateSnapshotFile = os.path.dirname(os.path.abspath(
+			__file__)) + "/../config/state.snapshot"
+		self.stateSnapshotInterval = 60.0
+
+		# maximal age in seconds of a state snapshot that is restored
+		# (an older snapshot does not describe the current state anymore
+		# and is ignored)
+		self.stateSnapshotMaxAge = 900.0
+
+		# runtime state loaded from the state snapshot on start
+		# (None if no snapshot exists)
+		self.stateSnapshot = None
+
 		# path to the csv user credentials file (if csv is used as backend)
 		self.userBackendCsvFile = os.path.dirname(os.path.abspath(__file__)) \
 			+ "/../config/users.csv"
@@ -95,6 +122,26 @@ class GlobalData:
 		# time the server is waiting on receives until a time out occurs
 		self.serverReceiveTimeout = 20.0
 
+		# is the compression of large messages activated and the minimal
+		# size of a message in bytes that is sent compressed
+		# (used if the configuration does not contain these settings)
+		self.compressionActivated = False
+		self.compressionThreshold = 1024
+
+		# number and lock of the sensor data updates the clients
+		# suppressed (deadband, minimum report interval) since the
+		# server was started
+		self.suppressedUpdatesLock = threading.BoundedSemaphore(1)
+		self.suppressedUpdates = 0
+
+		# cache and lock of the registrations of the nodes in the form:
+		# registrationCache[<username>] = (<registration fingerprint>,
+		# <node id>, {<remote sensor id>: <sensor id>, ...})
+		# (used to skip updating the database if a node registers itself
+		# again with an unchanged configuration)
+		self.registrationCacheLock = threading.BoundedSemaphore(1)
+		self.registrationCache = dict()
+
 		# list and lock of/for the asynchronous option executer
 		self.asyncOptionExecutersLock = threading.BoundedSemaphore(1)
 		self.asyncOptionExecuters = list()
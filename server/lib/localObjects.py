@@ -67,7 +67,15 @@ class AlertLevel:
 
 
 # This class represents a single sensor alert that was triggered.
-class SensorAlert:
+# (The attributes are stored in slots instead of a per object dictionary
+# because sensor alerts are created for every sensor alert read from
+# the database.)
+class SensorAlert(object):
+
+	__slots__ = ("sensorAlertId", "nodeId", "sensorId", "description",
+		"timeReceived", "alertDelay", "state", "hasOptionalData",
+		"optionalData", "changeState", "alertLevels", "rulesActivated",
+		"hasLatestData", "dataType", "sensorData")
 
 	def __init__(self):
 		self.sensorAlertId = None
@@ -17,6 +17,8 @@ import os
 import base64
 import random
 import json
+import zlib
+import hashlib
 from localObjects import SensorDataType, Sensor
 
 BUFSIZE = 4096
@@ -95,6 +97,30 @@ class ClientCommunication:
 		# is of type "sensor").
 		self.sensors = list()
 
+		# Flag that indicates if the compression of large messages was
+		# negotiated with the client, the minimal size of a message
+		# in bytes that is sent compressed and the maximal size of a
+		# decompressed message.
+		self.compression = False
+		self.compressionActivated = self.globalData.compressionActivated
+		self.compressionThreshold = self.globalData.compressionThreshold
+		self.maxDecompressedSize = 16777216
+
+		# Encoding of the registration message of the client
+		# (None if it is not compressed).
+		self.registrationEncoding = None
+
+		# Statistics of the compressed messages of this connection
+		# (sizes before and after the compression and the time spent
+		# to compress and decompress them).
+		self.compressionRawSize = 0
+		self.compressionSize = 0
+		self.compressionTime = 0.0
+
+		# Number of the sensor data updates the client suppressed
+		# (reported with its state changes).
+		self.suppressedUpdates = 0
+
 		# Needed for logging.
 		self.logger = self.globalData.logger
 		self.loggerFileHandler = None
@@ -814,6 +840,27 @@ class ClientCommunication:
 		# the client is finished as false
 		self.clientInitialized = False
 
+		# log the statistics of the compressed messages
+		if self.compressionRawSize > 0:
+			self.logger.info("[%s]: Compressed messages: %d bytes "
+				% (self.fileName, self.compressionRawSize)
+				+ "as %d bytes (%.1f%%) in %.3f seconds (%s:%d)."
+				% (self.compressionSize,
+				100.0 * self.compressionSize / self.compressionRawSize,
+				self.compressionTime, self.clientAddress, self.clientPort))
+
+		# log the sensor data updates the client suppressed
+		if self.suppressedUpdates > 0:
+			self.globalData.suppressedUpdatesLock.acquire()
+			totalSuppressedUpdates = self.globalData.suppressedUpdates
+			self.globalData.suppressedUpdatesLock.release()
+			self.logger.info("[%s]: Suppressed sensor data updates: %d "
+				% (self.fileName, self.suppressedUpdates)
+				+ "(%d in total since start) (%s:%d)."
+				% (totalSuppressedUpdates, self.clientAddress,
+				self.clientPort))
+			self.suppressedUpdates = 0
+
 		# mark node as not connected
 		self.storage.markNodeAsNotConnected(self.nodeId, logger=self.logger)
 
@@ -822,10 +869,68 @@ class ClientCommunication:
 		self.managerUpdateExecuter.managerUpdateEvent.set()
 
 
+	# Internal function that compresses the given message if the
+	# compression was negotiated with the client and the message is large
+	# enough (returns a tuple of the data to send and its encoding
+	# which is None if the message is not compressed).
+	def _compressMessage(self, messageType, message):
+
+		if (not self.compression
+			or len(message) < self.compressionThreshold):
+			return message, None
+
+		startTime = time.time()
+		data = zlib.compress(message)
+		duration = time.time() - startTime
+
+		self.compressionRawSize += len(message)
+		self.compressionSize += len(data)
+		self.compressionTime += duration
+
+		self.logger.debug("[%s]: Compressed %s message from %d to %d "
+			% (self.fileName, messageType, len(message), len(data))
+			+ "bytes in %.2f ms (%s:%d)."
+			% (duration * 1000, self.clientAddress, self.clientPort))
+
+		return data, "zlib"
+
+
+	# Internal function that decompresses the given received data
+	# with the given encoding (None if the data is not compressed).
+	def _decompressMessage(self, messageType, data, encoding):
+
+		if encoding is None:
+			return data
+
+		if not self.compression or encoding != "zlib":
+			raise ValueError("Encoding '%s' was not negotiated."
+				% encoding)
+
+		startTime = time.time()
+		decompressor = zlib.decompressobj()
+		message = decompressor.decompress(data, self.maxDecompressedSize)
+		if decompressor.unconsumed_tail:
+			raise ValueError("Decompressed message is larger than %d bytes."
+				% self.maxDecompressedSize)
+		duration = time.time() - startTime
+
+		self.compressionRawSize += len(message)
+		self.compressionSize += len(data)
+		self.compressionTime += duration
+
+		self.logger.debug("[%s]: Decompressed %s message from %d to %d "
+			% (self.fileName, messageType, len(data), len(message))
+			+ "bytes in %.2f ms (%s:%d)."
+			% (duration * 1000, self.clientAddress, self.clientPort))
+
+		return message
+
+
 	# this internal function that tries to initiate a transaction with
 	# the client (and acquires a lock if it is told to do so)
+	# (the encoding of the message is announced if it is compressed)
 	def _initiateTransaction(self, messageType, messageSize,
-		acquireLock=False):
+		acquireLock=False, encoding=None):
 
 		# try to get the exclusive state to be allowed to initiate a
 		# transaction with the client
@@ -889,6 +994,8 @@ class ClientCommunication:
 					"size": messageSize,
 					"message": messageType,
 					"payload": payload}
+				if encoding is not None:
+					message["encoding"] = encoding
 				self.sslSocket.send(json.dumps(message))
 
 			except Exception as e:
@@ -1339,9 +1446,22 @@ class ClientCommunication:
 			return False, 0
 
 		# Extract message header of received message.
+		self.compression = False
+		self.registrationEncoding = None
 		try:
 			messageSize = int(message["size"])
 
+			# Use compression if the client offers it and it is activated.
+			# The client offers to send its registration message compressed
+			# if it is large enough.
+			if (self.compressionActivated
+				and message["payload"].get("compression", None) == "zlib"):
+				self.compression = True
+
+				if "compressedSize" in message.keys():
+					messageSize = int(message["compressedSize"])
+					self.registrationEncoding = "zlib"
+
 		except Exception as e:
 			self.logger.exception("[%s]: Authentication message "
 				% self.fileName
@@ -1543,6 +1663,8 @@ class ClientCommunication:
 				"result": "ok",
 				"version": self.serverVersion,
 				"rev" : self.serverRev}
+			if self.compression:
+				payload["compression"] = "zlib"
 			utcTimestamp = int(time.time())
 			message = {"serverTime": utcTimestamp,
 				"message": "initialization",
@@ -1558,6 +1680,51 @@ class ClientCommunication:
 		return True, messageSize
 
 
+	# internal function that returns the fingerprint of the registration
+	# of the client (the states and data of the sensors are not part
+	# of it because they change without a change of the registration)
+	def _getRegistrationFingerprint(self, payload):
+
+		registration = dict(payload)
+		if "sensors" in registration.keys():
+			registration["sensors"] = map(
+				lambda x: dict(filter(
+				lambda y: y[0] != "state" and y[0] != "data",
+				x.items())),
+				registration["sensors"])
+		registration["version"] = self.clientVersion
+		registration["rev"] = self.clientRev
+
+		sha256 = hashlib.sha256()
+		sha256.update(json.dumps(registration, sort_keys=True))
+		return sha256.hexdigest()
+
+
+	# internal function that updates the states and data of the sensors
+	# of a client whose registration has not changed
+	# (instead of adding the sensors to the database again)
+	def _updateRegisteredSensors(self, sensorIds):
+
+		stateList = list()
+		dataList = list()
+		for sensor in self.sensors:
+			sensor.sensorId = sensorIds[sensor.remoteSensorId]
+			stateList.append( (sensor.remoteSensorId, sensor.state) )
+			if sensor.dataType != SensorDataType.NONE:
+				dataList.append( (sensor.remoteSensorId, sensor.data) )
+
+		if not self.storage.updateSensorState(self.nodeId, stateList,
+			logger=self.logger):
+			return False
+
+		if (dataList
+			and not self.storage.updateSensorData(self.nodeId, dataList,
+			logger=self.logger)):
+			return False
+
+		return True
+
+
 	# Internal function to register the client (add it to the database
 	# or check if it is known).
 	def _registerClient(self, messageSize):
@@ -1581,6 +1748,9 @@ class ClientCommunication:
 						% (self.clientAddress, self.clientPort))
 					return False
 
+			data = self._decompressMessage("registration", data,
+				self.registrationEncoding)
+
 			message = json.loads(data)
 			# check if an error was received
 			if "error" in message.keys():
@@ -1729,10 +1899,39 @@ class ClientCommunication:
 				% (self.fileName, self.hostname, self.nodeType,
 					self.clientAddress, self.clientPort))
 
+		# check if the node registered itself before with the same
+		# registration (and the node and its sensors still exist
+		# in the database)
+		# => the database does not have to be updated
+		try:
+			regFingerprint = self._getRegistrationFingerprint(
+				message["payload"])
+		except Exception as e:
+			regFingerprint = None
+		knownRegistration = False
+		self.globalData.registrationCacheLock.acquire()
+		cachedRegistration = self.globalData.registrationCache.get(
+			self.username)
+		self.globalData.registrationCacheLock.release()
+		if (not regFingerprint is None
+			and not cachedRegistration is None
+			and cachedRegistration[0] == regFingerprint
+			and cachedRegistration[1] == self.storage.getNodeId(
+			self.username, logger=self.logger)
+			and len(cachedRegistration[2]) == self.storage.getSensorCount(
+			cachedRegistration[1], logger=self.logger)):
+
+			self.logger.debug("[%s]: Registration of node unchanged. "
+				% self.fileName
+				+ "Skipping database update (%s:%d)."
+				% (self.clientAddress, self.clientPort))
+			knownRegistration = True
+
 		# add node to database
-		if not self.storage.addNode(self.username, self.hostname,
+		if (not knownRegistration
+			and not self.storage.addNode(self.username, self.hostname,
 			self.nodeType, self.instance, self.clientVersion, self.clientRev,
-			self.persistent, logger=self.logger):
+			self.persistent, logger=self.logger)):
 			self.logger.error("[%s]: Unable to add node to database."
 				% self.fileName)
 
@@ -1890,8 +2089,15 @@ class ClientCommunication:
 				self.sensors.append(tempSensor)
 
 			# add sensors to database
-			if not self.storage.addSensors(self.username, sensors,
-				logger=self.logger):
+			# (only the states and data of the sensors are updated
+			# if the registration has not changed)
+			if knownRegistration:
+				sensorsAdded = self._updateRegisteredSensors(
+					cachedRegistration[2])
+			else:
+				sensorsAdded = self.storage.addSensors(self.username,
+					sensors, logger=self.logger)
+			if not sensorsAdded:
 				self.logger.error("[%s]: Unable to add "
 					% self.fileName
 					+ "sensors to database (%s:%d)."
@@ -1909,9 +2115,13 @@ class ClientCommunication:
 
 				return False
 
-			# Get sensor id for each registered sensor object.
+			# Get sensor id for each registered sensor object
+			# (already set if the registration has not changed).
 			for sensor in self.sensors:
 
+				if knownRegistration:
+					continue
+
 				sensor.sensorId = self.storage.getSensorId(self.nodeId,
 					sensor.remoteSensorId, logger=self.logger)
 
@@ -2031,8 +2241,9 @@ class ClientCommunication:
 					self.clientAddress, self.clientPort))
 
 			# add alerts to database
-			if not self.storage.addAlerts(self.username, alerts,
-				logger=self.logger):
+			if (not knownRegistration
+				and not self.storage.addAlerts(self.username, alerts,
+				logger=self.logger)):
 				self.logger.error("[%s]: Unable to add " % self.fileName
 					+ "alerts to database (%s:%d)."
 					% (self.clientAddress, self.clientPort))
@@ -2104,8 +2315,9 @@ class ClientCommunication:
 					% (self.fileName, self.clientAddress, self.clientPort))
 
 			# add manager to database
-			if not self.storage.addManager(self.username, manager,
-				logger=self.logger):
+			if (not knownRegistration
+				and not self.storage.addManager(self.username, manager,
+				logger=self.logger)):
 				self.logger.error("[%s]: Unable to add " % self.fileName
 					+ "manager to database (%s:%d)."
 					% (self.clientAddress, self.clientPort))
@@ -2139,6 +2351,17 @@ class ClientCommunication:
 
 			return False
 
+		# remember the registration of the node to skip updating the
+		# database if the node registers itself again unchanged
+		if not regFingerprint is None:
+			sensorIds = dict()
+			for sensor in self.sensors:
+				sensorIds[sensor.remoteSensorId] = sensor.sensorId
+			self.globalData.registrationCacheLock.acquire()
+			self.globalData.registrationCache[self.username] = (
+				regFingerprint, self.nodeId, sensorIds)
+			self.globalData.registrationCacheLock.release()
+
 		# send registration response
 		try:
 
@@ -2787,6 +3010,20 @@ class ClientCommunication:
 						self.clientPort))
 					return False
 
+			# The number of data updates the client suppressed since its
+			# last state change is optional (only sent if there are any).
+			suppressedUpdates = 0
+			if "suppressed" in incomingMessage["payload"].keys():
+				suppressedUpdates = incomingMessage["payload"]["suppressed"]
+				if (not isinstance(suppressedUpdates, int)
+					or suppressedUpdates < 0):
+
+					self.logger.error("[%s]: Received suppressed invalid "
+						% self.fileName
+						+ "(%s:%d)."
+						% (self.clientAddress, self.clientPort))
+					return False
+
 			remoteSensorId = incomingMessage["payload"]["clientSensorId"]
 			state = incomingMessage["payload"]["state"]
 			sensorDataType = incomingMessage["payload"]["dataType"]
@@ -2843,6 +3080,18 @@ class ClientCommunication:
 			sensor.lastStateUpdated = int(time.time())
 			sensor.data = sensorData
 
+			# Count the data updates the client suppressed for this sensor.
+			if suppressedUpdates > 0:
+				self.suppressedUpdates += suppressedUpdates
+				self.globalData.suppressedUpdatesLock.acquire()
+				self.globalData.suppressedUpdates += suppressedUpdates
+				self.globalData.suppressedUpdatesLock.release()
+
+				self.logger.debug("[%s]: Client suppressed %d data updates "
+					% (self.fileName, suppressedUpdates)
+					+ "of remote sensor id %d (%s:%d)."
+					% (remoteSensorId, self.clientAddress, self.clientPort))
+
 		except Exception as e:
 			self.logger.exception("[%s]: Received state change "
 				% self.fileName
@@ -3255,9 +3504,13 @@ class ClientCommunication:
 		if not alertSystemStateMessage:
 			return False
 
+		alertSystemStateMessage, encoding = self._compressMessage("status",
+			alertSystemStateMessage)
+
 		# initiate transaction with client and acquire lock
 		if not self._initiateTransaction("status",
-			len(alertSystemStateMessage), acquireLock=True):
+			len(alertSystemStateMessage), acquireLock=True,
+			encoding=encoding):
 			return False
 
 		returnValue = self._sendManagerAllInformation(alertSystemStateMessage)
@@ -3271,9 +3524,12 @@ class ClientCommunication:
 
 		sensorAlertMessage = self._buildSensorAlertMessage(sensorAlert)
 
+		sensorAlertMessage, encoding = self._compressMessage("sensoralert",
+			sensorAlertMessage)
+
 		# initiate transaction with client and acquire lock
 		if not self._initiateTransaction("sensoralert",
-			len(sensorAlertMessage), acquireLock=True):
+			len(sensorAlertMessage), acquireLock=True, encoding=encoding):
 			return False
 
 		# Send sensor alert message.
@@ -3517,6 +3773,7 @@ class ClientCommunication:
 				if str(message["payload"]["type"]).upper() == "rts".upper():
 					receivedTransactionId = int(message["payload"]["id"])
 					messageSize = int(message["size"])
+					encoding = message.get("encoding", None)
 
 					# received RTS (request to send) message
 					self.logger.debug("[%s]: Received RTS %d message (%s:%d)."
@@ -3559,6 +3816,10 @@ class ClientCommunication:
 							self._finalizeLogger()
 							return
 
+					# decompress the message if it was sent compressed
+					data = self._decompressMessage(str(message["message"]),
+						data, encoding)
+
 				# if no RTS was received
 				# => client does not stick to protocol
 				# => terminate session